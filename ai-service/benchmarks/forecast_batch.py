@@ -0,0 +1,55 @@
+"""
+Benchmark ForecastModel.forecast_batch against per-series ForecastModel.forecast.
+
+Usage (from ai-service/):
+    python -m benchmarks.forecast_batch [--series N] [--days N] [--horizon 7|30|90] [--model-type NAME]
+"""
+import argparse
+import time
+from datetime import date, timedelta
+from typing import List, Optional
+
+import numpy as np
+
+from src.models.forecasting.forecast_model import DAILY_FIELDS, MODEL_TYPES, ForecastModel
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark; returns a process exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--series", type=int, default=10000, help="Number of series")
+    parser.add_argument("--days", type=int, default=90, help="Days of history per series")
+    parser.add_argument("--horizon", type=int, choices=[7, 30, 90], default=30, help="Forecast horizon in days")
+    parser.add_argument("--model-type", choices=MODEL_TYPES, default="exponential_smoothing", help="Model to benchmark")
+    args = parser.parse_args(argv)
+    
+    rng = np.random.default_rng(0)
+    quantities = rng.gamma(2.0, 20.0, size=(args.series, args.days)).round(3)
+    start = date.today() - timedelta(days=args.days - 1)
+    dates = [(start + timedelta(days=i)).isoformat() for i in range(args.days)]
+    model = ForecastModel(model_type=args.model_type)
+    
+    began = time.perf_counter()
+    per_series = [
+        model.forecast([{"date": day, "quantity": quantity} for day, quantity in zip(dates, row)], args.horizon)
+        for row in quantities.tolist()
+    ]
+    per_series_seconds = time.perf_counter() - began
+    
+    began = time.perf_counter()
+    batch = model.forecast_batch(quantities, args.horizon)
+    batch_seconds = time.perf_counter() - began
+    
+    for name in ("predicted_demand", "confidence_lower", "confidence_upper") + DAILY_FIELDS:
+        expected = np.array([result[name] for result in per_series])
+        np.testing.assert_allclose(batch[name], expected, atol=1e-3, err_msg=name)
+    np.testing.assert_allclose(batch["features"]["trend"], [result["features"]["trend"] for result in per_series], atol=1e-3)
+    
+    print(f"{args.model_type}: {args.series} series x {args.days} days, {args.horizon}-day horizon")
+    print(f"per-series: {per_series_seconds:8.3f} s")
+    print(f"batch:      {batch_seconds:8.3f} s  ({per_series_seconds / batch_seconds:.0f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
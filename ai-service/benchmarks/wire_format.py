@@ -0,0 +1,59 @@
+"""
+Benchmark reading a batch forecast request as JSON against the binary series format.
+
+Measures what the ai-service does before any model runs: parsing and
+validating the body, and getting the quantities as a matrix.
+
+Usage (from ai-service/):
+    python -m benchmarks.wire_format [--series N] [--days N]
+"""
+import argparse
+import json
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from src.api.forecast_api import ForecastBatchRequest
+from src.services import wire_format
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark; returns a process exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--series", type=int, default=10000, help="Number of series")
+    parser.add_argument("--days", type=int, default=90, help="Days of history per series")
+    args = parser.parse_args(argv)
+    
+    rng = np.random.default_rng(0)
+    quantities = rng.gamma(2.0, 20.0, size=(args.series, args.days)).round(3)
+    header = {
+        "series_ids": [f"{i}:0" for i in range(args.series)],
+        "start_date": "2025-01-01",
+        "forecast_horizon_days": 30,
+        "model_type": "auto"
+    }
+    json_body = json.dumps({**header, "quantities": quantities.tolist()}).encode("utf-8")
+    binary_body = wire_format.encode(header, quantities)
+    
+    began = time.perf_counter()
+    request = ForecastBatchRequest.model_validate_json(json_body)
+    from_json = np.asarray(request.quantities, dtype=np.float64)
+    json_seconds = time.perf_counter() - began
+    
+    began = time.perf_counter()
+    decoded_header, from_binary = wire_format.decode(binary_body)
+    ForecastBatchRequest.model_validate({**decoded_header, "quantities": []})
+    from_binary = from_binary.astype(np.float64)
+    binary_seconds = time.perf_counter() - began
+    
+    np.testing.assert_allclose(from_binary, from_json, rtol=1e-6)
+    
+    print(f"{args.series} series x {args.days} days")
+    print(f"json:   {len(json_body) / 1e6:8.2f} MB  {json_seconds:8.4f} s")
+    print(f"binary: {len(binary_body) / 1e6:8.2f} MB  {binary_seconds:8.4f} s  ({json_seconds / binary_seconds:.0f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,149 @@
+"""
+Backtesting API endpoints.
+"""
+import asyncio
+from fastapi import APIRouter, HTTPException, Request, status
+from pydantic import BaseModel
+from typing import List, Optional
+
+import numpy as np
+
+from src.api.series_request import quantity_matrix, read_request, request_body_openapi
+from src.models.forecasting.forecast_model import MODEL_TYPES
+from src.services import backtesting
+from src.services.model_executor import ModelPoolSaturated, model_executor
+from src.services.model_selection import model_selection
+
+router = APIRouter()
+
+
+class BacktestRequest(BaseModel):
+    """Backtest request: one row of daily quantities per series."""
+    series_ids: List[str]  # 'product_id:warehouse_id', as used by forecast requests
+    start_date: str  # ISO date of the first column
+    quantities: List[List[float]]  # len(series_ids) rows, all the same length (float32 array if sent binary)
+    forecast_horizon_days: int = 30  # Days per backtest window
+    folds: int = 3
+    model_types: Optional[List[str]] = None  # Candidates (defaults to every model)
+    persist: bool = True  # Store the winners for model_type 'auto' at this horizon
+
+
+class BacktestModelSummary(BaseModel):
+    """Accuracy of one candidate across all series."""
+    model_type: str
+    mean_wape: Optional[float]
+    share_within_tolerance: float  # Share of series x folds with the horizon total within 20% (SC-006)
+    wins: int
+
+
+class BacktestResponse(BaseModel):
+    """Columnar backtest response, one list entry per series, plus per-model summaries."""
+    series_ids: List[str]
+    forecast_horizon_days: int
+    folds: int
+    model_types: List[str]  # Winner per series
+    wape: List[Optional[float]]
+    mape: List[Optional[float]]
+    bias: List[Optional[float]]
+    within_tolerance: List[Optional[float]]
+    models: List[BacktestModelSummary]
+
+
+def _column(values: np.ndarray) -> List[Optional[float]]:
+    """JSON-safe list with NaN as None."""
+    return [None if np.isnan(value) else round(float(value), 4) for value in values]
+
+
+@router.post("", response_model=BacktestResponse, openapi_extra=request_body_openapi(BacktestRequest))
+async def run_backtest(http_request: Request):
+    """
+    Backtest candidate models on many series and pick the best per series.
+    
+    The series are split across the model worker pool, so a large request
+    uses every core. With persist, the winners are used by later forecast
+    requests with model_type 'auto'. The body is a BacktestRequest as JSON
+    or in the binary series format.
+    """
+    request = await read_request(http_request, BacktestRequest)
+    
+    candidates = request.model_types or list(MODEL_TYPES)
+    unknown = [model_type for model_type in candidates if model_type not in MODEL_TYPES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown model types: {', '.join(unknown)}. Must be among: {', '.join(MODEL_TYPES)}"
+        )
+    
+    if not request.series_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one series is required"
+        )
+    quantities = quantity_matrix(request.quantities, len(request.series_ids))
+    
+    if not 1 <= request.forecast_horizon_days <= 90 or not 1 <= request.folds <= 12:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="forecast_horizon_days must be 1 to 90 and folds 1 to 12"
+        )
+    
+    try:
+        chunks = np.array_split(quantities, min(model_executor.workers, len(quantities)))
+        chunk_results = await asyncio.gather(*(
+            model_executor.run(backtesting.evaluate, chunk, request.forecast_horizon_days, candidates, request.folds)
+            for chunk in chunks
+        ))
+    except ModelPoolSaturated:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Backtest failed: {str(e)}"
+        )
+    
+    results = {
+        model_type: {
+            name: np.concatenate([chunk[model_type][name] for chunk in chunk_results])
+            for name in backtesting.METRICS
+        }
+        for model_type in candidates
+    }
+    winners, metrics = backtesting.select_winners(results)
+    
+    columns = {
+        'wape': _column(metrics['wape']),
+        'mape': _column(metrics['mape']),
+        'bias': _column(metrics['bias']),
+        'within_tolerance': _column(metrics['within_tolerance'])
+    }
+    
+    if request.persist:
+        model_selection.record(request.forecast_horizon_days, {
+            series_id: {
+                'model_type': winner,
+                **{name: values[i] for name, values in columns.items()}
+            }
+            for i, (series_id, winner) in enumerate(zip(request.series_ids, winners))
+        })
+    
+    return BacktestResponse(
+        series_ids=request.series_ids,
+        forecast_horizon_days=request.forecast_horizon_days,
+        folds=request.folds,
+        model_types=winners,
+        **columns,
+        models=[
+            BacktestModelSummary(
+                model_type=model_type,
+                mean_wape=None if np.isnan(results[model_type]['wape']).all() else round(float(np.nanmean(results[model_type]['wape'])), 4),
+                share_within_tolerance=round(float(results[model_type]['within_tolerance'].mean()), 4),
+                wins=winners.count(model_type)
+            )
+            for model_type in candidates
+        ]
+    )
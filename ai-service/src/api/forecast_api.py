@@ -1,15 +1,26 @@
 """
 Forecast API endpoints.
 """
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 from datetime import date
 
-from src.models.forecasting.forecast_model import ForecastModel
+import numpy as np
+
+from src.api.series_request import quantity_matrix, read_request, request_body_openapi
+from src.models.forecasting.forecast_model import DAILY_FIELDS, MODEL_TYPES, ForecastModel
+from src.registry.model_registry import registry
+from src.services import model_tasks
+from src.services.forecast_cache import ForecastCache, forecast_cache
+from src.services.model_executor import ModelPoolSaturated, model_executor
+from src.services.model_selection import model_selection
 
 router = APIRouter()
 
+# Accepted model_type values; 'auto' uses each series' backtest winner
+REQUEST_MODEL_TYPES = MODEL_TYPES + ('auto',)
+
 
 class ForecastRequest(BaseModel):
     """Forecast generation request."""
@@ -17,7 +28,7 @@ class ForecastRequest(BaseModel):
     warehouse_id: str
     historical_data: List[dict]  # List of {date, quantity} records
     forecast_horizon_days: int  # 7, 30, or 90
-    model_type: Optional[str] = "exponential_smoothing"  # 'arima', 'exponential_smoothing', 'lstm'
+    model_type: Optional[str] = "auto"  # One of REQUEST_MODEL_TYPES
 
 
 class ForecastResponse(BaseModel):
@@ -32,26 +43,68 @@ class ForecastResponse(BaseModel):
     confidence_level: Optional[float] = 0.80
     model_version: str
     model_type: str
+    daily_demand: Optional[List[float]] = None  # Forecast for each day of the horizon, starting tomorrow
+    daily_lower: Optional[List[float]] = None  # 80% band per day
+    daily_upper: Optional[List[float]] = None
     features_json: Optional[dict] = None
 
 
-@router.post("", response_model=ForecastResponse)
-async def generate_forecast(request: ForecastRequest):
+class ForecastBatchRequest(BaseModel):
+    """Batch forecast request: one row of daily quantities per series."""
+    series_ids: List[str]
+    start_date: str  # ISO date of the first column
+    quantities: List[List[float]]  # len(series_ids) rows, all the same length (float32 array if sent binary)
+    forecast_horizon_days: int  # 7, 30, or 90
+    model_type: Optional[str] = "auto"  # One of REQUEST_MODEL_TYPES
+    include_daily: bool = False  # Also return the daily path of every series
+
+
+class ForecastBatchResponse(BaseModel):
+    """Columnar batch forecast response, one list entry per series."""
+    series_ids: List[str]
+    forecast_horizon_days: int
+    forecast_date: str
+    model_version: str
+    model_type: str
+    model_types: List[str]  # Model used per series (differs from model_type with 'auto')
+    confidence_level: float
+    predicted_demand: List[float]
+    confidence_lower: List[float]
+    confidence_upper: List[float]
+    daily_demand: Optional[List[List[float]]] = None  # With include_daily: one row of horizon days per series
+    daily_lower: Optional[List[List[float]]] = None
+    daily_upper: Optional[List[List[float]]] = None
+    features: Dict[str, List[Optional[float]]]
+
+
+@router.post("", response_model=ForecastResponse, openapi_extra=request_body_openapi(ForecastRequest))
+async def generate_forecast(http_request: Request):
     """
     Generate demand forecast for a product at a warehouse.
     
+    The body is a ForecastRequest as JSON, or one series in the binary
+    series format.
+    
     Args:
-        request: Forecast request with historical data
+        http_request: Request carrying the forecast request and historical data
         
     Returns:
         Forecast response with predicted demand
     """
+    request = await read_request(http_request, ForecastRequest)
+    
     if request.forecast_horizon_days not in [7, 30, 90]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="forecast_horizon_days must be 7, 30, or 90"
         )
     
+    if request.model_type not in REQUEST_MODEL_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"model_type must be one of: {', '.join(REQUEST_MODEL_TYPES)}"
+        )
+    
     if not request.historical_data or len(request.historical_data) < 10:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -59,14 +112,29 @@ async def generate_forecast(request: ForecastRequest):
         )
     
     try:
-        # Initialize forecast model
-        model = ForecastModel(model_type=request.model_type)
-        
-        # Generate forecast
-        forecast_result = model.forecast(
-            historical_data=request.historical_data,
-            horizon_days=request.forecast_horizon_days
+        registry.refresh()  # A version activated by another worker invalidates the cache
+        model_type = model_selection.resolve(
+            [f"{request.product_id}:{request.warehouse_id}"],
+            request.forecast_horizon_days,
+            len(request.historical_data),
+            request.model_type
+        )[0]
+        model = ForecastModel(model_type=model_type)
+        prefix = ForecastCache.key_prefix(
+            model_type, model.model_version, request.forecast_horizon_days, alpha=model.alpha, method="single"
         )
+        cache_key = ForecastCache.key(prefix, np.array([float(item.get('quantity', 0)) for item in request.historical_data]))
+        
+        # Generate forecast in the model pool unless this history was just forecast
+        forecast_result = forecast_cache.get(cache_key)
+        if forecast_result is None:
+            forecast_result = await model_executor.run(
+                model_tasks.forecast,
+                model_type,
+                request.historical_data,
+                request.forecast_horizon_days
+            )
+            forecast_cache.put(cache_key, forecast_result)
         
         return ForecastResponse(
             product_id=request.product_id,
@@ -78,11 +146,128 @@ async def generate_forecast(request: ForecastRequest):
             confidence_upper=forecast_result.get('confidence_upper'),
             confidence_level=forecast_result.get('confidence_level', 0.80),
             model_version=forecast_result['model_version'],
-            model_type=request.model_type,
+            model_type=model_type,
+            daily_demand=forecast_result.get('daily_demand'),
+            daily_lower=forecast_result.get('daily_lower'),
+            daily_upper=forecast_result.get('daily_upper'),
             features_json=forecast_result.get('features')
         )
+    except ModelPoolSaturated:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Forecast generation failed: {str(e)}"
         )
+
+
+@router.post("/batch", response_model=ForecastBatchResponse, openapi_extra=request_body_openapi(ForecastBatchRequest))
+async def generate_forecast_batch(http_request: Request):
+    """
+    Generate demand forecasts for many series in one request.
+    
+    The body is a ForecastBatchRequest as JSON or in the binary series
+    format, which skips parsing and validating every quantity.
+    
+    Args:
+        http_request: Request carrying series identifiers and their daily quantities as a matrix
+        
+    Returns:
+        Columnar forecast response, in the order of series_ids
+    """
+    request = await read_request(http_request, ForecastBatchRequest)
+    
+    if request.forecast_horizon_days not in [7, 30, 90]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="forecast_horizon_days must be 7, 30, or 90"
+        )
+    
+    if request.model_type not in REQUEST_MODEL_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"model_type must be one of: {', '.join(REQUEST_MODEL_TYPES)}"
+        )
+    
+    quantities = quantity_matrix(request.quantities, len(request.series_ids))
+    if quantities.shape[1] < 10:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least 10 historical data points are required"
+        )
+    
+    try:
+        registry.refresh()  # A version activated by another worker invalidates the cache
+        model_types = model_selection.resolve(
+            request.series_ids, request.forecast_horizon_days, quantities.shape[1], request.model_type
+        )
+        
+        rows: List[Optional[dict]] = [None] * len(model_types)
+        for model_type in dict.fromkeys(model_types):
+            index = [i for i, series_model in enumerate(model_types) if series_model == model_type]
+            for i, row in zip(index, await _forecast_rows(model_type, quantities[index], request.forecast_horizon_days)):
+                rows[i] = row
+        
+        return ForecastBatchResponse(
+            series_ids=request.series_ids,
+            forecast_horizon_days=request.forecast_horizon_days,
+            forecast_date=date.today().isoformat(),
+            model_version=rows[0]['model_version'],
+            model_type=request.model_type,
+            model_types=model_types,
+            confidence_level=rows[0]['confidence_level'],
+            predicted_demand=[row['predicted_demand'] for row in rows],
+            confidence_lower=[row['confidence_lower'] for row in rows],
+            confidence_upper=[row['confidence_upper'] for row in rows],
+            **({name: [row[name] for row in rows] for name in DAILY_FIELDS} if request.include_daily else {}),
+            features=_feature_columns(rows)
+        )
+    except ModelPoolSaturated:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Forecast generation failed: {str(e)}"
+        )
+
+
+async def _forecast_rows(model_type: str, quantities: np.ndarray, horizon_days: int) -> List[dict]:
+    """Per-series results of one model, from the cache or the model pool for the rest."""
+    model = ForecastModel(model_type=model_type)
+    model_version = model.model_version
+    prefix = ForecastCache.key_prefix(model_type, model_version, horizon_days, alpha=model.alpha, method="batch")
+    keys = [ForecastCache.key(prefix, row) for row in quantities]
+    rows = [forecast_cache.get(key) for key in keys]
+    
+    # Only series not forecast recently go to the model pool
+    missing = [i for i, row in enumerate(rows) if row is None]
+    if missing:
+        result = await model_executor.run(model_tasks.forecast_batch, model_type, quantities[missing], horizon_days)
+        for j, i in enumerate(missing):
+            rows[i] = {
+                'predicted_demand': float(result['predicted_demand'][j]),
+                'confidence_lower': float(result['confidence_lower'][j]),
+                'confidence_upper': float(result['confidence_upper'][j]),
+                'confidence_level': result['confidence_level'],
+                'model_version': model_version,
+                **{name: result[name][j].tolist() for name in DAILY_FIELDS},
+                'features': {name: float(values[j]) for name, values in result['features'].items()}
+            }
+            forecast_cache.put(keys[i], rows[i])
+    return rows
+
+
+def _feature_columns(rows: List[dict]) -> Dict[str, List[Optional[float]]]:
+    """Columnar features; a feature only some of the models report is None for the others."""
+    names = dict.fromkeys(name for row in rows for name in row['features'])
+    return {name: [row['features'].get(name) for row in rows] for name in names}
@@ -5,7 +5,8 @@ from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel
 from typing import Optional
 
-from src.services.recommendation_service import RecommendationService
+from src.services import model_tasks
+from src.services.model_executor import ModelPoolSaturated, model_executor
 
 router = APIRouter()
 
@@ -53,8 +54,6 @@ async def generate_recommendation(request: RecommendationRequest):
         )
     
     try:
-        service = RecommendationService()
-        
         if request.recommendation_type == 'reorder_quantity':
             if request.minimum_stock is None:
                 request.minimum_stock = request.current_stock * 0.5  # Default to 50% of current
@@ -62,7 +61,7 @@ async def generate_recommendation(request: RecommendationRequest):
             if request.safety_stock is None:
                 request.safety_stock = request.minimum_stock * 0.3  # Default to 30% of minimum
             
-            result = service.calculate_reorder_quantity(
+            params = dict(
                 current_stock=request.current_stock,
                 predicted_demand=request.predicted_demand,
                 lead_time_days=request.lead_time_days,
@@ -73,7 +72,7 @@ async def generate_recommendation(request: RecommendationRequest):
             if request.safety_stock is None:
                 request.safety_stock = request.current_stock * 0.2  # Default
             
-            result = service.calculate_reorder_point(
+            params = dict(
                 predicted_demand=request.predicted_demand,
                 lead_time_days=request.lead_time_days,
                 safety_stock=request.safety_stock
@@ -86,7 +85,7 @@ async def generate_recommendation(request: RecommendationRequest):
             if request.safety_stock is None:
                 request.safety_stock = request.minimum_stock * 0.3
             
-            result = service.calculate_reorder_quantity(
+            params = dict(
                 current_stock=request.current_stock,
                 predicted_demand=request.predicted_demand,
                 lead_time_days=request.lead_time_days,
@@ -94,6 +93,8 @@ async def generate_recommendation(request: RecommendationRequest):
                 minimum_stock=request.minimum_stock
             )
         
+        result = await model_executor.run(model_tasks.recommend, request.recommendation_type, params)
+        
         return RecommendationResponse(
             recommendation_type=request.recommendation_type,
             product_id=request.product_id,
@@ -105,6 +106,8 @@ async def generate_recommendation(request: RecommendationRequest):
             explanation=result['explanation'],
             explanation_json=result['explanation_json']
         )
+    except ModelPoolSaturated:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
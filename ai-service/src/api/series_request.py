@@ -0,0 +1,101 @@
+"""
+Request bodies carrying daily quantities, as JSON or in the binary series format.
+
+Endpoints taking quantities read their body with read_request, which picks
+the decoder from the Content-Type header: JSON is validated into the
+endpoint's pydantic model as usual, the binary format (see
+src.services.wire_format) is decoded without per-value parsing.
+"""
+from typing import Any, Dict, List, Type, TypeVar, Union
+
+import numpy as np
+from fastapi import HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+
+from src.services import wire_format
+
+RequestModel = TypeVar("RequestModel", bound=BaseModel)
+
+
+def request_body_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """openapi_extra documenting both encodings of a request body."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": model.model_json_schema()},
+                wire_format.CONTENT_TYPE: {"schema": {"type": "string", "format": "binary"}}
+            }
+        }
+    }
+
+
+async def read_request(request: Request, model: Type[RequestModel]) -> RequestModel:
+    """
+    Read a request body into model.
+    
+    Of a binary body only the header is validated; quantities is then set
+    to the float32 (series, days) array instead of lists. Models of one
+    series take historical_data instead, which is built as {date, quantity}
+    records from start_date and the single row.
+    """
+    content_type = request.headers.get("content-type")
+    body = await request.body()
+    
+    if content_type and not wire_format.is_binary(content_type) \
+            and not content_type.split(";")[0].strip().lower().endswith("json"):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Content-Type must be application/json or {wire_format.CONTENT_TYPE}"
+        )
+    
+    try:
+        if not wire_format.is_binary(content_type):
+            return model.model_validate_json(body)
+        
+        try:
+            header, quantities = wire_format.decode(body)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+        if "quantities" in model.model_fields:
+            return model.model_validate({**header, "quantities": []}).model_copy(update={"quantities": quantities})
+        return model.model_validate({**header, "historical_data": _records(header.get("start_date"), quantities)})
+    except ValidationError as e:
+        raise RequestValidationError(e.errors()) from e
+
+
+def _records(start_date: Any, quantities: np.ndarray) -> List[Dict[str, Any]]:
+    """{date, quantity} records of a one-row quantity matrix."""
+    if len(quantities) != 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Binary single-series requests must hold exactly one row"
+        )
+    try:
+        dates = np.datetime64(str(start_date), 'D') + np.arange(quantities.shape[1])
+    except (TypeError, ValueError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Binary single-series requests need an ISO start_date"
+        ) from e
+    return [{"date": str(day), "quantity": float(quantity)} for day, quantity in zip(dates, quantities[0])]
+
+
+def quantity_matrix(quantities: Union[np.ndarray, List[List[float]]], series_count: int) -> np.ndarray:
+    """Quantities as a float64 (series, days) matrix, rejecting ragged rows or a wrong row count."""
+    if not isinstance(quantities, np.ndarray):
+        days = len(quantities[0]) if quantities else 0
+        if any(len(row) != days for row in quantities):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="All quantity rows must have the same length"
+            )
+        quantities = np.asarray(quantities, dtype=np.float64).reshape(len(quantities), days)
+    
+    if len(quantities) != series_count:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="quantities must have one row per series"
+        )
+    return quantities.astype(np.float64, copy=False)
@@ -0,0 +1,29 @@
+"""
+Service settings.
+
+Read once from the environment:
+    AI_DATA_DIR             Directory for persistent state (default: the service's data/ directory)
+    AI_MODEL_REGISTRY_DIR   Model registry root (default: $AI_DATA_DIR/registry)
+
+Paths are made absolute, so they do not depend on the working directory
+the service is started from. Nothing is created until it is written.
+"""
+import os
+
+# ai-service directory (src/config/settings.py is three levels below it)
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class Settings:
+    """Service settings loaded from environment variables."""
+    
+    def __init__(self):
+        self.data_dir = os.path.abspath(os.environ.get("AI_DATA_DIR") or os.path.join(SERVICE_ROOT, "data"))
+        self.model_registry_dir = os.path.abspath(
+            os.environ.get("AI_MODEL_REGISTRY_DIR") or os.path.join(self.data_dir, "registry")
+        )
+        self.model_selection_path = os.path.join(self.data_dir, "model_selection.json")
+
+
+# Global settings instance
+settings = Settings()
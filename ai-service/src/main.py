@@ -3,8 +3,12 @@ AI Service FastAPI application for forecasting and recommendations.
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
-from src.api import forecast_api, recommendations_api
+from src.api import backtest_api, forecast_api, recommendations_api
+from src.registry.default_models import register_default_models
+from src.services.forecast_cache import forecast_cache
+from src.services.model_executor import ModelPoolSaturated, model_executor
 
 # Create FastAPI app
 app = FastAPI(
@@ -27,6 +31,29 @@ app.add_middleware(
 # Include routers
 app.include_router(forecast_api.router, prefix="/forecast", tags=["forecast"])
 app.include_router(recommendations_api.router, prefix="/recommendations", tags=["recommendations"])
+app.include_router(backtest_api.router, prefix="/backtest", tags=["backtest"])
+
+
+@app.exception_handler(ModelPoolSaturated)
+async def model_pool_saturated_handler(request, exc: ModelPoolSaturated):
+    """Shed load when the model pool is full rather than queueing without bound."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+@app.on_event("startup")
+async def register_models():
+    """Make sure the model registry holds the default model versions."""
+    register_default_models()
+
+
+@app.on_event("shutdown")
+async def stop_model_executor():
+    """Stop the model worker pool."""
+    model_executor.shutdown()
 
 
 @app.get("/")
@@ -43,3 +70,15 @@ async def root():
 async def health():
     """Health check endpoint."""
     return {"status": "healthy", "service": "ai-service"}
+
+
+@app.get("/metrics/model-pool")
+async def model_pool_metrics():
+    """Model execution pool size, load and timing counters."""
+    return model_executor.stats()
+
+
+@app.get("/metrics/forecast-cache")
+async def forecast_cache_metrics():
+    """Forecast result cache size and hit/miss counters."""
+    return forecast_cache.stats()
@@ -0,0 +1,159 @@
+"""
+Vectorized forecasting models fitted to many series at once.
+
+Each model takes a (series x days) matrix and fits every series for every
+parameter combination of its grid in one pass over the days: state arrays
+have shape (series, grid), so a step of the recursion is a handful of
+array operations regardless of how many series or candidates there are.
+Per series, the combination with the lowest one-step-ahead squared error
+wins.
+
+Every fit returns a dict with:
+    path     (series, horizon) forecast for each future day, clipped at 0
+    sigma    (series,) standard deviation of the one-step-ahead errors
+    params   name -> (series,) winning parameters
+    extra    name -> (series,) model-specific diagnostics
+"""
+import itertools
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+# Weekly seasonality of daily data
+WEEKLY_SEASON = 7
+
+HOLT_WINTERS_ALPHAS = (0.1, 0.3, 0.5)
+HOLT_WINTERS_BETAS = (0.01, 0.1)
+HOLT_WINTERS_GAMMAS = (0.05, 0.2, 0.4)
+
+CROSTON_ALPHAS = (0.05, 0.1, 0.2, 0.3)
+
+
+def holt_winters(
+    quantities: np.ndarray,
+    horizon_days: int,
+    season_length: int = WEEKLY_SEASON,
+    alphas: Sequence[float] = HOLT_WINTERS_ALPHAS,
+    betas: Sequence[float] = HOLT_WINTERS_BETAS,
+    gammas: Sequence[float] = HOLT_WINTERS_GAMMAS
+) -> Dict[str, Any]:
+    """
+    Additive Holt-Winters (level, trend, seasonal) with a grid over its parameters.
+    
+    The first season initializes level and seasonal indices, the first two
+    the trend, so at least two seasons of history are required.
+    
+    Args:
+        quantities: Matrix of shape (series, days), oldest day first
+        horizon_days: Days to forecast
+        season_length: Days per season
+        alphas: Level smoothing candidates
+        betas: Trend smoothing candidates
+        gammas: Seasonal smoothing candidates
+    """
+    series_count, days = quantities.shape
+    m = season_length
+    if days < 2 * m:
+        raise ValueError(f"Holt-Winters needs at least {2 * m} data points")
+    
+    grid = np.array(list(itertools.product(alphas, betas, gammas)))  # (grid, 3)
+    alpha, beta, gamma = grid[:, 0], grid[:, 1], grid[:, 2]
+    grid_size = len(grid)
+    
+    level0 = quantities[:, :m].mean(axis=1)
+    level = np.repeat(level0[:, None], grid_size, axis=1)
+    trend = np.repeat(((quantities[:, m:2 * m].mean(axis=1) - level0) / m)[:, None], grid_size, axis=1)
+    season = np.repeat((quantities[:, :m] - level0[:, None])[:, :, None], grid_size, axis=2)  # (series, m, grid)
+    sse = np.zeros((series_count, grid_size))
+    
+    for t in range(m, days):
+        i = t % m
+        y = quantities[:, t, None]
+        s = season[:, i, :]
+        sse += (y - (level + trend + s)) ** 2
+        new_level = alpha * (y - s) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        season[:, i, :] = gamma * (y - new_level) + (1 - gamma) * s
+        level = new_level
+    
+    best = sse.argmin(axis=1)
+    rows = np.arange(series_count)
+    level, trend = level[rows, best], trend[rows, best]
+    season = season[rows, :, best]  # (series, m)
+    
+    steps = np.arange(1, horizon_days + 1)
+    path = level[:, None] + steps * trend[:, None] + season[:, (days - 1 + steps) % m]
+    
+    # Busiest day of the week relative to the level (1.0 where the level is ~0)
+    safe_level = np.where(np.abs(level) > 1e-9, level, np.nan)
+    seasonality_factor = np.nan_to_num((level + season.max(axis=1)) / safe_level, nan=1.0)
+    
+    return {
+        'path': np.maximum(path, 0),
+        'sigma': np.sqrt(sse[rows, best] / (days - m)),
+        'params': {'alpha': alpha[best], 'beta': beta[best], 'gamma': gamma[best]},
+        'extra': {'seasonality_factor': seasonality_factor}
+    }
+
+
+def croston(
+    quantities: np.ndarray,
+    horizon_days: int,
+    alphas: Sequence[float] = CROSTON_ALPHAS,
+    bias_correction: bool = False
+) -> Dict[str, Any]:
+    """
+    Croston's method for intermittent demand, or SBA with bias_correction.
+    
+    Demand sizes and the intervals between demands are smoothed separately,
+    updated only on days with demand; the daily rate is size / interval
+    (times 1 - alpha / 2 for the Syntetos-Boylan approximation). Negative
+    values are treated as no demand. Series without any demand forecast 0.
+    
+    Args:
+        quantities: Matrix of shape (series, days), oldest day first
+        horizon_days: Days to forecast
+        alphas: Smoothing candidates, shared by sizes and intervals
+        bias_correction: Apply the SBA correction
+    """
+    demand = np.clip(quantities, 0, None)
+    series_count, days = demand.shape
+    alpha = np.asarray(alphas, dtype=np.float64)  # (grid,)
+    correction = 1 - alpha / 2 if bias_correction else np.ones_like(alpha)
+    
+    occurs = demand > 0
+    has_demand = occurs.any(axis=1)
+    first = np.where(has_demand, occurs.argmax(axis=1), days)
+    rows = np.arange(series_count)
+    
+    size = np.repeat(demand[rows, np.minimum(first, days - 1)][:, None], len(alpha), axis=1)
+    interval = np.repeat((first + 1.0)[:, None], len(alpha), axis=1)
+    last = first.copy()
+    sse = np.zeros((series_count, len(alpha)))
+    
+    for t in range(days):
+        after_first = t > first
+        if not after_first.any():
+            continue
+        y = demand[:, t, None]
+        error = y - correction * size / interval
+        sse += np.where(after_first[:, None], error ** 2, 0)
+        
+        update = (occurs[:, t] & after_first)[:, None]
+        size = np.where(update, size + alpha * (y - size), size)
+        interval = np.where(update, interval + alpha * ((t - last)[:, None] - interval), interval)
+        last = np.where(update[:, 0], t, last)
+    
+    best = sse.argmin(axis=1)
+    rate = np.where(has_demand, correction[best] * size[rows, best] / interval[rows, best], 0.0)
+    evaluated = np.maximum(days - 1 - first, 1)
+    
+    return {
+        'path': np.repeat(rate[:, None], horizon_days, axis=1),
+        'sigma': np.sqrt(sse[rows, best] / evaluated),
+        'params': {'alpha': alpha[best]},
+        'extra': {
+            # Average days between demands; above ~1.32 a series counts as intermittent
+            'adi': np.where(has_demand, days / np.maximum(occurs.sum(axis=1), 1), float(days))
+        }
+    }
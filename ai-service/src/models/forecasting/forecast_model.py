@@ -6,33 +6,104 @@ from datetime import datetime, timedelta
 import statistics
 import math
 
+import numpy as np
+
+from src.models.forecasting.batch_models import (
+    CROSTON_ALPHAS, HOLT_WINTERS_ALPHAS, HOLT_WINTERS_BETAS, HOLT_WINTERS_GAMMAS, WEEKLY_SEASON, croston, holt_winters
+)
+from src.registry.model_registry import registry
+
+# Supported model_type values
+MODEL_TYPES = ('exponential_smoothing', 'holt_winters', 'croston', 'sba')
+
+# z-score of the two-sided 80% confidence band
+Z_SCORE_80 = 1.28
+
+# Default exponential smoothing parameter
+DEFAULT_ALPHA = 0.3
+
+# Version used while the registry has no active version of a model
+DEFAULT_MODEL_VERSION = "1.0.0"
+
+# Parameters of each model, stored as artifacts of its registry versions
+DEFAULT_PARAMETERS = {
+    'exponential_smoothing': {'alpha': np.array(DEFAULT_ALPHA)},
+    'holt_winters': {
+        'alphas': np.array(HOLT_WINTERS_ALPHAS),
+        'betas': np.array(HOLT_WINTERS_BETAS),
+        'gammas': np.array(HOLT_WINTERS_GAMMAS)
+    },
+    'croston': {'alphas': np.array(CROSTON_ALPHAS)},
+    'sba': {'alphas': np.array(CROSTON_ALPHAS)}
+}
+
+# Per-day results: forecast and 80% band for each day of the horizon
+DAILY_FIELDS = ('daily_demand', 'daily_lower', 'daily_upper')
+
+# Days of history a model needs beyond the 10 every request has (Holt-Winters initializes from two seasons)
+MIN_HISTORY_DAYS = {'holt_winters': 2 * WEEKLY_SEASON}
+
+
+def fits_history(model_type: str, days: int) -> bool:
+    """Whether a model can be fitted to days of history."""
+    return days >= MIN_HISTORY_DAYS.get(model_type, 1)
+
+
+def registry_model_name(model_type: str) -> str:
+    """Name of a forecast model in the model registry."""
+    return f"forecast_{model_type}"
+
 
 class ForecastModel:
-    """Forecasting model using exponential smoothing (simple implementation)."""
+    """
+    Demand forecasting model.
+    
+    'exponential_smoothing' is simple exponential smoothing with a fixed
+    alpha. 'holt_winters' (weekly seasonality), 'croston' and 'sba' (for
+    intermittent demand) pick their parameters per series from a grid; they
+    are implemented in batch_models and always run vectorized.
+    
+    The alpha and the grids come from the artifacts of the model's active
+    version in the model registry, memory-mapped and shared by the worker
+    processes; DEFAULT_PARAMETERS fills in anything the registry lacks.
+    """
     
     def __init__(self, model_type: str = "exponential_smoothing"):
         """
         Initialize forecast model.
         
         Args:
-            model_type: Type of model ('exponential_smoothing', 'arima', 'lstm')
+            model_type: Type of model, one of MODEL_TYPES
         """
+        if model_type not in MODEL_TYPES:
+            raise ValueError(f"Unknown model_type: {model_type}. Must be one of: {', '.join(MODEL_TYPES)}")
+        
         self.model_type = model_type
-        self.model_version = "1.0.0"
+        active = registry.get_active_model(registry_model_name(model_type))
+        self.model_version = active['version'] if active else DEFAULT_MODEL_VERSION
+        self.parameters = {
+            **DEFAULT_PARAMETERS[model_type],
+            **(registry.load_artifacts(active['model_id']) if active else {})
+        }
+    
+    @property
+    def alpha(self) -> float:
+        """Smoothing parameter of exponential smoothing."""
+        return float(self.parameters.get('alpha', DEFAULT_ALPHA))
     
     def forecast(
         self,
         historical_data: List[Dict[str, Any]],
         horizon_days: int,
-        alpha: float = 0.3
+        alpha: Optional[float] = None
     ) -> Dict[str, Any]:
         """
-        Generate forecast using exponential smoothing.
+        Generate forecast for one series.
         
         Args:
             historical_data: List of {date, quantity} records
             horizon_days: Forecast horizon (7, 30, or 90 days)
-            alpha: Smoothing parameter (0-1)
+            alpha: Smoothing parameter (0-1), for exponential smoothing (defaults to self.alpha)
             
         Returns:
             Dictionary with forecast results
@@ -43,21 +114,35 @@ class ForecastModel:
         # Extract quantities from historical data
         quantities = [float(item.get('quantity', 0)) for item in historical_data]
         
+        if self.model_type != 'exponential_smoothing':
+            result = self.forecast_batch(np.array([quantities]), horizon_days)
+            return {
+                **result,
+                'predicted_demand': float(result['predicted_demand'][0]),
+                'confidence_lower': float(result['confidence_lower'][0]),
+                'confidence_upper': float(result['confidence_upper'][0]),
+                **{name: result[name][0].tolist() for name in DAILY_FIELDS},
+                'features': {name: float(values[0]) for name, values in result['features'].items()}
+            }
+        
         if len(quantities) < 2:
             # Simple average if insufficient data
             avg_demand = statistics.mean(quantities) if quantities else 0
             predicted = avg_demand * (horizon_days / 7)  # Scale to horizon
         else:
             # Exponential smoothing
-            predicted = self._exponential_smoothing(quantities, alpha, horizon_days)
+            predicted = self._exponential_smoothing(quantities, self.alpha if alpha is None else alpha, horizon_days)
         
         # Calculate confidence interval (simplified)
         std_dev = statistics.stdev(quantities) if len(quantities) > 1 else predicted * 0.2
         confidence_level = 0.80
-        z_score = 1.28  # For 80% confidence
         
-        confidence_lower = max(0, predicted - z_score * std_dev)
-        confidence_upper = predicted + z_score * std_dev
+        confidence_lower = max(0, predicted - Z_SCORE_80 * std_dev)
+        confidence_upper = predicted + Z_SCORE_80 * std_dev
+        
+        # Flat daily path at the smoothed level, banded by the spread of daily values
+        daily = predicted / horizon_days
+        daily_spread = Z_SCORE_80 * (statistics.stdev(quantities) if len(quantities) > 1 else daily * 0.2)
         
         # Extract features for explainability
         features = {
@@ -74,9 +159,154 @@ class ForecastModel:
             'confidence_upper': round(confidence_upper, 3),
             'confidence_level': confidence_level,
             'model_version': self.model_version,
+            'daily_demand': [round(daily, 3)] * horizon_days,
+            'daily_lower': [round(max(0, daily - daily_spread), 3)] * horizon_days,
+            'daily_upper': [round(daily + daily_spread, 3)] * horizon_days,
             'features': features
         }
     
+    def forecast_batch(
+        self,
+        quantities: np.ndarray,
+        horizon_days: int,
+        alpha: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate forecasts for many series at once.
+        
+        Same results as forecast() applied to each row, but computed with
+        array operations across all series. For exponential smoothing the
+        recursion is expanded into its closed-form weights, so one
+        matrix-vector product replaces the per-value loop.
+        
+        Args:
+            quantities: Matrix of shape (series, days), oldest day first
+            horizon_days: Forecast horizon (7, 30, or 90 days)
+            alpha: Smoothing parameter (0-1), for exponential smoothing (defaults to self.alpha)
+            
+        Returns:
+            Dictionary of per-series arrays (predicted_demand,
+            confidence_lower, confidence_upper, features), (series, horizon)
+            arrays of daily forecasts with their 80% band (daily_demand,
+            daily_lower, daily_upper), plus the scalar confidence_level and
+            model_version
+        """
+        quantities = np.asarray(quantities, dtype=np.float64)
+        if quantities.ndim != 2 or quantities.shape[1] == 0:
+            raise ValueError("Historical data is required")
+        
+        if self.model_type != 'exponential_smoothing':
+            return self._fit_batch(quantities, horizon_days)
+        
+        series_count, n = quantities.shape
+        means = quantities.mean(axis=1)
+        
+        if n < 2:
+            # Simple average if insufficient data
+            predicted = means * (horizon_days / 7)
+            std_dev = predicted * 0.2
+            daily_std = predicted / horizon_days * 0.2
+        else:
+            predicted = self._smoothed_level(quantities, self.alpha if alpha is None else alpha) * horizon_days
+            std_dev = quantities.std(axis=1, ddof=1)
+            daily_std = std_dev
+        
+        confidence_lower = np.maximum(0, predicted - Z_SCORE_80 * std_dev)
+        confidence_upper = predicted + Z_SCORE_80 * std_dev
+        daily = np.repeat((predicted / horizon_days)[:, None], horizon_days, axis=1)
+        
+        return {
+            'predicted_demand': np.round(predicted, 3),
+            'confidence_lower': np.round(confidence_lower, 3),
+            'confidence_upper': np.round(confidence_upper, 3),
+            'confidence_level': 0.80,
+            'model_version': self.model_version,
+            **self._daily_bands(daily, daily_std),
+            'features': {
+                'historical_mean': means,
+                'historical_std': std_dev,
+                'data_points': np.full(series_count, n),
+                'trend': self._calculate_trend_batch(quantities),
+                'seasonality_factor': np.ones(series_count)  # Simplified
+            }
+        }
+    
+    def forecast_path(
+        self,
+        quantities: np.ndarray,
+        horizon_days: int,
+        alpha: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Daily forecasts of many series.
+        
+        Args:
+            quantities: Matrix of shape (series, days), oldest day first
+            horizon_days: Days to forecast
+            alpha: Smoothing parameter (0-1), for exponential smoothing (defaults to self.alpha)
+            
+        Returns:
+            Matrix of shape (series, horizon_days)
+        """
+        quantities = np.asarray(quantities, dtype=np.float64)
+        if self.model_type == 'exponential_smoothing':
+            alpha = self.alpha if alpha is None else alpha
+            level = self._smoothed_level(quantities, alpha) if quantities.shape[1] > 1 else quantities.mean(axis=1) / 7
+            return np.repeat(level[:, None], horizon_days, axis=1)
+        return self._fit(quantities, horizon_days)['path']
+    
+    @staticmethod
+    def _daily_bands(path: np.ndarray, sigma: np.ndarray) -> Dict[str, np.ndarray]:
+        """Daily forecasts with an 80% band of z * sigma around each day, clipped at 0."""
+        spread = Z_SCORE_80 * sigma[:, None]
+        return {
+            'daily_demand': np.round(path, 3),
+            'daily_lower': np.round(np.maximum(0, path - spread), 3),
+            'daily_upper': np.round(path + spread, 3)
+        }
+    
+    @staticmethod
+    def _smoothed_level(quantities: np.ndarray, alpha: float) -> np.ndarray:
+        """Final exponential smoothing level of every row."""
+        # f = x0, then f = alpha * x + (1 - alpha) * f for each later value
+        decay = (1 - alpha) ** np.arange(quantities.shape[1] - 1, -1, -1, dtype=np.float64)
+        weights = alpha * decay
+        weights[0] = decay[0]
+        return quantities @ weights
+    
+    def _fit(self, quantities: np.ndarray, horizon_days: int) -> Dict[str, Any]:
+        """Fit a grid-fitted model from batch_models over the grids in self.parameters."""
+        p = self.parameters
+        if self.model_type == 'holt_winters':
+            return holt_winters(quantities, horizon_days, alphas=p['alphas'], betas=p['betas'], gammas=p['gammas'])
+        return croston(quantities, horizon_days, alphas=p['alphas'], bias_correction=self.model_type == 'sba')
+    
+    def _fit_batch(self, quantities: np.ndarray, horizon_days: int) -> Dict[str, Any]:
+        """Forecast with a grid-fitted model from batch_models."""
+        fit = self._fit(quantities, horizon_days)
+        
+        series_count, n = quantities.shape
+        predicted = fit['path'].sum(axis=1)
+        spread = Z_SCORE_80 * fit['sigma'] * math.sqrt(horizon_days)  # Daily errors taken as independent
+        
+        return {
+            'predicted_demand': np.round(predicted, 3),
+            'confidence_lower': np.round(np.maximum(0, predicted - spread), 3),
+            'confidence_upper': np.round(predicted + spread, 3),
+            'confidence_level': 0.80,
+            'model_version': self.model_version,
+            **self._daily_bands(fit['path'], fit['sigma']),
+            'features': {
+                'historical_mean': quantities.mean(axis=1),
+                'historical_std': quantities.std(axis=1, ddof=1) if n > 1 else np.zeros(series_count),
+                'data_points': np.full(series_count, n),
+                'trend': self._calculate_trend_batch(quantities),
+                'seasonality_factor': np.ones(series_count),
+                **fit['extra'],
+                **fit['params']
+            }
+        }
+    
     def _exponential_smoothing(self, data: List[float], alpha: float, horizon: int) -> float:
         """Apply exponential smoothing to predict future demand."""
         if not data:
@@ -110,3 +340,13 @@ class ForecastModel:
         
         trend = numerator / denominator
         return round(trend, 3)
+    
+    def _calculate_trend_batch(self, quantities: np.ndarray) -> np.ndarray:
+        """Least-squares slope of every row against the day index."""
+        n = quantities.shape[1]
+        if n < 2:
+            return np.zeros(quantities.shape[0])
+        
+        x = np.arange(n, dtype=np.float64) - (n - 1) / 2
+        slopes = (quantities - quantities.mean(axis=1, keepdims=True)) @ x / (x @ x)
+        return np.round(slopes, 3)
@@ -0,0 +1,35 @@
+"""
+Default model versions registered at startup.
+
+Each forecast model type is registered as 'forecast_<model_type>' version
+DEFAULT_MODEL_VERSION with its DEFAULT_PARAMETERS as artifacts, and
+activated unless the model already has an active version. A tuned
+version is registered the same way with other parameter arrays and
+activated (or rolled back) through the registry; ForecastModel picks it
+up in every worker.
+"""
+from src.models.forecasting.forecast_model import (
+    DEFAULT_MODEL_VERSION, DEFAULT_PARAMETERS, MODEL_TYPES, registry_model_name
+)
+from src.registry.model_registry import ModelRegistry, registry
+
+
+def register_default_models(target: ModelRegistry = registry) -> None:
+    """Register the default versions missing from the registry; safe to run in every worker."""
+    for model_type in MODEL_TYPES:
+        model_name = registry_model_name(model_type)
+        if target.get_model(f"{model_name}_{DEFAULT_MODEL_VERSION}") is not None:
+            continue
+        try:
+            target.register_model(
+                model_name,
+                'forecast',
+                DEFAULT_MODEL_VERSION,
+                metadata={'description': f"Default {model_type} parameters"},
+                artifacts=DEFAULT_PARAMETERS[model_type],
+                activate=target.get_active_model(model_name) is None
+            )
+        except ValueError:
+            pass  # Registered by another worker in the meantime
+    
+    target.register_model('recommendation_reorder', 'recommendation', '1.0.0')
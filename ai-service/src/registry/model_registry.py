@@ -1,72 +1,306 @@
 """
 Model registry for versioning and tracking AI models.
+
+The registry lives on local disk so it survives restarts and is shared by
+every worker process:
+
+    <root>/registry.json                    metadata of every version and activation history
+    <root>/artifacts/<model_id>/<name>.npy  fitted parameters, one array per file
+
+Metadata is rewritten atomically (temporary file and os.replace) under an
+exclusive lock on <root>/registry.lock, and every write increments the
+generation stored in it. A worker reloads the metadata when the generation
+differs from the one it holds, and tells its activation listeners about
+versions another worker activated. Artifacts are immutable once
+registered and are loaded lazily with mmap_mode='r', so workers share
+their pages through the OS page cache.
+
+The root is settings.model_registry_dir; it is created on the first write.
+Forecast models keep their parameters as artifacts of the registry model
+'forecast_<model_type>' (see src.registry.default_models).
 """
-from typing import Dict, Any, Optional
+import fcntl
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime
+from threading import RLock
+from typing import Callable, Dict, Any, Iterator, List, Mapping, Optional
+
+import numpy as np
+
+from src.config.settings import settings
+
+# Called with the model info dict whenever a model version becomes active
+ActivationListener = Callable[[Dict[str, Any]], None]
 
 
 class ModelRegistry:
-    """Registry for managing AI model versions."""
+    """File-backed registry for managing AI model versions and their artifacts."""
     
-    def __init__(self):
+    def __init__(self, root: str):
+        """
+        Initialize the registry; the metadata file is read on first use.
+        
+        Args:
+            root: Directory holding the metadata and artifacts
+        """
+        self.root = root
+        self.metadata_path = os.path.join(root, "registry.json")
         self.models: Dict[str, Dict[str, Any]] = {}
+        self._history: Dict[str, List[str]] = {}  # model_name -> model IDs in activation order, current last
+        self._generation: Optional[int] = None  # Of the metadata held in memory
+        self._artifacts: Dict[str, Dict[str, np.ndarray]] = {}
+        self._lock = RLock()
+        self._activation_listeners: List[ActivationListener] = []
+    
+    def add_activation_listener(self, listener: ActivationListener) -> None:
+        """Call listener with the model info each time a model version is activated."""
+        self._activation_listeners.append(listener)
+    
+    def _notify_activated(self, model: Dict[str, Any]) -> None:
+        for listener in self._activation_listeners:
+            listener(model)
+    
+    def _refresh(self) -> None:
+        """Reload the metadata if another process changed it, notifying about newly active versions."""
+        try:
+            with open(self.metadata_path, encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return
+        if state['generation'] == self._generation:
+            return
+        
+        was_active = {model_id for model_id, model in self.models.items() if model['is_active']}
+        self.models = state['models']
+        self._history = state['history']
+        self._generation = state['generation']
+        
+        if self._activation_listeners and was_active:
+            for model_id, model in self.models.items():
+                if model['is_active'] and model_id not in was_active:
+                    self._notify_activated(model)
+    
+    def refresh(self) -> None:
+        """Pick up changes made by other processes, e.g. before serving a request."""
+        with self._lock:
+            self._refresh()
+    
+    @contextmanager
+    def _update(self) -> Iterator[None]:
+        """Read-modify-write the metadata under the cross-process lock, then write it atomically."""
+        os.makedirs(self.root, exist_ok=True)
+        with self._lock, open(os.path.join(self.root, "registry.lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                yield
+                self._write_metadata()
+            except BaseException:
+                # Back to the stored state, dropping the partly applied change
+                self.models, self._history, self._generation = {}, {}, None
+                self._refresh()
+                raise
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _write_metadata(self) -> None:
+        generation = (self._generation or 0) + 1
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".registry.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(
+                    {'generation': generation, 'models': self.models, 'history': self._history},
+                    f, indent=2, sort_keys=True
+                )
+            os.replace(tmp_path, self.metadata_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._generation = generation
+    
+    def _artifact_dir(self, model_id: str) -> str:
+        return os.path.join(self.root, "artifacts", model_id)
+    
+    def _write_artifacts(self, model_id: str, artifacts: Mapping[str, np.ndarray]) -> List[str]:
+        """Save each array as <name>.npy in a scratch directory, then move it into place."""
+        parent = os.path.join(self.root, "artifacts")
+        os.makedirs(parent, exist_ok=True)
+        scratch = tempfile.mkdtemp(dir=parent, prefix=f".{model_id}.")
+        try:
+            for name, array in artifacts.items():
+                if not name or os.sep in name or name.startswith("."):
+                    raise ValueError(f"Invalid artifact name: {name!r}")
+                np.save(os.path.join(scratch, f"{name}.npy"), np.asarray(array), allow_pickle=False)
+            os.replace(scratch, self._artifact_dir(model_id))
+        except BaseException:
+            shutil.rmtree(scratch, ignore_errors=True)
+            raise
+        return sorted(artifacts)
     
     def register_model(
         self,
         model_name: str,
         model_type: str,
         version: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        artifacts: Optional[Mapping[str, np.ndarray]] = None,
+        activate: bool = True
     ) -> str:
         """
         Register a new model version.
         
+        Registering an existing version again without artifacts leaves it
+        unchanged, so every worker can register the defaults at startup.
+        
         Args:
             model_name: Name of the model
             model_type: Type of model (e.g., 'forecast', 'recommendation')
             version: Version string (e.g., '1.0.0')
             metadata: Additional metadata
-            
+            artifacts: Fitted parameters by name, e.g. a dict of arrays or a loaded .npz
+            activate: Make this the active version of the model
+        
         Returns:
             Model ID
+        
+        Raises:
+            ValueError: If the version is already registered and artifacts are given
         """
         model_id = f"{model_name}_{version}"
+        if artifacts is None and self.get_model(model_id) is not None:
+            return model_id
+        
+        with self._update():
+            if model_id in self.models:
+                if artifacts is not None:
+                    raise ValueError(f"Model {model_id} is already registered; artifacts of a version are immutable")
+                return model_id
+            
+            if os.path.exists(self._artifact_dir(model_id)):
+                shutil.rmtree(self._artifact_dir(model_id))  # Left by a registration that failed before its metadata
+            
+            self.models[model_id] = {
+                'model_id': model_id,
+                'model_name': model_name,
+                'model_type': model_type,
+                'version': version,
+                'registered_at': datetime.utcnow().isoformat(),
+                'metadata': metadata or {},
+                'artifacts': self._write_artifacts(model_id, artifacts) if artifacts is not None else [],
+                'is_active': False
+            }
+            if activate:
+                self._activate(model_id)
         
-        self.models[model_id] = {
-            'model_name': model_name,
-            'model_type': model_type,
-            'version': version,
-            'registered_at': datetime.utcnow().isoformat(),
-            'metadata': metadata or {},
-            'is_active': True
-        }
+        if activate:
+            self._notify_activated(self.models[model_id])
         
         return model_id
     
     def get_model(self, model_id: str) -> Optional[Dict[str, Any]]:
         """Get model information by ID."""
-        return self.models.get(model_id)
+        with self._lock:
+            self._refresh()
+            return self.models.get(model_id)
+    
+    def get_active_model(self, model_name: str) -> Optional[Dict[str, Any]]:
+        """Get the active version of a model."""
+        with self._lock:
+            self._refresh()
+            history = self._history.get(model_name)
+            model = self.models.get(history[-1]) if history else None
+            return model if model and model['is_active'] else None
     
     def list_models(self, model_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """List all registered models, optionally filtered by type."""
-        models = list(self.models.values())
+        with self._lock:
+            self._refresh()
+            models = list(self.models.values())
         
         if model_type:
             models = [m for m in models if m['model_type'] == model_type]
         
         return models
     
+    def load_artifacts(self, model_id: str) -> Dict[str, np.ndarray]:
+        """
+        Artifacts of a model version as read-only memory-mapped arrays.
+        
+        Files are mapped on first use and the mappings kept for the life of
+        the process; pages are read from disk only when touched.
+        
+        Raises:
+            KeyError: If the model version is not registered
+        """
+        with self._lock:
+            loaded = self._artifacts.get(model_id)
+            if loaded is not None:
+                return loaded
+            
+            model = self.get_model(model_id)
+            if model is None:
+                raise KeyError(model_id)
+            loaded = {
+                name: np.load(os.path.join(self._artifact_dir(model_id), f"{name}.npy"), mmap_mode='r', allow_pickle=False)
+                for name in model['artifacts']
+            }
+            self._artifacts[model_id] = loaded
+            return loaded
+    
+    def _activate(self, model_id: str) -> None:
+        """Mark model_id active and the other versions of its model inactive; call within _update."""
+        model = self.models[model_id]
+        for other in self.models.values():
+            if other['model_name'] == model['model_name']:
+                other['is_active'] = False
+        model['is_active'] = True
+        
+        history = self._history.setdefault(model['model_name'], [])
+        if model_id in history:
+            history.remove(model_id)
+        history.append(model_id)
+    
+    def activate_model(self, model_id: str) -> bool:
+        """Make a model version the active one, deactivating other versions of the same model."""
+        with self._update():
+            if model_id not in self.models:
+                return False
+            self._activate(model_id)
+        
+        self._notify_activated(self.models[model_id])
+        return True
+    
+    def rollback_model(self, model_name: str) -> Optional[str]:
+        """
+        Reactivate the version that was active before the current one.
+        
+        Returns:
+            Model ID now active, or None if there is no earlier version
+        """
+        with self._update():
+            history = self._history.get(model_name, [])
+            if len(history) < 2:
+                return None
+            current = history.pop()
+            self.models[current]['is_active'] = False
+            model_id = history[-1]
+            self.models[model_id]['is_active'] = True
+        
+        self._notify_activated(self.models[model_id])
+        return model_id
+    
     def deactivate_model(self, model_id: str) -> bool:
         """Deactivate a model version."""
-        if model_id in self.models:
+        with self._update():
+            if model_id not in self.models:
+                return False
             self.models[model_id]['is_active'] = False
-            return True
-        return False
-
+        return True
 
-# Global registry instance
-registry = ModelRegistry()
 
-# Register default models
-registry.register_model('forecast_exponential_smoothing', 'forecast', '1.0.0')
-registry.register_model('recommendation_reorder', 'recommendation', '1.0.0')
+# Global registry instance; default models are registered at startup (src.registry.default_models)
+registry = ModelRegistry(settings.model_registry_dir)
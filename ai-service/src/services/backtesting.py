@@ -0,0 +1,120 @@
+"""
+Rolling-origin backtesting of forecasting models.
+
+For every series the last folds x horizon days are cut into folds
+consecutive windows. Each candidate model is fitted on the history before
+a window and its daily forecasts compared with what happened in it; all
+series, folds and days are scored with array operations. The candidate
+with the lowest WAPE wins.
+
+evaluate() works on a plain matrix and returns plain arrays, so callers can
+split the series across the model worker pool and concatenate the results.
+"""
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from src.models.forecasting.forecast_model import MODEL_TYPES, ForecastModel
+
+# History every fold trains on at least (two weeks, for weekly seasonality)
+MIN_TRAINING_DAYS = 14
+
+# Relative error of the horizon total that counts as accurate (SC-006)
+ACCURACY_TOLERANCE = 0.2
+
+METRICS = ('wape', 'mape', 'bias', 'within_tolerance')
+
+
+def fold_origins(days: int, horizon_days: int, folds: int) -> List[int]:
+    """First day of each backtest window, oldest first, that leaves enough training history."""
+    origins = [days - horizon_days * k for k in range(folds, 0, -1)]
+    return [origin for origin in origins if origin >= MIN_TRAINING_DAYS]
+
+
+def error_metrics(actual: np.ndarray, forecast: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Per-series error metrics over all folds and days.
+    
+    Args:
+        actual: Realized values, shape (series, folds, days)
+        forecast: Forecasts, same shape
+    
+    Returns:
+        wape: sum |error| / sum |actual| (NaN when nothing was realized)
+        mape: mean |error| / |actual| over days with a non-zero actual
+        bias: sum error / sum |actual|; positive means over-forecasting
+        within_tolerance: share of folds whose horizon total was within ACCURACY_TOLERANCE
+    """
+    error = forecast - actual
+    scale = np.abs(actual).sum(axis=(1, 2))
+    safe_scale = np.where(scale > 0, scale, np.nan)
+    
+    nonzero = actual != 0
+    ape = np.abs(error) / np.where(nonzero, np.abs(actual), 1)
+    nonzero_days = nonzero.sum(axis=(1, 2))
+    
+    actual_total = actual.sum(axis=2)
+    total_error = np.abs(forecast.sum(axis=2) - actual_total) / np.where(actual_total != 0, np.abs(actual_total), np.nan)
+    
+    return {
+        'wape': np.abs(error).sum(axis=(1, 2)) / safe_scale,
+        'mape': np.where(nonzero, ape, 0).sum(axis=(1, 2)) / np.where(nonzero_days > 0, nonzero_days, np.nan),
+        'bias': error.sum(axis=(1, 2)) / safe_scale,
+        'within_tolerance': (total_error <= ACCURACY_TOLERANCE).mean(axis=1)
+    }
+
+
+def evaluate(
+    quantities: np.ndarray,
+    horizon_days: int,
+    model_types: Sequence[str] = MODEL_TYPES,
+    folds: int = 3
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Backtest every candidate model on every series.
+    
+    Args:
+        quantities: Matrix of shape (series, days), oldest day first
+        horizon_days: Days per backtest window
+        model_types: Candidate models
+        folds: Number of windows
+    
+    Returns:
+        model_type -> metric name -> per-series values
+    """
+    quantities = np.asarray(quantities, dtype=np.float64)
+    origins = fold_origins(quantities.shape[1], horizon_days, folds)
+    if not origins:
+        raise ValueError(
+            f"Backtesting a {horizon_days}-day horizon needs at least {MIN_TRAINING_DAYS + horizon_days} data points"
+        )
+    
+    actual = np.stack([quantities[:, origin:origin + horizon_days] for origin in origins], axis=1)
+    results = {}
+    for model_type in model_types:
+        model = ForecastModel(model_type=model_type)
+        forecast = np.stack([model.forecast_path(quantities[:, :origin], horizon_days) for origin in origins], axis=1)
+        results[model_type] = error_metrics(actual, forecast)
+    return results
+
+
+def select_winners(results: Dict[str, Dict[str, np.ndarray]]) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """
+    Pick the model with the lowest WAPE for every series.
+    
+    Series where no model could be scored (nothing realized) go to the
+    first candidate.
+    
+    Returns:
+        Winning model type per series, and the winners' metrics
+    """
+    model_types = list(results)
+    wape = np.stack([np.nan_to_num(results[model_type]['wape'], nan=np.inf) for model_type in model_types])
+    best = wape.argmin(axis=0)
+    columns = np.arange(len(best))
+    
+    metrics = {
+        name: np.stack([results[model_type][name] for model_type in model_types])[best, columns]
+        for name in METRICS
+    }
+    return [model_types[i] for i in best], metrics
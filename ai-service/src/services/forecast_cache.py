@@ -0,0 +1,123 @@
+"""
+Content-addressed cache of forecast results.
+
+Results are keyed by a hash of the history values, model type, model
+version, horizon and parameters, so the same history asked for again (a
+dashboard refresh, a retried request) is answered without running the
+model. Entries are evicted least recently used beyond max_entries and
+expire after a TTL. Each entry holds one series' result, so max_entries
+bounds memory.
+
+The cache is cleared when the model registry activates a new forecast
+model version.
+
+Configured through the environment:
+    AI_FORECAST_CACHE_MAX_ENTRIES   Entries kept (default 100000, 0 disables the cache)
+    AI_FORECAST_CACHE_TTL_SECONDS   Seconds an entry is kept (default 3600)
+"""
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.registry.model_registry import registry
+
+
+class ForecastCache:
+    """Per-process LRU cache of forecast results with a TTL."""
+    
+    def __init__(self, max_entries: int = 100000, ttl_seconds: float = 3600):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Entries kept before the least recently used are evicted
+            ttl_seconds: Seconds an entry is kept after it was written
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()  # key -> (expires_at, result)
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+    
+    @staticmethod
+    def key_prefix(model_type: str, model_version: str, horizon_days: int, **params: Any) -> "hashlib._Hash":
+        """Hash state covering everything but the history; extend a copy per series."""
+        header = json.dumps(
+            {"model_type": model_type, "model_version": model_version, "horizon_days": horizon_days, "params": params},
+            sort_keys=True
+        )
+        return hashlib.sha256(header.encode())
+    
+    @staticmethod
+    def key(prefix: "hashlib._Hash", quantities: np.ndarray) -> str:
+        """Key of one series' history under a key_prefix."""
+        digest = prefix.copy()
+        digest.update(np.ascontiguousarray(quantities, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached result for key, or None."""
+        now = time.monotonic()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[0] > now:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return item[1]
+            if item is not None:
+                del self._entries[key]
+            self._misses += 1
+            return None
+    
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a result, evicting the least recently used entries beyond max_entries."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._invalidations += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Size and hit/miss counters."""
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self._invalidations,
+        }
+
+
+# Global cache instance
+forecast_cache = ForecastCache(
+    max_entries=int(os.environ.get("AI_FORECAST_CACHE_MAX_ENTRIES", 100000)),
+    ttl_seconds=float(os.environ.get("AI_FORECAST_CACHE_TTL_SECONDS", 3600))
+)
+
+
+def _invalidate_on_forecast_activation(model: Dict[str, Any]) -> None:
+    """Results of the previous forecast model version must not be served."""
+    if model['model_type'] == 'forecast':
+        forecast_cache.invalidate()
+
+
+registry.add_activation_listener(_invalidate_on_forecast_activation)
@@ -0,0 +1,146 @@
+"""
+Bounded execution of model calls off the event loop.
+
+Model code is CPU-bound; run directly in an async handler it blocks every
+other request of the worker, /health included. The executor runs it in a
+process pool (or a thread pool) and admits at most workers + queue_depth
+calls at a time. Calls beyond that fail fast with ModelPoolSaturated, which
+the API answers with 503 and Retry-After, instead of queueing without bound.
+
+Configured through the environment:
+    AI_MODEL_POOL             'process' (default) or 'thread'
+    AI_MODEL_POOL_WORKERS     Pool size (default: CPU count)
+    AI_MODEL_POOL_QUEUE_DEPTH Calls allowed to wait for a worker (default: 2 x workers)
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+
+class ModelPoolSaturated(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+    
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Model execution pool is saturated")
+        self.retry_after = retry_after
+
+
+class ModelExecutor:
+    """Runs model calls in a bounded worker pool and keeps usage metrics."""
+    
+    def __init__(self, kind: str = "process", workers: Optional[int] = None, queue_depth: Optional[int] = None):
+        """
+        Initialize the executor; the pool itself is started on first use.
+        
+        Args:
+            kind: 'process' or 'thread'
+            workers: Pool size (defaults to the CPU count)
+            queue_depth: Calls allowed to wait for a free worker (defaults to 2 x workers)
+        """
+        if kind not in ("process", "thread"):
+            raise ValueError(f"Unknown model pool kind: {kind}. Must be 'process' or 'thread'")
+        
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_depth = queue_depth if queue_depth is not None else 2 * self.workers
+        self._pool: Optional[Executor] = None
+        
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._busy_seconds = 0.0
+        self._wait_seconds = 0.0
+    
+    @property
+    def capacity(self) -> int:
+        """Calls admitted at once: running plus waiting."""
+        return self.workers + self.queue_depth
+    
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="model")
+        return self._pool
+    
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run fn(*args, **kwargs) in the pool and wait for its result.
+        
+        With a process pool, fn must be a module-level function and its
+        arguments and result must be picklable.
+        
+        Raises:
+            ModelPoolSaturated: If capacity calls are already admitted
+        """
+        # Admission is checked and counted without awaiting, so it is atomic on the loop
+        if self._in_flight >= self.capacity:
+            self._rejected += 1
+            raise ModelPoolSaturated()
+        
+        self._in_flight += 1
+        self._submitted += 1
+        submitted_at = time.perf_counter()
+        try:
+            started_at, result = await asyncio.get_running_loop().run_in_executor(
+                self._get_pool(), partial(_timed_call, fn, args, kwargs)
+            )
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+        
+        finished_at = time.perf_counter()
+        self._completed += 1
+        self._busy_seconds += finished_at - started_at
+        self._wait_seconds += max(0.0, started_at - submitted_at)
+        return result
+    
+    def stats(self) -> Dict[str, Any]:
+        """Pool configuration and usage counters, for sizing workers per core."""
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "queue_depth": self.queue_depth,
+            "in_flight": self._in_flight,
+            "queued": max(0, self._in_flight - self.workers),
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "busy_seconds": round(self._busy_seconds, 3),
+            "avg_wait_ms": round(1000 * self._wait_seconds / self._completed, 3) if self._completed else 0.0,
+            "avg_run_ms": round(1000 * self._busy_seconds / self._completed, 3) if self._completed else 0.0,
+        }
+    
+    def shutdown(self) -> None:
+        """Stop the pool; it is started again on the next call."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def _timed_call(fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]):
+    """Run fn in the worker and return (start time, result)."""
+    started_at = time.perf_counter()
+    return started_at, fn(*args, **kwargs)
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+# Global executor instance
+model_executor = ModelExecutor(
+    kind=os.environ.get("AI_MODEL_POOL", "process"),
+    workers=_env_int("AI_MODEL_POOL_WORKERS"),
+    queue_depth=_env_int("AI_MODEL_POOL_QUEUE_DEPTH")
+)
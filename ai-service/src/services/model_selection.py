@@ -0,0 +1,132 @@
+"""
+Persisted per-series model choices from backtesting.
+
+Series are identified as 'product_id:warehouse_id', as the backend sends
+them, and each series has one choice per horizon it was backtested for.
+Choices live in one JSON file (settings.model_selection_path), shared by
+every worker and process:
+
+    {"<series_id>": {"<horizon_days>": {"model_type": ..., metrics..., "evaluated_at": ...}}}
+
+Writers take an exclusive lock on <file>.lock, re-read the file and replace
+it atomically (temporary file and os.replace), so concurrent backtests keep
+each other's winners. Readers reload the file when its inode, size or
+modification time changes; every write replaces the file, so its inode
+changes too.
+
+Forecast requests with model_type 'auto' use the series' choice for the
+requested horizon, or DEFAULT_MODEL_TYPE for series that were never
+backtested at that horizon or whose history is too short for the chosen
+model.
+"""
+import fcntl
+import json
+import os
+import tempfile
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.config.settings import settings
+from src.models.forecasting.forecast_model import fits_history
+
+# Used for series without a usable backtest result
+DEFAULT_MODEL_TYPE = "exponential_smoothing"
+
+
+class ModelSelectionStore:
+    """File-backed map of (series ID, horizon) to its best model."""
+    
+    def __init__(self, path: str):
+        """
+        Initialize the store; the file is read on first use.
+        
+        Args:
+            path: JSON file holding the choices
+        """
+        self.path = path
+        self._choices: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._loaded_signature: Optional[Tuple[int, int, int]] = None
+        self._lock = Lock()
+    
+    def _refresh(self, force: bool = False) -> None:
+        """Reload the file if another writer replaced it (always with force)."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if force or signature != self._loaded_signature:
+            with open(self.path, encoding="utf-8") as f:
+                self._choices = json.load(f)
+            self._loaded_signature = signature
+    
+    def get(self, series_id: str, horizon_days: int) -> Optional[Dict[str, Any]]:
+        """Stored choice for a series and horizon: model_type, metrics and evaluated_at."""
+        with self._lock:
+            self._refresh()
+            return self._choices.get(series_id, {}).get(str(horizon_days))
+    
+    def resolve(
+        self,
+        series_ids: Sequence[str],
+        horizon_days: int,
+        history_days: int,
+        model_type: str = "auto"
+    ) -> List[str]:
+        """
+        Model type to use per series: model_type itself unless it is 'auto'.
+        
+        Args:
+            series_ids: Series IDs
+            horizon_days: Horizon of the forecast request
+            history_days: Days of history each series is forecast from
+            model_type: Requested model type
+        """
+        if model_type != "auto":
+            return [model_type] * len(series_ids)
+        
+        horizon = str(horizon_days)
+        with self._lock:
+            self._refresh()
+            chosen = [self._choices.get(series_id, {}).get(horizon, {}).get('model_type') for series_id in series_ids]
+        return [
+            choice if choice and fits_history(choice, history_days) else DEFAULT_MODEL_TYPE
+            for choice in chosen
+        ]
+    
+    def record(self, horizon_days: int, choices: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Store the choices of one horizon (series ID -> model_type and metrics).
+        
+        The file is re-read under the cross-process lock and replaced
+        atomically, so choices recorded by other processes are kept.
+        """
+        evaluated_at = datetime.utcnow().isoformat()
+        horizon = str(horizon_days)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        
+        with self._lock, open(f"{self.path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh(force=True)
+                for series_id, choice in choices.items():
+                    self._choices.setdefault(series_id, {})[horizon] = {**choice, 'evaluated_at': evaluated_at}
+                
+                fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".model_selection.", suffix=".tmp")
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as f:
+                        json.dump(self._choices, f, separators=(',', ':'))
+                    os.replace(tmp_path, self.path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+                stat = os.stat(self.path)
+                self._loaded_signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+# Global store instance
+model_selection = ModelSelectionStore(settings.model_selection_path)
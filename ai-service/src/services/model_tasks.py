@@ -0,0 +1,30 @@
+"""
+Model calls run by the model executor.
+
+These are module-level functions taking and returning plain data so they
+can be sent to worker processes.
+"""
+from typing import Any, Dict, List
+
+import numpy as np
+
+from src.models.forecasting.forecast_model import ForecastModel
+from src.services.recommendation_service import RecommendationService
+
+
+def forecast(model_type: str, historical_data: List[Dict[str, Any]], horizon_days: int) -> Dict[str, Any]:
+    """Forecast one series."""
+    return ForecastModel(model_type=model_type).forecast(historical_data=historical_data, horizon_days=horizon_days)
+
+
+def forecast_batch(model_type: str, quantities: np.ndarray, horizon_days: int) -> Dict[str, Any]:
+    """Forecast every row of a (series x days) matrix."""
+    return ForecastModel(model_type=model_type).forecast_batch(quantities, horizon_days=horizon_days)
+
+
+def recommend(recommendation_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Calculate a reorder point, or a reorder quantity for the other recommendation types."""
+    service = RecommendationService()
+    if recommendation_type == 'reorder_point':
+        return service.calculate_reorder_point(**params)
+    return service.calculate_reorder_quantity(**params)
@@ -0,0 +1,91 @@
+"""
+Compact binary encoding of forecast requests.
+
+Instead of JSON {date, quantity} records or nested lists, a request can be
+sent as CONTENT_TYPE:
+
+    4 bytes   magic b'IVS1'
+    4 bytes   header length H, uint32 little-endian
+    H bytes   UTF-8 JSON header: start_date, series, days and the request's
+              other fields (series_ids or product_id and warehouse_id,
+              forecast_horizon_days, model_type)
+    0-3 bytes zero padding to a multiple of 4
+    series x days float32 little-endian quantities, row-major
+
+The quantities are decoded with np.frombuffer, a read-only view of the
+request body; nothing is parsed or validated per value.
+"""
+import json
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+CONTENT_TYPE = "application/x-invsight-series"
+
+MAGIC = b"IVS1"
+
+_PREFIX = struct.Struct("<4sI")
+
+_DTYPE = np.dtype("<f4")
+
+
+def is_binary(content_type: Optional[str]) -> bool:
+    """Whether a Content-Type header names this encoding."""
+    return (content_type or "").split(";")[0].strip().lower() == CONTENT_TYPE
+
+
+def encode(header: Dict[str, Any], quantities: np.ndarray) -> bytes:
+    """
+    Encode a request.
+
+    Args:
+        header: JSON-serializable request fields; series and days are added
+        quantities: Matrix of shape (series, days)
+    """
+    quantities = np.ascontiguousarray(quantities, dtype=_DTYPE)
+    if quantities.ndim != 2:
+        raise ValueError("quantities must be a (series, days) matrix")
+
+    header_bytes = json.dumps(
+        {**header, 'series': quantities.shape[0], 'days': quantities.shape[1]},
+        separators=(',', ':')
+    ).encode("utf-8")
+    padding = -(_PREFIX.size + len(header_bytes)) % _DTYPE.itemsize
+    return b"".join((
+        _PREFIX.pack(MAGIC, len(header_bytes)),
+        header_bytes,
+        b"\0" * padding,
+        quantities.tobytes()
+    ))
+
+
+def decode(body: bytes) -> Tuple[Dict[str, Any], np.ndarray]:
+    """
+    Decode a request.
+
+    Returns:
+        The header, and the quantities as a read-only float32 (series, days) view of body
+
+    Raises:
+        ValueError: If body is not a well-formed request
+    """
+    if len(body) < _PREFIX.size:
+        raise ValueError("Request body is too short")
+    magic, header_length = _PREFIX.unpack_from(body)
+    if magic != MAGIC:
+        raise ValueError("Request body is not in the binary series format")
+
+    offset = _PREFIX.size + header_length
+    try:
+        header = json.loads(bytes(body[_PREFIX.size:offset]))
+        series, days = int(header['series']), int(header['days'])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Malformed binary request header: {e}") from e
+
+    offset += -offset % _DTYPE.itemsize
+    if series < 0 or days < 0 or len(body) - offset != series * days * _DTYPE.itemsize:
+        raise ValueError(f"Binary request body does not hold {series} x {days} quantities")
+
+    quantities = np.frombuffer(body, dtype=_DTYPE, count=series * days, offset=offset)
+    return header, quantities.reshape(series, days)
@@ -0,0 +1,27 @@
+"""
+Pytest configuration and fixtures.
+"""
+import os
+import tempfile
+
+# Run models in threads and keep service state in a scratch directory; set before src is imported
+os.environ.setdefault("AI_MODEL_POOL", "thread")
+os.environ["AI_DATA_DIR"] = tempfile.mkdtemp(prefix="ai-service-tests-")
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+
+
+@pytest.fixture
+def client():
+    """Test client for the ai-service app."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def rng():
+    """Seeded random generator."""
+    return np.random.default_rng(42)
@@ -0,0 +1,113 @@
+"""
+Tests for the vectorized Holt-Winters and Croston/SBA models.
+"""
+import numpy as np
+import pytest
+
+from src.models.forecasting.batch_models import WEEKLY_SEASON, croston, holt_winters
+from src.models.forecasting.forecast_model import ForecastModel
+
+WEEK = np.array([10.0, 12.0, 11.0, 14.0, 20.0, 35.0, 8.0])
+
+
+def _records(row):
+    return [{"date": f"2024-01-{day + 1:02d}", "quantity": float(quantity)} for day, quantity in enumerate(row)]
+
+
+def _intermittent(rng, series=4, days=60):
+    return np.where(rng.random((series, days)) < 0.25, rng.poisson(6, (series, days)) + 1, 0).astype(np.float64)
+
+
+def test_holt_winters_continues_an_exact_weekly_pattern():
+    quantities = np.tile(WEEK, 4)[None, :]
+    fit = holt_winters(quantities, 14)
+    
+    np.testing.assert_allclose(fit['path'][0], np.tile(WEEK, 2), atol=1e-9)
+    assert fit['sigma'][0] == pytest.approx(0.0, abs=1e-9)
+    assert fit['extra']['seasonality_factor'][0] == pytest.approx(35.0 / WEEK.mean())
+
+
+def test_holt_winters_follows_a_trend():
+    days = np.arange(42, dtype=np.float64)
+    fit = holt_winters((50 + 2 * days)[None, :], 7)
+    
+    np.testing.assert_allclose(fit['path'][0], 50 + 2 * np.arange(42, 49), rtol=0.05)
+
+
+def test_holt_winters_needs_two_seasons():
+    with pytest.raises(ValueError, match=str(2 * WEEKLY_SEASON)):
+        holt_winters(np.ones((1, 2 * WEEKLY_SEASON - 1)), 7)
+
+
+@pytest.mark.parametrize("fit", [
+    lambda q: holt_winters(q, 30),
+    lambda q: croston(q, 30),
+    lambda q: croston(q, 30, bias_correction=True),
+])
+def test_each_series_is_fitted_independently(rng, fit):
+    """A series gets the same fit, winning parameters included, alone or in a batch."""
+    quantities = np.vstack([rng.poisson(15, (3, 42)), _intermittent(rng, 3, 42)]).astype(np.float64)
+    batch = fit(quantities)
+    
+    for i in range(len(quantities)):
+        single = fit(quantities[i:i + 1])
+        np.testing.assert_allclose(batch['path'][i], single['path'][0])
+        assert batch['sigma'][i] == pytest.approx(single['sigma'][0])
+        for name, values in single['params'].items():
+            assert batch['params'][name][i] == values[0]
+
+
+def test_croston_of_daily_constant_demand():
+    fit = croston(np.full((1, 30), 5.0), 7)
+    
+    np.testing.assert_allclose(fit['path'][0], 5.0)
+    assert fit['extra']['adi'][0] == pytest.approx(1.0)
+
+
+def test_sba_scales_croston_by_one_minus_half_alpha(rng):
+    quantities = _intermittent(rng)
+    plain = croston(quantities, 7, alphas=(0.2,))
+    corrected = croston(quantities, 7, alphas=(0.2,), bias_correction=True)
+    
+    np.testing.assert_allclose(corrected['path'], plain['path'] * 0.9)
+
+
+def test_croston_without_demand_forecasts_zero():
+    quantities = np.array([np.zeros(20), -np.ones(20)])
+    fit = croston(quantities, 7)
+    
+    np.testing.assert_array_equal(fit['path'], 0.0)
+    np.testing.assert_array_equal(fit['extra']['adi'], 20.0)
+
+
+def test_croston_treats_negative_values_as_no_demand(rng):
+    quantities = _intermittent(rng, series=1)
+    with_returns = np.where(quantities == 0, -3.0, quantities)
+    
+    np.testing.assert_allclose(croston(with_returns, 7)['path'], croston(quantities, 7)['path'])
+
+
+@pytest.mark.parametrize("model_type", ["holt_winters", "croston", "sba"])
+def test_forecast_matches_forecast_batch(rng, model_type):
+    """ForecastModel.forecast of one series equals its row of forecast_batch."""
+    model = ForecastModel(model_type)
+    quantities = np.vstack([rng.poisson(15, (2, 35)), _intermittent(rng, 2, 35)]).astype(np.float64)
+    batch = model.forecast_batch(quantities, 30)
+    
+    for i, row in enumerate(quantities):
+        single = model.forecast(_records(row), 30)
+        assert single['predicted_demand'] == batch['predicted_demand'][i]
+        assert single['confidence_upper'] == batch['confidence_upper'][i]
+        assert single['daily_demand'] == batch['daily_demand'][i].tolist()
+
+
+def test_holt_winters_forecast_with_short_history_is_rejected(client):
+    response = client.post("/forecast", json={
+        "product_id": "p1",
+        "warehouse_id": "w1",
+        "historical_data": _records(np.ones(12)),
+        "forecast_horizon_days": 7,
+        "model_type": "holt_winters"
+    })
+    
+    assert response.status_code == 400
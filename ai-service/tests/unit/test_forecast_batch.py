@@ -0,0 +1,117 @@
+"""
+Tests for batch forecasting: the vectorized path must match per-series forecasts.
+"""
+import numpy as np
+import pytest
+
+from src.models.forecasting.forecast_model import DAILY_FIELDS, ForecastModel
+
+
+def _records(row):
+    return [{"date": f"2024-01-{day + 1:02d}", "quantity": float(quantity)} for day, quantity in enumerate(row)]
+
+
+def _histories(rng):
+    return np.vstack([
+        rng.poisson(15, size=30),
+        rng.uniform(0, 200, size=30),
+        np.full(30, 7.0),
+        np.r_[np.zeros(29), 40.0]
+    ]).astype(np.float64)
+
+
+@pytest.mark.parametrize("horizon_days", [7, 30, 90])
+def test_exponential_smoothing_batch_matches_single_series(rng, horizon_days):
+    """Every row of forecast_batch equals forecast() of that series, to the rounding of the outputs."""
+    model = ForecastModel("exponential_smoothing")
+    quantities = _histories(rng)
+    batch = model.forecast_batch(quantities, horizon_days)
+    
+    for i, row in enumerate(quantities):
+        single = model.forecast(_records(row), horizon_days)
+        for name in ('predicted_demand', 'confidence_lower', 'confidence_upper'):
+            assert batch[name][i] == pytest.approx(single[name], abs=1e-3)
+        for name in DAILY_FIELDS:
+            np.testing.assert_allclose(batch[name][i], single[name], atol=1e-3)
+        for name, value in single['features'].items():
+            assert batch['features'][name][i] == pytest.approx(value, abs=1e-3)
+        assert batch['model_version'] == single['model_version']
+
+
+def test_exponential_smoothing_batch_matches_single_series_for_one_day():
+    """With a single day of history both fall back to the scaled average."""
+    model = ForecastModel("exponential_smoothing")
+    quantities = np.array([[12.0], [3.0]])
+    batch = model.forecast_batch(quantities, 30)
+    
+    for i, row in enumerate(quantities):
+        assert batch['predicted_demand'][i] == pytest.approx(model.forecast(_records(row), 30)['predicted_demand'])
+
+
+def test_smoothed_level_matches_recursion(rng):
+    """The closed-form weights give the same level as the smoothing loop."""
+    quantities = rng.uniform(0, 100, size=(5, 60))
+    for alpha in (0.05, 0.3, 0.9):
+        levels = ForecastModel._smoothed_level(quantities, alpha)
+        for row, level in zip(quantities, levels):
+            expected = row[0]
+            for value in row[1:]:
+                expected = alpha * value + (1 - alpha) * expected
+            assert level == pytest.approx(expected, rel=1e-12)
+
+
+def test_forecast_batch_rejects_empty_history():
+    with pytest.raises(ValueError):
+        ForecastModel("exponential_smoothing").forecast_batch(np.zeros((2, 0)), 7)
+
+
+def test_batch_endpoint_matches_single_series_endpoint(client, rng):
+    """POST /forecast/batch returns the same forecasts as one POST /forecast per series."""
+    quantities = _histories(rng)
+    series_ids = [f"p{i}:w1" for i in range(len(quantities))]
+    response = client.post("/forecast/batch", json={
+        "series_ids": series_ids,
+        "start_date": "2024-01-01",
+        "quantities": quantities.tolist(),
+        "forecast_horizon_days": 30,
+        "model_type": "exponential_smoothing",
+        "include_daily": True
+    })
+    assert response.status_code == 200
+    batch = response.json()
+    assert batch['model_types'] == ["exponential_smoothing"] * len(series_ids)
+    
+    for i, series_id in enumerate(series_ids):
+        product_id, warehouse_id = series_id.split(":")
+        single = client.post("/forecast", json={
+            "product_id": product_id,
+            "warehouse_id": warehouse_id,
+            "historical_data": _records(quantities[i]),
+            "forecast_horizon_days": 30,
+            "model_type": "exponential_smoothing"
+        }).json()
+        assert batch['predicted_demand'][i] == pytest.approx(single['predicted_demand'], abs=1e-3)
+        assert batch['confidence_upper'][i] == pytest.approx(single['confidence_upper'], abs=1e-3)
+        np.testing.assert_allclose(batch['daily_demand'][i], single['daily_demand'], atol=1e-3)
+
+
+def test_batch_endpoint_rejects_ragged_rows(client):
+    response = client.post("/forecast/batch", json={
+        "series_ids": ["a:w", "b:w"],
+        "start_date": "2024-01-01",
+        "quantities": [[1.0] * 12, [1.0] * 11],
+        "forecast_horizon_days": 7
+    })
+    
+    assert response.status_code == 400
+
+
+def test_batch_endpoint_rejects_wrong_row_count(client):
+    response = client.post("/forecast/batch", json={
+        "series_ids": ["a:w", "b:w"],
+        "start_date": "2024-01-01",
+        "quantities": [[1.0] * 12],
+        "forecast_horizon_days": 7
+    })
+    
+    assert response.status_code == 400
@@ -0,0 +1,96 @@
+"""
+Tests for the forecast result cache.
+"""
+import time
+
+import numpy as np
+
+from src.registry.model_registry import registry
+from src.services.forecast_cache import ForecastCache, forecast_cache
+
+
+def _key(quantities, model_version="1.0.0", horizon_days=7, **params):
+    prefix = ForecastCache.key_prefix("exponential_smoothing", model_version, horizon_days, **params)
+    return ForecastCache.key(prefix, np.asarray(quantities))
+
+
+def test_key_depends_on_history_and_model():
+    quantities = [1.0, 2.0, 3.0]
+    
+    assert _key(quantities) == _key(np.array(quantities, dtype=np.float32))
+    assert _key(quantities) != _key([1.0, 2.0, 3.5])
+    assert _key(quantities) != _key(quantities, model_version="1.1.0")
+    assert _key(quantities) != _key(quantities, horizon_days=30)
+    assert _key(quantities, alpha=0.3) != _key(quantities, alpha=0.5)
+
+
+def test_hit_and_miss():
+    cache = ForecastCache(max_entries=10)
+    result = {"predicted_demand": 12.0}
+    
+    assert cache.get("a") is None
+    cache.put("a", result)
+    assert cache.get("a") is result
+    
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_entries_expire_after_ttl():
+    cache = ForecastCache(max_entries=10, ttl_seconds=0.05)
+    cache.put("a", {"predicted_demand": 1.0})
+    assert cache.get("a") is not None
+    
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ForecastCache(max_entries=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    cache.get("a")  # "b" is now the least recently used
+    cache.put("c", {"n": 3})
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("c") == {"n": 3}
+    assert cache.stats()["entries"] == 2
+
+
+def test_zero_max_entries_disables_cache():
+    cache = ForecastCache(max_entries=0)
+    cache.put("a", {"n": 1})
+    
+    assert cache.get("a") is None
+
+
+def test_activating_forecast_model_invalidates_cache():
+    """Only activations of forecast models clear the global cache."""
+    forecast_cache.put("a", {"n": 1})
+    registry.register_model("recommendation_cache_test", "recommendation", "1.0.0")
+    assert forecast_cache.get("a") is not None
+    
+    invalidations = forecast_cache.stats()["invalidations"]
+    registry.register_model("forecast_cache_test", "forecast", "1.0.0")
+    assert forecast_cache.get("a") is None
+    assert forecast_cache.stats()["invalidations"] == invalidations + 1
+
+
+def test_repeated_request_is_served_from_cache(client, rng):
+    request = {
+        "series_ids": ["p1:w1", "p2:w1"],
+        "start_date": "2024-01-01",
+        "quantities": rng.uniform(0, 100, size=(2, 20)).tolist(),
+        "forecast_horizon_days": 7,
+        "model_type": "exponential_smoothing"
+    }
+    first = client.post("/forecast/batch", json=request)
+    hits = forecast_cache.stats()["hits"]
+    second = client.post("/forecast/batch", json=request)
+    
+    assert first.status_code == second.status_code == 200
+    assert second.json()["predicted_demand"] == first.json()["predicted_demand"]
+    assert forecast_cache.stats()["hits"] == hits + 2
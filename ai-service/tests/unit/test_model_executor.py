@@ -0,0 +1,108 @@
+"""
+Tests for the bounded model execution pool and the API's 503 on saturation.
+"""
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from src.api import forecast_api
+from src.main import app
+from src.services.forecast_cache import ForecastCache
+from src.services.model_executor import ModelExecutor, ModelPoolSaturated
+
+
+async def _occupy(executor: ModelExecutor, release: threading.Event, calls: int):
+    """Start calls that block a worker (or a queue slot) until release is set."""
+    tasks = [asyncio.create_task(executor.run(release.wait, 5)) for _ in range(calls)]
+    await asyncio.sleep(0.05)
+    return tasks
+
+
+async def test_run_returns_result():
+    executor = ModelExecutor(kind="thread", workers=1)
+    try:
+        assert await executor.run(pow, 2, 10) == 1024
+        assert executor.stats()["completed"] == 1
+    finally:
+        executor.shutdown()
+
+
+async def test_saturated_pool_rejects_calls():
+    """Calls beyond workers + queue_depth fail fast instead of queueing."""
+    executor = ModelExecutor(kind="thread", workers=1, queue_depth=1)
+    release = threading.Event()
+    try:
+        tasks = await _occupy(executor, release, executor.capacity)
+        stats = executor.stats()
+        assert stats["in_flight"] == 2
+        assert stats["queued"] == 1
+        
+        with pytest.raises(ModelPoolSaturated) as exc_info:
+            await executor.run(pow, 2, 2)
+        assert exc_info.value.retry_after >= 1
+        assert executor.stats()["rejected"] == 1
+        
+        release.set()
+        assert await asyncio.gather(*tasks) == [True, True]
+        assert await executor.run(pow, 2, 2) == 4
+        assert executor.stats()["in_flight"] == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+async def test_failed_call_frees_its_slot():
+    executor = ModelExecutor(kind="thread", workers=1, queue_depth=0)
+    try:
+        with pytest.raises(ZeroDivisionError):
+            await executor.run(divmod, 1, 0)
+        stats = executor.stats()
+        assert stats["failed"] == 1
+        assert stats["in_flight"] == 0
+        assert await executor.run(divmod, 7, 2) == (3, 1)
+    finally:
+        executor.shutdown()
+
+
+def test_unknown_pool_kind_is_rejected():
+    with pytest.raises(ValueError):
+        ModelExecutor(kind="greenlet")
+
+
+async def test_saturated_pool_returns_503(monkeypatch, rng):
+    """The forecast endpoint answers 503 with Retry-After while the pool is full."""
+    executor = ModelExecutor(kind="thread", workers=1, queue_depth=0)
+    monkeypatch.setattr(forecast_api, "model_executor", executor)
+    monkeypatch.setattr(forecast_api, "forecast_cache", ForecastCache(max_entries=0))  # Every request reaches the pool
+    release = threading.Event()
+    request = {
+        "series_ids": ["p1:w1"],
+        "start_date": "2024-01-01",
+        "quantities": [rng.uniform(0, 100, size=20).tolist()],
+        "forecast_horizon_days": 7,
+        "model_type": "exponential_smoothing"
+    }
+    
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            tasks = await _occupy(executor, release, executor.capacity)
+            response = await client.post("/forecast/batch", json=request)
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "1"
+            
+            release.set()
+            await asyncio.gather(*tasks)
+            response = await client.post("/forecast/batch", json=request)
+            assert response.status_code == 200
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_pool_metrics_endpoint(client):
+    response = client.get("/metrics/model-pool")
+    
+    assert response.status_code == 200
+    assert {"kind", "workers", "queue_depth", "in_flight", "rejected"} <= response.json().keys()
@@ -0,0 +1,165 @@
+"""
+Tests for the file-backed model registry shared by worker processes.
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+
+from src.models.forecasting import forecast_model
+from src.models.forecasting.forecast_model import DEFAULT_ALPHA, DEFAULT_MODEL_VERSION, ForecastModel
+from src.registry.default_models import register_default_models
+from src.registry.model_registry import ModelRegistry
+
+
+@pytest.fixture
+def registries(tmp_path):
+    """Two registries on the same root, as two worker processes would hold them."""
+    root = str(tmp_path / "registry")
+    return ModelRegistry(root), ModelRegistry(root)
+
+
+def _generation(registry: ModelRegistry) -> int:
+    with open(registry.metadata_path, encoding="utf-8") as f:
+        return json.load(f)['generation']
+
+
+def test_root_is_created_on_first_write(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    assert registry.get_active_model("forecast_x") is None
+    assert not os.path.exists(registry.root)
+    
+    registry.register_model("forecast_x", "forecast", "1.0.0")
+    assert os.path.exists(registry.metadata_path)
+
+
+def test_activation_is_seen_by_another_instance(registries):
+    writer, reader = registries
+    writer.register_model("forecast_x", "forecast", "1.0.0")
+    assert reader.get_active_model("forecast_x")['version'] == "1.0.0"
+    
+    writer.register_model("forecast_x", "forecast", "1.1.0")
+    assert reader.get_active_model("forecast_x")['version'] == "1.1.0"
+    assert not reader.get_model("forecast_x_1.0.0")['is_active']
+
+
+def test_refresh_notifies_listeners_of_versions_activated_elsewhere(registries):
+    writer, reader = registries
+    activated = []
+    reader.add_activation_listener(lambda model: activated.append(model['model_id']))
+    writer.register_model("forecast_x", "forecast", "1.0.0")
+    reader.refresh()
+    assert activated == []  # Nothing was active before the first load
+    
+    writer.register_model("forecast_x", "forecast", "1.1.0")
+    reader.refresh()
+    reader.refresh()
+    assert activated == ["forecast_x_1.1.0"]
+
+
+def test_every_write_increments_the_generation(registries):
+    writer, reader = registries
+    writer.register_model("forecast_x", "forecast", "1.0.0")
+    writer.register_model("forecast_x", "forecast", "1.1.0", activate=False)
+    assert _generation(writer) == 2
+    
+    reader.activate_model("forecast_x_1.1.0")
+    assert _generation(writer) == 3
+    assert writer.get_active_model("forecast_x")['version'] == "1.1.0"
+
+
+def test_change_is_seen_even_with_unchanged_mtime(registries):
+    """Refresh compares generations, so a rewrite within the mtime granularity is not missed."""
+    writer, reader = registries
+    writer.register_model("forecast_x", "forecast", "1.0.0")
+    writer.register_model("forecast_x", "forecast", "1.1.0", activate=False)
+    assert reader.get_active_model("forecast_x")['version'] == "1.0.0"
+    stat = os.stat(writer.metadata_path)
+    
+    writer.activate_model("forecast_x_1.1.0")
+    os.utime(writer.metadata_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert reader.get_active_model("forecast_x")['version'] == "1.1.0"
+
+
+def test_rollback_across_instances(registries):
+    writer, reader = registries
+    writer.register_model("forecast_x", "forecast", "1.0.0")
+    writer.register_model("forecast_x", "forecast", "1.1.0")
+    
+    assert reader.rollback_model("forecast_x") == "forecast_x_1.0.0"
+    assert writer.get_active_model("forecast_x")['version'] == "1.0.0"
+    assert writer.rollback_model("forecast_x") is None
+
+
+def test_concurrent_registrations_are_kept(registries):
+    """Each instance re-reads under the lock, so neither overwrites the other's version."""
+    first, second = registries
+    first.get_active_model("forecast_x")
+    second.get_active_model("forecast_x")
+    
+    first.register_model("forecast_x", "forecast", "1.0.0")
+    second.register_model("forecast_y", "forecast", "1.0.0")
+    
+    assert {model['model_id'] for model in first.list_models()} == {"forecast_x_1.0.0", "forecast_y_1.0.0"}
+
+
+def test_artifacts_are_memory_mapped_read_only(registries):
+    writer, reader = registries
+    weights = np.arange(12, dtype=np.float64).reshape(3, 4)
+    model_id = writer.register_model("forecast_x", "forecast", "1.0.0", artifacts={"weights": weights})
+    
+    artifacts = reader.load_artifacts(model_id)
+    assert isinstance(artifacts["weights"], np.memmap)
+    assert not artifacts["weights"].flags.writeable
+    np.testing.assert_array_equal(artifacts["weights"], weights)
+    assert reader.load_artifacts(model_id) is artifacts
+
+
+def test_artifacts_of_a_version_are_immutable(registries):
+    writer, _ = registries
+    model_id = writer.register_model("forecast_x", "forecast", "1.0.0", artifacts={"alpha": np.array(0.3)})
+    
+    assert writer.register_model("forecast_x", "forecast", "1.0.0") == model_id
+    with pytest.raises(ValueError):
+        writer.register_model("forecast_x", "forecast", "1.0.0", artifacts={"alpha": np.array(0.5)})
+    assert float(writer.load_artifacts(model_id)["alpha"]) == 0.3
+
+
+def test_failed_registration_leaves_registry_unchanged(registries):
+    writer, reader = registries
+    writer.register_model("forecast_x", "forecast", "1.0.0")
+    generation = _generation(writer)
+    
+    with pytest.raises(ValueError):
+        writer.register_model("forecast_x", "forecast", "1.1.0", artifacts={"../escape": np.zeros(1)})
+    
+    assert writer.get_model("forecast_x_1.1.0") is None
+    assert writer.get_active_model("forecast_x")['version'] == "1.0.0"
+    assert reader.get_active_model("forecast_x")['version'] == "1.0.0"
+    assert _generation(writer) == generation
+
+
+def test_default_models_do_not_replace_an_active_version(registries):
+    writer, reader = registries
+    register_default_models(writer)
+    writer.register_model("forecast_croston", "forecast", "2.0.0", artifacts={"alphas": np.array([0.4])})
+    register_default_models(reader)
+    
+    assert reader.get_active_model("forecast_croston")['version'] == "2.0.0"
+    assert reader.get_active_model("forecast_exponential_smoothing")['version'] == DEFAULT_MODEL_VERSION
+
+
+def test_forecast_model_uses_the_active_version(registries, monkeypatch):
+    writer, reader = registries
+    monkeypatch.setattr(forecast_model, "registry", reader)
+    register_default_models(writer)
+    assert ForecastModel("exponential_smoothing").alpha == DEFAULT_ALPHA
+    
+    writer.register_model("forecast_exponential_smoothing", "forecast", "1.1.0", artifacts={"alpha": np.array(0.8)})
+    model = ForecastModel("exponential_smoothing")
+    assert (model.model_version, model.alpha) == ("1.1.0", 0.8)
+    
+    writer.rollback_model("forecast_exponential_smoothing")
+    model = ForecastModel("exponential_smoothing")
+    assert (model.model_version, model.alpha) == (DEFAULT_MODEL_VERSION, DEFAULT_ALPHA)
@@ -0,0 +1,63 @@
+"""
+Unit tests for persisted per-series model choices.
+"""
+from uuid import uuid4
+
+from src.services.model_selection import DEFAULT_MODEL_TYPE, ModelSelectionStore, model_selection
+
+
+def _series_id():
+    return f"{uuid4()}:{uuid4()}"
+
+
+def test_writers_keep_each_others_choices(tmp_path):
+    """Two stores on one file, as in two processes, do not overwrite each other's winners."""
+    path = str(tmp_path / "model_selection.json")
+    first, second = ModelSelectionStore(path), ModelSelectionStore(path)
+    
+    first.get("a:1", 30)  # Load the (missing) file before the other writer
+    second.record(30, {"b:1": {"model_type": "croston"}})
+    first.record(30, {"a:1": {"model_type": "sba"}})
+    
+    reader = ModelSelectionStore(path)
+    assert reader.get("a:1", 30)["model_type"] == "sba"
+    assert reader.get("b:1", 30)["model_type"] == "croston"
+    assert second.resolve(["a:1", "b:1"], 30, 60) == ["sba", "croston"]
+
+
+def test_choices_are_kept_per_horizon(tmp_path):
+    """A winner chosen for one horizon is not used for another."""
+    store = ModelSelectionStore(str(tmp_path / "model_selection.json"))
+    store.record(7, {"a:1": {"model_type": "holt_winters"}})
+    store.record(90, {"a:1": {"model_type": "croston"}})
+    
+    assert store.resolve(["a:1"], 7, 60) == ["holt_winters"]
+    assert store.resolve(["a:1"], 90, 60) == ["croston"]
+    assert store.resolve(["a:1"], 30, 60) == [DEFAULT_MODEL_TYPE]
+    assert store.resolve(["a:1"], 7, 60, model_type="sba") == ["sba"]
+
+
+def test_winner_needing_more_history_falls_back(tmp_path):
+    """Holt-Winters needs two weeks; shorter histories use the default model."""
+    store = ModelSelectionStore(str(tmp_path / "model_selection.json"))
+    store.record(30, {"a:1": {"model_type": "holt_winters"}})
+    
+    assert store.resolve(["a:1"], 30, 13) == [DEFAULT_MODEL_TYPE]
+    assert store.resolve(["a:1"], 30, 14) == ["holt_winters"]
+
+
+def test_auto_batch_with_short_history_falls_back_per_series(client, rng):
+    """A stored Holt-Winters winner does not fail a batch whose history is too short for it."""
+    seasonal, plain = _series_id(), _series_id()
+    model_selection.record(30, {seasonal: {"model_type": "holt_winters"}})
+    
+    response = client.post("/forecast/batch", json={
+        "series_ids": [seasonal, plain],
+        "start_date": "2025-01-01",
+        "quantities": rng.poisson(5, size=(2, 12)).tolist(),
+        "forecast_horizon_days": 30,
+        "model_type": "auto"
+    })
+    
+    assert response.status_code == 200
+    assert response.json()["model_types"] == [DEFAULT_MODEL_TYPE, DEFAULT_MODEL_TYPE]
@@ -0,0 +1,155 @@
+"""
+Tests for the binary series format and binary request bodies.
+"""
+import struct
+
+import numpy as np
+import pytest
+
+from src.services import wire_format
+
+
+def _batch_header(series_ids):
+    return {
+        "series_ids": series_ids,
+        "start_date": "2024-01-01",
+        "forecast_horizon_days": 7,
+        "model_type": "exponential_smoothing"
+    }
+
+
+def test_round_trip(rng):
+    """Decoding an encoded request returns its header and quantities."""
+    quantities = rng.uniform(0, 50, size=(3, 17)).astype(np.float32)
+    header, decoded = wire_format.decode(wire_format.encode({"start_date": "2024-01-01"}, quantities))
+    
+    assert header == {"start_date": "2024-01-01", "series": 3, "days": 17}
+    assert decoded.dtype == np.dtype("<f4")
+    assert not decoded.flags.writeable
+    np.testing.assert_array_equal(decoded, quantities)
+
+
+def test_quantities_are_aligned_for_every_header_length():
+    """Padding puts the quantities on a float32 boundary whatever the header length."""
+    quantities = np.arange(6, dtype=np.float32).reshape(2, 3)
+    for name_length in range(4):
+        body = wire_format.encode({"x": "a" * name_length}, quantities)
+        assert (len(body) - quantities.nbytes) % 4 == 0
+        np.testing.assert_array_equal(wire_format.decode(body)[1], quantities)
+
+
+def test_encode_writes_little_endian_quantities():
+    """Big-endian or float64 input is sent as little-endian float32."""
+    quantities = np.array([[1.5, -2.0, 1e6]], dtype=">f8")
+    body = wire_format.encode({}, quantities)
+    
+    assert body[-12:] == struct.pack("<3f", 1.5, -2.0, 1e6)
+    np.testing.assert_array_equal(wire_format.decode(body)[1], quantities)
+
+
+def test_encode_rejects_non_matrix():
+    with pytest.raises(ValueError):
+        wire_format.encode({}, np.zeros(5))
+
+
+@pytest.mark.parametrize("body, message", [
+    (b"IVS", "too short"),
+    (b"NOPE" + struct.pack("<I", 2) + b"{}", "not in the binary series format"),
+    (b"IVS1" + struct.pack("<I", 7) + b"not json", "Malformed binary request header"),
+    (b"IVS1" + struct.pack("<I", 2) + b"{}", "Malformed binary request header"),
+    (b"IVS1" + struct.pack("<I", 21) + b'{"series":1,"days":2}' + b"\0" * 3 + b"\0" * 4, "does not hold 1 x 2"),
+    (b"IVS1" + struct.pack("<I", 21) + b'{"series":1,"days":2}' + b"\0" * 3 + b"\0" * 12, "does not hold 1 x 2"),
+    (b"IVS1" + struct.pack("<I", 22) + b'{"series":-1,"days":2}' + b"\0" * 2, "does not hold -1 x 2"),
+])
+def test_decode_rejects_malformed_bodies(body, message):
+    with pytest.raises(ValueError, match=message):
+        wire_format.decode(body)
+
+
+def test_decode_rejects_big_endian_header_length():
+    """A header length written big-endian reads as far past the body."""
+    body = bytearray(wire_format.encode({}, np.ones((1, 4), dtype=np.float32)))
+    header_length = struct.unpack_from("<I", body, 4)[0]
+    struct.pack_into(">I", body, 4, header_length)
+    
+    with pytest.raises(ValueError, match="Malformed binary request header"):
+        wire_format.decode(bytes(body))
+
+
+def test_is_binary_ignores_parameters_and_case():
+    assert wire_format.is_binary("Application/X-InvSight-Series; charset=binary")
+    assert not wire_format.is_binary("application/json")
+    assert not wire_format.is_binary(None)
+
+
+def test_binary_batch_request_matches_json(client, rng):
+    """A binary batch request is forecast exactly like the same request as JSON."""
+    series_ids = ["p1:w1", "p2:w1"]
+    quantities = rng.poisson(12, size=(2, 28)).astype(np.float32)
+    
+    binary = client.post(
+        "/forecast/batch",
+        content=wire_format.encode(_batch_header(series_ids), quantities),
+        headers={"Content-Type": wire_format.CONTENT_TYPE}
+    )
+    json_response = client.post(
+        "/forecast/batch",
+        json={**_batch_header(series_ids), "quantities": quantities.tolist()}
+    )
+    
+    assert binary.status_code == 200
+    assert json_response.status_code == 200
+    assert binary.json()["predicted_demand"] == json_response.json()["predicted_demand"]
+
+
+def test_binary_single_series_request(client, rng):
+    """A one-row binary body is a single-series forecast request."""
+    quantities = rng.poisson(8, size=(1, 21)).astype(np.float32)
+    header = {
+        "product_id": "p1",
+        "warehouse_id": "w1",
+        "start_date": "2024-01-01",
+        "forecast_horizon_days": 7,
+        "model_type": "exponential_smoothing"
+    }
+    response = client.post(
+        "/forecast",
+        content=wire_format.encode(header, quantities),
+        headers={"Content-Type": wire_format.CONTENT_TYPE}
+    )
+    
+    assert response.status_code == 200
+    assert response.json()["product_id"] == "p1"
+
+
+@pytest.mark.parametrize("body", [
+    b"IVS",
+    b"IVS1" + struct.pack("<I", 7) + b"not json",
+    b"IVS1" + struct.pack(">I", 2) + b"{}",
+    wire_format.encode(_batch_header(["p1:w1"]), np.ones((1, 12), dtype=np.float32))[:-4],
+])
+def test_malformed_binary_request_is_rejected(client, body):
+    response = client.post(
+        "/forecast/batch",
+        content=body,
+        headers={"Content-Type": wire_format.CONTENT_TYPE}
+    )
+    
+    assert response.status_code == 400
+
+
+def test_binary_single_series_request_needs_one_row(client):
+    header = {"product_id": "p1", "warehouse_id": "w1", "start_date": "2024-01-01", "forecast_horizon_days": 7}
+    response = client.post(
+        "/forecast",
+        content=wire_format.encode(header, np.ones((2, 12), dtype=np.float32)),
+        headers={"Content-Type": wire_format.CONTENT_TYPE}
+    )
+    
+    assert response.status_code == 400
+
+
+def test_unsupported_content_type_is_rejected(client):
+    response = client.post("/forecast/batch", content=b"a,b", headers={"Content-Type": "text/csv"})
+    
+    assert response.status_code == 415
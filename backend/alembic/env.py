@@ -24,6 +24,12 @@ from src.models.supplier import Supplier
 from src.models.purchase_order import PurchaseOrder
 from src.models.purchase_order_item import PurchaseOrderItem
 from src.models.ai_interaction import AIInteraction
+from src.models.warehouse_inventory_summary import WarehouseInventorySummary
+from src.models.inventory_snapshot import InventorySnapshot
+from src.models.daily_movement_rollup import DailyMovementRollup
+from src.models.outbox_event import OutboxEvent
+from src.models.forecast_run import ForecastRun
+from src.models.forecast_accuracy import ForecastAccuracy
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,71 @@
+"""Create warehouse_inventory_summaries table
+
+Revision ID: 007
+Revises: 006
+Create Date: 2025-02-10 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create warehouse_inventory_summaries table
+    op.create_table(
+        'warehouse_inventory_summaries',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('warehouse_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('sku_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_units', sa.Numeric(18, 3), nullable=False, server_default='0'),
+        sa.Column('low_stock_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_movement_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], name='fk_warehouse_inventory_summary_warehouse'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tenant_id', 'warehouse_id', name='uq_warehouse_inventory_summary')
+    )
+    
+    # Populate from current inventory
+    op.execute("""
+        INSERT INTO warehouse_inventory_summaries
+            (tenant_id, warehouse_id, sku_count, total_units, low_stock_count, last_movement_at)
+        SELECT
+            tenant_id,
+            warehouse_id,
+            COUNT(*),
+            COALESCE(SUM(quantity), 0),
+            COUNT(*) FILTER (WHERE minimum_stock IS NOT NULL AND quantity < minimum_stock),
+            MAX(last_movement_at)
+        FROM inventory
+        GROUP BY tenant_id, warehouse_id
+    """)
+    
+    # Enable Row-Level Security
+    op.execute('ALTER TABLE warehouse_inventory_summaries ENABLE ROW LEVEL SECURITY')
+    
+    # Create RLS policy
+    op.execute("""
+        CREATE POLICY warehouse_inventory_summaries_tenant_isolation ON warehouse_inventory_summaries
+        FOR ALL
+        USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+    """)
+
+
+def downgrade() -> None:
+    # Drop RLS policy
+    op.execute('DROP POLICY IF EXISTS warehouse_inventory_summaries_tenant_isolation ON warehouse_inventory_summaries')
+    
+    # Disable RLS
+    op.execute('ALTER TABLE warehouse_inventory_summaries DISABLE ROW LEVEL SECURITY')
+    
+    # Drop table
+    op.drop_table('warehouse_inventory_summaries')
@@ -0,0 +1,46 @@
+"""Add maintained below_minimum flag to inventory
+
+Revision ID: 008
+Revises: 007
+Create Date: 2025-02-12 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Add flag column
+    op.add_column(
+        'inventory',
+        sa.Column('below_minimum', sa.Boolean(), nullable=False, server_default=sa.text('false'))
+    )
+    
+    # Backfill from current stock levels
+    op.execute("""
+        UPDATE inventory
+        SET below_minimum = true
+        WHERE minimum_stock IS NOT NULL AND quantity < minimum_stock
+    """)
+    
+    # Partial index holding only the low-stock rows
+    op.create_index(
+        'idx_inventory_below_minimum',
+        'inventory',
+        ['tenant_id', 'warehouse_id'],
+        postgresql_where=sa.text('below_minimum')
+    )
+
+
+def downgrade() -> None:
+    # Drop index
+    op.drop_index('idx_inventory_below_minimum', table_name='inventory')
+    
+    # Drop column
+    op.drop_column('inventory', 'below_minimum')
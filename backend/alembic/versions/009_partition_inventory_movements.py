@@ -0,0 +1,175 @@
+"""Partition inventory_movements by month on performed_at
+
+Revision ID: 009
+Revises: 008
+Create Date: 2025-02-14 00:00:00.000000
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+# Partitions created ahead of the current month; src.jobs.manage_movement_partitions keeps this up
+MONTHS_AHEAD = 3
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _movement_columns():
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False, server_default=sa.text('uuid_generate_v4()')),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('movement_type', sa.String(20), nullable=False),
+        sa.Column('product_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('source_warehouse_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('destination_warehouse_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('quantity', sa.Numeric(15, 3), nullable=False),
+        sa.Column('quantity_before', sa.Numeric(15, 3), nullable=True),
+        sa.Column('quantity_after', sa.Numeric(15, 3), nullable=True),
+        sa.Column('reference_number', sa.String(100), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('performed_by', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('performed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('approved_by', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('approved_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], name='fk_movement_product'),
+        sa.ForeignKeyConstraint(['source_warehouse_id'], ['warehouses.id'], name='fk_movement_source_warehouse'),
+        sa.ForeignKeyConstraint(['destination_warehouse_id'], ['warehouses.id'], name='fk_movement_destination_warehouse'),
+        sa.CheckConstraint("movement_type IN ('inbound', 'outbound', 'transfer')", name='ck_movement_type'),
+        sa.CheckConstraint(
+            "(movement_type = 'inbound' AND source_warehouse_id IS NULL AND destination_warehouse_id IS NOT NULL) OR "
+            "(movement_type = 'outbound' AND source_warehouse_id IS NOT NULL AND destination_warehouse_id IS NULL) OR "
+            "(movement_type = 'transfer' AND source_warehouse_id IS NOT NULL AND destination_warehouse_id IS NOT NULL)",
+            name='ck_movement_warehouses'
+        ),
+        sa.CheckConstraint('quantity > 0', name='ck_movement_quantity_positive'),
+    ]
+
+
+def _create_indexes(table: str) -> None:
+    op.create_index('idx_inventory_movements_tenant_performed_at', table, ['tenant_id', 'performed_at'])
+    op.create_index('idx_inventory_movements_tenant_product_performed_at', table, ['tenant_id', 'product_id', 'performed_at'])
+    op.create_index('idx_inventory_movements_product_id', table, ['product_id'])
+    op.create_index('idx_inventory_movements_performed_at', table, ['performed_at'])
+    op.create_index('idx_inventory_movements_performed_by', table, ['performed_by'])
+    op.create_index('idx_inventory_movements_type', table, ['movement_type'])
+    op.create_index('idx_inventory_movements_source_warehouse', table, ['source_warehouse_id'])
+    op.create_index('idx_inventory_movements_destination_warehouse', table, ['destination_warehouse_id'])
+
+
+def _enable_rls() -> None:
+    op.execute('ALTER TABLE inventory_movements ENABLE ROW LEVEL SECURITY')
+    op.execute("""
+        CREATE POLICY inventory_movements_tenant_isolation ON inventory_movements
+        FOR ALL
+        USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+    """)
+
+
+def upgrade() -> None:
+    # Move the existing table aside; its indexes and constraints keep their names until dropped
+    op.execute('DROP POLICY IF EXISTS inventory_movements_tenant_isolation ON inventory_movements')
+    op.rename_table('inventory_movements', 'inventory_movements_unpartitioned')
+    # Migration 003 left the primary key with Postgres's default name, which the new table reuses
+    op.execute(
+        'ALTER TABLE inventory_movements_unpartitioned '
+        'RENAME CONSTRAINT inventory_movements_pkey TO inventory_movements_unpartitioned_pkey'
+    )
+    for name in (
+        'idx_inventory_movements_tenant_id',
+        'idx_inventory_movements_product_id',
+        'idx_inventory_movements_performed_at',
+        'idx_inventory_movements_performed_by',
+        'idx_inventory_movements_type',
+        'idx_inventory_movements_source_warehouse',
+        'idx_inventory_movements_destination_warehouse',
+    ):
+        op.drop_index(name, table_name='inventory_movements_unpartitioned')
+    for name in ('fk_movement_product', 'fk_movement_source_warehouse', 'fk_movement_destination_warehouse'):
+        op.drop_constraint(name, 'inventory_movements_unpartitioned', type_='foreignkey')
+    for name in ('ck_movement_type', 'ck_movement_warehouses', 'ck_movement_quantity_positive'):
+        op.drop_constraint(name, 'inventory_movements_unpartitioned', type_='check')
+    
+    # Partitioned table; the partition key has to be part of the primary key
+    op.create_table(
+        'inventory_movements',
+        *_movement_columns(),
+        sa.PrimaryKeyConstraint('id', 'performed_at', name='inventory_movements_pkey'),
+        postgresql_partition_by='RANGE (performed_at)'
+    )
+    _create_indexes('inventory_movements')
+    
+    # Monthly partitions from the oldest movement up to MONTHS_AHEAD months from now
+    bind = op.get_bind()
+    oldest = bind.execute(sa.text('SELECT MIN(performed_at) FROM inventory_movements_unpartitioned')).scalar()
+    month = (oldest.date() if oldest else date.today()).replace(day=1)
+    last = _add_months(date.today().replace(day=1), MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE inventory_movements_p{month.year:04d}{month.month:02d} "
+            f"PARTITION OF inventory_movements "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+    
+    # Copy rows into their partitions and drop the old table
+    op.execute('INSERT INTO inventory_movements SELECT * FROM inventory_movements_unpartitioned')
+    op.drop_table('inventory_movements_unpartitioned')
+    
+    _enable_rls()
+
+
+def downgrade() -> None:
+    op.execute('DROP POLICY IF EXISTS inventory_movements_tenant_isolation ON inventory_movements')
+    op.rename_table('inventory_movements', 'inventory_movements_partitioned')
+    op.execute(
+        'ALTER TABLE inventory_movements_partitioned '
+        'RENAME CONSTRAINT inventory_movements_pkey TO inventory_movements_partitioned_pkey'
+    )
+    for name in (
+        'idx_inventory_movements_tenant_performed_at',
+        'idx_inventory_movements_tenant_product_performed_at',
+        'idx_inventory_movements_product_id',
+        'idx_inventory_movements_performed_at',
+        'idx_inventory_movements_performed_by',
+        'idx_inventory_movements_type',
+        'idx_inventory_movements_source_warehouse',
+        'idx_inventory_movements_destination_warehouse',
+    ):
+        op.drop_index(name, table_name='inventory_movements_partitioned')
+    for name in ('fk_movement_product', 'fk_movement_source_warehouse', 'fk_movement_destination_warehouse'):
+        op.drop_constraint(name, 'inventory_movements_partitioned', type_='foreignkey')
+    for name in ('ck_movement_type', 'ck_movement_warehouses', 'ck_movement_quantity_positive'):
+        op.drop_constraint(name, 'inventory_movements_partitioned', type_='check')
+    
+    # Plain table as created by migration 003
+    op.create_table(
+        'inventory_movements',
+        *_movement_columns(),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_inventory_movements_tenant_id', 'inventory_movements', ['tenant_id'])
+    op.create_index('idx_inventory_movements_product_id', 'inventory_movements', ['product_id'])
+    op.create_index('idx_inventory_movements_performed_at', 'inventory_movements', ['performed_at'])
+    op.create_index('idx_inventory_movements_performed_by', 'inventory_movements', ['performed_by'])
+    op.create_index('idx_inventory_movements_type', 'inventory_movements', ['movement_type'])
+    op.create_index('idx_inventory_movements_source_warehouse', 'inventory_movements', ['source_warehouse_id'])
+    op.create_index('idx_inventory_movements_destination_warehouse', 'inventory_movements', ['destination_warehouse_id'])
+    
+    op.execute('INSERT INTO inventory_movements SELECT * FROM inventory_movements_partitioned')
+    op.execute('DROP TABLE inventory_movements_partitioned CASCADE')  # Drops the partitions too
+    
+    _enable_rls()
@@ -0,0 +1,71 @@
+"""Create inventory_snapshots table
+
+Revision ID: 010
+Revises: 009
+Create Date: 2025-02-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create inventory_snapshots table
+    op.create_table(
+        'inventory_snapshots',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('product_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('warehouse_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('quantity', sa.Numeric(15, 3), nullable=False),
+        sa.Column('snapshot_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], name='fk_inventory_snapshot_product'),
+        sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], name='fk_inventory_snapshot_warehouse'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tenant_id', 'product_id', 'warehouse_id', 'snapshot_at', name='uq_inventory_snapshot')
+    )
+    
+    # Create indexes
+    op.create_index('idx_inventory_snapshots_tenant_warehouse_taken', 'inventory_snapshots', ['tenant_id', 'warehouse_id', 'snapshot_at'])
+    op.create_index('idx_inventory_snapshots_snapshot_at', 'inventory_snapshots', ['snapshot_at'])
+    
+    # First snapshot, so as-of queries replay only movements from now on
+    op.execute("""
+        INSERT INTO inventory_snapshots (tenant_id, product_id, warehouse_id, quantity, snapshot_at)
+        SELECT tenant_id, product_id, warehouse_id, quantity, now()
+        FROM inventory
+    """)
+    
+    # Enable Row-Level Security
+    op.execute('ALTER TABLE inventory_snapshots ENABLE ROW LEVEL SECURITY')
+    
+    # Create RLS policy
+    op.execute("""
+        CREATE POLICY inventory_snapshots_tenant_isolation ON inventory_snapshots
+        FOR ALL
+        USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+    """)
+
+
+def downgrade() -> None:
+    # Drop RLS policy
+    op.execute('DROP POLICY IF EXISTS inventory_snapshots_tenant_isolation ON inventory_snapshots')
+    
+    # Disable RLS
+    op.execute('ALTER TABLE inventory_snapshots DISABLE ROW LEVEL SECURITY')
+    
+    # Drop indexes
+    op.drop_index('idx_inventory_snapshots_snapshot_at', table_name='inventory_snapshots')
+    op.drop_index('idx_inventory_snapshots_tenant_warehouse_taken', table_name='inventory_snapshots')
+    
+    # Drop table
+    op.drop_table('inventory_snapshots')
@@ -0,0 +1,103 @@
+"""Create daily_movement_rollup table
+
+Revision ID: 011
+Revises: 010
+Create Date: 2025-02-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create daily_movement_rollup table
+    op.create_table(
+        'daily_movement_rollup',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('product_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('warehouse_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('inbound_quantity', sa.Numeric(18, 3), nullable=False, server_default='0'),
+        sa.Column('outbound_quantity', sa.Numeric(18, 3), nullable=False, server_default='0'),
+        sa.Column('transfer_in_quantity', sa.Numeric(18, 3), nullable=False, server_default='0'),
+        sa.Column('transfer_out_quantity', sa.Numeric(18, 3), nullable=False, server_default='0'),
+        sa.Column('movement_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], name='fk_daily_movement_rollup_product'),
+        sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], name='fk_daily_movement_rollup_warehouse'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tenant_id', 'product_id', 'warehouse_id', 'day', name='uq_daily_movement_rollup')
+    )
+    
+    # Create indexes
+    op.create_index('idx_daily_movement_rollup_tenant_warehouse_day', 'daily_movement_rollup', ['tenant_id', 'warehouse_id', 'day'])
+    
+    # Backfill from the movement ledger (UTC days)
+    op.execute("""
+        INSERT INTO daily_movement_rollup
+            (tenant_id, product_id, warehouse_id, day,
+             inbound_quantity, outbound_quantity, transfer_in_quantity, transfer_out_quantity, movement_count)
+        SELECT
+            tenant_id,
+            product_id,
+            warehouse_id,
+            day,
+            SUM(inbound_quantity),
+            SUM(outbound_quantity),
+            SUM(transfer_in_quantity),
+            SUM(transfer_out_quantity),
+            COUNT(*)
+        FROM (
+            SELECT tenant_id, product_id, destination_warehouse_id AS warehouse_id,
+                   (performed_at AT TIME ZONE 'UTC')::date AS day,
+                   CASE WHEN movement_type = 'inbound' THEN quantity ELSE 0 END AS inbound_quantity,
+                   0 AS outbound_quantity,
+                   CASE WHEN movement_type = 'transfer' THEN quantity ELSE 0 END AS transfer_in_quantity,
+                   0 AS transfer_out_quantity
+            FROM inventory_movements
+            WHERE destination_warehouse_id IS NOT NULL
+            UNION ALL
+            SELECT tenant_id, product_id, source_warehouse_id,
+                   (performed_at AT TIME ZONE 'UTC')::date,
+                   0,
+                   CASE WHEN movement_type = 'outbound' THEN quantity ELSE 0 END,
+                   0,
+                   CASE WHEN movement_type = 'transfer' THEN quantity ELSE 0 END
+            FROM inventory_movements
+            WHERE source_warehouse_id IS NOT NULL
+        ) AS sides
+        GROUP BY tenant_id, product_id, warehouse_id, day
+    """)
+    
+    # Enable Row-Level Security
+    op.execute('ALTER TABLE daily_movement_rollup ENABLE ROW LEVEL SECURITY')
+    
+    # Create RLS policy
+    op.execute("""
+        CREATE POLICY daily_movement_rollup_tenant_isolation ON daily_movement_rollup
+        FOR ALL
+        USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+    """)
+
+
+def downgrade() -> None:
+    # Drop RLS policy
+    op.execute('DROP POLICY IF EXISTS daily_movement_rollup_tenant_isolation ON daily_movement_rollup')
+    
+    # Disable RLS
+    op.execute('ALTER TABLE daily_movement_rollup DISABLE ROW LEVEL SECURITY')
+    
+    # Drop indexes
+    op.drop_index('idx_daily_movement_rollup_tenant_warehouse_day', table_name='daily_movement_rollup')
+    
+    # Drop table
+    op.drop_table('daily_movement_rollup')
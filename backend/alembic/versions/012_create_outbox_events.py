@@ -0,0 +1,71 @@
+"""Create outbox_events table
+
+Revision ID: 012
+Revises: 011
+Create Date: 2025-02-24 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create outbox_events table
+    op.create_table(
+        'outbox_events',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('event_type', sa.String(100), nullable=False),
+        sa.Column('aggregate_type', sa.String(50), nullable=False),
+        sa.Column('aggregate_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('payload', postgresql.JSONB(), nullable=False),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    
+    # Create indexes
+    op.create_index('idx_outbox_events_tenant_id', 'outbox_events', ['tenant_id'])
+    op.create_index(
+        'idx_outbox_events_pending',
+        'outbox_events',
+        ['created_at'],
+        postgresql_where=sa.text('published_at IS NULL')
+    )
+    op.create_index('idx_outbox_events_published_at', 'outbox_events', ['published_at'])
+    
+    # Enable Row-Level Security
+    op.execute('ALTER TABLE outbox_events ENABLE ROW LEVEL SECURITY')
+    
+    # Create RLS policy
+    op.execute("""
+        CREATE POLICY outbox_events_tenant_isolation ON outbox_events
+        FOR ALL
+        USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+    """)
+
+
+def downgrade() -> None:
+    # Drop RLS policy
+    op.execute('DROP POLICY IF EXISTS outbox_events_tenant_isolation ON outbox_events')
+    
+    # Disable RLS
+    op.execute('ALTER TABLE outbox_events DISABLE ROW LEVEL SECURITY')
+    
+    # Drop indexes
+    op.drop_index('idx_outbox_events_published_at', table_name='outbox_events')
+    op.drop_index('idx_outbox_events_pending', table_name='outbox_events')
+    op.drop_index('idx_outbox_events_tenant_id', table_name='outbox_events')
+    
+    # Drop table
+    op.drop_table('outbox_events')
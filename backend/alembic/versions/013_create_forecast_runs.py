@@ -0,0 +1,74 @@
+"""Create forecast_runs table and index forecasts by series and generated_at
+
+Revision ID: 013
+Revises: 012
+Create Date: 2025-03-03 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create forecast_runs table
+    op.create_table(
+        'forecast_runs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('forecast_horizon_days', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='running'),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('series_total', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('series_processed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('series_failed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.CheckConstraint("status IN ('running', 'completed', 'failed')", name='ck_forecast_run_status')
+    )
+    
+    # Create indexes
+    op.create_index('idx_forecast_runs_tenant_id', 'forecast_runs', ['tenant_id'])
+    op.create_index('idx_forecast_runs_tenant_status', 'forecast_runs', ['tenant_id', 'forecast_horizon_days', 'status'])
+    
+    # Latest forecast per series, for the scheduler's due-series query
+    op.create_index(
+        'idx_forecasts_series_generated',
+        'forecasts',
+        ['tenant_id', 'forecast_horizon_days', 'product_id', 'warehouse_id', 'generated_at']
+    )
+    
+    # Enable Row-Level Security
+    op.execute('ALTER TABLE forecast_runs ENABLE ROW LEVEL SECURITY')
+    
+    # Create RLS policy
+    op.execute("""
+        CREATE POLICY forecast_runs_tenant_isolation ON forecast_runs
+        FOR ALL
+        USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+    """)
+
+
+def downgrade() -> None:
+    # Drop RLS policy
+    op.execute('DROP POLICY IF EXISTS forecast_runs_tenant_isolation ON forecast_runs')
+    
+    # Disable RLS
+    op.execute('ALTER TABLE forecast_runs DISABLE ROW LEVEL SECURITY')
+    
+    # Drop indexes
+    op.drop_index('idx_forecasts_series_generated', table_name='forecasts')
+    op.drop_index('idx_forecast_runs_tenant_status', table_name='forecast_runs')
+    op.drop_index('idx_forecast_runs_tenant_id', table_name='forecast_runs')
+    
+    # Drop table
+    op.drop_table('forecast_runs')
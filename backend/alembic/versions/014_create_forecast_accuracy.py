@@ -0,0 +1,92 @@
+"""Create forecast_accuracy table and track realized demand on forecasts
+
+Revision ID: 014
+Revises: 013
+Create Date: 2025-03-10 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Realized demand of matured forecasts; NULL until evaluated
+    op.add_column('forecasts', sa.Column('realized_demand', sa.Numeric(15, 3), nullable=True))
+    op.create_index(
+        'idx_forecasts_unevaluated',
+        'forecasts',
+        ['tenant_id', 'forecast_horizon_days', 'forecast_date'],
+        postgresql_where=sa.text('realized_demand IS NULL')
+    )
+    
+    # Create forecast_accuracy table
+    op.create_table(
+        'forecast_accuracy',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('product_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('warehouse_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('forecast_horizon_days', sa.Integer(), nullable=False),
+        sa.Column('model_type', sa.String(50), nullable=False),
+        sa.Column('model_version', sa.String(50), nullable=False),
+        sa.Column('forecasts_evaluated', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('predicted_total', sa.Numeric(18, 3), nullable=False, server_default='0'),
+        sa.Column('actual_total', sa.Numeric(18, 3), nullable=False, server_default='0'),
+        sa.Column('abs_error_total', sa.Numeric(18, 3), nullable=False, server_default='0'),
+        sa.Column('ape_total', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('ape_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('within_tolerance_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_forecast_date', sa.Date(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), onupdate=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], name='fk_forecast_accuracy_product'),
+        sa.ForeignKeyConstraint(['warehouse_id'], ['warehouses.id'], name='fk_forecast_accuracy_warehouse'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'tenant_id', 'product_id', 'warehouse_id', 'forecast_horizon_days', 'model_type', 'model_version',
+            name='uq_forecast_accuracy'
+        )
+    )
+    
+    # Create indexes
+    op.create_index('idx_forecast_accuracy_tenant_id', 'forecast_accuracy', ['tenant_id'])
+    op.create_index(
+        'idx_forecast_accuracy_tenant_model',
+        'forecast_accuracy',
+        ['tenant_id', 'forecast_horizon_days', 'model_type', 'model_version']
+    )
+    
+    # Enable Row-Level Security
+    op.execute('ALTER TABLE forecast_accuracy ENABLE ROW LEVEL SECURITY')
+    
+    # Create RLS policy
+    op.execute("""
+        CREATE POLICY forecast_accuracy_tenant_isolation ON forecast_accuracy
+        FOR ALL
+        USING (tenant_id = current_setting('app.current_tenant_id', true)::uuid)
+    """)
+
+
+def downgrade() -> None:
+    # Drop RLS policy
+    op.execute('DROP POLICY IF EXISTS forecast_accuracy_tenant_isolation ON forecast_accuracy')
+    
+    # Disable RLS
+    op.execute('ALTER TABLE forecast_accuracy DISABLE ROW LEVEL SECURITY')
+    
+    # Drop indexes
+    op.drop_index('idx_forecast_accuracy_tenant_model', table_name='forecast_accuracy')
+    op.drop_index('idx_forecast_accuracy_tenant_id', table_name='forecast_accuracy')
+    
+    # Drop table
+    op.drop_table('forecast_accuracy')
+    
+    op.drop_index('idx_forecasts_unevaluated', table_name='forecasts')
+    op.drop_column('forecasts', 'realized_demand')
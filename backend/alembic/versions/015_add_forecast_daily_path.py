@@ -0,0 +1,24 @@
+"""Store the packed daily forecast path on forecasts
+
+Revision ID: 015
+Revises: 014
+Create Date: 2025-03-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Daily demand and 80% band as packed float32 (see src/services/forecast_path.py)
+    op.add_column('forecasts', sa.Column('daily_path', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('forecasts', 'daily_path')
@@ -0,0 +1,25 @@
+"""Clear daily paths of forecasts made from stock-level history
+
+Revision ID: 016
+Revises: 015
+Create Date: 2025-03-24 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '016'
+down_revision = '015'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Forecasts so far were fitted to daily stock levels, so their paths are
+    # not demand; stock-out estimates wait for the next (demand) forecast
+    op.execute('UPDATE forecasts SET daily_path = NULL WHERE daily_path IS NOT NULL')
+
+
+def downgrade() -> None:
+    # The cleared paths are not restored
+    pass
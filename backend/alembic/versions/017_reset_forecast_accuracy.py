@@ -0,0 +1,25 @@
+"""Reset forecast accuracy sums built from stock-level forecasts
+
+Revision ID: 017
+Revises: 016
+Create Date: 2025-03-24 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '017'
+down_revision = '016'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The sums scored stock-level forecasts against outbound quantity; they
+    # restart with the demand forecasts that keep a daily path
+    op.execute('DELETE FROM forecast_accuracy')
+
+
+def downgrade() -> None:
+    # The deleted sums are not restored
+    pass
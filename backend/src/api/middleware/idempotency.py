@@ -0,0 +1,167 @@
+"""
+Idempotency-Key support for write endpoints.
+
+Clients on unreliable networks (handheld scanners) may send a POST again
+when they miss the response. If they send an Idempotency-Key header, the
+first successful response is stored and every retry with the same key gets
+that response back, marked with an Idempotent-Replayed header, without the
+endpoint running again. Keys are scoped to the authenticated tenant and
+user.
+"""
+import hashlib
+import re
+from typing import Iterable, List, Optional
+
+from jose import JWTError, jwt
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config.settings import settings
+from src.services.idempotency_store import IdempotencyStore, StoredResponse, idempotency_store
+
+IDEMPOTENCY_KEY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+def _principal(authorization: Optional[bytes]) -> Optional[str]:
+    """Tenant and user the key belongs to, or None without a valid bearer token."""
+    if not authorization or not authorization.lower().startswith(b"bearer "):
+        return None
+    try:
+        payload = jwt.decode(authorization[7:].decode("latin-1"), settings.secret_key, algorithms=[settings.algorithm])
+    except JWTError:
+        return None
+    if payload.get("tenant_id") is None or payload.get("sub") is None:
+        return None
+    return f"{payload['tenant_id']}:{payload['sub']}"
+
+
+class IdempotencyMiddleware:
+    """Replays stored responses for POSTs retried with the same Idempotency-Key."""
+    
+    def __init__(self, app: ASGIApp, paths: Iterable[str], store: Optional[IdempotencyStore] = None):
+        """
+        Initialize the middleware.
+        
+        Args:
+            app: Wrapped application
+            paths: Regular expressions of the paths that accept keys
+            store: Key store (defaults to the global idempotency_store)
+        """
+        self.app = app
+        self.paths = [re.compile(path) for path in paths]
+        self.store = store or idempotency_store
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        
+        key = authorization = None
+        for name, value in scope["headers"]:
+            if name == IDEMPOTENCY_KEY_HEADER:
+                key = value
+            elif name == b"authorization":
+                authorization = value
+        
+        # Requests without a key (or not to a keyed path) pass straight through
+        if key is None or not any(path.match(scope["path"]) for path in self.paths):
+            await self.app(scope, receive, send)
+            return
+        
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await JSONResponse(
+                status_code=400,
+                content={"detail": f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters"}
+            )(scope, receive, send)
+            return
+        
+        principal = _principal(authorization)
+        if principal is None:  # The endpoint rejects the request itself
+            await self.app(scope, receive, send)
+            return
+        
+        body = await self._read_body(receive)
+        fingerprint = hashlib.sha256(scope["path"].encode() + b"\n" + body).hexdigest()
+        scoped_key = f"{principal}:{key.decode('latin-1')}"
+        
+        existing = await self.store.reserve(scoped_key, fingerprint)
+        if existing is not None:
+            await self._respond_existing(existing, fingerprint, scope, receive, send)
+            return
+        
+        status_code = 0
+        headers: List[tuple] = []
+        chunks: List[bytes] = []
+        
+        async def send_and_capture(message: Message) -> None:
+            nonlocal status_code, headers
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = [(name.decode("latin-1"), value.decode("latin-1")) for name, value in message.get("headers", [])]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+        
+        body_sent = False
+        
+        async def replay_body() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+        
+        try:
+            await self.app(scope, replay_body, send_and_capture)
+        except BaseException:
+            await self.store.release(scoped_key)
+            raise
+        
+        # Only successes are kept; failures (conflicts, validation) may be retried
+        if 200 <= status_code < 300:
+            await self.store.complete(scoped_key, StoredResponse(
+                fingerprint=fingerprint,
+                status_code=status_code,
+                headers=headers,
+                body=b"".join(chunks).decode("latin-1")
+            ))
+        else:
+            await self.store.release(scoped_key)
+    
+    @staticmethod
+    async def _read_body(receive: Receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+    
+    @staticmethod
+    async def _respond_existing(existing, fingerprint: str, scope: Scope, receive: Receive, send: Send) -> None:
+        """Replay a stored response, or refuse a conflicting use of the key."""
+        if existing.fingerprint != fingerprint:
+            await JSONResponse(
+                status_code=422,
+                content={"detail": "Idempotency-Key was already used with a different request"}
+            )(scope, receive, send)
+            return
+        
+        if not isinstance(existing, StoredResponse):
+            await JSONResponse(
+                status_code=409,
+                content={"detail": "A request with this Idempotency-Key is still in progress"},
+                headers={"Retry-After": "1"}
+            )(scope, receive, send)
+            return
+        
+        await send({
+            "type": "http.response.start",
+            "status": existing.status_code,
+            "headers": [
+                (name.encode("latin-1"), value.encode("latin-1")) for name, value in existing.headers
+            ] + [(REPLAYED_HEADER.lower().encode(), b"true")]
+        })
+        await send({"type": "http.response.body", "body": existing.body.encode("latin-1")})
@@ -0,0 +1,61 @@
+"""
+Bulk export API endpoints.
+"""
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from src.database.session import get_db
+from src.api.middleware.tenant import get_tenant_id
+from src.services.export_service import ExportService, EXPORT_FORMATS
+
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+@router.get("/{dataset}")
+async def export_dataset(
+    dataset: str,
+    format: str = Query("ndjson", description=f"One of: {', '.join(EXPORT_FORMATS)}"),
+    since: Optional[datetime] = Query(None, description="Only rows at or after this time (movements, audit-logs)"),
+    until: Optional[datetime] = Query(None, description="Only rows before this time (movements, audit-logs)"),
+    tenant_id: UUID = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream a full snapshot of a dataset as NDJSON or CSV.
+    
+    Datasets: inventory, movements, audit-logs. Rows are written as they are
+    fetched from a server-side cursor, so memory use does not depend on how
+    many rows the tenant has.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid format: {format}. Must be one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    
+    try:
+        query = ExportService.build_query(dataset, tenant_id, since=since, until=until)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    columns = ExportService.get_dataset(dataset).columns
+    chunks = ExportService.stream_rows(db, query)
+    body = ExportService.iter_csv(columns, chunks) if format == "csv" else ExportService.iter_ndjson(columns, chunks)
+    
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{format}"'}
+    )
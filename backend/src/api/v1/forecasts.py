@@ -1,15 +1,20 @@
 """
 Forecasts API endpoints.
 """
+import json
+from dataclasses import asdict
+from datetime import date
 from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from src.database.session import get_db
 from src.api.middleware.tenant import get_tenant_id
 from src.services.forecast_service import ForecastService
+from src.services.forecast_accuracy_service import ForecastAccuracyService
 from src.models.forecast import Forecast
 
 router = APIRouter(prefix="/forecast", tags=["forecasts"])
@@ -40,7 +45,83 @@ class ForecastCreate(BaseModel):
     product_id: str
     warehouse_id: str
     forecast_horizon_days: int  # 7, 30, or 90
-    model_type: str = "exponential_smoothing"
+    model_type: str = "auto"
+
+
+class ForecastBatchCreate(BaseModel):
+    """Batch forecast request: every inventory row of the tenant, or of one warehouse."""
+    forecast_horizon_days: int  # 7, 30, or 90
+    warehouse_id: str | None = None
+    model_type: str = "auto"
+    batch_size: int | None = Field(None, ge=1, le=10000)  # Series per ai-service request
+    concurrency: int | None = Field(None, ge=1, le=32)  # ai-service requests in flight
+
+
+class ForecastAccuracyResponse(BaseModel):
+    """Running accuracy of one series' matured forecasts for one horizon and model."""
+    product_id: UUID
+    warehouse_id: UUID
+    forecast_horizon_days: int
+    model_type: str
+    model_version: str
+    forecasts_evaluated: int
+    predicted_total: float
+    actual_total: float
+    wape: float | None
+    bias: float | None
+    mape: float | None
+    within_tolerance_share: float | None  # SC-006: share of forecasts within forecast_accuracy_tolerance
+    last_forecast_date: date | None
+    
+    class Config:
+        from_attributes = True
+
+
+class ForecastAccuracySummaryResponse(BaseModel):
+    """Running accuracy of one model version over all series of a horizon."""
+    forecast_horizon_days: int
+    model_type: str
+    model_version: str
+    series: int
+    forecasts_evaluated: int
+    predicted_total: float
+    actual_total: float
+    wape: float | None
+    bias: float | None
+    mape: float | None
+    within_tolerance_share: float | None
+    
+    class Config:
+        from_attributes = True
+
+
+class ForecastDayResponse(BaseModel):
+    """Forecast demand of one day with its 80% band."""
+    date: date
+    demand: float
+    lower: float
+    upper: float
+
+
+class DailyForecastResponse(BaseModel):
+    """Daily path of the latest forecast of a series, over the requested days."""
+    forecast_id: UUID
+    forecast_horizon_days: int
+    forecast_date: date
+    model_version: str
+    model_type: str | None
+    days: List[ForecastDayResponse]
+
+
+class StockoutEstimateResponse(BaseModel):
+    """When available stock runs out; dates are None if stock lasts beyond the forecast path."""
+    forecast_id: UUID
+    forecast_date: date
+    on_hand: float
+    expected_stockout_date: date | None
+    earliest_stockout_date: date | None  # Under the upper band
+    latest_stockout_date: date | None  # Under the lower band
+    forecast_end_date: date
 
 
 @router.get("", response_model=List[ForecastResponse])
@@ -99,3 +180,154 @@ async def create_forecast(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Forecast generation failed: {str(e)}"
         )
+
+
+@router.post("/batch")
+async def create_forecasts_batch(
+    batch_data: ForecastBatchCreate,
+    tenant_id: UUID = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
+):
+    """
+    Forecast a whole tenant or warehouse in batches.
+    
+    Streams progress as newline-delimited JSON, one object per chunk of
+    series (total, processed, forecasted, failed, errors, done).
+    """
+    if batch_data.forecast_horizon_days not in [7, 30, 90]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="forecast_horizon_days must be 7, 30, or 90"
+        )
+    
+    progress = ForecastService.generate_forecasts_batch(
+        db=db,
+        tenant_id=tenant_id,
+        forecast_horizon_days=batch_data.forecast_horizon_days,
+        warehouse_id=UUID(batch_data.warehouse_id) if batch_data.warehouse_id else None,
+        model_type=batch_data.model_type,
+        batch_size=batch_data.batch_size,
+        concurrency=batch_data.concurrency
+    )
+    
+    async def body():
+        async for update in progress:
+            yield json.dumps({**asdict(update), "done": update.done}, separators=(',', ':')) + "\n"
+    
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@router.get("/accuracy", response_model=List[ForecastAccuracyResponse])
+async def list_forecast_accuracy(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    product_id: Optional[UUID] = Query(None),
+    warehouse_id: Optional[UUID] = Query(None),
+    forecast_horizon_days: Optional[int] = Query(None),
+    model_type: Optional[str] = Query(None),
+    tenant_id: UUID = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
+):
+    """Get per-series accuracy of matured forecasts against realized demand."""
+    return ForecastAccuracyService.get_accuracy(
+        db=db,
+        tenant_id=tenant_id,
+        product_id=product_id,
+        warehouse_id=warehouse_id,
+        forecast_horizon_days=forecast_horizon_days,
+        model_type=model_type,
+        skip=skip,
+        limit=limit
+    )
+
+
+@router.get("/accuracy/summary", response_model=List[ForecastAccuracySummaryResponse])
+async def get_forecast_accuracy_summary(
+    forecast_horizon_days: Optional[int] = Query(None),
+    warehouse_id: Optional[UUID] = Query(None),
+    tenant_id: UUID = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
+):
+    """Get accuracy per horizon, model type and model version, e.g. to monitor SC-006."""
+    return ForecastAccuracyService.get_summary(
+        db=db,
+        tenant_id=tenant_id,
+        forecast_horizon_days=forecast_horizon_days,
+        warehouse_id=warehouse_id
+    )
+
+
+@router.get("/daily", response_model=DailyForecastResponse)
+async def get_daily_forecast(
+    product_id: UUID = Query(...),
+    warehouse_id: UUID = Query(...),
+    forecast_horizon_days: Optional[int] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    tenant_id: UUID = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
+):
+    """Get per-day demand and band of a series' latest forecast, from start_date to end_date."""
+    daily = ForecastService.get_daily_forecast(
+        db=db,
+        tenant_id=tenant_id,
+        product_id=product_id,
+        warehouse_id=warehouse_id,
+        forecast_horizon_days=forecast_horizon_days,
+        start=start_date,
+        end=end_date
+    )
+    if daily is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No daily forecast found for this product and warehouse"
+        )
+    
+    forecast, path = daily
+    return DailyForecastResponse(
+        forecast_id=forecast.id,
+        forecast_horizon_days=forecast.forecast_horizon_days,
+        forecast_date=forecast.forecast_date,
+        model_version=forecast.model_version,
+        model_type=forecast.model_type,
+        days=path.days()
+    )
+
+
+@router.get("/stockout", response_model=StockoutEstimateResponse)
+async def get_stockout_estimate(
+    product_id: UUID = Query(...),
+    warehouse_id: UUID = Query(...),
+    forecast_horizon_days: Optional[int] = Query(None),
+    tenant_id: UUID = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
+):
+    """Estimate when available stock of a series runs out, from its latest daily forecast."""
+    estimate = ForecastService.estimate_stockout(
+        db=db,
+        tenant_id=tenant_id,
+        product_id=product_id,
+        warehouse_id=warehouse_id,
+        forecast_horizon_days=forecast_horizon_days
+    )
+    if estimate is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No inventory or daily forecast found for this product and warehouse"
+        )
+    
+    if estimate.stale:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Latest daily forecast ends on {estimate.path_end.isoformat()}; generate a new forecast first"
+        )
+    
+    return StockoutEstimateResponse(
+        forecast_id=estimate.forecast.id,
+        forecast_date=estimate.forecast.forecast_date,
+        on_hand=estimate.on_hand,
+        expected_stockout_date=estimate.expected,
+        earliest_stockout_date=estimate.earliest,
+        latest_stockout_date=estimate.latest,
+        forecast_end_date=estimate.path_end
+    )
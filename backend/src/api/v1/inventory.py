@@ -1,19 +1,28 @@
 """
 Inventory API endpoints.
 """
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from src.config.settings import settings
 from src.database.session import get_db
 from src.api.middleware.tenant import get_tenant_id, get_user_id
-from src.services.inventory_service import InventoryService
+from src.services.inventory_service import DEFAULT_MOVEMENT_HISTORY_DAYS, InventoryService, MAX_MOVEMENT_BATCH_SIZE
+from src.services.inventory_summary_service import InventorySummaryService
+from src.services.inventory_snapshot_service import InventorySnapshotService
+from src.services.movement_sequencer import MovementQueueFullError, SequenceTicket, movement_sequencer
 from src.models.inventory_movement import InventoryMovement
 
 router = APIRouter(prefix="/inventory", tags=["inventory"])
 
+# Response header carrying the cursor for the next page of GET /inventory
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 class InventoryResponse(BaseModel):
     """Inventory response model with product and warehouse details."""
@@ -35,23 +44,51 @@ class InventoryResponse(BaseModel):
 
 @router.get("", response_model=List[InventoryResponse])
 async def list_inventory(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
     warehouse_id: Optional[UUID] = Query(None),
     low_stock: bool = Query(False, description="Filter to show only low stock items"),
     tenant_id: UUID = Depends(get_tenant_id),
     db: Session = Depends(get_db)
 ):
-    """Get list of inventory items with product and warehouse details."""
-    inventory_items = InventoryService.get_inventory_with_details(
+    """
+    Get list of inventory items with product and warehouse details.
+    
+    Items are ordered by (warehouse, sku, id). Pass the X-Next-Cursor response
+    header back as `cursor` to fetch the next page; the header is omitted on
+    the last page. `skip` is still accepted for offset paging but gets slower
+    the deeper the page, so it is ignored when a cursor is given.
+    """
+    if cursor is not None or not skip:
+        try:
+            items, next_cursor = InventoryService.get_inventory_page(
+                db,
+                tenant_id,
+                limit=limit,
+                cursor=cursor,
+                warehouse_id=warehouse_id,
+                low_stock_only=low_stock
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return items
+    
+    return InventoryService.get_inventory_with_details(
         db,
         tenant_id,
         warehouse_id=warehouse_id,
-        low_stock_only=low_stock
+        low_stock_only=low_stock,
+        skip=skip,
+        limit=limit
     )
-    
-    # Apply pagination
-    return inventory_items[skip:skip + limit]
 
 
 @router.get("/low-stock", response_model=List[InventoryResponse])
@@ -70,6 +107,83 @@ async def get_low_stock_items(
     return inventory_items
 
 
+class WarehouseSummaryResponse(BaseModel):
+    """Per-warehouse inventory summary."""
+    warehouse_id: str
+    warehouse_name: str
+    sku_count: int
+    total_units: float
+    low_stock_count: int
+    last_movement_at: str | None
+
+
+@router.get("/summary", response_model=List[WarehouseSummaryResponse])
+async def get_warehouse_summaries(
+    tenant_id: UUID = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
+):
+    """
+    Get SKU count, total units, low-stock count and last movement per warehouse.
+    
+    Reads the maintained summary table, one row per warehouse, instead of
+    aggregating the inventory table.
+    """
+    return InventorySummaryService.get_for_tenant(db, tenant_id)
+
+
+class StockAsOfResponse(BaseModel):
+    """Stock of one product in one warehouse at a point in time."""
+    product_id: str
+    warehouse_id: str
+    as_of: str
+    quantity: float
+    snapshot_at: str | None  # Snapshot the movements were replayed from
+    movements_replayed: int
+
+
+def _stock_as_of_response(stock: dict) -> StockAsOfResponse:
+    """Build the API response for an as-of stock figure."""
+    return StockAsOfResponse(
+        product_id=str(stock['product_id']),
+        warehouse_id=str(stock['warehouse_id']),
+        as_of=stock['as_of'].isoformat(),
+        quantity=float(stock['quantity']),
+        snapshot_at=stock['snapshot_at'].isoformat() if stock['snapshot_at'] else None,
+        movements_replayed=stock['movements_replayed']
+    )
+
+
+@router.get("/as-of", response_model=List[StockAsOfResponse])
+async def get_stock_as_of(
+    warehouse_id: UUID = Query(..., description="Warehouse to report on"),
+    as_of: datetime = Query(..., description="Point in time"),
+    product_id: Optional[UUID] = Query(None, description="Only this product; omit for the whole warehouse"),
+    tenant_id: UUID = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
+):
+    """
+    Get stock levels as they were at a point in time.
+    
+    Starts from the nearest earlier inventory snapshot and replays only the
+    movements performed after it. Times before the oldest retained snapshot
+    or movement partition get 400.
+    """
+    try:
+        if product_id:
+            stock = InventorySnapshotService.get_stock_as_of(db, tenant_id, product_id, warehouse_id, as_of)
+            return [_stock_as_of_response(stock)]
+        
+        return [
+            _stock_as_of_response(stock)
+            for stock in InventorySnapshotService.get_warehouse_stock_as_of(db, tenant_id, warehouse_id, as_of)
+        ]
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        ) from e
+
+
 class MovementCreate(BaseModel):
     """Movement creation model."""
     movement_type: str  # 'inbound', 'outbound', 'transfer'
@@ -99,11 +213,36 @@ class MovementResponse(BaseModel):
     performed_at: str
     approved_by: str | None
     approved_at: str | None
+    queue_wait_ms: float | None = None  # Time spent queued behind other movements on the same SKU
+    delayed: bool = False  # True if applied after another movement on the same SKU
     
     class Config:
         from_attributes = True
 
 
+def _movement_response(movement: InventoryMovement, ticket: Optional[SequenceTicket] = None) -> MovementResponse:
+    """Build the API response for a movement, with its queueing details."""
+    return MovementResponse(
+        id=str(movement.id),
+        tenant_id=str(movement.tenant_id),
+        movement_type=movement.movement_type,
+        product_id=str(movement.product_id),
+        source_warehouse_id=str(movement.source_warehouse_id) if movement.source_warehouse_id else None,
+        destination_warehouse_id=str(movement.destination_warehouse_id) if movement.destination_warehouse_id else None,
+        quantity=float(movement.quantity),
+        quantity_before=float(movement.quantity_before) if movement.quantity_before is not None else None,
+        quantity_after=float(movement.quantity_after) if movement.quantity_after is not None else None,
+        reference_number=movement.reference_number,
+        notes=movement.notes,
+        performed_by=str(movement.performed_by),
+        performed_at=movement.performed_at.isoformat(),
+        approved_by=str(movement.approved_by) if movement.approved_by else None,
+        approved_at=movement.approved_at.isoformat() if movement.approved_at else None,
+        queue_wait_ms=round(ticket.wait_ms, 3) if ticket else None,
+        delayed=ticket.delayed if ticket else False
+    )
+
+
 @router.post("/movement", response_model=MovementResponse, status_code=status.HTTP_201_CREATED)
 async def create_movement(
     movement_data: MovementCreate,
@@ -118,78 +257,85 @@ async def create_movement(
     - inbound: Receiving stock (requires destination_warehouse_id)
     - outbound: Shipping stock (requires source_warehouse_id)
     - transfer: Moving stock between warehouses (requires both)
+    
+    Movements on the same product and warehouse are queued and applied in
+    arrival order; the response reports queue_wait_ms and whether the
+    movement was delayed behind another one. An expected_version is checked
+    when the movement's turn comes and gets 409 if the stock changed since;
+    omit it to have the movement applied whatever ran before it.
     """
     from decimal import Decimal
     
     product_id = UUID(movement_data.product_id)
     quantity = Decimal(str(movement_data.quantity))
+    kwargs = dict(
+        db=db,
+        product_id=product_id,
+        quantity=quantity,
+        tenant_id=tenant_id,
+        performed_by=user_id,
+        reference_number=movement_data.reference_number,
+        notes=movement_data.notes
+    )
     
-    try:
-        if movement_data.movement_type == "inbound":
-            if not movement_data.destination_warehouse_id:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="destination_warehouse_id is required for inbound movements"
-                )
-            
-            movement = InventoryService.create_inbound_movement(
-                db=db,
-                product_id=product_id,
-                destination_warehouse_id=UUID(movement_data.destination_warehouse_id),
-                quantity=quantity,
-                tenant_id=tenant_id,
-                performed_by=user_id,
-                reference_number=movement_data.reference_number,
-                notes=movement_data.notes
-            )
-            
-        elif movement_data.movement_type == "outbound":
-            if not movement_data.source_warehouse_id:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="source_warehouse_id is required for outbound movements"
-                )
-            
-            movement = InventoryService.create_outbound_movement(
-                db=db,
-                product_id=product_id,
-                source_warehouse_id=UUID(movement_data.source_warehouse_id),
-                quantity=quantity,
-                tenant_id=tenant_id,
-                performed_by=user_id,
-                reference_number=movement_data.reference_number,
-                notes=movement_data.notes,
-                expected_version=movement_data.expected_version
+    if movement_data.movement_type == "inbound":
+        if not movement_data.destination_warehouse_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="destination_warehouse_id is required for inbound movements"
             )
-            
-        elif movement_data.movement_type == "transfer":
-            if not movement_data.source_warehouse_id or not movement_data.destination_warehouse_id:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Both source_warehouse_id and destination_warehouse_id are required for transfer movements"
-                )
-            
-            movement = InventoryService.create_transfer_movement(
-                db=db,
-                product_id=product_id,
-                source_warehouse_id=UUID(movement_data.source_warehouse_id),
-                destination_warehouse_id=UUID(movement_data.destination_warehouse_id),
-                quantity=quantity,
-                tenant_id=tenant_id,
-                performed_by=user_id,
-                reference_number=movement_data.reference_number,
-                notes=movement_data.notes,
-                expected_version=movement_data.expected_version
+        
+        create = InventoryService.create_inbound_movement
+        kwargs["destination_warehouse_id"] = UUID(movement_data.destination_warehouse_id)
+        warehouse_ids = [kwargs["destination_warehouse_id"]]
+    
+    elif movement_data.movement_type == "outbound":
+        if not movement_data.source_warehouse_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="source_warehouse_id is required for outbound movements"
             )
-            
-        else:
+        
+        create = InventoryService.create_outbound_movement
+        kwargs["source_warehouse_id"] = UUID(movement_data.source_warehouse_id)
+        kwargs["expected_version"] = movement_data.expected_version
+        warehouse_ids = [kwargs["source_warehouse_id"]]
+    
+    elif movement_data.movement_type == "transfer":
+        if not movement_data.source_warehouse_id or not movement_data.destination_warehouse_id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid movement_type: {movement_data.movement_type}. Must be 'inbound', 'outbound', or 'transfer'"
+                detail="Both source_warehouse_id and destination_warehouse_id are required for transfer movements"
             )
         
-        return movement
+        create = InventoryService.create_transfer_movement
+        kwargs["source_warehouse_id"] = UUID(movement_data.source_warehouse_id)
+        kwargs["destination_warehouse_id"] = UUID(movement_data.destination_warehouse_id)
+        kwargs["expected_version"] = movement_data.expected_version
+        warehouse_ids = [kwargs["source_warehouse_id"], kwargs["destination_warehouse_id"]]
+    
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid movement_type: {movement_data.movement_type}. Must be 'inbound', 'outbound', or 'transfer'"
+        )
+    
+    try:
+        if not settings.movement_sequencing_enabled:
+            return _movement_response(create(**kwargs))
+        
+        async with movement_sequencer.sequence(
+            (tenant_id, product_id, warehouse_id) for warehouse_id in warehouse_ids
+        ) as ticket:
+            movement = await run_in_threadpool(create, **kwargs)
         
+        return _movement_response(movement, ticket)
+    
+    except MovementQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e)
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -202,6 +348,69 @@ async def create_movement(
         )
 
 
+class MovementBatchCreate(BaseModel):
+    """Batch movement creation model."""
+    movements: List[MovementCreate] = Field(..., min_length=1, max_length=MAX_MOVEMENT_BATCH_SIZE)
+    atomic: bool = False  # Reject the whole batch if any row fails validation
+
+
+class MovementBatchResult(BaseModel):
+    """Per-row result of a batch movement request."""
+    index: int
+    status: str  # 'applied', 'rejected' or 'skipped'
+    movement_id: str | None = None
+    quantity_before: float | None = None
+    quantity_after: float | None = None
+    error: str | None = None
+
+
+class MovementBatchResponse(BaseModel):
+    """Batch movement response model."""
+    applied: int
+    rejected: int
+    results: List[MovementBatchResult]
+
+
+@router.post("/movements:batch", response_model=MovementBatchResponse)
+async def create_movements_batch(
+    batch_data: MovementBatchCreate,
+    tenant_id: UUID = Depends(get_tenant_id),
+    user_id: UUID = Depends(get_user_id),
+    db: Session = Depends(get_db)
+):
+    """
+    Create many inventory movements in one transaction.
+    
+    Rows are validated together and applied in order. Each row gets its own
+    result; rejected rows do not prevent the others from being applied unless
+    `atomic` is set.
+    """
+    try:
+        results = InventoryService.create_movements_batch(
+            db=db,
+            movements=[movement.model_dump() for movement in batch_data.movements],
+            tenant_id=tenant_id,
+            performed_by=user_id,
+            atomic=batch_data.atomic
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return MovementBatchResponse(
+        applied=sum(1 for result in results if result['status'] == 'applied'),
+        rejected=sum(1 for result in results if result['status'] == 'rejected'),
+        results=[
+            MovementBatchResult(
+                **{**result, 'movement_id': str(result['movement_id']) if result['movement_id'] else None}
+            )
+            for result in results
+        ]
+    )
+
+
 @router.get("/movements", response_model=List[MovementResponse])
 async def get_movement_history(
     skip: int = Query(0, ge=0),
@@ -209,10 +418,17 @@ async def get_movement_history(
     product_id: Optional[UUID] = Query(None),
     warehouse_id: Optional[UUID] = Query(None),
     movement_type: Optional[str] = Query(None, description="Filter by type: inbound, outbound, transfer"),
+    since: Optional[datetime] = Query(None, description=f"Only movements performed at or after this time (default: {DEFAULT_MOVEMENT_HISTORY_DAYS} days before until)"),
+    until: Optional[datetime] = Query(None, description="Only movements performed before this time"),
     tenant_id: UUID = Depends(get_tenant_id),
     db: Session = Depends(get_db)
 ):
-    """Get movement history with optional filters."""
+    """
+    Get movement history with optional filters.
+    
+    Pass since/until to limit the scan to the matching monthly partitions;
+    without since only the last 90 days (up to until) are returned.
+    """
     # Validate movement_type if provided
     if movement_type and movement_type not in ["inbound", "outbound", "transfer"]:
         raise HTTPException(
@@ -227,7 +443,9 @@ async def get_movement_history(
         warehouse_id=warehouse_id,
         movement_type=movement_type,
         skip=skip,
-        limit=limit
+        limit=limit,
+        since=since,
+        until=until
     )
     
-    return movements
+    return [_movement_response(movement) for movement in movements]
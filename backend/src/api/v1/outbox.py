@@ -0,0 +1,47 @@
+"""
+Outbox monitoring API endpoints.
+"""
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from src.database.session import get_db
+from src.api.middleware.tenant import get_tenant_id
+from src.services.outbox_service import OutboxService
+from src.services.outbox_dispatcher import outbox_dispatcher
+
+router = APIRouter(prefix="/outbox", tags=["outbox"])
+
+
+class OutboxLagResponse(BaseModel):
+    """Outbox delivery lag for the current tenant."""
+    pending: int
+    failed: int
+    oldest_pending_at: Optional[datetime]
+    lag_seconds: float
+    dispatcher_running: bool  # In the worker that served this request
+    dispatcher_last_batch_at: Optional[datetime]
+    dispatcher_last_error: Optional[str]
+
+
+@router.get("/lag", response_model=OutboxLagResponse)
+async def get_outbox_lag(
+    tenant_id: UUID = Depends(get_tenant_id),
+    db: Session = Depends(get_db)
+):
+    """
+    Report how far change event delivery is behind.
+    
+    Counts pending events and events that ran out of delivery attempts,
+    and how long the oldest pending event has been waiting.
+    """
+    lag = OutboxService.get_lag(db, tenant_id)
+    return OutboxLagResponse(
+        **lag,
+        dispatcher_running=outbox_dispatcher.running,
+        dispatcher_last_batch_at=outbox_dispatcher.last_batch_at,
+        dispatcher_last_error=outbox_dispatcher.last_error
+    )
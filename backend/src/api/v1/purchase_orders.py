@@ -75,6 +75,51 @@ class PurchaseOrderResponse(BaseModel):
         from_attributes = True
 
 
+def _iso(value) -> str | None:
+    """ISO 8601 text for an optional date or datetime."""
+    return value.isoformat() if value is not None else None
+
+
+def _purchase_order_response(po) -> PurchaseOrderResponse:
+    """Build the API response for a purchase order and its items."""
+    return PurchaseOrderResponse(
+        id=str(po.id),
+        tenant_id=str(po.tenant_id),
+        order_number=po.order_number,
+        supplier_id=str(po.supplier_id),
+        status=po.status,
+        total_amount=float(po.total_amount) if po.total_amount is not None else None,
+        currency=po.currency,
+        expected_delivery_date=_iso(po.expected_delivery_date),
+        actual_delivery_date=_iso(po.actual_delivery_date),
+        created_by=str(po.created_by),
+        created_at=po.created_at.isoformat(),
+        approved_by=str(po.approved_by) if po.approved_by else None,
+        approved_at=_iso(po.approved_at),
+        sent_at=_iso(po.sent_at),
+        received_at=_iso(po.received_at),
+        cancelled_at=_iso(po.cancelled_at),
+        cancelled_by=str(po.cancelled_by) if po.cancelled_by else None,
+        cancellation_reason=po.cancellation_reason,
+        ai_recommendation_id=str(po.ai_recommendation_id) if po.ai_recommendation_id else None,
+        notes=po.notes,
+        items=[
+            PurchaseOrderItemResponse(
+                id=str(item.id),
+                purchase_order_id=str(item.purchase_order_id),
+                product_id=str(item.product_id),
+                warehouse_id=str(item.warehouse_id) if item.warehouse_id else None,
+                quantity=float(item.quantity),
+                unit_cost=float(item.unit_cost),
+                total_cost=float(item.total_cost),
+                received_quantity=float(item.received_quantity or 0),
+                line_number=item.line_number
+            )
+            for item in po.items
+        ]
+    )
+
+
 class PurchaseOrderUpdate(BaseModel):
     """Purchase order update model."""
     expected_delivery_date: str | None = None
@@ -105,7 +150,7 @@ async def list_purchase_orders(
         skip=skip,
         limit=limit
     )
-    return purchase_orders
+    return [_purchase_order_response(po) for po in purchase_orders]
 
 
 @router.get("/{po_id}", response_model=PurchaseOrderResponse)
@@ -121,7 +166,7 @@ async def get_purchase_order(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Purchase order not found"
         )
-    return po
+    return _purchase_order_response(po)
 
 
 @router.post("", response_model=PurchaseOrderResponse, status_code=status.HTTP_201_CREATED)
@@ -149,7 +194,7 @@ async def create_purchase_order(
         notes=po_data.notes
     )
     
-    return po
+    return _purchase_order_response(po)
 
 
 @router.post("/from-recommendation/{recommendation_id}", response_model=PurchaseOrderResponse, status_code=status.HTTP_201_CREATED)
@@ -171,7 +216,7 @@ async def create_po_from_recommendation(
             user_id=user_id,
             order_number=order_number
         )
-        return po
+        return _purchase_order_response(po)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -200,7 +245,7 @@ async def update_purchase_order(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Purchase order not found"
             )
-        return po
+        return _purchase_order_response(po)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -227,7 +272,7 @@ async def approve_purchase_order(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Purchase order not found"
             )
-        return po
+        return _purchase_order_response(po)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -257,7 +302,7 @@ async def receive_purchase_order(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Purchase order not found"
             )
-        return po
+        return _purchase_order_response(po)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1,7 +1,8 @@
 """
 WebSocket connection handler for real-time inventory updates.
 """
-from typing import Dict, Set
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set
 from fastapi import WebSocket, WebSocketDisconnect, Depends
 from sqlalchemy.orm import Session
 import json
@@ -10,6 +11,8 @@ import asyncio
 from src.database.session import get_db
 from src.api.middleware.auth import get_current_user
 from src.api.middleware.tenant import get_tenant_id
+from src.services.outbox_service import OutboxMessage, OutboxService
+from src.services.websocket_fanout import websocket_fanout
 
 
 class ConnectionManager:
@@ -18,9 +21,12 @@ class ConnectionManager:
     def __init__(self):
         # Map tenant_id -> Set of WebSocket connections
         self.active_connections: Dict[str, Set[WebSocket]] = {}
+        # Event loop serving the connections, for broadcasts from worker threads
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
     
     async def connect(self, websocket: WebSocket, tenant_id: str):
         """Accept a WebSocket connection and add to tenant's connection set."""
+        self.loop = asyncio.get_running_loop()
         await websocket.accept()
         if tenant_id not in self.active_connections:
             self.active_connections[tenant_id] = set()
@@ -149,6 +155,50 @@ async def broadcast_inventory_update(tenant_id: str, inventory_data: dict):
     message = {
         "type": "inventory_update",
         "data": inventory_data,
-        "timestamp": asyncio.get_event_loop().time()
+        "timestamp": datetime.now(timezone.utc).isoformat()
     }
     await manager.broadcast_to_tenant(tenant_id, message)
+
+
+# WebSocket message type for outbox event types the frontend already understands
+OUTBOX_MESSAGE_TYPES = {
+    "inventory.updated": "inventory_update",
+    "inventory.low_stock_entered": "low_stock_entered",
+    "inventory.low_stock_left": "low_stock_left",
+}
+
+
+def push_outbox_event(outbox_message: OutboxMessage):
+    """
+    Publish a dispatched outbox event to the WebSocket clients of every worker.
+    
+    Called from the dispatcher thread. The event counts as delivered once
+    the fan-out accepted it; each worker then relays it to its own sockets.
+    """
+    websocket_fanout.publish({
+        "tenant_id": str(outbox_message.tenant_id),
+        "message": {
+            "type": OUTBOX_MESSAGE_TYPES.get(outbox_message.event_type, outbox_message.event_type),
+            "event_id": str(outbox_message.id),
+            "data": outbox_message.payload,
+            "timestamp": outbox_message.created_at.isoformat()
+        }
+    })
+
+
+def relay_to_connections(event: dict):
+    """
+    Send a fanned-out event to this worker's sockets of the tenant.
+    
+    The broadcast is scheduled on the connections' event loop without
+    waiting, so this can be called from any thread.
+    """
+    tenant_id = event["tenant_id"]
+    loop = manager.loop
+    if loop is None or loop.is_closed() or tenant_id not in manager.active_connections:
+        return
+    asyncio.run_coroutine_threadsafe(manager.broadcast_to_tenant(tenant_id, event["message"]), loop)
+
+
+OutboxService.register_consumer("websocket", push_outbox_event)
+websocket_fanout.subscribe(relay_to_connections)
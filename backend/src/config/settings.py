@@ -21,6 +21,7 @@ class Settings(BaseSettings):
     
     # API
     api_v1_prefix: str = "/v1"
+    web_concurrency: int = 1  # API worker processes; gunicorn reads the same WEB_CONCURRENCY variable
     
     # CORS
     cors_origins: list[str] = ["http://localhost:3000", "http://localhost:3001"]
@@ -30,10 +31,43 @@ class Settings(BaseSettings):
     
     # AI Service
     ai_service_url: Optional[str] = "http://localhost:8001"
+    ai_service_wire_format: str = "json"  # 'json', or 'binary' to send quantities as packed float32
     
     # Voice Service
     voice_service_url: Optional[str] = "http://localhost:8002"
     
+    # Inventory movements
+    movement_sequencing_enabled: bool = True  # Queue same-SKU movements instead of returning 409
+    movement_queue_max_depth: int = 1000  # Per SKU, per worker process
+    
+    # Inventory snapshots
+    inventory_snapshot_commit_lag_seconds: int = 300  # Longer than any transaction recording movements may run
+    
+    # Outbox
+    outbox_dispatcher_enabled: bool = True  # Run the dispatcher in each API worker
+    outbox_batch_size: int = 100
+    outbox_poll_interval_seconds: float = 0.5
+    outbox_max_attempts: int = 10  # After this many failed deliveries an event is left for inspection
+    outbox_retention_hours: int = 72  # Published events are purged after this
+    websocket_fanout_backend: str = "memory"  # 'memory' (dispatching worker's sockets) or 'redis' (every worker, uses redis_url)
+    
+    # Idempotency keys
+    idempotency_backend: str = "memory"  # 'memory' (per worker) or 'redis' (shared, uses redis_url)
+    idempotency_ttl_seconds: int = 86400
+    idempotency_in_flight_ttl_seconds: int = 60  # Lease of a running request's key; keep above the slowest write endpoint
+    idempotency_max_entries: int = 10000  # Memory backend only, per worker process
+    
+    # Batch forecasting
+    forecast_batch_size: int = 500  # Series per ai-service request
+    forecast_batch_concurrency: int = 4  # ai-service requests in flight per batch run
+    
+    # Forecast scheduler
+    forecast_scheduler_horizons: list[int] = [30]  # Horizons refreshed by each scheduler run
+    forecast_scheduler_concurrency: int = 4  # ai-service requests in flight, shared fairly by all tenants
+    
+    # Forecast accuracy tracking
+    forecast_accuracy_tolerance: float = 0.2  # Relative error of a horizon total that counts as accurate (SC-006)
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
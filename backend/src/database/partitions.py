@@ -0,0 +1,112 @@
+"""
+Monthly range partition management for time-partitioned tables (PostgreSQL).
+
+Partitions are named <table>_pYYYYMM and cover [first of month, first of
+next month) of the partition key.
+"""
+import re
+from datetime import date
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+PARTITION_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+def month_start(day: date) -> date:
+    """First day of the month containing day."""
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after month (may be negative)."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """Name of the partition of table holding the given month."""
+    return f"{table}_p{month.year:04d}{month.month:02d}"
+
+
+def list_partitions(conn: Connection, table: str) -> List[str]:
+    """Names of the partitions currently attached to table, oldest first."""
+    rows = conn.execute(
+        text("""
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :table
+        """),
+        {"table": table}
+    ).scalars().all()
+    return sorted(name for name in rows if PARTITION_SUFFIX.search(name))
+
+
+def create_monthly_partition(conn: Connection, table: str, month: date) -> bool:
+    """
+    Create the partition for one month if it does not exist yet.
+    
+    Returns:
+        True if the partition was created
+    """
+    month = month_start(month)
+    name = partition_name(table, month)
+    if name in list_partitions(conn, table):
+        return False
+    
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    ))
+    return True
+
+
+def ensure_partitions(conn: Connection, table: str, start: date, months_ahead: int) -> List[str]:
+    """
+    Create every missing monthly partition from start up to months_ahead months from today.
+    
+    Returns:
+        Names of the partitions created
+    """
+    created = []
+    month = month_start(start)
+    last = add_months(month_start(date.today()), months_ahead)
+    while month <= last:
+        if create_monthly_partition(conn, table, month):
+            created.append(partition_name(table, month))
+        month = add_months(month, 1)
+    return created
+
+
+def detach_partitions_before(
+    conn: Connection,
+    table: str,
+    cutoff: date,
+    drop: bool = False
+) -> List[str]:
+    """
+    Detach partitions whose whole month is before cutoff.
+    
+    Detached partitions stay as ordinary tables (for archiving) unless drop
+    is set.
+    
+    Returns:
+        Names of the partitions detached
+    """
+    detached = []
+    for name in list_partitions(conn, table):
+        match = PARTITION_SUFFIX.search(name)
+        month = date(int(match.group(1)), int(match.group(2)), 1)
+        if add_months(month, 1) > month_start(cutoff):
+            continue
+        
+        conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        if drop:
+            conn.execute(text(f"DROP TABLE {name}"))
+        detached.append(name)
+    return detached
+
@@ -0,0 +1 @@
+# Maintenance jobs, run as: python -m src.jobs.<job>
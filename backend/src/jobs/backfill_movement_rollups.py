@@ -0,0 +1,34 @@
+"""
+Backfill daily movement rollups from the inventory_movements ledger.
+
+Usage:
+    python -m src.jobs.backfill_movement_rollups [--tenant-id UUID] [--since YYYY-MM-DD]
+"""
+import argparse
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+
+from src.database.session import SessionLocal
+from src.services.movement_rollup_service import MovementRollupService
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the backfill; returns a process exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tenant-id", type=UUID, default=None, help="Only backfill this tenant")
+    parser.add_argument("--since", type=date.fromisoformat, default=None, help="Only rebuild days from this one on")
+    args = parser.parse_args(argv)
+    
+    db = SessionLocal()
+    try:
+        written = MovementRollupService.rebuild(db, tenant_id=args.tenant_id, since=args.since)
+    finally:
+        db.close()
+    
+    print(f"Wrote {written} daily movement rollups")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
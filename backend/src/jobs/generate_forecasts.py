@@ -0,0 +1,54 @@
+"""
+Generate forecasts for every inventory row of a tenant.
+
+Usage:
+    python -m src.jobs.generate_forecasts --tenant-id UUID [--warehouse-id UUID] [--horizon 7|30|90]
+        [--model-type NAME] [--batch-size N] [--concurrency N]
+"""
+import argparse
+import asyncio
+from typing import List, Optional
+from uuid import UUID
+
+from src.database.session import SessionLocal
+from src.services.forecast_service import ForecastService
+
+
+async def _run(args: argparse.Namespace) -> int:
+    db = SessionLocal()
+    try:
+        progress = None
+        async for progress in ForecastService.generate_forecasts_batch(
+            db,
+            tenant_id=args.tenant_id,
+            forecast_horizon_days=args.horizon,
+            warehouse_id=args.warehouse_id,
+            model_type=args.model_type,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency
+        ):
+            print(f"{progress.processed}/{progress.total} series, {progress.forecasted} forecasted, {progress.failed} failed")
+    finally:
+        db.close()
+    
+    for error in progress.errors:
+        print(f"Failed batch: {error}")
+    return 1 if progress.failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the batch forecast; returns a process exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tenant-id", type=UUID, required=True, help="Tenant to forecast")
+    parser.add_argument("--warehouse-id", type=UUID, default=None, help="Only forecast this warehouse")
+    parser.add_argument("--horizon", type=int, choices=[7, 30, 90], default=30, help="Forecast horizon in days")
+    parser.add_argument("--model-type", default="auto", help="Model type to use ('auto' picks the backtested best per series)")
+    parser.add_argument("--batch-size", type=int, default=None, help="Series per ai-service request")
+    parser.add_argument("--concurrency", type=int, default=None, help="ai-service requests in flight")
+    args = parser.parse_args(argv)
+    
+    return asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,48 @@
+"""
+Create upcoming monthly partitions of inventory_movements and retire old ones.
+
+Run daily (or at least monthly) so inserts never hit a month without a
+partition; there is no default partition, so such an insert fails.
+
+Usage:
+    python -m src.jobs.manage_movement_partitions [--months-ahead N] [--retain-months N [--drop]]
+"""
+import argparse
+from datetime import date
+from typing import List, Optional
+
+from src.database.partitions import add_months, detach_partitions_before, ensure_partitions, month_start
+from src.database.session import engine
+
+
+TABLE = "inventory_movements"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the partition maintenance; returns a process exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--months-ahead", type=int, default=3, help="Months of partitions to keep ready after the current one")
+    parser.add_argument("--retain-months", type=int, default=None, help="Detach partitions older than this many months")
+    parser.add_argument("--drop", action="store_true", help="Drop detached partitions instead of keeping them as tables")
+    args = parser.parse_args(argv)
+    
+    if args.drop and args.retain_months is None:
+        parser.error("--drop requires --retain-months")
+    
+    this_month = month_start(date.today())
+    with engine.begin() as conn:
+        created = ensure_partitions(conn, TABLE, this_month, args.months_ahead)
+        detached = []
+        if args.retain_months is not None:
+            cutoff = add_months(this_month, -args.retain_months)
+            detached = detach_partitions_before(conn, TABLE, cutoff, drop=args.drop)
+    
+    print(f"Created {len(created)} partitions: {', '.join(created) or '-'}")
+    if args.retain_months is not None:
+        action = "Dropped" if args.drop else "Detached"
+        print(f"{action} {len(detached)} partitions: {', '.join(detached) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
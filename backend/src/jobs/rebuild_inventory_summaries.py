@@ -0,0 +1,32 @@
+"""
+Rebuild per-warehouse inventory summaries from the inventory table.
+
+Usage:
+    python -m src.jobs.rebuild_inventory_summaries [--tenant-id UUID]
+"""
+import argparse
+from typing import List, Optional
+from uuid import UUID
+
+from src.database.session import SessionLocal
+from src.services.inventory_summary_service import InventorySummaryService
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the rebuild; returns a process exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tenant-id", type=UUID, default=None, help="Only rebuild this tenant")
+    args = parser.parse_args(argv)
+    
+    db = SessionLocal()
+    try:
+        written = InventorySummaryService.rebuild(db, tenant_id=args.tenant_id)
+    finally:
+        db.close()
+    
+    print(f"Rebuilt {written} warehouse inventory summaries")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
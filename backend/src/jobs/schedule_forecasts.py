@@ -0,0 +1,39 @@
+"""
+Refresh forecasts of series that moved or went stale since their last forecast.
+
+Meant to run nightly from cron. A run interrupted by a crash is resumed by
+the next one. Run a single instance at a time.
+
+Usage:
+    python -m src.jobs.schedule_forecasts [--tenant-id UUID ...] [--horizon 7|30|90 ...] [--concurrency N]
+"""
+import argparse
+import asyncio
+from typing import List, Optional
+from uuid import UUID
+
+from src.models.forecast_run import ForecastRunStatus
+from src.services.forecast_scheduler import ForecastScheduler
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the scheduler once; returns a process exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tenant-id", type=UUID, action="append", default=None, help="Only refresh this tenant (repeatable)")
+    parser.add_argument("--horizon", type=int, choices=[7, 30, 90], action="append", default=None, help="Horizon to refresh (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=None, help="ai-service requests in flight across all tenants")
+    args = parser.parse_args(argv)
+    
+    runs = asyncio.run(ForecastScheduler.run(tenant_ids=args.tenant_id, horizons=args.horizon, concurrency=args.concurrency))
+    
+    for run in runs:
+        print(
+            f"Tenant {run.tenant_id}, {run.forecast_horizon_days}-day horizon: {run.status}, "
+            f"{run.series_processed}/{run.series_total} series, {run.series_failed} failed"
+            + (f" ({run.last_error})" if run.last_error else "")
+        )
+    return 0 if all(run.status == ForecastRunStatus.COMPLETED.value for run in runs) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
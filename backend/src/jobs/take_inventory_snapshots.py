@@ -0,0 +1,59 @@
+"""
+Take inventory snapshots for point-in-time stock queries.
+
+Runs once by default (for cron); with --interval-hours it keeps running and
+takes a snapshot every interval. Run a single instance only: every run
+writes a full copy of the inventory quantities.
+
+Usage:
+    python -m src.jobs.take_inventory_snapshots [--tenant-id UUID] [--retain-days N] [--interval-hours N]
+"""
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from uuid import UUID
+
+from src.database.session import SessionLocal
+from src.services.inventory_snapshot_service import InventorySnapshotService
+
+
+def run_once(tenant_id: Optional[UUID], retain_days: Optional[int]) -> None:
+    """Take one snapshot and prune old ones."""
+    db = SessionLocal()
+    try:
+        written = InventorySnapshotService.take_snapshot(db, tenant_id=tenant_id)
+        print(f"Snapshot of {written} inventory rows taken")
+        
+        if retain_days is not None:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=retain_days)
+            deleted = InventorySnapshotService.prune(db, cutoff, tenant_id=tenant_id)
+            print(f"Pruned {deleted} snapshot rows older than {cutoff.isoformat()}")
+    finally:
+        db.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the snapshot job; returns a process exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tenant-id", type=UUID, default=None, help="Only snapshot this tenant")
+    parser.add_argument("--retain-days", type=int, default=None, help="Delete snapshots older than this many days")
+    parser.add_argument("--interval-hours", type=float, default=None, help="Keep running, taking a snapshot every N hours")
+    args = parser.parse_args(argv)
+    
+    if args.interval_hours is None:
+        run_once(args.tenant_id, args.retain_days)
+        return 0
+    
+    interval = args.interval_hours * 3600
+    while True:
+        started = time.monotonic()
+        try:
+            run_once(args.tenant_id, args.retain_days)
+        except Exception as e:
+            print(f"Error taking inventory snapshot: {e}")
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,40 @@
+"""
+Evaluate matured forecasts against realized demand and update accuracy aggregates.
+
+Meant to run daily from cron. Only forecasts whose horizon has passed since
+the last run are read; an interrupted run is continued by the next one.
+Run a single instance at a time.
+
+Usage:
+    python -m src.jobs.track_forecast_accuracy [--tenant-id UUID ...] [--as-of YYYY-MM-DD] [--tolerance F]
+"""
+import argparse
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+
+from src.database.session import SessionLocal
+from src.services.forecast_accuracy_service import ForecastAccuracyService
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Evaluate matured forecasts once; returns a process exit code."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tenant-id", type=UUID, action="append", default=None, help="Only evaluate this tenant (repeatable)")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=None, help="Evaluate windows that ended before this day (default: today)")
+    parser.add_argument("--tolerance", type=float, default=None, help="Relative error counted as accurate (default: forecast_accuracy_tolerance)")
+    args = parser.parse_args(argv)
+    
+    db = SessionLocal()
+    try:
+        tenant_ids = args.tenant_id or ForecastAccuracyService.tenant_ids(db)
+        for tenant_id in tenant_ids:
+            evaluated = ForecastAccuracyService.evaluate(db, tenant_id, as_of=args.as_of, tolerance=args.tolerance)
+            print(f"Tenant {tenant_id}: {evaluated} forecasts evaluated")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,8 +7,11 @@ from fastapi.responses import JSONResponse
 
 from src.config.settings import settings
 from src.api.middleware.security import SecurityHeadersMiddleware
-from src.api.v1 import auth, products, warehouses, inventory, forecasts, recommendations, suppliers, purchase_orders, ai_query
+from src.api.middleware.idempotency import IdempotencyMiddleware, REPLAYED_HEADER
+from src.api.v1 import auth, products, warehouses, inventory, forecasts, recommendations, suppliers, purchase_orders, ai_query, exports, outbox
 from src.api.websocket import websocket_endpoint
+from src.services.outbox_dispatcher import outbox_dispatcher
+from src.services.websocket_fanout import websocket_fanout
 
 # Create FastAPI app
 app = FastAPI(
@@ -19,6 +22,16 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+# Replay stored responses to writes retried with an Idempotency-Key (innermost,
+# so the outer middleware still adds its headers to replays)
+app.add_middleware(
+    IdempotencyMiddleware,
+    paths=[
+        rf"^{settings.api_v1_prefix}/inventory/movement$",
+        rf"^{settings.api_v1_prefix}/purchase-orders/[^/]+/receive$",
+    ]
+)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -26,6 +39,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", REPLAYED_HEADER],  # Inventory list pagination, idempotent retries
 )
 
 # Add security headers
@@ -41,11 +55,28 @@ app.include_router(recommendations.router, prefix=settings.api_v1_prefix)
 app.include_router(suppliers.router, prefix=settings.api_v1_prefix)
 app.include_router(purchase_orders.router, prefix=settings.api_v1_prefix)
 app.include_router(ai_query.router, prefix=settings.api_v1_prefix)
+app.include_router(exports.router, prefix=settings.api_v1_prefix)
+app.include_router(outbox.router, prefix=settings.api_v1_prefix)
 
 # WebSocket endpoint
 app.websocket("/ws/inventory")(websocket_endpoint)
 
 
+@app.on_event("startup")
+async def start_outbox_dispatcher():
+    """Deliver change events from the outbox while the app runs."""
+    await websocket_fanout.start()
+    if settings.outbox_dispatcher_enabled:
+        outbox_dispatcher.start()
+
+
+@app.on_event("shutdown")
+async def stop_outbox_dispatcher():
+    """Stop the outbox dispatcher."""
+    await outbox_dispatcher.stop()
+    await websocket_fanout.stop()
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -0,0 +1,44 @@
+"""
+DailyMovementRollup model holding per-day movement totals.
+"""
+from sqlalchemy import Column, Integer, Numeric, Date, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from src.models.base import BaseModel
+
+
+class DailyMovementRollup(BaseModel):
+    """Movement totals for one product in one warehouse on one (UTC) day."""
+    
+    __tablename__ = "daily_movement_rollup"
+    
+    product_id = Column(UUID(as_uuid=True), ForeignKey('products.id'), nullable=False)
+    warehouse_id = Column(UUID(as_uuid=True), ForeignKey('warehouses.id'), nullable=False)
+    day = Column(Date, nullable=False)
+    inbound_quantity = Column(Numeric(18, 3), nullable=False, default=0)
+    outbound_quantity = Column(Numeric(18, 3), nullable=False, default=0)
+    transfer_in_quantity = Column(Numeric(18, 3), nullable=False, default=0)
+    transfer_out_quantity = Column(Numeric(18, 3), nullable=False, default=0)
+    movement_count = Column(Integer, nullable=False, default=0)
+    
+    # Relationships
+    product = relationship("Product")
+    warehouse = relationship("Warehouse")
+    
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint('tenant_id', 'product_id', 'warehouse_id', 'day', name='uq_daily_movement_rollup'),
+        Index('idx_daily_movement_rollup_tenant_warehouse_day', 'tenant_id', 'warehouse_id', 'day'),
+    )
+    
+    @property
+    def net_quantity(self):
+        """Net change in stock on the day."""
+        return (
+            self.inbound_quantity + self.transfer_in_quantity
+            - self.outbound_quantity - self.transfer_out_quantity
+        )
+    
+    def __repr__(self):
+        return f"<DailyMovementRollup(product_id={self.product_id}, warehouse_id={self.warehouse_id}, day={self.day})>"
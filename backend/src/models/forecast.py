@@ -1,7 +1,7 @@
 """
 Forecast model representing AI-generated demand predictions.
 """
-from sqlalchemy import Column, Integer, Date, Numeric, String, DateTime, ForeignKey, UniqueConstraint, Index, CheckConstraint
+from sqlalchemy import Column, Integer, Date, Numeric, String, DateTime, LargeBinary, ForeignKey, UniqueConstraint, Index, CheckConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy import func
@@ -26,6 +26,8 @@ class Forecast(BaseModel):
     model_type = Column(String(50), nullable=True)  # e.g., 'arima', 'exponential_smoothing', 'lstm'
     generated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
     features_json = Column(JSONB, nullable=True)  # Model input features for explainability
+    daily_path = Column(LargeBinary, nullable=True)  # Packed daily forecasts and 80% band (see services.forecast_path)
+    realized_demand = Column(Numeric(15, 3), nullable=True)  # Outbound plus transfer-out quantity over the horizon, set once it has passed
     
     # Relationships
     product = relationship("Product", backref="forecasts")
@@ -40,6 +42,11 @@ class Forecast(BaseModel):
         Index('idx_forecasts_product_warehouse', 'product_id', 'warehouse_id'),
         Index('idx_forecasts_horizon_date', 'forecast_horizon_days', 'forecast_date'),
         Index('idx_forecasts_model_version', 'model_version'),
+        Index('idx_forecasts_series_generated', 'tenant_id', 'forecast_horizon_days', 'product_id', 'warehouse_id', 'generated_at'),
+        Index(
+            'idx_forecasts_unevaluated', 'tenant_id', 'forecast_horizon_days', 'forecast_date',
+            postgresql_where=realized_demand.is_(None)
+        ),
         CheckConstraint('forecast_horizon_days IN (7, 30, 90)', name='ck_forecast_horizon'),
         CheckConstraint('predicted_demand >= 0', name='ck_forecast_demand_non_negative'),
     )
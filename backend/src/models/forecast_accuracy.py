@@ -0,0 +1,74 @@
+"""
+ForecastAccuracy model holding running forecast accuracy aggregates.
+"""
+from sqlalchemy import Column, Integer, Float, Numeric, String, Date, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from src.models.base import BaseModel
+
+
+class AccuracyRatios:
+    """Accuracy ratios derived from the running sums; None where they are undefined."""
+    
+    @property
+    def wape(self):
+        """Weighted absolute percentage error: sum |error| / sum actual."""
+        return float(self.abs_error_total) / float(self.actual_total) if self.actual_total else None
+    
+    @property
+    def bias(self):
+        """Sum error / sum actual; positive means over-forecasting."""
+        return (float(self.predicted_total) - float(self.actual_total)) / float(self.actual_total) if self.actual_total else None
+    
+    @property
+    def mape(self):
+        """Mean |error| / actual over forecasts with demand."""
+        return self.ape_total / self.ape_count if self.ape_count else None
+    
+    @property
+    def within_tolerance_share(self):
+        """Share of forecasts within the accuracy tolerance (SC-006)."""
+        return self.within_tolerance_count / self.forecasts_evaluated if self.forecasts_evaluated else None
+
+
+class ForecastAccuracy(AccuracyRatios, BaseModel):
+    """
+    Accuracy of one series' matured forecasts for one horizon and model.
+    
+    Only sums are stored, so evaluating newly matured forecasts adds to a
+    row and ratios (WAPE, bias, MAPE, share within tolerance) are derived
+    on read.
+    """
+    
+    __tablename__ = "forecast_accuracy"
+    
+    product_id = Column(UUID(as_uuid=True), ForeignKey('products.id'), nullable=False)
+    warehouse_id = Column(UUID(as_uuid=True), ForeignKey('warehouses.id'), nullable=False)
+    forecast_horizon_days = Column(Integer, nullable=False)
+    model_type = Column(String(50), nullable=False)  # 'unknown' for forecasts stored without one
+    model_version = Column(String(50), nullable=False)
+    forecasts_evaluated = Column(Integer, nullable=False, default=0)
+    predicted_total = Column(Numeric(18, 3), nullable=False, default=0)
+    actual_total = Column(Numeric(18, 3), nullable=False, default=0)  # Realized demand (outbound plus transfer-out quantity)
+    abs_error_total = Column(Numeric(18, 3), nullable=False, default=0)
+    ape_total = Column(Float, nullable=False, default=0)  # Sum of |error| / actual over forecasts with demand
+    ape_count = Column(Integer, nullable=False, default=0)
+    within_tolerance_count = Column(Integer, nullable=False, default=0)  # Within forecast_accuracy_tolerance (SC-006)
+    last_forecast_date = Column(Date, nullable=True)
+    
+    # Relationships
+    product = relationship("Product")
+    warehouse = relationship("Warehouse")
+    
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint(
+            'tenant_id', 'product_id', 'warehouse_id', 'forecast_horizon_days', 'model_type', 'model_version',
+            name='uq_forecast_accuracy'
+        ),
+        Index('idx_forecast_accuracy_tenant_model', 'tenant_id', 'forecast_horizon_days', 'model_type', 'model_version'),
+    )
+    
+    def __repr__(self):
+        return f"<ForecastAccuracy(product_id={self.product_id}, warehouse_id={self.warehouse_id}, model={self.model_type}/{self.model_version})>"
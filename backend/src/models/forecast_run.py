@@ -0,0 +1,44 @@
+"""
+ForecastRun model tracking scheduled forecast refreshes.
+"""
+import enum
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, CheckConstraint, func
+
+from src.models.base import BaseModel
+
+
+class ForecastRunStatus(str, enum.Enum):
+    """Forecast run status enumeration."""
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ForecastRun(BaseModel):
+    """
+    One scheduled refresh of a tenant's forecasts for one horizon.
+    
+    A run left 'running' by a crashed scheduler is resumed by the next
+    one: series forecast since started_at count as done.
+    """
+    
+    __tablename__ = "forecast_runs"
+    
+    forecast_horizon_days = Column(Integer, nullable=False)
+    status = Column(String(20), nullable=False, default=ForecastRunStatus.RUNNING.value)
+    started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)  # Database clock, like Forecast.generated_at
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    series_total = Column(Integer, nullable=False, default=0)  # Series due when the run (or its last resume) began
+    series_processed = Column(Integer, nullable=False, default=0)
+    series_failed = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    
+    # Constraints
+    __table_args__ = (
+        Index('idx_forecast_runs_tenant_status', 'tenant_id', 'forecast_horizon_days', 'status'),
+        CheckConstraint("status IN ('running', 'completed', 'failed')", name='ck_forecast_run_status'),
+    )
+    
+    def __repr__(self):
+        return f"<ForecastRun(id={self.id}, horizon={self.forecast_horizon_days}d, status={self.status})>"
@@ -1,7 +1,7 @@
 """
 Inventory model representing current stock levels for products at warehouses.
 """
-from sqlalchemy import Column, Numeric, Integer, DateTime, ForeignKey, UniqueConstraint, Index, CheckConstraint
+from sqlalchemy import Column, Numeric, Integer, Boolean, DateTime, ForeignKey, UniqueConstraint, Index, CheckConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy import func
@@ -24,6 +24,7 @@ class Inventory(BaseModel):
     last_movement_at = Column(DateTime(timezone=True), nullable=True)
     last_updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     version = Column(Integer, nullable=False, default=0)  # For optimistic locking
+    below_minimum = Column(Boolean, nullable=False, default=False, server_default=text('false'))  # Maintained quantity < minimum_stock
     
     # Relationships
     product = relationship("Product", backref="inventory_items")
@@ -34,6 +35,11 @@ class Inventory(BaseModel):
         UniqueConstraint('tenant_id', 'product_id', 'warehouse_id', name='uq_inventory_product_warehouse'),
         Index('idx_inventory_product_warehouse', 'tenant_id', 'product_id', 'warehouse_id', unique=True),
         Index('idx_inventory_low_stock', 'tenant_id', 'quantity', 'minimum_stock'),
+        Index(
+            'idx_inventory_below_minimum', 'tenant_id', 'warehouse_id',
+            postgresql_where=text('below_minimum'),
+            sqlite_where=text('below_minimum')
+        ),
         Index('idx_inventory_warehouse', 'warehouse_id'),
         CheckConstraint('quantity >= 0', name='ck_inventory_quantity_non_negative'),
         CheckConstraint('reserved_quantity >= 0', name='ck_inventory_reserved_non_negative'),
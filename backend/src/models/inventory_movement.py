@@ -18,7 +18,13 @@ class MovementType(str, enum.Enum):
 
 
 class InventoryMovement(BaseModel):
-    """InventoryMovement entity representing changes in inventory quantity."""
+    """
+    InventoryMovement entity representing changes in inventory quantity.
+    
+    In PostgreSQL the table is range-partitioned by month on performed_at
+    (migration 009); queries should bound performed_at so partitions can be
+    pruned.
+    """
     
     __tablename__ = "inventory_movements"
     
@@ -32,7 +38,7 @@ class InventoryMovement(BaseModel):
     reference_number = Column(String(100), nullable=True)
     notes = Column(Text, nullable=True)
     performed_by = Column(UUID(as_uuid=True), nullable=False, index=True)
-    performed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    performed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, primary_key=True)  # Partition key, so part of the primary key
     approved_by = Column(UUID(as_uuid=True), nullable=True)
     approved_at = Column(DateTime(timezone=True), nullable=True)
     
@@ -43,7 +49,8 @@ class InventoryMovement(BaseModel):
     
     # Constraints
     __table_args__ = (
-        Index('idx_inventory_movements_tenant_id', 'tenant_id'),
+        Index('idx_inventory_movements_tenant_performed_at', 'tenant_id', 'performed_at'),
+        Index('idx_inventory_movements_tenant_product_performed_at', 'tenant_id', 'product_id', 'performed_at'),
         Index('idx_inventory_movements_product_id', 'product_id'),
         Index('idx_inventory_movements_performed_at', 'performed_at'),
         Index('idx_inventory_movements_performed_by', 'performed_by'),
@@ -0,0 +1,33 @@
+"""
+InventorySnapshot model holding periodic copies of inventory quantities.
+"""
+from sqlalchemy import Column, Numeric, DateTime, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from src.models.base import BaseModel
+
+
+class InventorySnapshot(BaseModel):
+    """Quantity of one inventory row at snapshot_at, the base for as-of replays."""
+    
+    __tablename__ = "inventory_snapshots"
+    
+    product_id = Column(UUID(as_uuid=True), ForeignKey('products.id'), nullable=False)
+    warehouse_id = Column(UUID(as_uuid=True), ForeignKey('warehouses.id'), nullable=False)
+    quantity = Column(Numeric(15, 3), nullable=False)
+    snapshot_at = Column(DateTime(timezone=True), nullable=False)
+    
+    # Relationships
+    product = relationship("Product")
+    warehouse = relationship("Warehouse")
+    
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint('tenant_id', 'product_id', 'warehouse_id', 'snapshot_at', name='uq_inventory_snapshot'),
+        Index('idx_inventory_snapshots_tenant_warehouse_taken', 'tenant_id', 'warehouse_id', 'snapshot_at'),
+        Index('idx_inventory_snapshots_snapshot_at', 'snapshot_at'),
+    )
+    
+    def __repr__(self):
+        return f"<InventorySnapshot(product_id={self.product_id}, warehouse_id={self.warehouse_id}, snapshot_at={self.snapshot_at})>"
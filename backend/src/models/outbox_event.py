@@ -0,0 +1,41 @@
+"""
+OutboxEvent model for change events awaiting delivery.
+"""
+from sqlalchemy import Column, String, Text, Integer, DateTime, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+from src.models.base import BaseModel
+
+
+class OutboxEvent(BaseModel):
+    """
+    A change event written in the same transaction as the change.
+    
+    The outbox dispatcher delivers pending events to consumers and sets
+    published_at; an event stays pending until every consumer accepted it.
+    """
+    
+    __tablename__ = "outbox_events"
+    
+    event_type = Column(String(100), nullable=False)  # e.g. 'inventory.updated'
+    aggregate_type = Column(String(50), nullable=False)  # e.g. 'Inventory'
+    aggregate_id = Column(UUID(as_uuid=True), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    published_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    
+    # Constraints
+    __table_args__ = (
+        # Only pending events are indexed, so the dispatcher's scan stays small
+        Index(
+            'idx_outbox_events_pending',
+            'created_at',
+            postgresql_where=text('published_at IS NULL'),
+            sqlite_where=text('published_at IS NULL')
+        ),
+        Index('idx_outbox_events_published_at', 'published_at'),
+    )
+    
+    def __repr__(self):
+        return f"<OutboxEvent(event_type={self.event_type}, aggregate_id={self.aggregate_id}, published_at={self.published_at})>"
@@ -0,0 +1,31 @@
+"""
+WarehouseInventorySummary model holding per-warehouse inventory aggregates.
+"""
+from sqlalchemy import Column, Integer, Numeric, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from src.models.base import BaseModel
+
+
+class WarehouseInventorySummary(BaseModel):
+    """Aggregated stock figures for one warehouse, kept in step with inventory."""
+    
+    __tablename__ = "warehouse_inventory_summaries"
+    
+    warehouse_id = Column(UUID(as_uuid=True), ForeignKey('warehouses.id'), nullable=False)
+    sku_count = Column(Integer, nullable=False, default=0)  # Inventory rows in the warehouse
+    total_units = Column(Numeric(18, 3), nullable=False, default=0)
+    low_stock_count = Column(Integer, nullable=False, default=0)  # Rows with quantity < minimum_stock
+    last_movement_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Relationships
+    warehouse = relationship("Warehouse")
+    
+    # Constraints
+    __table_args__ = (
+        UniqueConstraint('tenant_id', 'warehouse_id', name='uq_warehouse_inventory_summary'),
+    )
+    
+    def __repr__(self):
+        return f"<WarehouseInventorySummary(warehouse_id={self.warehouse_id}, sku_count={self.sku_count})>"
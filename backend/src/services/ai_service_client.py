@@ -2,24 +2,55 @@
 AI Service API client for communicating with the AI service.
 """
 import httpx
-from typing import Dict, Any, List, Optional
+import numpy as np
+from typing import Callable, Dict, Any, List, Optional, Union
 from uuid import UUID
 
 from src.config.settings import settings
+from src.services import ai_wire_format
 
 
 class AIServiceClient:
     """Client for communicating with the AI service."""
     
-    def __init__(self, base_url: Optional[str] = None):
+    def __init__(self, base_url: Optional[str] = None, wire_format: Optional[str] = None):
         """
         Initialize AI service client.
         
         Args:
             base_url: Base URL of AI service (defaults to settings)
+            wire_format: 'json' or 'binary' encoding of quantities (defaults to settings)
         """
         self.base_url = base_url or settings.ai_service_url or "http://localhost:8001"
         self.timeout = 30.0
+        self.batch_timeout = 300.0
+        self.wire_format = wire_format or settings.ai_service_wire_format
+    
+    async def _post_series(
+        self,
+        client: httpx.AsyncClient,
+        path: str,
+        header: Dict[str, Any],
+        quantities: np.ndarray,
+        json_body: Callable[[], Dict[str, Any]]
+    ) -> httpx.Response:
+        """
+        POST a request carrying daily quantities.
+        
+        With the binary wire format the quantities are sent packed; an
+        ai-service that answers 415 gets JSON from then on.
+        """
+        if self.wire_format == "binary":
+            response = await client.post(
+                f"{self.base_url}{path}",
+                content=ai_wire_format.encode(header, quantities),
+                headers={"Content-Type": ai_wire_format.CONTENT_TYPE}
+            )
+            if response.status_code != httpx.codes.UNSUPPORTED_MEDIA_TYPE:
+                return response
+            self.wire_format = "json"
+        
+        return await client.post(f"{self.base_url}{path}", json=json_body())
     
     async def generate_forecast(
         self,
@@ -27,7 +58,7 @@ class AIServiceClient:
         warehouse_id: UUID,
         historical_data: List[Dict[str, Any]],
         forecast_horizon_days: int,
-        model_type: str = "exponential_smoothing"
+        model_type: str = "auto"
     ) -> Dict[str, Any]:
         """
         Generate demand forecast.
@@ -35,23 +66,68 @@ class AIServiceClient:
         Args:
             product_id: Product ID
             warehouse_id: Warehouse ID
-            historical_data: Historical inventory data
+            historical_data: Daily demand history ({date, quantity} records)
             forecast_horizon_days: Forecast horizon (7, 30, or 90)
             model_type: Model type to use
             
         Returns:
             Forecast result dictionary
         """
+        header = {
+            "product_id": str(product_id),
+            "warehouse_id": str(warehouse_id),
+            "start_date": historical_data[0]["date"] if historical_data else None,
+            "forecast_horizon_days": forecast_horizon_days,
+            "model_type": model_type
+        }
         async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/forecast",
-                json={
-                    "product_id": str(product_id),
-                    "warehouse_id": str(warehouse_id),
-                    "historical_data": historical_data,
-                    "forecast_horizon_days": forecast_horizon_days,
-                    "model_type": model_type
-                }
+            response = await self._post_series(
+                client,
+                "/forecast",
+                header,
+                np.array([[float(item["quantity"]) for item in historical_data]]),
+                lambda: {**header, "historical_data": historical_data}
+            )
+            response.raise_for_status()
+            return response.json()
+    
+    async def generate_forecast_batch(
+        self,
+        series_ids: List[str],
+        start_date: str,
+        quantities: Union[np.ndarray, List[List[float]]],
+        forecast_horizon_days: int,
+        model_type: str = "auto"
+    ) -> Dict[str, Any]:
+        """
+        Generate demand forecasts for many series in one request.
+        
+        Args:
+            series_ids: One identifier per series, echoed back in the response
+            start_date: ISO date of the first column of quantities
+            quantities: (series, days) matrix, or one list of daily quantities per series
+            forecast_horizon_days: Forecast horizon (7, 30, or 90)
+            model_type: Model type to use
+            
+        Returns:
+            Columnar result: one list entry per series for each output field,
+            including the daily path (daily_demand, daily_lower, daily_upper)
+        """
+        header = {
+            "series_ids": series_ids,
+            "start_date": start_date,
+            "forecast_horizon_days": forecast_horizon_days,
+            "model_type": model_type,
+            "include_daily": True
+        }
+        matrix = np.asarray(quantities, dtype=np.float64)
+        async with httpx.AsyncClient(timeout=self.batch_timeout) as client:
+            response = await self._post_series(
+                client,
+                "/forecast/batch",
+                header,
+                matrix,
+                lambda: {**header, "quantities": matrix.tolist()}
             )
             response.raise_for_status()
             return response.json()
@@ -0,0 +1,45 @@
+"""
+Binary series format for requests to the ai-service.
+
+Mirrors the ai-service's src/services/wire_format.py: a JSON header with
+the request fields, then the quantities as a packed little-endian float32
+(series, days) matrix, sent as CONTENT_TYPE. Keep both sides in step.
+"""
+import json
+import struct
+from typing import Any, Dict
+
+import numpy as np
+
+CONTENT_TYPE = "application/x-invsight-series"
+
+MAGIC = b"IVS1"
+
+_PREFIX = struct.Struct("<4sI")
+
+_DTYPE = np.dtype("<f4")
+
+
+def encode(header: Dict[str, Any], quantities: np.ndarray) -> bytes:
+    """
+    Encode a request.
+    
+    Args:
+        header: JSON-serializable request fields; series and days are added
+        quantities: Matrix of shape (series, days)
+    """
+    quantities = np.ascontiguousarray(quantities, dtype=_DTYPE)
+    if quantities.ndim != 2:
+        raise ValueError("quantities must be a (series, days) matrix")
+    
+    header_bytes = json.dumps(
+        {**header, 'series': quantities.shape[0], 'days': quantities.shape[1]},
+        separators=(',', ':')
+    ).encode("utf-8")
+    padding = -(_PREFIX.size + len(header_bytes)) % _DTYPE.itemsize
+    return b"".join((
+        _PREFIX.pack(MAGIC, len(header_bytes)),
+        header_bytes,
+        b"\0" * padding,
+        quantities.tobytes()
+    ))
@@ -3,11 +3,16 @@ Audit service for logging operations.
 """
 from uuid import UUID
 from typing import Optional, Dict, Any
+from sqlalchemy import event, insert
 from sqlalchemy.orm import Session
 
 from src.models.audit_log import AuditLog
 
 
+# Session.info key holding audit entries staged for the current transaction
+PENDING_AUDIT_LOGS_KEY = "pending_audit_logs"
+
+
 class AuditService:
     """Service for creating audit log entries."""
     
@@ -24,7 +29,10 @@ class AuditService:
         user_agent: Optional[str] = None,
     ) -> AuditLog:
         """
-        Create an audit log entry.
+        Create an audit log entry and commit it immediately.
+        
+        Prefer stage_action inside service methods that commit their own
+        unit of work, so the audit row is written in the same transaction.
         
         Args:
             db: Database session
@@ -36,7 +44,7 @@ class AuditService:
             changes: Dictionary of changes (before/after)
             ip_address: Client IP address
             user_agent: Client user agent
-            
+        
         Returns:
             Created AuditLog entry
         """
@@ -57,3 +65,83 @@ class AuditService:
         
         return audit_log
 
+    @staticmethod
+    def stage_action(
+        db: Session,
+        tenant_id: UUID,
+        action: str,
+        entity_type: str,
+        entity_id: UUID,
+        user_id: Optional[UUID] = None,
+        changes: Optional[Dict[str, Any]] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ) -> None:
+        """
+        Stage an audit log entry on the session (deferred mode).
+        
+        Staged entries are written with one multi-row INSERT when the
+        caller's transaction commits, and discarded if it rolls back, so an
+        audit row is never committed without the change it describes.
+        
+        Args:
+            db: Database session
+            tenant_id: Tenant ID
+            action: Action name (e.g., 'inventory.movement.create')
+            entity_type: Entity type (e.g., 'InventoryMovement')
+            entity_id: Entity ID (must be assigned before staging)
+            user_id: User ID who performed the action
+            changes: Dictionary of changes (before/after)
+            ip_address: Client IP address
+            user_agent: Client user agent
+        """
+        if entity_id is None:
+            raise ValueError("entity_id is required to stage an audit entry")
+        
+        db.info.setdefault(PENDING_AUDIT_LOGS_KEY, []).append({
+            'tenant_id': tenant_id,
+            'user_id': user_id,
+            'action': action,
+            'entity_type': entity_type,
+            'entity_id': entity_id,
+            'changes_json': changes,
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+        })
+    
+    @staticmethod
+    def write_staged(db: Session) -> int:
+        """
+        Write all staged audit entries in one statement.
+        
+        Called automatically before commit; may be called explicitly to make
+        staged entries visible to queries in the current transaction.
+        
+        Returns:
+            Number of audit entries written
+        """
+        pending = db.info.pop(PENDING_AUDIT_LOGS_KEY, None)
+        if not pending:
+            return 0
+        
+        db.execute(insert(AuditLog), pending)
+        return len(pending)
+    
+    @staticmethod
+    def discard_staged(db: Session) -> None:
+        """Drop staged audit entries without writing them."""
+        db.info.pop(PENDING_AUDIT_LOGS_KEY, None)
+
+
+@event.listens_for(Session, "before_commit")
+def _write_staged_audit_logs(session: Session) -> None:
+    """Flush staged audit entries as part of the committing transaction."""
+    if not session.in_nested_transaction():  # Also fires when a savepoint is released
+        AuditService.write_staged(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_staged_audit_logs(session: Session) -> None:
+    """Staged entries belong to the rolled-back transaction."""
+    if not session.in_nested_transaction():  # A savepoint rollback keeps the outer work
+        AuditService.discard_staged(session)
@@ -0,0 +1,203 @@
+"""
+Export service for streaming bulk snapshots of tenant data.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from src.models.audit_log import AuditLog
+from src.models.inventory import Inventory
+from src.models.inventory_movement import InventoryMovement
+
+
+# Rows fetched per round trip from the server-side cursor, and written per chunk
+EXPORT_FETCH_SIZE = 2000
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+
+class ExportDataset:
+    """A table that can be exported, with its columns and time column."""
+    
+    def __init__(self, model, columns: Sequence[str], time_column: Optional[str] = None):
+        self.model = model
+        self.columns = list(columns)
+        self.time_column = time_column
+
+
+EXPORT_DATASETS: Dict[str, ExportDataset] = {
+    "inventory": ExportDataset(
+        Inventory,
+        [
+            "id", "product_id", "warehouse_id", "quantity", "reserved_quantity",
+            "minimum_stock", "safety_stock", "reorder_point", "last_movement_at",
+            "last_updated_at", "version",
+        ],
+    ),
+    "movements": ExportDataset(
+        InventoryMovement,
+        [
+            "id", "movement_type", "product_id", "source_warehouse_id",
+            "destination_warehouse_id", "quantity", "quantity_before", "quantity_after",
+            "reference_number", "notes", "performed_by", "performed_at",
+            "approved_by", "approved_at",
+        ],
+        time_column="performed_at",
+    ),
+    "audit-logs": ExportDataset(
+        AuditLog,
+        [
+            "id", "user_id", "action", "entity_type", "entity_id", "changes_json",
+            "ip_address", "user_agent", "created_at",
+        ],
+        time_column="created_at",
+    ),
+}
+
+
+def _json_value(value: Any) -> Any:
+    """Convert a column value to a JSON-serializable value."""
+    if value is None or isinstance(value, (str, int, float, bool, dict, list)):
+        return value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)  # UUID, INET, enums
+
+
+def _csv_value(value: Any) -> Any:
+    """Convert a column value to a CSV cell."""
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(',', ':'))
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class ExportService:
+    """Service for streaming exports."""
+    
+    @staticmethod
+    def build_query(
+        dataset: str,
+        tenant_id: UUID,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Select:
+        """
+        Build the export query for a tenant's rows in a dataset.
+        
+        Selects plain columns rather than ORM objects, so streaming the result
+        does not accumulate objects in the session's identity map.
+        
+        Args:
+            dataset: Dataset name (a key of EXPORT_DATASETS)
+            tenant_id: Tenant ID
+            since: Only rows at or after this time (datasets with a time column)
+            until: Only rows before this time (datasets with a time column)
+        
+        Returns:
+            Select returning columns in EXPORT_DATASETS[dataset].columns order
+        
+        Raises:
+            ValueError: If the dataset is unknown or does not support time filters
+        """
+        spec = ExportService.get_dataset(dataset)
+        model = spec.model
+        
+        query = select(*(getattr(model, name) for name in spec.columns)).where(
+            model.tenant_id == tenant_id
+        )
+        
+        if spec.time_column:
+            time_column = getattr(model, spec.time_column)
+            if since:
+                query = query.where(time_column >= since)
+            if until:
+                query = query.where(time_column < until)
+            query = query.order_by(time_column)
+        elif since or until:
+            raise ValueError(f"Dataset '{dataset}' does not support since/until filters")
+        
+        return query
+    
+    @staticmethod
+    def stream_rows(
+        db: Session,
+        query: Select,
+        fetch_size: int = EXPORT_FETCH_SIZE
+    ) -> Iterator[List[Sequence[Any]]]:
+        """
+        Stream the rows of an export query in chunks.
+        
+        Reads through a server-side cursor, so at most one chunk of rows is
+        held in memory at a time regardless of the size of the table.
+        
+        Args:
+            db: Database session (must stay open while the iterator is consumed)
+            query: Query from build_query
+            fetch_size: Rows per chunk
+        
+        Yields:
+            Lists of row tuples
+        """
+        result = db.execute(
+            query.execution_options(stream_results=True, yield_per=fetch_size)
+        )
+        try:
+            for partition in result.partitions():
+                yield partition
+        finally:
+            result.close()
+    
+    @staticmethod
+    def get_dataset(dataset: str) -> ExportDataset:
+        """
+        Look up an exportable dataset.
+        
+        Raises:
+            ValueError: If the dataset is unknown
+        """
+        spec = EXPORT_DATASETS.get(dataset)
+        if spec is None:
+            raise ValueError(
+                f"Unknown dataset '{dataset}'. Must be one of: {', '.join(EXPORT_DATASETS)}"
+            )
+        return spec
+    
+    @staticmethod
+    def iter_ndjson(columns: Sequence[str], chunks: Iterator[List[Sequence[Any]]]) -> Iterator[bytes]:
+        """Encode row chunks as newline-delimited JSON, one output chunk per input chunk."""
+        for rows in chunks:
+            yield "".join(
+                json.dumps(
+                    {name: _json_value(value) for name, value in zip(columns, row)},
+                    separators=(',', ':')
+                ) + "\n"
+                for row in rows
+            ).encode("utf-8")
+    
+    @staticmethod
+    def iter_csv(columns: Sequence[str], chunks: Iterator[List[Sequence[Any]]]) -> Iterator[bytes]:
+        """Encode row chunks as CSV with a header row, one output chunk per input chunk."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        
+        writer.writerow(columns)
+        yield buffer.getvalue().encode("utf-8")
+        
+        for rows in chunks:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([_csv_value(value) for value in row] for row in rows)
+            yield buffer.getvalue().encode("utf-8")
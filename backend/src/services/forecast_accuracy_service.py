@@ -0,0 +1,301 @@
+"""
+Incremental forecast accuracy tracking.
+
+A forecast made on forecast_date covers the days after it up to
+forecast_date + horizon. Once that window has passed, its realized demand
+(DAILY_DEMAND from the daily movement rollups, the quantity forecasts are
+fitted to) is written to Forecast.realized_demand and its errors are added
+to the running sums in forecast_accuracy, per series, horizon, model type
+and model version. Forecasts without a daily path were made from
+stock-level history (see migration 016) and are not evaluated.
+
+Each evaluation only reads forecasts that are matured and not yet
+evaluated, one (horizon, forecast_date) group at a time, and marks them in
+the same transaction that updates the sums, so a run never rescans old
+forecasts and an interrupted run is safely continued by the next one.
+Run a single evaluator at a time.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+import numpy as np
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.models.daily_movement_rollup import DailyMovementRollup
+from src.models.forecast import Forecast
+from src.models.forecast_accuracy import AccuracyRatios, ForecastAccuracy
+from src.services.movement_rollup_service import DAILY_DEMAND
+
+# Horizons forecasts are made for (ck_forecast_horizon)
+FORECAST_HORIZONS = (7, 30, 90)
+
+# Forecasts evaluated per write
+ACCURACY_CHUNK_SIZE = 5000
+
+# Stored for forecasts without a model type
+UNKNOWN_MODEL_TYPE = "unknown"
+
+# Running sums added up by evaluation and summaries
+_SUM_COLUMNS = (
+    'forecasts_evaluated', 'predicted_total', 'actual_total', 'abs_error_total',
+    'ape_total', 'ape_count', 'within_tolerance_count'
+)
+
+
+@dataclass
+class AccuracySummary(AccuracyRatios):
+    """Accuracy of one model version over all series of a horizon."""
+    forecast_horizon_days: int
+    model_type: str
+    model_version: str
+    series: int
+    forecasts_evaluated: int
+    predicted_total: Decimal
+    actual_total: Decimal
+    abs_error_total: Decimal
+    ape_total: float
+    ape_count: int
+    within_tolerance_count: int
+
+
+def _decimal(value: float) -> Decimal:
+    return Decimal(str(round(float(value), 3)))
+
+
+class ForecastAccuracyService:
+    """Service for forecast accuracy tracking."""
+    
+    @staticmethod
+    def matured_groups(db: Session, tenant_id: UUID, as_of: date) -> List[Tuple[int, date]]:
+        """
+        (horizon, forecast_date) groups with forecasts ready to evaluate, oldest first.
+        
+        A forecast is ready once the last day of its window is before as_of.
+        """
+        groups = []
+        for horizon in FORECAST_HORIZONS:
+            days = db.execute(
+                select(Forecast.forecast_date)
+                .where(
+                    Forecast.tenant_id == tenant_id,
+                    Forecast.forecast_horizon_days == horizon,
+                    Forecast.forecast_date < as_of - timedelta(days=horizon),
+                    Forecast.realized_demand.is_(None),
+                    Forecast.daily_path.isnot(None)
+                )
+                .distinct()
+            ).scalars()
+            groups.extend((horizon, day) for day in days)
+        return sorted(groups, key=lambda group: (group[1], group[0]))
+    
+    @staticmethod
+    def tenant_ids(db: Session) -> List[UUID]:
+        """Tenants with any forecast not yet evaluated."""
+        return list(db.execute(
+            select(Forecast.tenant_id).where(Forecast.realized_demand.is_(None), Forecast.daily_path.isnot(None)).distinct()
+        ).scalars())
+    
+    @staticmethod
+    def evaluate(
+        db: Session,
+        tenant_id: UUID,
+        as_of: Optional[date] = None,
+        tolerance: Optional[float] = None
+    ) -> int:
+        """
+        Evaluate all of a tenant's matured forecasts, committing after each group.
+        
+        Args:
+            db: Database session
+            tenant_id: Tenant ID
+            as_of: Evaluate windows that ended before this day (defaults to today)
+            tolerance: Relative error counted as accurate (defaults to forecast_accuracy_tolerance)
+        
+        Returns:
+            Number of forecasts evaluated
+        """
+        as_of = as_of or date.today()
+        tolerance = settings.forecast_accuracy_tolerance if tolerance is None else tolerance
+        
+        evaluated = 0
+        for horizon, forecast_date in ForecastAccuracyService.matured_groups(db, tenant_id, as_of):
+            evaluated += ForecastAccuracyService.evaluate_group(db, tenant_id, horizon, forecast_date, tolerance)
+            db.commit()
+        return evaluated
+    
+    @staticmethod
+    def evaluate_group(
+        db: Session,
+        tenant_id: UUID,
+        forecast_horizon_days: int,
+        forecast_date: date,
+        tolerance: float
+    ) -> int:
+        """
+        Evaluate the unevaluated forecasts of one horizon made on one day.
+        
+        Realized demand of every series is summed in SQL from the rollups of
+        the window; errors are computed for the whole group at once. The
+        caller commits.
+        
+        Returns:
+            Number of forecasts evaluated
+        """
+        realized = (
+            select(
+                DailyMovementRollup.product_id,
+                DailyMovementRollup.warehouse_id,
+                func.sum(DAILY_DEMAND).label('quantity')
+            )
+            .where(
+                DailyMovementRollup.tenant_id == tenant_id,
+                DailyMovementRollup.day > forecast_date,
+                DailyMovementRollup.day <= forecast_date + timedelta(days=forecast_horizon_days)
+            )
+            .group_by(DailyMovementRollup.product_id, DailyMovementRollup.warehouse_id)
+            .subquery()
+        )
+        rows = db.execute(
+            select(
+                Forecast.id,
+                Forecast.product_id,
+                Forecast.warehouse_id,
+                func.coalesce(Forecast.model_type, UNKNOWN_MODEL_TYPE),
+                Forecast.model_version,
+                Forecast.predicted_demand,
+                func.coalesce(realized.c.quantity, 0)
+            )
+            .outerjoin(realized, and_(
+                realized.c.product_id == Forecast.product_id,
+                realized.c.warehouse_id == Forecast.warehouse_id
+            ))
+            .where(
+                Forecast.tenant_id == tenant_id,
+                Forecast.forecast_horizon_days == forecast_horizon_days,
+                Forecast.forecast_date == forecast_date,
+                Forecast.realized_demand.is_(None),
+                Forecast.daily_path.isnot(None)
+            )
+        ).all()
+        
+        for start in range(0, len(rows), ACCURACY_CHUNK_SIZE):
+            chunk = rows[start:start + ACCURACY_CHUNK_SIZE]
+            predicted = np.array([float(row[5]) for row in chunk])
+            actual = np.array([float(row[6]) for row in chunk])
+            abs_error = np.abs(predicted - actual)
+            has_demand = actual > 0
+            ape = np.where(has_demand, abs_error / np.where(has_demand, actual, 1), 0.0)
+            within = abs_error <= tolerance * actual
+            
+            db.execute(
+                update(Forecast),
+                [{'id': row[0], 'realized_demand': _decimal(actual[i])} for i, row in enumerate(chunk)]
+            )
+            ForecastAccuracyService._add_to_sums(db, [
+                {
+                    'id': uuid4(),
+                    'tenant_id': tenant_id,
+                    'product_id': product_id,
+                    'warehouse_id': warehouse_id,
+                    'forecast_horizon_days': forecast_horizon_days,
+                    'model_type': model_type,
+                    'model_version': model_version,
+                    'forecasts_evaluated': 1,
+                    'predicted_total': _decimal(predicted[i]),
+                    'actual_total': _decimal(actual[i]),
+                    'abs_error_total': _decimal(abs_error[i]),
+                    'ape_total': float(ape[i]),
+                    'ape_count': int(has_demand[i]),
+                    'within_tolerance_count': int(within[i]),
+                    'last_forecast_date': forecast_date
+                }
+                for i, (_, product_id, warehouse_id, model_type, model_version, _, _) in enumerate(chunk)
+            ])
+        
+        return len(rows)
+    
+    @staticmethod
+    def _add_to_sums(db: Session, rows: List[Dict]) -> None:
+        """Add rows to the running sums, creating missing aggregates, in one statement."""
+        if not rows:
+            return
+        
+        is_postgresql = db.get_bind().dialect.name == "postgresql"
+        dialect = postgresql if is_postgresql else sqlite
+        latest = func.greatest if is_postgresql else func.max
+        stmt = dialect.insert(ForecastAccuracy)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['tenant_id', 'product_id', 'warehouse_id', 'forecast_horizon_days', 'model_type', 'model_version'],
+            set_={
+                **{column: getattr(ForecastAccuracy, column) + stmt.excluded[column] for column in _SUM_COLUMNS},
+                'last_forecast_date': latest(ForecastAccuracy.last_forecast_date, stmt.excluded.last_forecast_date),
+                'updated_at': func.now()
+            }
+        )
+        db.execute(stmt, rows)
+    
+    @staticmethod
+    def get_accuracy(
+        db: Session,
+        tenant_id: UUID,
+        product_id: Optional[UUID] = None,
+        warehouse_id: Optional[UUID] = None,
+        forecast_horizon_days: Optional[int] = None,
+        model_type: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[ForecastAccuracy]:
+        """Per-series accuracy aggregates with optional filters."""
+        query = db.query(ForecastAccuracy).filter(ForecastAccuracy.tenant_id == tenant_id)
+        
+        if product_id:
+            query = query.filter(ForecastAccuracy.product_id == product_id)
+        
+        if warehouse_id:
+            query = query.filter(ForecastAccuracy.warehouse_id == warehouse_id)
+        
+        if forecast_horizon_days:
+            query = query.filter(ForecastAccuracy.forecast_horizon_days == forecast_horizon_days)
+        
+        if model_type:
+            query = query.filter(ForecastAccuracy.model_type == model_type)
+        
+        return query.order_by(
+            ForecastAccuracy.product_id,
+            ForecastAccuracy.warehouse_id,
+            ForecastAccuracy.forecast_horizon_days,
+            ForecastAccuracy.model_type,
+            ForecastAccuracy.model_version
+        ).offset(skip).limit(limit).all()
+    
+    @staticmethod
+    def get_summary(
+        db: Session,
+        tenant_id: UUID,
+        forecast_horizon_days: Optional[int] = None,
+        warehouse_id: Optional[UUID] = None
+    ) -> List[AccuracySummary]:
+        """Accuracy per horizon, model type and model version, summed over series in SQL."""
+        group = (ForecastAccuracy.forecast_horizon_days, ForecastAccuracy.model_type, ForecastAccuracy.model_version)
+        query = (
+            select(
+                *group,
+                func.count().label('series'),
+                *(func.sum(getattr(ForecastAccuracy, column)).label(column) for column in _SUM_COLUMNS)
+            )
+            .where(ForecastAccuracy.tenant_id == tenant_id)
+            .group_by(*group)
+            .order_by(*group)
+        )
+        if forecast_horizon_days:
+            query = query.where(ForecastAccuracy.forecast_horizon_days == forecast_horizon_days)
+        if warehouse_id:
+            query = query.where(ForecastAccuracy.warehouse_id == warehouse_id)
+        
+        return [AccuracySummary(**row._mapping) for row in db.execute(query)]
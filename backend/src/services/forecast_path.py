@@ -0,0 +1,101 @@
+"""
+Daily forecast paths stored with each forecast.
+
+Forecast.daily_path packs the ai-service's per-day forecasts as
+little-endian float32: the horizon's daily demand, then the lower and the
+upper bound of its 80% band, horizon values each (12 bytes per day, about
+1 KB for 90 days). Day i of the path is forecast_date + 1 + i, the same
+window forecast accuracy is measured over.
+
+Day-level questions (demand over a date range, when stock runs out) are
+answered by slicing the unpacked arrays, without calling the ai-service.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# ai-service result fields packed into Forecast.daily_path, in order
+DAILY_FIELDS = ('daily_demand', 'daily_lower', 'daily_upper')
+
+_DTYPE = np.dtype("<f4")
+
+
+def pack(daily_demand: Sequence[float], daily_lower: Sequence[float], daily_upper: Sequence[float]) -> bytes:
+    """Pack a daily path and its band into a Forecast.daily_path value."""
+    return np.asarray([daily_demand, daily_lower, daily_upper], dtype=_DTYPE).tobytes()
+
+
+def pack_result(result: Dict[str, Any], row: Optional[int] = None) -> Optional[bytes]:
+    """Forecast.daily_path of an ai-service result (of one series, or row of a batch); None without a path."""
+    if any(result.get(name) is None for name in DAILY_FIELDS):
+        return None
+    if row is None:
+        return pack(*(result[name] for name in DAILY_FIELDS))
+    return pack(*(result[name][row] for name in DAILY_FIELDS))
+
+
+@dataclass
+class DailyForecast:
+    """Daily forecasts with their 80% band, one array entry per day from start."""
+    start: date
+    demand: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    
+    @classmethod
+    def unpack(cls, daily_path: bytes, forecast_date: date) -> "DailyForecast":
+        """Read-only views of a Forecast.daily_path value."""
+        values = np.frombuffer(daily_path, dtype=_DTYPE)
+        if len(values) % len(DAILY_FIELDS):
+            raise ValueError(f"daily_path of {len(daily_path)} bytes is not a packed daily path")
+        demand, lower, upper = values.reshape(len(DAILY_FIELDS), -1)
+        return cls(start=forecast_date + timedelta(days=1), demand=demand, lower=lower, upper=upper)
+    
+    def __len__(self) -> int:
+        return len(self.demand)
+    
+    @property
+    def end(self) -> date:
+        """Last day of the path."""
+        return self.start + timedelta(days=len(self) - 1)
+    
+    def slice(self, start: Optional[date] = None, end: Optional[date] = None) -> "DailyForecast":
+        """The days from start to end (inclusive) that the path covers."""
+        first = max((start - self.start).days, 0) if start else 0
+        stop = min((end - self.start).days + 1, len(self)) if end else len(self)
+        stop = max(stop, first)
+        return DailyForecast(
+            start=self.start + timedelta(days=first),
+            demand=self.demand[first:stop],
+            lower=self.lower[first:stop],
+            upper=self.upper[first:stop]
+        )
+    
+    def days(self) -> List[Dict[str, Any]]:
+        """One {date, demand, lower, upper} record per day."""
+        return [
+            {
+                "date": self.start + timedelta(days=i),
+                "demand": float(demand),
+                "lower": float(lower),
+                "upper": float(upper)
+            }
+            for i, (demand, lower, upper) in enumerate(zip(self.demand, self.lower, self.upper))
+        ]
+    
+    def depletion_day(self, on_hand: float, band: str = "demand") -> Optional[date]:
+        """
+        First day on which cumulative demand reaches on_hand.
+        
+        Args:
+            on_hand: Stock available at the start of the path
+            band: 'demand', or 'upper' / 'lower' for the earliest / latest likely day
+        
+        Returns:
+            The day, or None if stock lasts beyond the path
+        """
+        cumulative = np.cumsum(getattr(self, band), dtype=np.float64)
+        reached = np.flatnonzero(cumulative >= on_hand)
+        return self.start + timedelta(days=int(reached[0])) if len(reached) else None
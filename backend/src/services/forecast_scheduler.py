@@ -0,0 +1,210 @@
+"""
+Incremental forecast scheduler.
+
+A scheduler run refreshes, for every tenant and configured horizon, only
+the series that are due: never forecast, moved since their latest forecast
+(Inventory.last_movement_at after Forecast.generated_at), or with a
+forecast older than its horizon. Due series are forecast in chunks, those
+never forecast or with the oldest forecast first.
+
+Tenants share forecast_scheduler_concurrency slots. Each chunk waits for a
+slot and slots are handed out in arrival order, so tenants take turns and
+a large catalog cannot starve a small one.
+
+Each (tenant, horizon) refresh is recorded in forecast_runs and its counts
+updated after every chunk. A run left 'running' by a crash is resumed by
+the next scheduler run: series forecast since its started_at are no longer
+due, so finished chunks are not redone. Run a single scheduler at a time.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.database.session import SessionLocal
+from src.models.forecast import Forecast
+from src.models.forecast_run import ForecastRun, ForecastRunStatus
+from src.models.inventory import Inventory
+from src.services.forecast_service import ForecastService
+from src.services.movement_rollup_service import SeriesKey
+
+
+class ForecastScheduler:
+    """Selects due series and refreshes their forecasts tenant by tenant."""
+    
+    @staticmethod
+    def due_series(
+        db: Session,
+        tenant_id: UUID,
+        forecast_horizon_days: int,
+        since: Optional[datetime] = None
+    ) -> List[SeriesKey]:
+        """
+        Series whose forecast for a horizon needs refreshing, most overdue first.
+        
+        Args:
+            db: Database session
+            tenant_id: Tenant ID
+            forecast_horizon_days: Forecast horizon (7, 30, or 90)
+            since: Treat series forecast at or after this time as done
+        
+        Returns:
+            (product_id, warehouse_id) pairs
+        """
+        latest = (
+            select(
+                Forecast.product_id,
+                Forecast.warehouse_id,
+                func.max(Forecast.generated_at).label('generated_at')
+            )
+            .where(Forecast.tenant_id == tenant_id, Forecast.forecast_horizon_days == forecast_horizon_days)
+            .group_by(Forecast.product_id, Forecast.warehouse_id)
+            .subquery()
+        )
+        generated_at = latest.c.generated_at
+        
+        stale_before = datetime.now(timezone.utc) - timedelta(days=forecast_horizon_days)
+        due = or_(Inventory.last_movement_at > generated_at, generated_at < stale_before)
+        if since is not None:
+            due = and_(generated_at < since, due)
+        
+        query = (
+            select(Inventory.product_id, Inventory.warehouse_id)
+            .outerjoin(latest, and_(
+                latest.c.product_id == Inventory.product_id,
+                latest.c.warehouse_id == Inventory.warehouse_id
+            ))
+            .where(Inventory.tenant_id == tenant_id, or_(generated_at.is_(None), due))
+            .order_by(
+                generated_at.asc().nulls_first(),
+                Inventory.last_movement_at.desc().nulls_last(),
+                Inventory.product_id,
+                Inventory.warehouse_id
+            )
+        )
+        return [(product_id, warehouse_id) for product_id, warehouse_id in db.execute(query)]
+    
+    @staticmethod
+    def tenant_ids(db: Session) -> List[UUID]:
+        """Tenants with any inventory."""
+        return list(db.execute(select(Inventory.tenant_id).distinct()).scalars())
+    
+    @staticmethod
+    def start_run(db: Session, tenant_id: UUID, forecast_horizon_days: int) -> ForecastRun:
+        """Resume the tenant's unfinished run for the horizon, or start a new one."""
+        run = db.query(ForecastRun).filter(
+            ForecastRun.tenant_id == tenant_id,
+            ForecastRun.forecast_horizon_days == forecast_horizon_days,
+            ForecastRun.status == ForecastRunStatus.RUNNING.value
+        ).order_by(ForecastRun.started_at).first()
+        
+        if run is None:
+            run = ForecastRun(
+                tenant_id=tenant_id,
+                forecast_horizon_days=forecast_horizon_days,
+                status=ForecastRunStatus.RUNNING.value
+            )
+            db.add(run)
+            db.commit()
+            db.refresh(run)
+        
+        return run
+    
+    @staticmethod
+    async def run_tenant(
+        tenant_id: UUID,
+        forecast_horizon_days: int,
+        slots: asyncio.Semaphore,
+        model_type: str = "auto",
+        session_factory: Callable[[], Session] = SessionLocal
+    ) -> ForecastRun:
+        """
+        Refresh one tenant's due series for a horizon.
+        
+        Every chunk holds one of the shared slots while its ai-service
+        request runs. A failure is recorded on the run rather than raised,
+        so other tenants carry on.
+        
+        Returns:
+            The finished ForecastRun
+        """
+        db = session_factory()
+        try:
+            run = ForecastScheduler.start_run(db, tenant_id, forecast_horizon_days)
+            series = ForecastScheduler.due_series(db, tenant_id, forecast_horizon_days, since=run.started_at)
+            processed_before, failed_before = run.series_processed, run.series_failed
+            run.series_total = processed_before + len(series)
+            db.commit()
+            
+            batches = ForecastService.generate_forecasts_batch(
+                db, tenant_id, forecast_horizon_days,
+                series=series,
+                model_type=model_type,
+                concurrency=1
+            )
+            try:
+                while True:
+                    async with slots:
+                        try:
+                            progress = await batches.__anext__()
+                        except StopAsyncIteration:
+                            break
+                    run.series_processed = processed_before + progress.processed
+                    run.series_failed = failed_before + progress.failed
+                    if progress.errors:
+                        run.last_error = progress.errors[-1]
+                    db.commit()
+            except Exception as e:
+                db.rollback()
+                run.status = ForecastRunStatus.FAILED.value
+                run.last_error = f"{type(e).__name__}: {e}"
+            else:
+                run.status = ForecastRunStatus.COMPLETED.value
+            
+            run.finished_at = func.now()
+            db.commit()
+            db.refresh(run)
+            return run
+        finally:
+            db.close()
+    
+    @staticmethod
+    async def run(
+        tenant_ids: Optional[Sequence[UUID]] = None,
+        horizons: Optional[Sequence[int]] = None,
+        concurrency: Optional[int] = None,
+        model_type: str = "auto",
+        session_factory: Callable[[], Session] = SessionLocal
+    ) -> List[ForecastRun]:
+        """
+        Refresh due forecasts of several tenants at once.
+        
+        Args:
+            tenant_ids: Tenants to refresh (defaults to every tenant with inventory)
+            horizons: Horizons to refresh (defaults to settings)
+            concurrency: Chunks in flight across all tenants (defaults to settings)
+            model_type: Model type to use
+            session_factory: Creates the session of each tenant run
+        
+        Returns:
+            One ForecastRun per tenant and horizon
+        """
+        horizons = horizons or settings.forecast_scheduler_horizons
+        slots = asyncio.Semaphore(concurrency or settings.forecast_scheduler_concurrency)
+        
+        if tenant_ids is None:
+            db = session_factory()
+            try:
+                tenant_ids = ForecastScheduler.tenant_ids(db)
+            finally:
+                db.close()
+        
+        return list(await asyncio.gather(*(
+            ForecastScheduler.run_tenant(tenant_id, horizon, slots, model_type, session_factory)
+            for tenant_id in tenant_ids
+            for horizon in horizons
+        )))
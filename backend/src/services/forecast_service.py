@@ -1,17 +1,82 @@
 """
 Forecast service for managing forecasts and integrating with AI service.
 """
-from typing import List, Optional, Dict
-from uuid import UUID
-from datetime import date, datetime, timedelta, timezone
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, List, Optional, Dict, Sequence, Tuple
+from uuid import UUID, uuid4
+from datetime import date, timedelta
 from decimal import Decimal
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc, or_
+from sqlalchemy import desc, func, select
+from sqlalchemy.dialects import postgresql, sqlite
 
+from src.config.settings import settings
 from src.models.forecast import Forecast
 from src.models.inventory import Inventory
-from src.models.inventory_movement import InventoryMovement
 from src.services.ai_service_client import ai_service_client
+from src.services.forecast_path import DailyForecast, pack_result
+from src.services.movement_rollup_service import MovementRollupService, SeriesKey
+
+
+@dataclass
+class ForecastHistory:
+    """Daily demand history of several series, aligned to one date index."""
+    dates: np.ndarray  # datetime64[D], oldest first
+    series: List[SeriesKey]  # (product_id, warehouse_id) per row
+    quantities: np.ndarray  # float64, shape (len(series), len(dates))
+    
+    def __len__(self) -> int:
+        return len(self.dates)
+    
+    def to_records(self, row: int = 0) -> List[Dict[str, Any]]:
+        """One series as {date, quantity} records, the ai-service request format."""
+        return [
+            {"date": str(day), "quantity": float(quantity)}
+            for day, quantity in zip(self.dates, self.quantities[row])
+        ]
+    
+    def take(self, rows: slice) -> "ForecastHistory":
+        """The history of a subset of the series."""
+        return ForecastHistory(dates=self.dates, series=self.series[rows], quantities=self.quantities[rows])
+
+
+@dataclass
+class BatchForecastProgress:
+    """Progress of a batch forecast run, reported after each chunk of series."""
+    total: int  # Series in the run
+    processed: int = 0
+    forecasted: int = 0
+    failed: int = 0
+    errors: List[str] = field(default_factory=list)  # One message per failed ai-service request
+    
+    @property
+    def done(self) -> bool:
+        return self.processed >= self.total
+
+
+@dataclass
+class StockoutEstimate:
+    """When available stock of a series runs out under its latest daily forecast path."""
+    forecast: Forecast
+    on_hand: float  # Available stock: quantity minus reserved_quantity
+    expected: Optional[date]  # Cumulative daily demand reaches on_hand; None if stock lasts beyond the path
+    earliest: Optional[date]  # Same under the upper band
+    latest: Optional[date]  # Same under the lower band
+    path_end: date
+    stale: bool = False  # The path ends before the day after as_of, so nothing was estimated
+
+
+# Forecast columns replaced when a batch run forecasts a series again on the same day
+_UPSERT_COLUMNS = (
+    'predicted_demand', 'confidence_lower', 'confidence_upper', 'confidence_level',
+    'model_version', 'model_type', 'features_json', 'daily_path'
+)
+
+
+def _decimal(value) -> Optional[Decimal]:
+    return Decimal(str(value)) if value is not None else None
 
 
 class ForecastService:
@@ -24,7 +89,7 @@ class ForecastService:
         warehouse_id: UUID,
         forecast_horizon_days: int,
         tenant_id: UUID,
-        model_type: str = "exponential_smoothing"
+        model_type: str = "auto"
     ) -> Forecast:
         """
         Generate forecast using AI service.
@@ -40,19 +105,19 @@ class ForecastService:
         Returns:
             Created Forecast
         """
-        # Get historical inventory movement data
-        historical_data = ForecastService._get_historical_data(
+        # Get daily demand history
+        history = ForecastService._get_historical_data(
             db, product_id, warehouse_id, tenant_id, days=90
         )
         
-        if len(historical_data) < 10:
+        if len(history) < 10:
             raise ValueError("Insufficient historical data. Need at least 10 data points.")
         
         # Call AI service
         forecast_result = await ai_service_client.generate_forecast(
             product_id=product_id,
             warehouse_id=warehouse_id,
-            historical_data=historical_data,
+            historical_data=history.to_records(),
             forecast_horizon_days=forecast_horizon_days,
             model_type=model_type
         )
@@ -69,8 +134,9 @@ class ForecastService:
             confidence_upper=Decimal(str(forecast_result['confidence_upper'])) if forecast_result.get('confidence_upper') else None,
             confidence_level=Decimal(str(forecast_result.get('confidence_level', 0.80))),
             model_version=forecast_result['model_version'],
-            model_type=model_type,
-            features_json=forecast_result.get('features')
+            model_type=forecast_result.get('model_type', model_type),
+            features_json=forecast_result.get('features'),
+            daily_path=pack_result(forecast_result)
         )
         
         db.add(forecast)
@@ -79,6 +145,144 @@ class ForecastService:
         
         return forecast
     
+    @staticmethod
+    async def generate_forecasts_batch(
+        db: Session,
+        tenant_id: UUID,
+        forecast_horizon_days: int,
+        warehouse_id: Optional[UUID] = None,
+        series: Optional[Sequence[SeriesKey]] = None,
+        model_type: str = "auto",
+        days: int = 90,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> AsyncIterator[BatchForecastProgress]:
+        """
+        Forecast every inventory row of a tenant, or of one warehouse.
+        
+        Series are processed in the given order. Histories are read batch_size * concurrency series at a time. Each
+        chunk is sent to the ai-service in requests of batch_size series, at
+        most concurrency in flight, and the results are upserted (one row
+        per series, horizon and day) and committed before the next chunk.
+        A failed request only fails its own series.
+        
+        Args:
+            db: Database session
+            tenant_id: Tenant ID
+            forecast_horizon_days: Forecast horizon (7, 30, or 90)
+            warehouse_id: Only forecast this warehouse
+            series: Forecast these (product_id, warehouse_id) pairs instead
+            model_type: Model type to use
+            days: Days of history per series
+            batch_size: Series per ai-service request (defaults to settings)
+            concurrency: ai-service requests in flight (defaults to settings)
+        
+        Yields:
+            Progress after each chunk; the last one has done set
+        """
+        if days < 10:
+            raise ValueError("Insufficient historical data. Need at least 10 data points.")
+        
+        batch_size = batch_size or settings.forecast_batch_size
+        concurrency = concurrency or settings.forecast_batch_concurrency
+        semaphore = asyncio.Semaphore(concurrency)
+        forecast_date = date.today()
+        
+        if series is None:
+            series = ForecastService._inventory_series(db, tenant_id, warehouse_id)
+        series = list(series)
+        progress = BatchForecastProgress(total=len(series))
+        
+        async def request(history: ForecastHistory) -> Dict[str, Any]:
+            async with semaphore:
+                return await ai_service_client.generate_forecast_batch(
+                    series_ids=[f"{product_id}:{series_warehouse_id}" for product_id, series_warehouse_id in history.series],
+                    start_date=str(history.dates[0]),
+                    quantities=history.quantities,
+                    forecast_horizon_days=forecast_horizon_days,
+                    model_type=model_type
+                )
+        
+        chunk_size = batch_size * concurrency
+        for offset in range(0, len(series), chunk_size):
+            history = ForecastService.get_history(db, tenant_id, series=series[offset:offset + chunk_size], days=days)
+            batches = [history.take(slice(i, i + batch_size)) for i in range(0, len(history.series), batch_size)]
+            results = await asyncio.gather(*(request(batch) for batch in batches), return_exceptions=True)
+            
+            rows = []
+            for batch, result in zip(batches, results):
+                if isinstance(result, BaseException):
+                    progress.failed += len(batch.series)
+                    progress.errors.append(f"{type(result).__name__}: {result}")
+                    continue
+                rows.extend(ForecastService._forecast_rows(
+                    tenant_id, batch.series, result, forecast_horizon_days, forecast_date, model_type
+                ))
+            
+            ForecastService._upsert_forecasts(db, rows)
+            db.commit()
+            
+            progress.forecasted += len(rows)
+            progress.processed += len(history.series)
+            yield progress
+        
+        if not series:
+            yield progress
+    
+    @staticmethod
+    def _forecast_rows(
+        tenant_id: UUID,
+        series: Sequence[SeriesKey],
+        result: Dict[str, Any],
+        forecast_horizon_days: int,
+        forecast_date: date,
+        model_type: str
+    ) -> List[Dict[str, Any]]:
+        """Forecast table rows from a columnar ai-service batch result."""
+        count = len(series)
+        lower = result.get('confidence_lower') or [None] * count
+        upper = result.get('confidence_upper') or [None] * count
+        features = result.get('features') or {}
+        model_types = result.get('model_types') or [model_type] * count
+        
+        return [
+            {
+                'id': uuid4(),
+                'tenant_id': tenant_id,
+                'product_id': product_id,
+                'warehouse_id': warehouse_id,
+                'forecast_horizon_days': forecast_horizon_days,
+                'forecast_date': forecast_date,
+                'predicted_demand': _decimal(max(result['predicted_demand'][i], 0)),  # ck_forecast_demand_non_negative
+                'confidence_lower': _decimal(lower[i]),
+                'confidence_upper': _decimal(upper[i]),
+                'confidence_level': _decimal(result.get('confidence_level', 0.80)),
+                'model_version': result['model_version'],
+                'model_type': model_types[i],
+                'features_json': {name: values[i] for name, values in features.items()} or None,
+                'daily_path': pack_result(result, i)
+            }
+            for i, (product_id, warehouse_id) in enumerate(series)
+        ]
+    
+    @staticmethod
+    def _upsert_forecasts(db: Session, rows: List[Dict[str, Any]]) -> None:
+        """Insert forecasts, replacing any for the same series, horizon and day, in one statement."""
+        if not rows:
+            return
+        
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = dialect.insert(Forecast)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['tenant_id', 'product_id', 'warehouse_id', 'forecast_horizon_days', 'forecast_date'],
+            set_={
+                **{column: stmt.excluded[column] for column in _UPSERT_COLUMNS},
+                'generated_at': func.now(),
+                'updated_at': func.now()
+            }
+        )
+        db.execute(stmt, rows)
+    
     @staticmethod
     def _get_historical_data(
         db: Session,
@@ -86,63 +290,69 @@ class ForecastService:
         warehouse_id: UUID,
         tenant_id: UUID,
         days: int = 90
-    ) -> List[dict]:
-        """Get historical inventory data for forecasting."""
-        # Get inventory movements for the last N days
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
-        
-        movements = db.query(InventoryMovement).filter(
-            and_(
-                InventoryMovement.tenant_id == tenant_id,
-                InventoryMovement.product_id == product_id,
-                InventoryMovement.performed_at >= cutoff_date
-            )
-        ).filter(
-            or_(
-                InventoryMovement.destination_warehouse_id == warehouse_id,
-                InventoryMovement.source_warehouse_id == warehouse_id
-            )
-        ).order_by(InventoryMovement.performed_at).all()
+    ) -> "ForecastHistory":
+        """Forecast history of one product in one warehouse (see get_history)."""
+        return ForecastService.get_history(db, tenant_id, series=[(product_id, warehouse_id)], days=days)
+    
+    @staticmethod
+    def get_history(
+        db: Session,
+        tenant_id: UUID,
+        series: Optional[Sequence[SeriesKey]] = None,
+        warehouse_id: Optional[UUID] = None,
+        days: int = 90
+    ) -> "ForecastHistory":
+        """
+        Get daily demand history for forecasting, for many series at once.
         
-        # Get current inventory
-        inventory = db.query(Inventory).filter(
-            and_(
-                Inventory.tenant_id == tenant_id,
-                Inventory.product_id == product_id,
-                Inventory.warehouse_id == warehouse_id
-            )
-        ).first()
-        
-        # Build historical data points
-        # For simplicity, aggregate by day
-        daily_data: Dict[date, float] = {}
-        current_quantity = float(inventory.quantity) if inventory else 0.0
-        
-        # Work backwards from today
-        for i in range(days):
-            day = date.today() - timedelta(days=i)
-            daily_data[day] = 0.0
-        
-        # Process movements to calculate daily quantities
-        for movement in movements:
-            movement_date = movement.performed_at.date()
-            if movement.destination_warehouse_id == warehouse_id:
-                # Inbound or transfer in
-                daily_data[movement_date] = daily_data.get(movement_date, 0) + float(movement.quantity)
-            elif movement.source_warehouse_id == warehouse_id:
-                # Outbound or transfer out
-                daily_data[movement_date] = daily_data.get(movement_date, 0) - float(movement.quantity)
-        
-        # Convert to list format
-        historical_data = [
-            {
-                "date": day.isoformat(),
-                "quantity": current_quantity + daily_data.get(day, 0)
-            }
-            for day in sorted(daily_data.keys())
-        ]
+        Demand is the stock leaving the warehouse each day (outbound plus
+        transfer-out quantity, see DAILY_DEMAND), so forecasts predict
+        consumption. Days without movements have zero demand. It is summed
+        in SQL from daily_movement_rollup, so the cost is one row per series
+        and day with movements rather than one per movement, and all series
+        share a round trip per chunk.
+        
+        Args:
+            db: Database session
+            tenant_id: Tenant ID
+            series: (product_id, warehouse_id) pairs; defaults to every
+                inventory row of the tenant (or of warehouse_id)
+            warehouse_id: Limit the default series to one warehouse
+            days: Days of history, ending today
+        
+        Returns:
+            ForecastHistory with one row per series
+        """
+        today = date.today()
+        start = today - timedelta(days=days - 1)
+        
+        if series is None:
+            series = ForecastService._inventory_series(db, tenant_id, warehouse_id)
+        series = list(series)
         
-        return historical_data
+        index = {key: i for i, key in enumerate(series)}
+        demand = np.zeros((len(series), days))
+        for product_id, series_warehouse_id, day, quantity in MovementRollupService.iter_demand_by_day(
+            db, tenant_id, start, today, series=series, warehouse_id=warehouse_id
+        ):
+            row = index.get((product_id, series_warehouse_id))
+            if row is not None:
+                demand[row, (day - start).days] = float(quantity)
+        
+        return ForecastHistory(
+            dates=np.arange(np.datetime64(start, 'D'), np.datetime64(today, 'D') + 1),
+            series=series,
+            quantities=demand
+        )
+    
+    @staticmethod
+    def _inventory_series(db: Session, tenant_id: UUID, warehouse_id: Optional[UUID]) -> List[SeriesKey]:
+        """(product_id, warehouse_id) of every inventory row of the tenant, or of one warehouse."""
+        query = select(Inventory.product_id, Inventory.warehouse_id).where(Inventory.tenant_id == tenant_id)
+        if warehouse_id:
+            query = query.where(Inventory.warehouse_id == warehouse_id)
+        
+        return [tuple(row) for row in db.execute(query.order_by(Inventory.warehouse_id, Inventory.product_id))]
     
     @staticmethod
     def get_forecasts(
@@ -167,3 +377,96 @@ class ForecastService:
             query = query.filter(Forecast.forecast_horizon_days == forecast_horizon_days)
         
         return query.order_by(desc(Forecast.generated_at)).offset(skip).limit(limit).all()
+    
+    @staticmethod
+    def get_daily_forecast(
+        db: Session,
+        tenant_id: UUID,
+        product_id: UUID,
+        warehouse_id: UUID,
+        forecast_horizon_days: Optional[int] = None,
+        start: Optional[date] = None,
+        end: Optional[date] = None
+    ) -> Optional[Tuple[Forecast, DailyForecast]]:
+        """
+        Latest forecast of a series that has a daily path, and the path's days from start to end.
+        
+        Forecasts stored before daily paths were kept are skipped.
+        
+        Returns:
+            (forecast, daily path), or None if the series has no daily path
+        """
+        query = db.query(Forecast).filter(
+            Forecast.tenant_id == tenant_id,
+            Forecast.product_id == product_id,
+            Forecast.warehouse_id == warehouse_id,
+            Forecast.daily_path.isnot(None)
+        )
+        
+        if forecast_horizon_days:
+            query = query.filter(Forecast.forecast_horizon_days == forecast_horizon_days)
+        
+        forecast = query.order_by(desc(Forecast.forecast_date), desc(Forecast.generated_at)).first()
+        if forecast is None:
+            return None
+        
+        path = DailyForecast.unpack(forecast.daily_path, forecast.forecast_date)
+        return forecast, path.slice(start, end)
+    
+    @staticmethod
+    def estimate_stockout(
+        db: Session,
+        tenant_id: UUID,
+        product_id: UUID,
+        warehouse_id: UUID,
+        forecast_horizon_days: Optional[int] = None,
+        as_of: Optional[date] = None
+    ) -> Optional[StockoutEstimate]:
+        """
+        Estimate when available stock runs out, from the latest daily forecast path.
+        
+        Available stock (quantity minus reserved_quantity) covers demand
+        from the day after as_of (defaults to today); the band gives the
+        earliest and latest likely day. If the latest path ends before that
+        day, the estimate is marked stale and has no dates.
+        
+        Returns:
+            The estimate, or None if the series has no inventory row or no daily path
+        """
+        as_of = as_of or date.today()
+        available = db.execute(
+            select(Inventory.quantity - Inventory.reserved_quantity).where(
+                Inventory.tenant_id == tenant_id,
+                Inventory.product_id == product_id,
+                Inventory.warehouse_id == warehouse_id
+            )
+        ).scalar()
+        if available is None:
+            return None
+        
+        daily = ForecastService.get_daily_forecast(db, tenant_id, product_id, warehouse_id, forecast_horizon_days)
+        if daily is None:
+            return None
+        
+        forecast, path = daily
+        on_hand = float(available)
+        remaining = path.slice(start=as_of + timedelta(days=1))
+        if not len(remaining):
+            return StockoutEstimate(
+                forecast=forecast,
+                on_hand=on_hand,
+                expected=None,
+                earliest=None,
+                latest=None,
+                path_end=path.end,
+                stale=True
+            )
+        
+        return StockoutEstimate(
+            forecast=forecast,
+            on_hand=on_hand,
+            expected=remaining.depletion_day(on_hand),
+            earliest=remaining.depletion_day(on_hand, band='upper'),
+            latest=remaining.depletion_day(on_hand, band='lower'),
+            path_end=remaining.end
+        )
@@ -0,0 +1,197 @@
+"""
+Stores for Idempotency-Key request de-duplication.
+
+A key is first reserved while the original request runs, then replaced by
+the response it produced. Retries with the same key get the stored
+response back instead of repeating the write. Stored responses expire
+after a TTL; a reservation only holds its key for a short lease, so a key
+whose worker died mid-request can be claimed again without waiting for the
+full TTL.
+
+The default store is an in-memory LRU, which is per process: with several
+API workers a retry only hits if it reaches the same worker. Set
+idempotency_backend to 'redis' to share keys between workers; the memory
+store logs a warning when web_concurrency says several workers run.
+"""
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from threading import Lock
+from typing import Dict, List, Optional, Tuple, Union
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoredResponse:
+    """Response recorded for an idempotency key."""
+    fingerprint: str  # Hash of the request the key was first used with
+    status_code: int
+    headers: List[Tuple[str, str]]
+    body: str  # Raw bytes decoded as latin-1, so any body round-trips through JSON
+
+
+@dataclass
+class _InFlight:
+    """Marker for a key whose original request is still running."""
+    fingerprint: str
+
+
+Entry = Union[StoredResponse, _InFlight]
+
+
+class IdempotencyStore(ABC):
+    """Interface for idempotency key stores."""
+    
+    @abstractmethod
+    async def reserve(self, key: str, fingerprint: str) -> Optional[Entry]:
+        """
+        Claim a key for a new request.
+        
+        Args:
+            key: Scoped idempotency key
+            fingerprint: Hash of the request
+        
+        Returns:
+            None if the key was claimed, otherwise the existing entry (the
+            stored response, or an in-flight marker)
+        """
+    
+    @abstractmethod
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        """Replace a reservation with the response of the original request."""
+    
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """Drop a reservation so the request can be retried."""
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """Per-process LRU store with a size bound and TTL."""
+    
+    def __init__(self, max_entries: int = 10000, ttl_seconds: int = 86400, in_flight_ttl_seconds: int = 60):
+        """
+        Initialize the store.
+        
+        Args:
+            max_entries: Entries kept before the least recently used are evicted
+            ttl_seconds: Seconds a stored response is kept
+            in_flight_ttl_seconds: Seconds a reservation holds its key
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.in_flight_ttl_seconds = in_flight_ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Entry]]" = OrderedDict()  # key -> (expires_at, entry)
+        self._lock = Lock()
+    
+    async def reserve(self, key: str, fingerprint: str) -> Optional[Entry]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and item[0] > now:
+                self._entries.move_to_end(key)
+                return item[1]
+            self._put(key, _InFlight(fingerprint), now + self.in_flight_ttl_seconds)
+            return None
+    
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        with self._lock:
+            self._put(key, response, time.monotonic() + self.ttl_seconds)
+    
+    async def release(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def _put(self, key: str, entry: Entry, expires_at: float) -> None:
+        self._entries[key] = (expires_at, entry)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def stats(self) -> Dict[str, int]:
+        """Number of keys currently held."""
+        return {"entries": len(self._entries)}
+
+
+class RedisIdempotencyStore(IdempotencyStore):
+    """Store shared by all workers, kept in Redis with a TTL per key."""
+    
+    def __init__(
+        self,
+        url: str,
+        ttl_seconds: int = 86400,
+        in_flight_ttl_seconds: int = 60,
+        prefix: str = "idempotency:"
+    ):
+        """
+        Initialize the store.
+        
+        Args:
+            url: Redis URL
+            ttl_seconds: Seconds a stored response is kept
+            in_flight_ttl_seconds: Seconds a reservation holds its key
+            prefix: Prefix for the Redis keys
+        """
+        import redis.asyncio as redis
+        
+        self.ttl_seconds = ttl_seconds
+        self.in_flight_ttl_seconds = in_flight_ttl_seconds
+        self.prefix = prefix
+        self._redis = redis.from_url(url)
+    
+    async def reserve(self, key: str, fingerprint: str) -> Optional[Entry]:
+        value = json.dumps({"in_flight": True, "fingerprint": fingerprint})
+        # Short lease: if this worker dies before complete(), the key frees up quickly
+        if await self._redis.set(self.prefix + key, value, nx=True, ex=self.in_flight_ttl_seconds):
+            return None
+        
+        raw = await self._redis.get(self.prefix + key)
+        if raw is None:  # Expired or released in between; claim it on the next retry
+            return _InFlight(fingerprint)
+        data = json.loads(raw)
+        if data.pop("in_flight", False):
+            return _InFlight(data["fingerprint"])
+        return StoredResponse(
+            fingerprint=data["fingerprint"],
+            status_code=data["status_code"],
+            headers=[tuple(header) for header in data["headers"]],
+            body=data["body"]
+        )
+    
+    async def complete(self, key: str, response: StoredResponse) -> None:
+        await self._redis.set(self.prefix + key, json.dumps(asdict(response)), ex=self.ttl_seconds)
+    
+    async def release(self, key: str) -> None:
+        await self._redis.delete(self.prefix + key)
+
+
+def create_idempotency_store() -> IdempotencyStore:
+    """Build the store selected by settings.idempotency_backend."""
+    if settings.idempotency_backend == "redis":
+        return RedisIdempotencyStore(
+            settings.redis_url,
+            ttl_seconds=settings.idempotency_ttl_seconds,
+            in_flight_ttl_seconds=settings.idempotency_in_flight_ttl_seconds
+        )
+    if settings.idempotency_backend == "memory":
+        if settings.web_concurrency > 1:
+            logger.warning(
+                "idempotency_backend is 'memory' with %d workers: retries reaching another worker "
+                "are applied again. Set IDEMPOTENCY_BACKEND=redis.",
+                settings.web_concurrency
+            )
+        return MemoryIdempotencyStore(
+            max_entries=settings.idempotency_max_entries,
+            ttl_seconds=settings.idempotency_ttl_seconds,
+            in_flight_ttl_seconds=settings.idempotency_in_flight_ttl_seconds
+        )
+    raise ValueError(f"Unknown idempotency_backend: {settings.idempotency_backend}. Must be 'memory' or 'redis'")
+
+
+# Global store instance
+idempotency_store = create_idempotency_store()
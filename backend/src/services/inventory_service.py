@@ -1,19 +1,64 @@
 """
 Inventory service for managing inventory levels and queries.
 """
-from typing import List, Optional
-from uuid import UUID
-from decimal import Decimal
+import base64
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from uuid import UUID, uuid4
+from decimal import Decimal, InvalidOperation
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, delete, or_, insert, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 
 from src.models.inventory import Inventory
 from src.models.inventory_movement import InventoryMovement, MovementType
 from src.models.product import Product
 from src.models.warehouse import Warehouse
 from src.services.audit_service import AuditService
-from src.database.tenant_context import get_current_tenant_id
-from datetime import datetime, timezone
+from src.services.inventory_summary_service import InventorySummaryService
+from src.services.movement_rollup_service import MovementRollupService
+from src.services.outbox_service import OutboxService
+from src.services.stock_alert_service import StockAlertService, is_below_minimum
+from datetime import datetime, timedelta, timezone
+
+
+# Upper bound on rows accepted by a single batch ingestion call
+MAX_MOVEMENT_BATCH_SIZE = 5000
+
+# Window of movement history returned when no start time is given
+DEFAULT_MOVEMENT_HISTORY_DAYS = 90
+
+
+class StockChange(NamedTuple):
+    """Result of an atomic stock update on one inventory row."""
+    inventory_id: UUID
+    quantity_before: Decimal
+    quantity_after: Decimal
+    version: int
+    minimum_stock: Optional[Decimal] = None
+    created: bool = False  # The inventory row was inserted by this change
+
+
+def encode_inventory_cursor(warehouse_id: UUID, sku: str, inventory_id: UUID) -> str:
+    """Encode the (warehouse, sku, id) position of a row as an opaque cursor."""
+    payload = json.dumps([str(warehouse_id), sku, str(inventory_id)], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_inventory_cursor(cursor: str) -> Tuple[UUID, str, UUID]:
+    """
+    Decode a cursor produced by encode_inventory_cursor.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        warehouse_id, sku, inventory_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return UUID(warehouse_id), str(sku), UUID(inventory_id)
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError("Invalid pagination cursor")
 
 
 class InventoryService:
@@ -35,12 +80,7 @@ class InventoryService:
             query = query.filter(Inventory.warehouse_id == warehouse_id)
         
         if low_stock_only:
-            query = query.filter(
-                and_(
-                    Inventory.minimum_stock.isnot(None),
-                    Inventory.quantity < Inventory.minimum_stock
-                )
-            )
+            query = query.filter(Inventory.below_minimum == True)
         
         return query.offset(skip).limit(limit).all()
     
@@ -76,8 +116,7 @@ class InventoryService:
         query = db.query(Inventory).filter(
             and_(
                 Inventory.tenant_id == tenant_id,
-                Inventory.minimum_stock.isnot(None),
-                Inventory.quantity < Inventory.minimum_stock
+                Inventory.below_minimum == True  # Served by the idx_inventory_below_minimum partial index
             )
         )
         
@@ -101,6 +140,10 @@ class InventoryService:
             db, product_id, warehouse_id, tenant_id
         )
         
+        created = inventory is None
+        quantity_before = inventory.quantity if inventory else Decimal('0')
+        minimum_stock_before = inventory.minimum_stock if inventory else None
+        
         if inventory:
             inventory.quantity = quantity
             if minimum_stock is not None:
@@ -109,6 +152,7 @@ class InventoryService:
                 inventory.safety_stock = safety_stock
         else:
             inventory = Inventory(
+                id=uuid4(),
                 tenant_id=tenant_id,
                 product_id=product_id,
                 warehouse_id=warehouse_id,
@@ -118,18 +162,45 @@ class InventoryService:
             )
             db.add(inventory)
         
+        inventory.below_minimum = StockAlertService.stage_crossing(
+            db,
+            tenant_id=tenant_id,
+            inventory_id=inventory.id,
+            product_id=product_id,
+            warehouse_id=warehouse_id,
+            was_below=not created and is_below_minimum(Decimal(str(quantity_before)), minimum_stock_before),
+            quantity=Decimal(str(quantity)),
+            minimum_stock=Decimal(str(inventory.minimum_stock)) if inventory.minimum_stock is not None else None
+        )
+        InventorySummaryService.stage_stock_change(
+            db,
+            tenant_id=tenant_id,
+            warehouse_id=warehouse_id,
+            quantity_before=Decimal(str(quantity_before)),
+            quantity_after=Decimal(str(quantity)),
+            minimum_stock_before=minimum_stock_before,
+            minimum_stock_after=inventory.minimum_stock,
+            created=created
+        )
+        InventoryService._stage_inventory_updated(
+            db, tenant_id, inventory.id, product_id, warehouse_id,
+            Decimal(str(quantity)),
+            Decimal(str(inventory.minimum_stock)) if inventory.minimum_stock is not None else None,
+            inventory.last_movement_at
+        )
+        
         db.commit()
         db.refresh(inventory)
         return inventory
     
     @staticmethod
-    def get_inventory_with_details(
+    def _inventory_details_query(
         db: Session,
         tenant_id: UUID,
         warehouse_id: Optional[UUID] = None,
         low_stock_only: bool = False
-    ) -> List[dict]:
-        """Get inventory with product and warehouse details for dashboard."""
+    ):
+        """Inventory joined with product and warehouse, in (warehouse, sku, id) order."""
         query = db.query(
             Inventory,
             Product,
@@ -139,42 +210,141 @@ class InventoryService:
         ).join(
             Warehouse, Inventory.warehouse_id == Warehouse.id
         ).filter(
-            Inventory.tenant_id == tenant_id
+            Inventory.tenant_id == tenant_id,
+            # Redundant with the join, but lets a page walk idx_products_tenant_sku in order
+            Product.tenant_id == tenant_id
         )
         
         if warehouse_id:
             query = query.filter(Inventory.warehouse_id == warehouse_id)
         
         if low_stock_only:
-            query = query.filter(
-                and_(
-                    Inventory.minimum_stock.isnot(None),
-                    Inventory.quantity < Inventory.minimum_stock
-                )
-            )
+            query = query.filter(Inventory.below_minimum == True)
+        
+        return query.order_by(Inventory.warehouse_id, Product.sku, Inventory.id)
+    
+    @staticmethod
+    def _inventory_details_row(inv: Inventory, prod: Product, wh: Warehouse) -> dict:
+        """Dashboard representation of one inventory row."""
+        return {
+            'id': str(inv.id),
+            'product_id': str(inv.product_id),
+            'product_sku': prod.sku,
+            'product_name': prod.name,
+            'warehouse_id': str(inv.warehouse_id),
+            'warehouse_name': wh.name,
+            'quantity': float(inv.quantity),
+            'reserved_quantity': float(inv.reserved_quantity),
+            'available_quantity': float(inv.available_quantity),
+            'minimum_stock': float(inv.minimum_stock) if inv.minimum_stock else None,
+            'safety_stock': float(inv.safety_stock) if inv.safety_stock else None,
+            'is_low_stock': inv.is_low_stock,
+            'unit_of_measure': prod.unit_of_measure,
+            'last_movement_at': inv.last_movement_at.isoformat() if inv.last_movement_at else None,
+        }
+    
+    @staticmethod
+    def get_inventory_with_details(
+        db: Session,
+        tenant_id: UUID,
+        warehouse_id: Optional[UUID] = None,
+        low_stock_only: bool = False,
+        skip: int = 0,
+        limit: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Get inventory with product and warehouse details for dashboard.
+        
+        Rows are ordered by (warehouse, sku, id); skip and limit are applied in
+        the query. Prefer get_inventory_page for deep pages, since OFFSET still
+        reads every skipped row.
+        """
+        query = InventoryService._inventory_details_query(
+            db, tenant_id, warehouse_id=warehouse_id, low_stock_only=low_stock_only
+        )
         
-        results = query.all()
+        if skip:
+            query = query.offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
         
         return [
-            {
-                'id': str(inv.id),
-                'product_id': str(inv.product_id),
-                'product_sku': prod.sku,
-                'product_name': prod.name,
-                'warehouse_id': str(inv.warehouse_id),
-                'warehouse_name': wh.name,
-                'quantity': float(inv.quantity),
-                'reserved_quantity': float(inv.reserved_quantity),
-                'available_quantity': float(inv.available_quantity),
-                'minimum_stock': float(inv.minimum_stock) if inv.minimum_stock else None,
-                'safety_stock': float(inv.safety_stock) if inv.safety_stock else None,
-                'is_low_stock': inv.is_low_stock,
-                'unit_of_measure': prod.unit_of_measure,
-                'last_movement_at': inv.last_movement_at.isoformat() if inv.last_movement_at else None,
-            }
-            for inv, prod, wh in results
+            InventoryService._inventory_details_row(inv, prod, wh)
+            for inv, prod, wh in query.all()
         ]
     
+    @staticmethod
+    def get_inventory_page(
+        db: Session,
+        tenant_id: UUID,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        warehouse_id: Optional[UUID] = None,
+        low_stock_only: bool = False
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Get one page of inventory details using keyset pagination.
+        
+        Rows are ordered by (warehouse, sku, id). Each warehouse is read with
+        its own bounded query that continues after the cursor's (sku, id), so
+        the cost of a page depends on the page size rather than on how many
+        inventory rows the tenant has or how deep the page is.
+        
+        Args:
+            db: Database session
+            tenant_id: Tenant ID
+            limit: Maximum number of rows to return
+            cursor: next_cursor from the previous page, or None for the first page
+            warehouse_id: Restrict to a single warehouse
+            low_stock_only: Only return items below their minimum stock
+        
+        Returns:
+            Tuple of (rows, next_cursor); next_cursor is None on the last page
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        position = decode_inventory_cursor(cursor) if cursor else None
+        
+        # Warehouses are few; walk them in id order and page within each one
+        warehouse_query = db.query(Warehouse.id).filter(
+            Warehouse.tenant_id == tenant_id
+        ).order_by(Warehouse.id)
+        if warehouse_id:
+            warehouse_query = warehouse_query.filter(Warehouse.id == warehouse_id)
+        if position:
+            warehouse_query = warehouse_query.filter(Warehouse.id >= position[0])
+        
+        rows = []
+        for (current_warehouse_id,) in warehouse_query.all():
+            query = InventoryService._inventory_details_query(
+                db, tenant_id, warehouse_id=current_warehouse_id, low_stock_only=low_stock_only
+            )
+            if position and position[0] == current_warehouse_id:
+                query = query.filter(
+                    tuple_(Product.sku, Inventory.id) > tuple_(position[1], position[2])
+                )
+            
+            # SKUs are unique per tenant, so within one warehouse ordering by sku
+            # alone matches (sku, id) and can be read straight off the index
+            query = query.order_by(None).order_by(Product.sku)
+            
+            # One extra row tells us whether another page follows
+            rows.extend(query.limit(limit + 1 - len(rows)).all())
+            if len(rows) > limit:
+                break
+        
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last_inv, last_prod, _ = rows[-1]
+            next_cursor = encode_inventory_cursor(last_inv.warehouse_id, last_prod.sku, last_inv.id)
+        
+        return [
+            InventoryService._inventory_details_row(inv, prod, wh)
+            for inv, prod, wh in rows
+        ], next_cursor
+    
     @staticmethod
     def create_inbound_movement(
         db: Session,
@@ -184,7 +354,8 @@ class InventoryService:
         tenant_id: UUID,
         performed_by: UUID,
         reference_number: Optional[str] = None,
-        notes: Optional[str] = None
+        notes: Optional[str] = None,
+        commit: bool = True
     ) -> InventoryMovement:
         """
         Create an inbound movement (receiving stock).
@@ -198,46 +369,28 @@ class InventoryService:
             performed_by: User ID performing the movement
             reference_number: Optional reference number (e.g., PO number)
             notes: Optional notes
-            
+            commit: Commit the unit of work; pass False to only flush so the
+                caller can group several movements in one transaction
+        
         Returns:
             Created InventoryMovement
-            
+        
         Raises:
             ValueError: If quantity is invalid
         """
         if quantity <= 0:
             raise ValueError("Quantity must be positive")
         
-        # Get or create inventory record
-        inventory = InventoryService.get_by_product_and_warehouse(
-            db, product_id, destination_warehouse_id, tenant_id
+        # Add stock in one statement, creating the inventory record if needed
+        change = InventoryService._increment_stock(
+            db, tenant_id, product_id, destination_warehouse_id, quantity
         )
-        
-        quantity_before = Decimal('0')
-        if inventory:
-            quantity_before = inventory.quantity
-            # Check optimistic locking (version will be incremented on update)
-            current_version = inventory.version
-        else:
-            inventory = Inventory(
-                tenant_id=tenant_id,
-                product_id=product_id,
-                warehouse_id=destination_warehouse_id,
-                quantity=Decimal('0'),
-                version=0
-            )
-            db.add(inventory)
-            db.flush()  # Get the ID
-        
-        # Update inventory
-        inventory.quantity += quantity
-        inventory.version += 1
-        inventory.last_movement_at = datetime.now(timezone.utc)
-        
-        quantity_after = inventory.quantity
+        quantity_before = change.quantity_before
+        quantity_after = change.quantity_after
         
         # Create movement record
         movement = InventoryMovement(
+            id=uuid4(),
             tenant_id=tenant_id,
             movement_type=MovementType.INBOUND.value,
             product_id=product_id,
@@ -251,9 +404,10 @@ class InventoryService:
             performed_at=datetime.now(timezone.utc)
         )
         db.add(movement)
+        InventoryService._stage_movement_created(db, movement)
         
         # Audit log
-        AuditService.log_action(
+        AuditService.stage_action(
             db,
             tenant_id=tenant_id,
             user_id=performed_by,
@@ -269,9 +423,11 @@ class InventoryService:
             }
         )
         
-        db.commit()
-        db.refresh(movement)
-        db.refresh(inventory)
+        if commit:
+            db.commit()
+            db.refresh(movement)
+        else:
+            db.flush()
         
         return movement
     
@@ -285,7 +441,8 @@ class InventoryService:
         performed_by: UUID,
         reference_number: Optional[str] = None,
         notes: Optional[str] = None,
-        expected_version: Optional[int] = None
+        expected_version: Optional[int] = None,
+        commit: bool = True
     ) -> InventoryMovement:
         """
         Create an outbound movement (shipping stock).
@@ -300,10 +457,11 @@ class InventoryService:
             reference_number: Optional reference number
             notes: Optional notes
             expected_version: Expected version for optimistic locking
-            
+            commit: Commit the unit of work; pass False to only flush
+        
         Returns:
             Created InventoryMovement
-            
+        
         Raises:
             ValueError: If insufficient stock or quantity invalid
             RuntimeError: If optimistic locking conflict
@@ -311,36 +469,16 @@ class InventoryService:
         if quantity <= 0:
             raise ValueError("Quantity must be positive")
         
-        # Get inventory
-        inventory = InventoryService.get_by_product_and_warehouse(
-            db, product_id, source_warehouse_id, tenant_id
+        # Compare-and-decrement: stock check and update in one statement
+        change = InventoryService._decrement_stock(
+            db, tenant_id, product_id, source_warehouse_id, quantity, expected_version
         )
-        
-        if not inventory:
-            raise ValueError(f"Inventory not found for product {product_id} at warehouse {source_warehouse_id}")
-        
-        # Optimistic locking check
-        if expected_version is not None and inventory.version != expected_version:
-            raise RuntimeError("Inventory was modified by another operation. Please refresh and try again.")
-        
-        quantity_before = inventory.quantity
-        available = inventory.available_quantity
-        
-        # Check sufficient stock
-        if available < quantity:
-            raise ValueError(
-                f"Insufficient stock. Available: {available}, Requested: {quantity}"
-            )
-        
-        # Update inventory
-        inventory.quantity -= quantity
-        inventory.version += 1
-        inventory.last_movement_at = datetime.now(timezone.utc)
-        
-        quantity_after = inventory.quantity
+        quantity_before = change.quantity_before
+        quantity_after = change.quantity_after
         
         # Create movement record
         movement = InventoryMovement(
+            id=uuid4(),
             tenant_id=tenant_id,
             movement_type=MovementType.OUTBOUND.value,
             product_id=product_id,
@@ -354,16 +492,17 @@ class InventoryService:
             performed_at=datetime.now(timezone.utc)
         )
         db.add(movement)
+        InventoryService._stage_movement_created(db, movement)
         
         # Audit log
-        AuditService.log_action(
+        AuditService.stage_action(
             db,
             tenant_id=tenant_id,
             user_id=performed_by,
             action="inventory.movement.outbound",
             entity_type="InventoryMovement",
             entity_id=movement.id,
-            changes_json={
+            changes={
                 "product_id": str(product_id),
                 "warehouse_id": str(source_warehouse_id),
                 "quantity": float(quantity),
@@ -372,9 +511,11 @@ class InventoryService:
             }
         )
         
-        db.commit()
-        db.refresh(movement)
-        db.refresh(inventory)
+        if commit:
+            db.commit()
+            db.refresh(movement)
+        else:
+            db.flush()
         
         return movement
     
@@ -389,7 +530,8 @@ class InventoryService:
         performed_by: UUID,
         reference_number: Optional[str] = None,
         notes: Optional[str] = None,
-        expected_version: Optional[int] = None
+        expected_version: Optional[int] = None,
+        commit: bool = True
     ) -> InventoryMovement:
         """
         Create a transfer movement (moving stock between warehouses).
@@ -406,10 +548,11 @@ class InventoryService:
             reference_number: Optional reference number
             notes: Optional notes
             expected_version: Expected version for optimistic locking (source inventory)
-            
+            commit: Commit the unit of work; pass False to only flush
+        
         Returns:
             Created InventoryMovement
-            
+        
         Raises:
             ValueError: If insufficient stock or quantity invalid
             RuntimeError: If optimistic locking conflict
@@ -420,60 +563,23 @@ class InventoryService:
         if source_warehouse_id == destination_warehouse_id:
             raise ValueError("Source and destination warehouses must be different")
         
-        # Get source inventory
-        source_inventory = InventoryService.get_by_product_and_warehouse(
-            db, product_id, source_warehouse_id, tenant_id
+        # Take stock from the source first; nothing is written if it is short
+        source_change = InventoryService._decrement_stock(
+            db, tenant_id, product_id, source_warehouse_id, quantity, expected_version,
+            location="source "
         )
-        
-        if not source_inventory:
-            raise ValueError(f"Inventory not found for product {product_id} at source warehouse {source_warehouse_id}")
-        
-        # Optimistic locking check
-        if expected_version is not None and source_inventory.version != expected_version:
-            raise RuntimeError("Inventory was modified by another operation. Please refresh and try again.")
-        
-        source_quantity_before = source_inventory.quantity
-        available = source_inventory.available_quantity
-        
-        # Check sufficient stock at source
-        if available < quantity:
-            raise ValueError(
-                f"Insufficient stock at source. Available: {available}, Requested: {quantity}"
-            )
-        
-        # Get or create destination inventory
-        dest_inventory = InventoryService.get_by_product_and_warehouse(
-            db, product_id, destination_warehouse_id, tenant_id
+        dest_change = InventoryService._increment_stock(
+            db, tenant_id, product_id, destination_warehouse_id, quantity
         )
         
-        dest_quantity_before = Decimal('0')
-        if dest_inventory:
-            dest_quantity_before = dest_inventory.quantity
-        else:
-            dest_inventory = Inventory(
-                tenant_id=tenant_id,
-                product_id=product_id,
-                warehouse_id=destination_warehouse_id,
-                quantity=Decimal('0'),
-                version=0
-            )
-            db.add(dest_inventory)
-            db.flush()
-        
-        # Update both inventories atomically
-        source_inventory.quantity -= quantity
-        source_inventory.version += 1
-        source_inventory.last_movement_at = datetime.utcnow()
-        
-        dest_inventory.quantity += quantity
-        dest_inventory.version += 1
-        dest_inventory.last_movement_at = datetime.utcnow()
-        
-        source_quantity_after = source_inventory.quantity
-        dest_quantity_after = dest_inventory.quantity
+        source_quantity_before = source_change.quantity_before
+        source_quantity_after = source_change.quantity_after
+        dest_quantity_before = dest_change.quantity_before
+        dest_quantity_after = dest_change.quantity_after
         
         # Create movement record
         movement = InventoryMovement(
+            id=uuid4(),
             tenant_id=tenant_id,
             movement_type=MovementType.TRANSFER.value,
             product_id=product_id,
@@ -488,9 +594,10 @@ class InventoryService:
             performed_at=datetime.now(timezone.utc)
         )
         db.add(movement)
+        InventoryService._stage_movement_created(db, movement)
         
         # Audit log
-        AuditService.log_action(
+        AuditService.stage_action(
             db,
             tenant_id=tenant_id,
             user_id=performed_by,
@@ -509,13 +616,649 @@ class InventoryService:
             }
         )
         
-        db.commit()
-        db.refresh(movement)
-        db.refresh(source_inventory)
-        db.refresh(dest_inventory)
+        if commit:
+            db.commit()
+            db.refresh(movement)
+        else:
+            db.flush()
         
         return movement
     
+    @staticmethod
+    def _decrement_stock(
+        db: Session,
+        tenant_id: UUID,
+        product_id: UUID,
+        warehouse_id: UUID,
+        quantity: Decimal,
+        expected_version: Optional[int] = None,
+        location: str = ""
+    ) -> StockChange:
+        """
+        Atomically take stock from an inventory row (compare-and-decrement).
+        
+        A single conditional UPDATE ... RETURNING checks available quantity
+        (and the version, if given) and applies the decrement, so concurrent
+        pickers cannot both pass the check on the same stale read. Inventory
+        objects already loaded in the session are not refreshed.
+        
+        Raises:
+            ValueError: If the inventory row is missing or stock is insufficient
+            RuntimeError: If expected_version does not match
+        """
+        conditions = [
+            Inventory.tenant_id == tenant_id,
+            Inventory.product_id == product_id,
+            Inventory.warehouse_id == warehouse_id,
+            Inventory.quantity - Inventory.reserved_quantity >= quantity,
+        ]
+        if expected_version is not None:
+            conditions.append(Inventory.version == expected_version)
+        
+        now = datetime.now(timezone.utc)
+        row = db.execute(
+            update(Inventory)
+            .where(*conditions)
+            .values(
+                quantity=Inventory.quantity - quantity,
+                version=Inventory.version + 1,
+                last_movement_at=now,
+                below_minimum=InventoryService._below_minimum_after(Inventory.quantity - quantity)
+            )
+            .returning(Inventory.id, Inventory.quantity, Inventory.version, Inventory.minimum_stock)
+            .execution_options(synchronize_session=False)
+        ).first()
+        
+        if row is not None:
+            change = StockChange(row.id, row.quantity + quantity, row.quantity, row.version, row.minimum_stock)
+            InventoryService._stage_stock_change(db, tenant_id, product_id, warehouse_id, change, now)
+            return change
+        
+        # The update matched nothing; read the row only to report why
+        current = db.execute(
+            select(Inventory.quantity, Inventory.reserved_quantity, Inventory.version).where(
+                Inventory.tenant_id == tenant_id,
+                Inventory.product_id == product_id,
+                Inventory.warehouse_id == warehouse_id
+            )
+        ).first()
+        if current is None:
+            raise ValueError(f"Inventory not found for product {product_id} at {location}warehouse {warehouse_id}")
+        if expected_version is not None and current.version != expected_version:
+            raise RuntimeError("Inventory was modified by another operation. Please refresh and try again.")
+        available = current.quantity - current.reserved_quantity
+        raise ValueError(
+            f"Insufficient stock{' at ' + location.strip() if location else ''}. "
+            f"Available: {available}, Requested: {quantity}"
+        )
+    
+    @staticmethod
+    def _increment_stock(
+        db: Session,
+        tenant_id: UUID,
+        product_id: UUID,
+        warehouse_id: UUID,
+        quantity: Decimal
+    ) -> StockChange:
+        """
+        Atomically add stock to an inventory row, creating it if missing.
+        
+        Uses UPDATE ... RETURNING; when no row exists it is inserted inside
+        a savepoint, and a concurrent insert of the same row falls back to
+        the update.
+        """
+        now = datetime.now(timezone.utc)
+        stmt = (
+            update(Inventory)
+            .where(
+                Inventory.tenant_id == tenant_id,
+                Inventory.product_id == product_id,
+                Inventory.warehouse_id == warehouse_id
+            )
+            .values(
+                quantity=Inventory.quantity + quantity,
+                version=Inventory.version + 1,
+                last_movement_at=now,
+                below_minimum=InventoryService._below_minimum_after(Inventory.quantity + quantity)
+            )
+            .returning(Inventory.id, Inventory.quantity, Inventory.version, Inventory.minimum_stock)
+            .execution_options(synchronize_session=False)
+        )
+        
+        row = db.execute(stmt).first()
+        if row is None:
+            inventory_id = uuid4()
+            try:
+                with db.begin_nested():
+                    db.execute(insert(Inventory).values(
+                        id=inventory_id,
+                        tenant_id=tenant_id,
+                        product_id=product_id,
+                        warehouse_id=warehouse_id,
+                        quantity=quantity,
+                        reserved_quantity=Decimal('0'),
+                        version=1,
+                        last_movement_at=now
+                    ))
+                change = StockChange(inventory_id, Decimal('0'), quantity, 1, created=True)
+            except IntegrityError:
+                row = db.execute(stmt).first()
+                if row is None:
+                    raise RuntimeError("Inventory row could not be created or updated; retry the movement")
+        
+        if row is not None:
+            change = StockChange(row.id, row.quantity - quantity, row.quantity, row.version, row.minimum_stock)
+        InventoryService._stage_stock_change(db, tenant_id, product_id, warehouse_id, change, now)
+        return change
+    
+    @staticmethod
+    def _below_minimum_after(new_quantity):
+        """SQL expression for the below_minimum flag once quantity becomes new_quantity."""
+        return and_(Inventory.minimum_stock.isnot(None), new_quantity < Inventory.minimum_stock)
+    
+    @staticmethod
+    def _stage_stock_change(
+        db: Session,
+        tenant_id: UUID,
+        product_id: UUID,
+        warehouse_id: UUID,
+        change: StockChange,
+        movement_at: datetime
+    ) -> None:
+        """Stage the summary update, change event and any low-stock crossing for a movement's stock change."""
+        StockAlertService.stage_crossing(
+            db,
+            tenant_id=tenant_id,
+            inventory_id=change.inventory_id,
+            product_id=product_id,
+            warehouse_id=warehouse_id,
+            was_below=not change.created and is_below_minimum(change.quantity_before, change.minimum_stock),
+            quantity=change.quantity_after,
+            minimum_stock=change.minimum_stock
+        )
+        InventorySummaryService.stage_stock_change(
+            db,
+            tenant_id=tenant_id,
+            warehouse_id=warehouse_id,
+            quantity_before=change.quantity_before,
+            quantity_after=change.quantity_after,
+            minimum_stock_before=change.minimum_stock,
+            minimum_stock_after=change.minimum_stock,
+            created=change.created,
+            movement_at=movement_at
+        )
+        InventoryService._stage_inventory_updated(
+            db, tenant_id, change.inventory_id, product_id, warehouse_id,
+            change.quantity_after, change.minimum_stock, movement_at
+        )
+    
+    @staticmethod
+    def _stage_movement_created(db: Session, movement: InventoryMovement) -> None:
+        """Stage the rollup delta and change event for a new movement."""
+        InventoryService._stage_movement_row(db, {
+            column: getattr(movement, column)
+            for column in (
+                'id', 'tenant_id', 'movement_type', 'product_id', 'source_warehouse_id',
+                'destination_warehouse_id', 'quantity', 'reference_number', 'performed_by', 'performed_at'
+            )
+        })
+    
+    @staticmethod
+    def _stage_movement_row(db: Session, movement: Dict[str, Any]) -> None:
+        """Stage the rollup delta and change event for a new movement given as column values."""
+        MovementRollupService.stage_movement(
+            db,
+            tenant_id=movement['tenant_id'],
+            movement_type=movement['movement_type'],
+            product_id=movement['product_id'],
+            source_warehouse_id=movement['source_warehouse_id'],
+            destination_warehouse_id=movement['destination_warehouse_id'],
+            quantity=movement['quantity'],
+            performed_at=movement['performed_at']
+        )
+        OutboxService.enqueue(
+            db,
+            tenant_id=movement['tenant_id'],
+            event_type="inventory.movement.created",
+            aggregate_type="InventoryMovement",
+            aggregate_id=movement['id'],
+            payload={
+                'id': str(movement['id']),
+                'movement_type': movement['movement_type'],
+                'product_id': str(movement['product_id']),
+                'source_warehouse_id': str(movement['source_warehouse_id']) if movement['source_warehouse_id'] else None,
+                'destination_warehouse_id': str(movement['destination_warehouse_id']) if movement['destination_warehouse_id'] else None,
+                'quantity': float(movement['quantity']),
+                'reference_number': movement['reference_number'],
+                'performed_by': str(movement['performed_by']),
+                'performed_at': movement['performed_at'].isoformat(),
+            }
+        )
+    
+    @staticmethod
+    def _stage_inventory_updated(
+        db: Session,
+        tenant_id: UUID,
+        inventory_id: UUID,
+        product_id: UUID,
+        warehouse_id: UUID,
+        quantity: Decimal,
+        minimum_stock: Optional[Decimal],
+        movement_at: Optional[datetime]
+    ) -> None:
+        """Stage the change event for an inventory row's new stock level."""
+        OutboxService.enqueue(
+            db,
+            tenant_id=tenant_id,
+            event_type="inventory.updated",
+            aggregate_type="Inventory",
+            aggregate_id=inventory_id,
+            payload={
+                'id': str(inventory_id),
+                'product_id': str(product_id),
+                'warehouse_id': str(warehouse_id),
+                'quantity': float(quantity),
+                'minimum_stock': float(minimum_stock) if minimum_stock is not None else None,
+                'is_low_stock': is_below_minimum(quantity, minimum_stock),
+                'last_movement_at': movement_at.isoformat() if movement_at else None,
+            }
+        )
+    
+    @staticmethod
+    def _parse_batch_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize and statically validate one row of a movement batch.
+        
+        Raises:
+            ValueError: If the row is malformed
+        """
+        movement_type = row.get('movement_type')
+        if movement_type not in (t.value for t in MovementType):
+            raise ValueError(
+                f"Invalid movement_type: {movement_type}. Must be 'inbound', 'outbound', or 'transfer'"
+            )
+        
+        try:
+            quantity = Decimal(str(row.get('quantity')))
+        except InvalidOperation:
+            raise ValueError("Quantity must be a number")
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
+        
+        source = row.get('source_warehouse_id')
+        destination = row.get('destination_warehouse_id')
+        if movement_type == MovementType.INBOUND.value:
+            if not destination:
+                raise ValueError("destination_warehouse_id is required for inbound movements")
+            source = None
+        elif movement_type == MovementType.OUTBOUND.value:
+            if not source:
+                raise ValueError("source_warehouse_id is required for outbound movements")
+            destination = None
+        else:
+            if not source or not destination:
+                raise ValueError(
+                    "Both source_warehouse_id and destination_warehouse_id are required for transfer movements"
+                )
+            if str(source) == str(destination):
+                raise ValueError("Source and destination warehouses must be different")
+        
+        return {
+            'movement_type': movement_type,
+            'product_id': UUID(str(row['product_id'])),
+            'source_warehouse_id': UUID(str(source)) if source else None,
+            'destination_warehouse_id': UUID(str(destination)) if destination else None,
+            'quantity': quantity,
+            'reference_number': row.get('reference_number'),
+            'notes': row.get('notes'),
+            'expected_version': row.get('expected_version'),
+        }
+    
+    @staticmethod
+    def _lock_batch_inventory(
+        db: Session,
+        tenant_id: UUID,
+        stock: Dict[tuple, Dict[str, Any]],
+        *criteria,
+        created: frozenset = frozenset()
+    ) -> None:
+        """Lock the matching inventory rows and add their state to stock; ids in created are new rows."""
+        rows = db.execute(
+            select(
+                Inventory.id,
+                Inventory.product_id,
+                Inventory.warehouse_id,
+                Inventory.quantity,
+                Inventory.reserved_quantity,
+                Inventory.version,
+                Inventory.minimum_stock,
+            ).where(Inventory.tenant_id == tenant_id, *criteria).with_for_update()
+        ).all()
+        for inv in rows:
+            stock[(inv.product_id, inv.warehouse_id)] = {
+                'id': inv.id,
+                'quantity': inv.quantity,
+                'original_quantity': inv.quantity,
+                'reserved_quantity': inv.reserved_quantity,
+                'minimum_stock': inv.minimum_stock,
+                'version': inv.version,
+                'is_new': inv.id in created,
+                'is_dirty': False,
+            }
+    
+    @staticmethod
+    def _insert_missing_inventory(
+        db: Session,
+        tenant_id: UUID,
+        keys: set,
+        now: datetime
+    ) -> frozenset:
+        """
+        Insert empty inventory rows for (product_id, warehouse_id) keys.
+        
+        Uses INSERT ... ON CONFLICT DO NOTHING, so a row a concurrent
+        transaction created first is left alone instead of failing the
+        batch. Returns the ids of the rows this call inserted.
+        """
+        dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+        stmt = (
+            dialect.insert(Inventory)
+            .values([
+                {
+                    'id': uuid4(),
+                    'tenant_id': tenant_id,
+                    'product_id': product_id,
+                    'warehouse_id': warehouse_id,
+                    'quantity': Decimal('0'),
+                    'reserved_quantity': Decimal('0'),
+                    'version': 0,
+                    'last_movement_at': now,
+                }
+                for product_id, warehouse_id in keys
+            ])
+            .on_conflict_do_nothing(index_elements=['tenant_id', 'product_id', 'warehouse_id'])
+            .returning(Inventory.id)
+        )
+        return frozenset(db.scalars(stmt))
+    
+    @staticmethod
+    def create_movements_batch(
+        db: Session,
+        movements: List[Dict[str, Any]],
+        tenant_id: UUID,
+        performed_by: UUID,
+        atomic: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply many inventory movements in a single transaction.
+        
+        Rows are validated together (one lookup for products, one for
+        warehouses and one locking read for every touched inventory row),
+        then applied in order against in-memory stock levels. Stock updates,
+        new inventory rows, movements and audit entries are each written with
+        one multi-row statement and a single commit, instead of the
+        lookup/flush/commit/refresh cycle the single-row methods pay per row.
+        
+        Args:
+            db: Database session
+            movements: Movement rows with the same fields as the single-row API
+            tenant_id: Tenant ID
+            performed_by: User ID performing the movements
+            atomic: If True, nothing is applied when any row is rejected
+        
+        Returns:
+            One result dict per input row, in input order, with keys
+            index, status ('applied', 'rejected' or 'skipped'), movement_id,
+            quantity_before, quantity_after and error
+        
+        Raises:
+            ValueError: If the batch is empty or too large
+        """
+        if not movements:
+            raise ValueError("At least one movement is required")
+        if len(movements) > MAX_MOVEMENT_BATCH_SIZE:
+            raise ValueError(f"A batch may contain at most {MAX_MOVEMENT_BATCH_SIZE} movements")
+        
+        results: List[Dict[str, Any]] = []
+        parsed: List[Optional[Dict[str, Any]]] = []
+        for index, row in enumerate(movements):
+            results.append({
+                'index': index,
+                'status': 'rejected',
+                'movement_id': None,
+                'quantity_before': None,
+                'quantity_after': None,
+                'error': None,
+            })
+            try:
+                parsed.append(InventoryService._parse_batch_row(row))
+            except (ValueError, TypeError, KeyError) as e:
+                parsed.append(None)
+                results[index]['error'] = str(e) if not isinstance(e, KeyError) else f"Missing field: {e}"
+        
+        valid = [row for row in parsed if row is not None]
+        product_ids = {row['product_id'] for row in valid}
+        warehouse_ids = {
+            wh for row in valid
+            for wh in (row['source_warehouse_id'], row['destination_warehouse_id']) if wh
+        }
+        
+        # Validate references for the whole batch at once
+        known_products = set(db.scalars(
+            select(Product.id).where(Product.tenant_id == tenant_id, Product.id.in_(product_ids))
+        )) if product_ids else set()
+        known_warehouses = set(db.scalars(
+            select(Warehouse.id).where(Warehouse.tenant_id == tenant_id, Warehouse.id.in_(warehouse_ids))
+        )) if warehouse_ids else set()
+        
+        # Lock every inventory row the batch may touch
+        now = datetime.now(timezone.utc)
+        stock: Dict[tuple, Dict[str, Any]] = {}
+        if product_ids and warehouse_ids:
+            InventoryService._lock_batch_inventory(
+                db, tenant_id, stock,
+                Inventory.product_id.in_(product_ids),
+                Inventory.warehouse_id.in_(warehouse_ids)
+            )
+            
+            # Create missing destination rows up front; rows another
+            # transaction created meanwhile are locked with their real stock
+            missing = {
+                (row['product_id'], row['destination_warehouse_id']) for row in valid
+                if row['destination_warehouse_id']
+                and row['product_id'] in known_products
+                and row['destination_warehouse_id'] in known_warehouses
+            } - stock.keys()
+            if missing:
+                created = InventoryService._insert_missing_inventory(db, tenant_id, missing, now)
+                InventoryService._lock_batch_inventory(
+                    db, tenant_id, stock,
+                    tuple_(Inventory.product_id, Inventory.warehouse_id).in_(missing),
+                    created=created
+                )
+        
+        movement_rows: List[Dict[str, Any]] = []
+        
+        for index, row in enumerate(parsed):
+            if row is None:
+                continue
+            result = results[index]
+            
+            if row['product_id'] not in known_products:
+                result['error'] = f"Product {row['product_id']} not found"
+                continue
+            missing = [
+                wh for wh in (row['source_warehouse_id'], row['destination_warehouse_id'])
+                if wh and wh not in known_warehouses
+            ]
+            if missing:
+                result['error'] = f"Warehouse {missing[0]} not found"
+                continue
+            
+            quantity = row['quantity']
+            source = None
+            if row['source_warehouse_id']:
+                source = stock.get((row['product_id'], row['source_warehouse_id']))
+                if source is None:
+                    result['error'] = (
+                        f"Inventory not found for product {row['product_id']} "
+                        f"at warehouse {row['source_warehouse_id']}"
+                    )
+                    continue
+                if row['expected_version'] is not None and source['version'] != row['expected_version']:
+                    result['error'] = "Inventory was modified by another operation. Please refresh and try again."
+                    continue
+                available = source['quantity'] - source['reserved_quantity']
+                if available < quantity:
+                    result['error'] = f"Insufficient stock. Available: {available}, Requested: {quantity}"
+                    continue
+            
+            destination = None
+            if row['destination_warehouse_id']:
+                key = (row['product_id'], row['destination_warehouse_id'])
+                destination = stock[key]
+            
+            changes: Dict[str, Any] = {
+                'product_id': str(row['product_id']),
+                'quantity': float(quantity),
+            }
+            if source is not None:
+                source_before = source['quantity']
+                source['quantity'] -= quantity
+                source['version'] += 1
+                source['is_dirty'] = True
+            if destination is not None:
+                dest_before = destination['quantity']
+                destination['quantity'] += quantity
+                destination['version'] += 1
+                destination['is_dirty'] = True
+            
+            if row['movement_type'] == MovementType.INBOUND.value:
+                quantity_before, quantity_after = dest_before, destination['quantity']
+                changes['warehouse_id'] = str(row['destination_warehouse_id'])
+            elif row['movement_type'] == MovementType.OUTBOUND.value:
+                quantity_before, quantity_after = source_before, source['quantity']
+                changes['warehouse_id'] = str(row['source_warehouse_id'])
+            else:
+                quantity_before, quantity_after = source_before, destination['quantity']
+                changes.update({
+                    'source_warehouse_id': str(row['source_warehouse_id']),
+                    'destination_warehouse_id': str(row['destination_warehouse_id']),
+                    'source_quantity_before': float(source_before),
+                    'source_quantity_after': float(source['quantity']),
+                    'dest_quantity_before': float(dest_before),
+                    'dest_quantity_after': float(destination['quantity']),
+                })
+            if row['movement_type'] != MovementType.TRANSFER.value:
+                changes['quantity_before'] = float(quantity_before)
+                changes['quantity_after'] = float(quantity_after)
+            
+            movement_id = uuid4()
+            movement_rows.append({
+                'id': movement_id,
+                'tenant_id': tenant_id,
+                'movement_type': row['movement_type'],
+                'product_id': row['product_id'],
+                'source_warehouse_id': row['source_warehouse_id'],
+                'destination_warehouse_id': row['destination_warehouse_id'],
+                'quantity': quantity,
+                'quantity_before': quantity_before,
+                'quantity_after': quantity_after,
+                'reference_number': row['reference_number'],
+                'notes': row['notes'],
+                'performed_by': performed_by,
+                'performed_at': now,
+            })
+            AuditService.stage_action(
+                db,
+                tenant_id=tenant_id,
+                user_id=performed_by,
+                action=f"inventory.movement.{row['movement_type']}",
+                entity_type="InventoryMovement",
+                entity_id=movement_id,
+                changes=changes
+            )
+            result.update({
+                'status': 'applied',
+                'movement_id': movement_id,
+                'quantity_before': float(quantity_before),
+                'quantity_after': float(quantity_after),
+            })
+        
+        rejected = any(result['status'] == 'rejected' for result in results)
+        if atomic and rejected:
+            db.rollback()
+            for result in results:
+                if result['status'] == 'applied':
+                    result.update({
+                        'status': 'skipped',
+                        'movement_id': None,
+                        'quantity_before': None,
+                        'quantity_after': None,
+                        'error': "Batch not applied because other rows were rejected",
+                    })
+            return results
+        
+        if not movement_rows:
+            db.rollback()
+            return results
+        
+        updated_inventory = [
+            {
+                'id': state['id'],
+                'quantity': state['quantity'],
+                'version': state['version'],
+                'last_movement_at': now,
+                'below_minimum': is_below_minimum(state['quantity'], state['minimum_stock']),
+            }
+            for state in stock.values()
+            if state['is_dirty']
+        ]
+        unused_inventory = [
+            state['id'] for state in stock.values()
+            if state['is_new'] and not state['is_dirty']
+        ]
+        
+        if updated_inventory:
+            db.execute(update(Inventory), updated_inventory)
+        if unused_inventory:
+            db.execute(delete(Inventory).where(Inventory.id.in_(unused_inventory)))
+        db.execute(insert(InventoryMovement), movement_rows)
+        for movement_row in movement_rows:
+            InventoryService._stage_movement_row(db, movement_row)
+        
+        for (product_id, warehouse_id), state in stock.items():
+            if state['is_dirty']:
+                StockAlertService.stage_crossing(
+                    db,
+                    tenant_id=tenant_id,
+                    inventory_id=state['id'],
+                    product_id=product_id,
+                    warehouse_id=warehouse_id,
+                    was_below=not state['is_new'] and is_below_minimum(state['original_quantity'], state['minimum_stock']),
+                    quantity=state['quantity'],
+                    minimum_stock=state['minimum_stock']
+                )
+                InventorySummaryService.stage_stock_change(
+                    db,
+                    tenant_id=tenant_id,
+                    warehouse_id=warehouse_id,
+                    quantity_before=state['original_quantity'],
+                    quantity_after=state['quantity'],
+                    minimum_stock_before=state['minimum_stock'],
+                    minimum_stock_after=state['minimum_stock'],
+                    created=state['is_new'],
+                    movement_at=now
+                )
+                InventoryService._stage_inventory_updated(
+                    db, tenant_id, state['id'], product_id, warehouse_id,
+                    state['quantity'], state['minimum_stock'], now
+                )
+        
+        db.commit()  # Also writes the staged audit entries, summary and rollup deltas and outbox events
+        
+        return results
+    
     @staticmethod
     def get_movement_history(
         db: Session,
@@ -524,13 +1267,29 @@ class InventoryService:
         warehouse_id: Optional[UUID] = None,
         movement_type: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
     ) -> List[InventoryMovement]:
-        """Get movement history with optional filters."""
+        """
+        Get movement history with optional filters.
+        
+        since/until bound performed_at, so only the monthly partitions
+        covering that range are scanned. Without since, only the last
+        DEFAULT_MOVEMENT_HISTORY_DAYS days (up to until, or now) are
+        returned.
+        """
+        if since is None:
+            since = (until or datetime.now(timezone.utc)) - timedelta(days=DEFAULT_MOVEMENT_HISTORY_DAYS)
+        
         query = db.query(InventoryMovement).filter(
-            InventoryMovement.tenant_id == tenant_id
+            InventoryMovement.tenant_id == tenant_id,
+            InventoryMovement.performed_at >= since
         )
         
+        if until:
+            query = query.filter(InventoryMovement.performed_at < until)
+        
         if product_id:
             query = query.filter(InventoryMovement.product_id == product_id)
         
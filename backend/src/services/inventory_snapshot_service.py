@@ -0,0 +1,332 @@
+"""
+Point-in-time stock queries.
+
+Inventory quantities are copied into inventory_snapshots periodically (see
+src.jobs.take_inventory_snapshots). The stock of a row as of any time is its
+nearest earlier snapshot plus the movements performed between the snapshot
+and that time, so a query replays only the movements since the last
+snapshot instead of the whole ledger.
+
+A movement's performed_at is the start of the transaction that recorded
+it, which can commit after a snapshot has read the inventory. So a
+snapshot is not recorded at the time it is taken but
+inventory_snapshot_commit_lag_seconds earlier, with the movements
+performed since then taken back out of its quantities; the replay adds
+them again, together with any that had not committed yet.
+
+As-of queries are answered from the snapshots and partitions still
+retained; earlier times are rejected. Quantities set directly
+(InventoryService.create_or_update) are not movements; they are reflected
+from the next snapshot on.
+"""
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import case, delete, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.database.partitions import PARTITION_SUFFIX, list_partitions
+from src.models.inventory import Inventory
+from src.models.inventory_movement import InventoryMovement
+from src.models.inventory_snapshot import InventorySnapshot
+
+
+# Inventory rows copied per INSERT when taking a snapshot
+SNAPSHOT_CHUNK_SIZE = 5000
+
+
+class InventorySnapshotService:
+    """Service for inventory snapshots and as-of stock queries."""
+    
+    @staticmethod
+    def take_snapshot(
+        db: Session,
+        tenant_id: Optional[UUID] = None,
+        snapshot_at: Optional[datetime] = None
+    ) -> int:
+        """
+        Record the quantity of every inventory row as of snapshot_at.
+        
+        The current quantities and the movements performed after
+        snapshot_at are read in one REPEATABLE READ transaction (on
+        PostgreSQL), and each row's quantity is its current one minus those
+        movements. Commits pending work first.
+        
+        Args:
+            db: Database session
+            tenant_id: Only snapshot this tenant's inventory
+            snapshot_at: Time recorded on the snapshot (defaults to the
+                database's current time minus
+                inventory_snapshot_commit_lag_seconds; a later time can miss
+                movements that are still being committed)
+        
+        Returns:
+            Number of snapshot rows written
+        """
+        # The isolation level can only be set when a transaction starts
+        db.commit()
+        if db.get_bind().dialect.name == "postgresql":
+            db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        
+        if snapshot_at is None:
+            now = db.execute(select(func.now())).scalar()
+            if now.tzinfo is None:  # SQLite returns UTC without a zone
+                now = now.replace(tzinfo=timezone.utc)
+            snapshot_at = now - timedelta(seconds=settings.inventory_snapshot_commit_lag_seconds)
+        
+        performed_since = InventorySnapshotService._net_change_since(db, snapshot_at, tenant_id)
+        
+        query = select(
+            Inventory.tenant_id,
+            Inventory.product_id,
+            Inventory.warehouse_id,
+            Inventory.quantity
+        )
+        if tenant_id:
+            query = query.where(Inventory.tenant_id == tenant_id)
+        
+        result = db.execute(query.execution_options(yield_per=SNAPSHOT_CHUNK_SIZE))
+        written = 0
+        for chunk in result.partitions():
+            db.execute(
+                insert(InventorySnapshot),
+                [
+                    {
+                        'id': uuid4(),
+                        'tenant_id': row.tenant_id,
+                        'product_id': row.product_id,
+                        'warehouse_id': row.warehouse_id,
+                        'quantity': row.quantity - performed_since.get(
+                            (row.tenant_id, row.product_id, row.warehouse_id), Decimal('0')
+                        ),
+                        'snapshot_at': snapshot_at
+                    }
+                    for row in chunk
+                ]
+            )
+            written += len(chunk)
+        db.commit()
+        
+        return written
+    
+    @staticmethod
+    def _net_change_since(
+        db: Session,
+        since: datetime,
+        tenant_id: Optional[UUID] = None
+    ) -> Dict[Tuple[UUID, UUID, UUID], Decimal]:
+        """Net quantity change per (tenant, product, warehouse) from movements performed after since."""
+        changes: Dict[Tuple[UUID, UUID, UUID], Decimal] = {}
+        for warehouse_column, sign in (
+            (InventoryMovement.destination_warehouse_id, 1),
+            (InventoryMovement.source_warehouse_id, -1)
+        ):
+            query = select(
+                InventoryMovement.tenant_id,
+                InventoryMovement.product_id,
+                warehouse_column,
+                func.sum(InventoryMovement.quantity)
+            ).where(
+                InventoryMovement.performed_at > since,
+                warehouse_column.isnot(None)
+            ).group_by(InventoryMovement.tenant_id, InventoryMovement.product_id, warehouse_column)
+            if tenant_id:
+                query = query.where(InventoryMovement.tenant_id == tenant_id)
+            
+            for movement_tenant_id, product_id, warehouse_id, quantity in db.execute(query):
+                key = (movement_tenant_id, product_id, warehouse_id)
+                changes[key] = changes.get(key, Decimal('0')) + sign * Decimal(str(quantity))
+        return changes
+    
+    @staticmethod
+    def prune(db: Session, before: datetime, tenant_id: Optional[UUID] = None) -> int:
+        """
+        Delete snapshots taken before a cutoff.
+        
+        As-of queries for times before the oldest remaining snapshot are
+        rejected from then on, as are those whose replay needs movements
+        of a detached partition (src.jobs.manage_movement_partitions); the
+        shorter of the two retentions bounds how far back stock can be
+        queried.
+        
+        Returns:
+            Number of snapshot rows deleted
+        """
+        stmt = delete(InventorySnapshot).where(InventorySnapshot.snapshot_at < before)
+        if tenant_id:
+            stmt = stmt.where(InventorySnapshot.tenant_id == tenant_id)
+        deleted = db.execute(stmt).rowcount
+        db.commit()
+        
+        return deleted
+    
+    @staticmethod
+    def _ledger_start(db: Session) -> Optional[datetime]:
+        """Start of the oldest movement partition still attached; None if the table is not partitioned."""
+        if db.get_bind().dialect.name != "postgresql":
+            return None
+        partitions = list_partitions(db.connection(), InventoryMovement.__tablename__)
+        if not partitions:
+            return None
+        match = PARTITION_SUFFIX.search(partitions[0])
+        return datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+    
+    @staticmethod
+    def _replay_base(db: Session, tenant_id: UUID, warehouse_id: UUID, as_of: datetime) -> Optional[datetime]:
+        """
+        Time of the warehouse's latest snapshot at or before as_of, or None to replay the whole ledger.
+        
+        Raises:
+            ValueError: If the snapshots or movements needed for as_of are no longer retained
+        """
+        oldest, latest = db.execute(
+            select(
+                func.min(InventorySnapshot.snapshot_at),
+                func.max(case((InventorySnapshot.snapshot_at <= as_of, InventorySnapshot.snapshot_at)))
+            ).where(
+                InventorySnapshot.tenant_id == tenant_id,
+                InventorySnapshot.warehouse_id == warehouse_id
+            )
+        ).one()
+        if oldest is not None and latest is None:
+            raise ValueError(f"Stock before {oldest.isoformat()} is no longer available; that is the oldest retained snapshot")
+        
+        ledger_start = InventorySnapshotService._ledger_start(db)
+        if ledger_start is not None and (latest or as_of) < ledger_start:
+            raise ValueError(f"Movements before {ledger_start.isoformat()} are no longer retained")
+        return latest
+    
+    @staticmethod
+    def _replay_query(
+        tenant_id: UUID,
+        warehouse_id: UUID,
+        after: Optional[datetime],
+        as_of: datetime
+    ):
+        """Net quantity change and movement count per product in (after, as_of]."""
+        net_change = func.coalesce(func.sum(
+            case(
+                (InventoryMovement.destination_warehouse_id == warehouse_id, InventoryMovement.quantity),
+                else_=-InventoryMovement.quantity
+            )
+        ), 0)
+        
+        query = select(
+            InventoryMovement.product_id,
+            net_change.label('net_change'),
+            func.count(InventoryMovement.id).label('movements')
+        ).where(
+            InventoryMovement.tenant_id == tenant_id,
+            InventoryMovement.performed_at <= as_of,
+            or_(
+                InventoryMovement.source_warehouse_id == warehouse_id,
+                InventoryMovement.destination_warehouse_id == warehouse_id
+            )
+        ).group_by(InventoryMovement.product_id)
+        
+        if after is not None:
+            query = query.where(InventoryMovement.performed_at > after)
+        return query
+    
+    @staticmethod
+    def get_stock_as_of(
+        db: Session,
+        tenant_id: UUID,
+        product_id: UUID,
+        warehouse_id: UUID,
+        as_of: datetime
+    ) -> dict:
+        """
+        Get the stock of one product in one warehouse at a point in time.
+        
+        Args:
+            db: Database session
+            tenant_id: Tenant ID
+            product_id: Product ID
+            warehouse_id: Warehouse ID
+            as_of: Point in time
+        
+        Returns:
+            Quantity as of the given time, with the snapshot it was replayed
+            from and the number of movements replayed
+        
+        Raises:
+            ValueError: If as_of is before the retained snapshots or movements
+        """
+        snapshot_at = InventorySnapshotService._replay_base(db, tenant_id, warehouse_id, as_of)
+        base_quantity = Decimal('0')  # Also for a product the warehouse did not hold at the snapshot
+        if snapshot_at is not None:
+            base_quantity = db.execute(
+                select(InventorySnapshot.quantity).where(
+                    InventorySnapshot.tenant_id == tenant_id,
+                    InventorySnapshot.product_id == product_id,
+                    InventorySnapshot.warehouse_id == warehouse_id,
+                    InventorySnapshot.snapshot_at == snapshot_at
+                )
+            ).scalar() or Decimal('0')
+        
+        replay = db.execute(
+            InventorySnapshotService._replay_query(tenant_id, warehouse_id, snapshot_at, as_of)
+            .where(InventoryMovement.product_id == product_id)
+        ).first()
+        
+        return {
+            'product_id': product_id,
+            'warehouse_id': warehouse_id,
+            'as_of': as_of,
+            'quantity': base_quantity + (Decimal(str(replay.net_change)) if replay else Decimal('0')),
+            'snapshot_at': snapshot_at,
+            'movements_replayed': replay.movements if replay else 0,
+        }
+    
+    @staticmethod
+    def get_warehouse_stock_as_of(
+        db: Session,
+        tenant_id: UUID,
+        warehouse_id: UUID,
+        as_of: datetime
+    ) -> List[dict]:
+        """
+        Get the stock of every product in a warehouse at a point in time.
+        
+        Uses the latest snapshot of the warehouse taken at or before as_of
+        and replays the warehouse's movements since then in one grouped
+        query.
+        
+        Returns:
+            One entry per product, shaped like get_stock_as_of
+        
+        Raises:
+            ValueError: If as_of is before the retained snapshots or movements
+        """
+        snapshot_at = InventorySnapshotService._replay_base(db, tenant_id, warehouse_id, as_of)
+        
+        stock: Dict[UUID, Tuple[Decimal, int]] = {}
+        if snapshot_at is not None:
+            for product_id, quantity in db.execute(
+                select(InventorySnapshot.product_id, InventorySnapshot.quantity).where(
+                    InventorySnapshot.tenant_id == tenant_id,
+                    InventorySnapshot.warehouse_id == warehouse_id,
+                    InventorySnapshot.snapshot_at == snapshot_at
+                )
+            ):
+                stock[product_id] = (quantity, 0)
+        
+        for row in db.execute(InventorySnapshotService._replay_query(tenant_id, warehouse_id, snapshot_at, as_of)):
+            quantity, _ = stock.get(row.product_id, (Decimal('0'), 0))
+            stock[row.product_id] = (quantity + Decimal(str(row.net_change)), row.movements)
+        
+        return [
+            {
+                'product_id': product_id,
+                'warehouse_id': warehouse_id,
+                'as_of': as_of,
+                'quantity': quantity,
+                'snapshot_at': snapshot_at,
+                'movements_replayed': movements,
+            }
+            for product_id, (quantity, movements) in sorted(stock.items(), key=lambda item: str(item[0]))
+        ]
@@ -0,0 +1,247 @@
+"""
+Per-warehouse inventory summary maintenance.
+
+Every change to an inventory row is staged on the session as a delta for
+its warehouse. Deltas are merged per warehouse and written with one
+increment UPDATE per warehouse when the caller's transaction commits, so
+the summary always moves together with the inventory rows it describes.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import case, delete, event, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.models.inventory import Inventory
+from src.models.warehouse import Warehouse
+from src.models.warehouse_inventory_summary import WarehouseInventorySummary
+from src.services.stock_alert_service import is_below_minimum
+
+
+# Session.info key holding summary deltas staged for the current transaction
+PENDING_SUMMARY_DELTAS_KEY = "pending_warehouse_summary_deltas"
+
+
+@dataclass
+class SummaryDelta:
+    """Net change to one warehouse summary within a transaction."""
+    sku_count: int = 0
+    total_units: Decimal = Decimal('0')
+    low_stock_count: int = 0
+    last_movement_at: Optional[datetime] = None
+
+
+class InventorySummaryService:
+    """Service for per-warehouse inventory summaries."""
+    
+    @staticmethod
+    def stage_stock_change(
+        db: Session,
+        tenant_id: UUID,
+        warehouse_id: UUID,
+        quantity_before: Decimal,
+        quantity_after: Decimal,
+        minimum_stock_before: Optional[Decimal] = None,
+        minimum_stock_after: Optional[Decimal] = None,
+        created: bool = False,
+        movement_at: Optional[datetime] = None
+    ) -> None:
+        """
+        Stage the summary effect of one inventory row change.
+        
+        Args:
+            db: Database session
+            tenant_id: Tenant ID
+            warehouse_id: Warehouse of the inventory row
+            quantity_before: Quantity before the change (0 for a new row)
+            quantity_after: Quantity after the change
+            minimum_stock_before: Minimum stock before the change
+            minimum_stock_after: Minimum stock after the change
+            created: True if the inventory row was created by this change
+            movement_at: Time of the movement, if the change was a movement
+        """
+        deltas = db.info.setdefault(PENDING_SUMMARY_DELTAS_KEY, {})
+        delta = deltas.setdefault((tenant_id, warehouse_id), SummaryDelta())
+        
+        if created:
+            delta.sku_count += 1
+        delta.total_units += quantity_after - quantity_before
+        was_low = not created and is_below_minimum(quantity_before, minimum_stock_before)
+        delta.low_stock_count += int(is_below_minimum(quantity_after, minimum_stock_after)) - int(was_low)
+        if movement_at and (delta.last_movement_at is None or movement_at > delta.last_movement_at):
+            delta.last_movement_at = movement_at
+    
+    @staticmethod
+    def write_staged(db: Session) -> int:
+        """
+        Apply all staged deltas, one statement per touched warehouse.
+        
+        Warehouses are updated in a fixed order so concurrent transactions
+        touching the same warehouses lock their summary rows consistently.
+        
+        Returns:
+            Number of warehouse summaries updated
+        """
+        pending: Dict[Tuple[UUID, UUID], SummaryDelta] = db.info.pop(PENDING_SUMMARY_DELTAS_KEY, None)
+        if not pending:
+            return 0
+        
+        db.flush()  # Summaries created below are aggregated from the flushed inventory
+        for (tenant_id, warehouse_id), delta in sorted(pending.items(), key=lambda item: str(item[0])):
+            InventorySummaryService._apply_delta(db, tenant_id, warehouse_id, delta)
+        return len(pending)
+    
+    @staticmethod
+    def discard_staged(db: Session) -> None:
+        """Drop staged deltas without writing them."""
+        db.info.pop(PENDING_SUMMARY_DELTAS_KEY, None)
+    
+    @staticmethod
+    def _apply_delta(db: Session, tenant_id: UUID, warehouse_id: UUID, delta: SummaryDelta) -> None:
+        """Increment one summary row, creating it if missing."""
+        last_movement_at = WarehouseInventorySummary.last_movement_at
+        if delta.last_movement_at is not None:
+            last_movement_at = case(
+                (
+                    (WarehouseInventorySummary.last_movement_at.is_(None))
+                    | (WarehouseInventorySummary.last_movement_at < delta.last_movement_at),
+                    delta.last_movement_at
+                ),
+                else_=WarehouseInventorySummary.last_movement_at
+            )
+        
+        stmt = (
+            update(WarehouseInventorySummary)
+            .where(
+                WarehouseInventorySummary.tenant_id == tenant_id,
+                WarehouseInventorySummary.warehouse_id == warehouse_id
+            )
+            .values(
+                sku_count=WarehouseInventorySummary.sku_count + delta.sku_count,
+                total_units=WarehouseInventorySummary.total_units + delta.total_units,
+                low_stock_count=WarehouseInventorySummary.low_stock_count + delta.low_stock_count,
+                last_movement_at=last_movement_at
+            )
+            .execution_options(synchronize_session=False)
+        )
+        
+        if db.execute(stmt).rowcount:
+            return
+        
+        # First change in this warehouse: create the row from the live inventory
+        # so a summary created after the fact starts out correct
+        row = db.execute(InventorySummaryService._aggregate_query(tenant_id, warehouse_id)).first()
+        if row is None:
+            return
+        try:
+            with db.begin_nested():
+                db.execute(insert(WarehouseInventorySummary).values(id=uuid4(), **row._mapping))
+        except IntegrityError:
+            db.execute(stmt)
+    
+    @staticmethod
+    def _aggregate_query(tenant_id: Optional[UUID] = None, warehouse_id: Optional[UUID] = None):
+        """Recompute summaries from inventory, grouped by tenant and warehouse."""
+        query = select(
+            Inventory.tenant_id.label('tenant_id'),
+            Inventory.warehouse_id.label('warehouse_id'),
+            func.count(Inventory.id).label('sku_count'),
+            func.coalesce(func.sum(Inventory.quantity), 0).label('total_units'),
+            func.coalesce(func.sum(
+                case(
+                    (
+                        Inventory.minimum_stock.isnot(None) & (Inventory.quantity < Inventory.minimum_stock),
+                        1
+                    ),
+                    else_=0
+                )
+            ), 0).label('low_stock_count'),
+            func.max(Inventory.last_movement_at).label('last_movement_at')
+        ).group_by(Inventory.tenant_id, Inventory.warehouse_id)
+        
+        if tenant_id:
+            query = query.where(Inventory.tenant_id == tenant_id)
+        if warehouse_id:
+            query = query.where(Inventory.warehouse_id == warehouse_id)
+        return query
+    
+    @staticmethod
+    def get_for_tenant(db: Session, tenant_id: UUID) -> List[dict]:
+        """
+        Get the summary of every warehouse of a tenant.
+        
+        Reads one row per warehouse; warehouses without inventory report zeros.
+        """
+        rows = db.execute(
+            select(Warehouse.id, Warehouse.name, WarehouseInventorySummary)
+            .outerjoin(
+                WarehouseInventorySummary,
+                (WarehouseInventorySummary.warehouse_id == Warehouse.id)
+                & (WarehouseInventorySummary.tenant_id == tenant_id)
+            )
+            .where(Warehouse.tenant_id == tenant_id)
+            .order_by(Warehouse.name)
+        ).all()
+        
+        return [
+            {
+                'warehouse_id': str(warehouse_id),
+                'warehouse_name': name,
+                'sku_count': summary.sku_count if summary else 0,
+                'total_units': float(summary.total_units) if summary else 0.0,
+                'low_stock_count': summary.low_stock_count if summary else 0,
+                'last_movement_at': summary.last_movement_at.isoformat() if summary and summary.last_movement_at else None,
+            }
+            for warehouse_id, name, summary in rows
+        ]
+    
+    @staticmethod
+    def rebuild(db: Session, tenant_id: Optional[UUID] = None) -> int:
+        """
+        Recompute summaries from the inventory table.
+        
+        Replaces the summaries of one tenant (or all tenants) in a single
+        transaction; use it after bulk loads that bypass InventoryService or
+        to repair drift.
+        
+        Args:
+            db: Database session
+            tenant_id: Only rebuild this tenant's summaries
+        
+        Returns:
+            Number of summary rows written
+        """
+        InventorySummaryService.discard_staged(db)
+        
+        clear = delete(WarehouseInventorySummary)
+        if tenant_id:
+            clear = clear.where(WarehouseInventorySummary.tenant_id == tenant_id)
+        db.execute(clear)
+        
+        rows = [
+            {'id': uuid4(), **row._mapping}
+            for row in db.execute(InventorySummaryService._aggregate_query(tenant_id))
+        ]
+        if rows:
+            db.execute(insert(WarehouseInventorySummary), rows)
+        db.commit()
+        
+        return len(rows)
+
+
+@event.listens_for(Session, "before_commit")
+def _write_staged_summary_deltas(session: Session) -> None:
+    """Apply staged summary deltas as part of the committing transaction."""
+    if not session.in_nested_transaction():  # Also fires when a savepoint is released
+        InventorySummaryService.write_staged(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_staged_summary_deltas(session: Session) -> None:
+    """Staged deltas belong to the rolled-back transaction."""
+    if not session.in_nested_transaction():  # A savepoint rollback keeps the outer work
+        InventorySummaryService.discard_staged(session)
@@ -0,0 +1,373 @@
+"""
+Daily movement rollup maintenance.
+
+Every movement is staged on the session as a delta for the (product,
+warehouse, day) rows it touches: one for inbound and outbound movements,
+two for transfers. Deltas are merged and written when the caller's
+transaction commits, so forecasting can read one small row per day instead
+of every movement.
+
+Days are UTC calendar days of performed_at.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import Date, case, cast, delete, event, func, insert, literal, select, tuple_, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.models.daily_movement_rollup import DailyMovementRollup
+from src.models.inventory_movement import InventoryMovement, MovementType
+
+
+# Session.info key holding rollup deltas staged for the current transaction
+PENDING_ROLLUP_DELTAS_KEY = "pending_daily_movement_rollup_deltas"
+
+# Rollup rows inserted per statement by rebuild
+REBUILD_CHUNK_SIZE = 5000
+
+# (product, warehouse) pairs per query when reading many series
+SERIES_CHUNK_SIZE = 1000
+
+# Stock leaving a warehouse on a day: what forecasts predict and accuracy is scored against
+DAILY_DEMAND = DailyMovementRollup.outbound_quantity + DailyMovementRollup.transfer_out_quantity
+
+RollupKey = Tuple[UUID, UUID, UUID, date]  # tenant_id, product_id, warehouse_id, day
+SeriesKey = Tuple[UUID, UUID]  # product_id, warehouse_id
+
+
+@dataclass
+class RollupDelta:
+    """Net change to one rollup row within a transaction."""
+    inbound_quantity: Decimal = Decimal('0')
+    outbound_quantity: Decimal = Decimal('0')
+    transfer_in_quantity: Decimal = Decimal('0')
+    transfer_out_quantity: Decimal = Decimal('0')
+    movement_count: int = 0
+
+
+def movement_day(performed_at: datetime) -> date:
+    """UTC day a movement is rolled up into."""
+    if performed_at.tzinfo is not None:
+        performed_at = performed_at.astimezone(timezone.utc)
+    return performed_at.date()
+
+
+class MovementRollupService:
+    """Service for daily movement rollups."""
+    
+    @staticmethod
+    def stage_movement(
+        db: Session,
+        tenant_id: UUID,
+        movement_type: str,
+        product_id: UUID,
+        source_warehouse_id: Optional[UUID],
+        destination_warehouse_id: Optional[UUID],
+        quantity: Decimal,
+        performed_at: datetime
+    ) -> None:
+        """
+        Stage the rollup effect of one movement.
+        
+        Args:
+            db: Database session
+            tenant_id: Tenant ID
+            movement_type: 'inbound', 'outbound' or 'transfer'
+            product_id: Product ID
+            source_warehouse_id: Source warehouse (outbound, transfer)
+            destination_warehouse_id: Destination warehouse (inbound, transfer)
+            quantity: Quantity moved
+            performed_at: Time of the movement
+        """
+        deltas: Dict[RollupKey, RollupDelta] = db.info.setdefault(PENDING_ROLLUP_DELTAS_KEY, {})
+        day = movement_day(performed_at)
+        
+        def delta_for(warehouse_id: UUID) -> RollupDelta:
+            delta = deltas.setdefault((tenant_id, product_id, warehouse_id, day), RollupDelta())
+            delta.movement_count += 1
+            return delta
+        
+        if movement_type == MovementType.INBOUND.value:
+            delta_for(destination_warehouse_id).inbound_quantity += quantity
+        elif movement_type == MovementType.OUTBOUND.value:
+            delta_for(source_warehouse_id).outbound_quantity += quantity
+        elif movement_type == MovementType.TRANSFER.value:
+            delta_for(source_warehouse_id).transfer_out_quantity += quantity
+            delta_for(destination_warehouse_id).transfer_in_quantity += quantity
+    
+    @staticmethod
+    def write_staged(db: Session) -> int:
+        """
+        Apply all staged deltas, one statement per touched rollup row.
+        
+        Rows are updated in a fixed order so concurrent transactions lock
+        them consistently.
+        
+        Returns:
+            Number of rollup rows updated
+        """
+        pending: Dict[RollupKey, RollupDelta] = db.info.pop(PENDING_ROLLUP_DELTAS_KEY, None)
+        if not pending:
+            return 0
+        
+        for key, delta in sorted(pending.items(), key=lambda item: tuple(str(part) for part in item[0])):
+            MovementRollupService._apply_delta(db, key, delta)
+        return len(pending)
+    
+    @staticmethod
+    def discard_staged(db: Session) -> None:
+        """Drop staged deltas without writing them."""
+        db.info.pop(PENDING_ROLLUP_DELTAS_KEY, None)
+    
+    @staticmethod
+    def _apply_delta(db: Session, key: RollupKey, delta: RollupDelta) -> None:
+        """Increment one rollup row, creating it if missing."""
+        tenant_id, product_id, warehouse_id, day = key
+        stmt = (
+            update(DailyMovementRollup)
+            .where(
+                DailyMovementRollup.tenant_id == tenant_id,
+                DailyMovementRollup.product_id == product_id,
+                DailyMovementRollup.warehouse_id == warehouse_id,
+                DailyMovementRollup.day == day
+            )
+            .values(
+                inbound_quantity=DailyMovementRollup.inbound_quantity + delta.inbound_quantity,
+                outbound_quantity=DailyMovementRollup.outbound_quantity + delta.outbound_quantity,
+                transfer_in_quantity=DailyMovementRollup.transfer_in_quantity + delta.transfer_in_quantity,
+                transfer_out_quantity=DailyMovementRollup.transfer_out_quantity + delta.transfer_out_quantity,
+                movement_count=DailyMovementRollup.movement_count + delta.movement_count
+            )
+            .execution_options(synchronize_session=False)
+        )
+        
+        if db.execute(stmt).rowcount:
+            return
+        
+        # First movement of the day for this product and warehouse
+        try:
+            with db.begin_nested():
+                db.execute(insert(DailyMovementRollup).values(
+                    id=uuid4(),
+                    tenant_id=tenant_id,
+                    product_id=product_id,
+                    warehouse_id=warehouse_id,
+                    day=day,
+                    inbound_quantity=delta.inbound_quantity,
+                    outbound_quantity=delta.outbound_quantity,
+                    transfer_in_quantity=delta.transfer_in_quantity,
+                    transfer_out_quantity=delta.transfer_out_quantity,
+                    movement_count=delta.movement_count
+                ))
+        except IntegrityError:
+            db.execute(stmt)
+    
+    @staticmethod
+    def _aggregate_query(dialect_name: str, tenant_id: Optional[UUID] = None, since: Optional[date] = None):
+        """Recompute rollups from inventory_movements, one row per (tenant, product, warehouse, day)."""
+        if dialect_name == "postgresql":
+            day = cast(func.timezone('UTC', InventoryMovement.performed_at), Date)
+        else:
+            day = func.date(InventoryMovement.performed_at)
+        
+        def quantity_if(movement_type: MovementType):
+            return case((InventoryMovement.movement_type == movement_type.value, InventoryMovement.quantity), else_=0)
+        
+        zero = literal(0)
+        inbound_side = select(
+            InventoryMovement.tenant_id.label('tenant_id'),
+            InventoryMovement.product_id.label('product_id'),
+            InventoryMovement.destination_warehouse_id.label('warehouse_id'),
+            day.label('day'),
+            quantity_if(MovementType.INBOUND).label('inbound_quantity'),
+            zero.label('outbound_quantity'),
+            quantity_if(MovementType.TRANSFER).label('transfer_in_quantity'),
+            zero.label('transfer_out_quantity')
+        ).where(InventoryMovement.destination_warehouse_id.isnot(None))
+        outbound_side = select(
+            InventoryMovement.tenant_id.label('tenant_id'),
+            InventoryMovement.product_id.label('product_id'),
+            InventoryMovement.source_warehouse_id.label('warehouse_id'),
+            day.label('day'),
+            zero.label('inbound_quantity'),
+            quantity_if(MovementType.OUTBOUND).label('outbound_quantity'),
+            zero.label('transfer_in_quantity'),
+            quantity_if(MovementType.TRANSFER).label('transfer_out_quantity')
+        ).where(InventoryMovement.source_warehouse_id.isnot(None))
+        
+        if tenant_id:
+            inbound_side = inbound_side.where(InventoryMovement.tenant_id == tenant_id)
+            outbound_side = outbound_side.where(InventoryMovement.tenant_id == tenant_id)
+        if since:
+            start = datetime.combine(since, time.min, timezone.utc)
+            inbound_side = inbound_side.where(InventoryMovement.performed_at >= start)
+            outbound_side = outbound_side.where(InventoryMovement.performed_at >= start)
+        
+        sides = union_all(inbound_side, outbound_side).subquery()
+        return select(
+            sides.c.tenant_id,
+            sides.c.product_id,
+            sides.c.warehouse_id,
+            sides.c.day,
+            func.sum(sides.c.inbound_quantity).label('inbound_quantity'),
+            func.sum(sides.c.outbound_quantity).label('outbound_quantity'),
+            func.sum(sides.c.transfer_in_quantity).label('transfer_in_quantity'),
+            func.sum(sides.c.transfer_out_quantity).label('transfer_out_quantity'),
+            func.count().label('movement_count')
+        ).group_by(sides.c.tenant_id, sides.c.product_id, sides.c.warehouse_id, sides.c.day)
+    
+    @staticmethod
+    def rebuild(db: Session, tenant_id: Optional[UUID] = None, since: Optional[date] = None) -> int:
+        """
+        Recompute rollups from inventory_movements.
+        
+        Replaces the rollups of one tenant (or all tenants), optionally only
+        from a given day on, in a single transaction. Use it to backfill or
+        to repair drift after bulk loads that bypass InventoryService.
+        
+        Args:
+            db: Database session
+            tenant_id: Only rebuild this tenant's rollups
+            since: Only rebuild days from this one on
+        
+        Returns:
+            Number of rollup rows written
+        """
+        MovementRollupService.discard_staged(db)
+        
+        clear = delete(DailyMovementRollup)
+        if tenant_id:
+            clear = clear.where(DailyMovementRollup.tenant_id == tenant_id)
+        if since:
+            clear = clear.where(DailyMovementRollup.day >= since)
+        db.execute(clear)
+        
+        query = MovementRollupService._aggregate_query(db.get_bind().dialect.name, tenant_id, since)
+        result = db.execute(query.execution_options(yield_per=REBUILD_CHUNK_SIZE))
+        written = 0
+        for chunk in result.partitions():
+            rows = []
+            for row in chunk:
+                values = dict(row._mapping)
+                if isinstance(values['day'], str):  # SQLite returns date() as text
+                    values['day'] = date.fromisoformat(values['day'])
+                rows.append({'id': uuid4(), **values})
+            db.execute(insert(DailyMovementRollup), rows)
+            written += len(rows)
+        db.commit()
+        
+        return written
+    
+    @staticmethod
+    def get_series(
+        db: Session,
+        tenant_id: UUID,
+        product_id: UUID,
+        warehouse_id: UUID,
+        start: date,
+        end: date
+    ) -> List[DailyMovementRollup]:
+        """Rollups of one product in one warehouse for start <= day <= end, oldest first."""
+        return list(db.execute(
+            select(DailyMovementRollup)
+            .where(
+                DailyMovementRollup.tenant_id == tenant_id,
+                DailyMovementRollup.product_id == product_id,
+                DailyMovementRollup.warehouse_id == warehouse_id,
+                DailyMovementRollup.day >= start,
+                DailyMovementRollup.day <= end
+            )
+            .order_by(DailyMovementRollup.day)
+        ).scalars())
+    
+    @staticmethod
+    def get_for_warehouse(
+        db: Session,
+        tenant_id: UUID,
+        warehouse_id: UUID,
+        start: date,
+        end: date
+    ) -> List[DailyMovementRollup]:
+        """Rollups of every product in a warehouse for start <= day <= end, by product then day."""
+        return list(db.execute(
+            select(DailyMovementRollup)
+            .where(
+                DailyMovementRollup.tenant_id == tenant_id,
+                DailyMovementRollup.warehouse_id == warehouse_id,
+                DailyMovementRollup.day >= start,
+                DailyMovementRollup.day <= end
+            )
+            .order_by(DailyMovementRollup.product_id, DailyMovementRollup.day)
+        ).scalars())
+    
+    @staticmethod
+    def iter_demand_by_day(
+        db: Session,
+        tenant_id: UUID,
+        start: date,
+        end: date,
+        series: Optional[Sequence[SeriesKey]] = None,
+        warehouse_id: Optional[UUID] = None
+    ) -> Iterator[Tuple[UUID, UUID, date, Decimal]]:
+        """
+        Demand (DAILY_DEMAND) per (product, warehouse, day), summed in SQL.
+        
+        Only the four aggregate columns cross the wire; no ORM rows are
+        built. Series are read SERIES_CHUNK_SIZE pairs per query.
+        
+        Args:
+            db: Database session
+            tenant_id: Tenant ID
+            start: First day (inclusive)
+            end: Last day (inclusive)
+            series: (product_id, warehouse_id) pairs to read
+            warehouse_id: Read every product of this warehouse instead
+        
+        Yields:
+            (product_id, warehouse_id, day, demand) for days with movements
+        """
+        demand = func.sum(DAILY_DEMAND)
+        query = (
+            select(DailyMovementRollup.product_id, DailyMovementRollup.warehouse_id, DailyMovementRollup.day, demand)
+            .where(
+                DailyMovementRollup.tenant_id == tenant_id,
+                DailyMovementRollup.day >= start,
+                DailyMovementRollup.day <= end
+            )
+            .group_by(DailyMovementRollup.product_id, DailyMovementRollup.warehouse_id, DailyMovementRollup.day)
+        )
+        if warehouse_id:
+            query = query.where(DailyMovementRollup.warehouse_id == warehouse_id)
+        
+        if series is None:
+            chunks = [query]
+        else:
+            pairs = list(series)
+            chunks = [
+                query.where(
+                    tuple_(DailyMovementRollup.product_id, DailyMovementRollup.warehouse_id).in_(pairs[i:i + SERIES_CHUNK_SIZE])
+                )
+                for i in range(0, len(pairs), SERIES_CHUNK_SIZE)
+            ]
+        
+        for chunk in chunks:
+            for product_id, series_warehouse_id, day, quantity in db.execute(chunk):
+                yield product_id, series_warehouse_id, day, quantity
+
+
+@event.listens_for(Session, "before_commit")
+def _write_staged_rollup_deltas(session: Session) -> None:
+    """Apply staged rollup deltas as part of the committing transaction."""
+    if not session.in_nested_transaction():  # Also fires when a savepoint is released
+        MovementRollupService.write_staged(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_staged_rollup_deltas(session: Session) -> None:
+    """Staged deltas belong to the rolled-back transaction."""
+    if not session.in_nested_transaction():  # A savepoint rollback keeps the outer work
+        MovementRollupService.discard_staged(session)
@@ -0,0 +1,124 @@
+"""
+Per-SKU sequencing of inventory movements.
+
+Movements that touch the same (tenant, product, warehouse) are queued and
+applied one at a time in arrival order instead of failing with a version
+conflict. Movements on different SKUs run concurrently. The sequencer is
+per process; across workers the conditional stock UPDATE in
+InventoryService still guarantees consistency.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, Tuple
+from uuid import UUID
+
+from src.config.settings import settings
+
+
+SkuKey = Tuple[UUID, UUID, UUID]  # (tenant_id, product_id, warehouse_id)
+
+
+class MovementQueueFullError(Exception):
+    """Raised when a SKU already has the maximum number of queued movements."""
+
+
+@dataclass
+class SequenceTicket:
+    """Describes how long a movement waited for its turn."""
+    queued_behind: int  # Movements ahead of this one when it arrived
+    wait_ms: float = 0.0
+    
+    @property
+    def delayed(self) -> bool:
+        """True if the movement had to wait for another movement on the same SKU."""
+        return self.queued_behind > 0
+
+
+class _Shard:
+    """Lock and queue depth (holder plus waiters) for one SKU."""
+    
+    __slots__ = ("lock", "depth")
+    
+    def __init__(self):
+        self.lock = asyncio.Lock()  # Waiters are woken in FIFO order
+        self.depth = 0
+
+
+class MovementSequencer:
+    """Serializes movements per SKU, in arrival order."""
+    
+    def __init__(self, max_queue_depth: int = 1000):
+        """
+        Initialize the sequencer.
+        
+        Args:
+            max_queue_depth: Maximum queued movements per SKU before new ones are refused
+        """
+        self.max_queue_depth = max_queue_depth
+        self._shards: Dict[SkuKey, _Shard] = {}
+    
+    @asynccontextmanager
+    async def sequence(self, keys: Iterable[SkuKey]) -> AsyncIterator[SequenceTicket]:
+        """
+        Wait for exclusive access to every SKU a movement touches.
+        
+        Transfers touch two SKUs; shards are always acquired in sorted key
+        order so two transfers in opposite directions cannot deadlock.
+        
+        Args:
+            keys: SKU keys touched by the movement
+        
+        Yields:
+            SequenceTicket with the queue position and time spent waiting
+        
+        Raises:
+            MovementQueueFullError: If a SKU's queue is already full
+        """
+        ordered = sorted(set(keys), key=lambda key: tuple(str(part) for part in key))
+        shards = [self._shards.setdefault(key, _Shard()) for key in ordered]
+        
+        if any(shard.depth >= self.max_queue_depth for shard in shards):
+            self._drop_idle(ordered)
+            raise MovementQueueFullError(
+                "Too many pending movements for this item. Please try again shortly."
+            )
+        
+        ticket = SequenceTicket(queued_behind=max(shard.depth for shard in shards))
+        for shard in shards:
+            shard.depth += 1
+        
+        acquired = []
+        start = time.perf_counter()
+        try:
+            for shard in shards:
+                await shard.lock.acquire()
+                acquired.append(shard)
+            ticket.wait_ms = (time.perf_counter() - start) * 1000
+            yield ticket
+        finally:
+            for shard in reversed(acquired):
+                shard.lock.release()
+            for shard in shards:
+                shard.depth -= 1
+            self._drop_idle(ordered)
+    
+    def _drop_idle(self, keys: Iterable[SkuKey]) -> None:
+        """Forget shards nobody is holding or waiting on."""
+        for key in keys:
+            shard = self._shards.get(key)
+            if shard is not None and shard.depth == 0:
+                del self._shards[key]
+    
+    def stats(self) -> Dict[str, int]:
+        """Current number of busy SKUs and movements in flight."""
+        return {
+            "active_skus": len(self._shards),
+            "pending_movements": sum(shard.depth for shard in self._shards.values()),
+            "deepest_queue": max((shard.depth for shard in self._shards.values()), default=0),
+        }
+
+
+# Global sequencer instance
+movement_sequencer = MovementSequencer(max_queue_depth=settings.movement_queue_max_depth)
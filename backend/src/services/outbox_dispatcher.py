@@ -0,0 +1,84 @@
+"""
+Background dispatcher draining the transactional outbox.
+
+Runs as an asyncio task in each API worker (started from src.main). Every
+batch is claimed with SKIP LOCKED, so workers share the work without
+delivering an event twice at the same time.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from src.config.settings import settings
+from src.database.session import SessionLocal
+from src.services.outbox_service import OutboxService
+
+
+# Seconds between purges of published events
+PURGE_INTERVAL_SECONDS = 3600
+
+
+class OutboxDispatcher:
+    """Polls outbox_events and publishes pending events to the consumers."""
+    
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._last_purge = 0.0
+        self.dispatched_total = 0
+        self.last_batch_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def start(self) -> None:
+        """Start polling on the running event loop."""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop polling and wait for the current batch to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    def dispatch_once(self) -> int:
+        """Dispatch one batch in the calling thread; returns events published."""
+        db = SessionLocal()
+        try:
+            published = OutboxService.dispatch_batch(db)
+            self.dispatched_total += published
+            self.last_batch_at = datetime.now(timezone.utc)
+            
+            now = self.last_batch_at.timestamp()
+            if now - self._last_purge >= PURGE_INTERVAL_SECONDS:
+                self._last_purge = now
+                cutoff = self.last_batch_at - timedelta(hours=settings.outbox_retention_hours)
+                OutboxService.purge_published(db, cutoff)
+            return published
+        finally:
+            db.close()
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                published = await asyncio.to_thread(self.dispatch_once)
+                self.last_error = None
+            except Exception as e:
+                published = 0
+                self.last_error = str(e)
+                print(f"Error dispatching outbox events: {e}")
+            
+            # A full batch means more is waiting; otherwise wait for new events
+            if published < settings.outbox_batch_size:
+                await asyncio.sleep(settings.outbox_poll_interval_seconds)
+
+
+# Global dispatcher instance
+outbox_dispatcher = OutboxDispatcher()
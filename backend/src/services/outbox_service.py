@@ -0,0 +1,234 @@
+"""
+Transactional outbox for change events.
+
+Services stage events on the session with OutboxService.enqueue; they are
+inserted into outbox_events in the same transaction as the change they
+describe, and dropped with it on rollback. A dispatcher reads pending events
+in batches and hands them to the registered consumers (the WebSocket
+fan-out among them). Delivery is at least once: an event is
+marked published only after every consumer accepted it, so consumers must
+tolerate repeats (use OutboxMessage.id to de-duplicate).
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, event, func, insert, select
+from sqlalchemy.orm import Session
+
+from src.config.settings import settings
+from src.models.outbox_event import OutboxEvent
+
+
+# Session.info key holding events staged for the current transaction
+PENDING_OUTBOX_EVENTS_KEY = "pending_outbox_events"
+
+
+@dataclass(frozen=True)
+class OutboxMessage:
+    """An outbox event as handed to consumers."""
+    id: UUID
+    tenant_id: UUID
+    event_type: str
+    aggregate_type: str
+    aggregate_id: UUID
+    payload: Dict[str, Any]
+    created_at: datetime
+
+
+OutboxConsumer = Callable[[OutboxMessage], None]
+
+_consumers: Dict[str, OutboxConsumer] = {}
+
+
+class OutboxService:
+    """Service for outbox events."""
+    
+    @staticmethod
+    def enqueue(
+        db: Session,
+        tenant_id: UUID,
+        event_type: str,
+        aggregate_type: str,
+        aggregate_id: UUID,
+        payload: Dict[str, Any]
+    ) -> UUID:
+        """
+        Stage a change event to be written when the caller's transaction commits.
+        
+        Args:
+            db: Database session
+            tenant_id: Tenant ID
+            event_type: Event type (e.g., 'inventory.updated')
+            aggregate_type: Entity type the event is about (e.g., 'Inventory')
+            aggregate_id: Entity ID
+            payload: JSON-serializable event data
+        
+        Returns:
+            ID of the staged event
+        """
+        event_id = uuid4()
+        db.info.setdefault(PENDING_OUTBOX_EVENTS_KEY, []).append({
+            'id': event_id,
+            'tenant_id': tenant_id,
+            'event_type': event_type,
+            'aggregate_type': aggregate_type,
+            'aggregate_id': aggregate_id,
+            'payload': payload,
+            'attempts': 0,
+            'created_at': datetime.now(timezone.utc),  # Per event, so events of one transaction keep their order
+        })
+        return event_id
+    
+    @staticmethod
+    def write_staged(db: Session) -> int:
+        """
+        Write all staged events in one statement.
+        
+        Returns:
+            Number of events written
+        """
+        pending = db.info.pop(PENDING_OUTBOX_EVENTS_KEY, None)
+        if not pending:
+            return 0
+        
+        db.execute(insert(OutboxEvent), pending)
+        return len(pending)
+    
+    @staticmethod
+    def discard_staged(db: Session) -> None:
+        """Drop staged events without writing them."""
+        db.info.pop(PENDING_OUTBOX_EVENTS_KEY, None)
+    
+    @staticmethod
+    def register_consumer(name: str, consumer: OutboxConsumer) -> None:
+        """
+        Subscribe to outbox events under a unique name.
+        
+        Consumers run synchronously in the dispatcher thread while the batch
+        is locked; hand off to another thread or event loop for slow work.
+        Raising leaves the event pending so it is retried.
+        """
+        _consumers[name] = consumer
+    
+    @staticmethod
+    def unregister_consumer(name: str) -> None:
+        """Remove a consumer added with register_consumer."""
+        _consumers.pop(name, None)
+    
+    @staticmethod
+    def dispatch_batch(db: Session, batch_size: Optional[int] = None) -> int:
+        """
+        Deliver the oldest pending events to every consumer.
+        
+        Claims up to batch_size pending events with FOR UPDATE SKIP LOCKED,
+        so several dispatchers can run side by side without delivering the
+        same event concurrently. Events a consumer rejected are retried on
+        later batches until settings.outbox_max_attempts is reached.
+        
+        Args:
+            db: Database session
+            batch_size: Maximum events to claim (defaults to settings.outbox_batch_size)
+        
+        Returns:
+            Number of events published
+        """
+        events = db.execute(
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.published_at.is_(None),
+                OutboxEvent.attempts < settings.outbox_max_attempts
+            )
+            .order_by(OutboxEvent.created_at)
+            .limit(batch_size or settings.outbox_batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        
+        published = 0
+        for outbox_event in events:
+            message = OutboxMessage(
+                id=outbox_event.id,
+                tenant_id=outbox_event.tenant_id,
+                event_type=outbox_event.event_type,
+                aggregate_type=outbox_event.aggregate_type,
+                aggregate_id=outbox_event.aggregate_id,
+                payload=outbox_event.payload,
+                created_at=outbox_event.created_at
+            )
+            try:
+                for consumer in list(_consumers.values()):
+                    consumer(message)
+            except Exception as e:
+                outbox_event.attempts += 1
+                outbox_event.last_error = str(e)
+                continue
+            
+            outbox_event.published_at = datetime.now(timezone.utc)
+            published += 1
+        
+        db.commit()
+        return published
+    
+    @staticmethod
+    def get_lag(db: Session, tenant_id: Optional[UUID] = None) -> dict:
+        """
+        Measure how far delivery is behind.
+        
+        Returns:
+            Pending and failed (out of attempts) event counts, the oldest
+            pending event's creation time, and lag_seconds: how long that
+            event has been waiting (0 when nothing is pending)
+        """
+        pending = OutboxEvent.published_at.is_(None) & (OutboxEvent.attempts < settings.outbox_max_attempts)
+        failed = OutboxEvent.published_at.is_(None) & (OutboxEvent.attempts >= settings.outbox_max_attempts)
+        
+        query = select(
+            func.count(OutboxEvent.id).filter(pending).label('pending'),
+            func.count(OutboxEvent.id).filter(failed).label('failed'),
+            func.min(OutboxEvent.created_at).filter(pending).label('oldest_pending_at')
+        ).where(OutboxEvent.published_at.is_(None))
+        if tenant_id:
+            query = query.where(OutboxEvent.tenant_id == tenant_id)
+        row = db.execute(query).first()
+        
+        oldest = row.oldest_pending_at
+        if oldest is not None and oldest.tzinfo is None:
+            oldest = oldest.replace(tzinfo=timezone.utc)
+        return {
+            'pending': row.pending,
+            'failed': row.failed,
+            'oldest_pending_at': oldest,
+            'lag_seconds': (datetime.now(timezone.utc) - oldest).total_seconds() if oldest else 0.0,
+        }
+    
+    @staticmethod
+    def purge_published(db: Session, before: datetime) -> int:
+        """
+        Delete events published before a cutoff.
+        
+        Returns:
+            Number of events deleted
+        """
+        deleted = db.execute(
+            delete(OutboxEvent).where(
+                OutboxEvent.published_at.isnot(None),
+                OutboxEvent.published_at < before
+            )
+        ).rowcount
+        db.commit()
+        return deleted
+
+
+@event.listens_for(Session, "before_commit")
+def _write_staged_outbox_events(session: Session) -> None:
+    """Insert staged events as part of the committing transaction."""
+    if not session.in_nested_transaction():  # Also fires when a savepoint is released
+        OutboxService.write_staged(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_staged_outbox_events(session: Session) -> None:
+    """Staged events belong to the rolled-back transaction."""
+    if not session.in_nested_transaction():  # A savepoint rollback keeps the outer work
+        OutboxService.discard_staged(session)
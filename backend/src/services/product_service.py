@@ -7,7 +7,6 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
 from src.models.product import Product
-from src.database.tenant_context import get_current_tenant_id
 
 
 class ProductService:
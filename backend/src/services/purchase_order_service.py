@@ -14,6 +14,7 @@ from src.models.ai_recommendation import AIRecommendation
 from src.models.inventory import Inventory
 from src.services.inventory_service import InventoryService
 from src.services.audit_service import AuditService
+from src.services.outbox_service import OutboxService
 
 
 class PurchaseOrderService:
@@ -108,7 +109,7 @@ class PurchaseOrderService:
         recommendation.actioned_at = datetime.now(timezone.utc)
         
         # Audit log
-        AuditService.log_action(
+        AuditService.stage_action(
             db,
             tenant_id=tenant_id,
             user_id=user_id,
@@ -121,6 +122,7 @@ class PurchaseOrderService:
                 "order_number": order_number
             }
         )
+        PurchaseOrderService._stage_event(db, po, "created")
         
         db.commit()
         db.refresh(po)
@@ -172,6 +174,7 @@ class PurchaseOrderService:
         
         # Calculate total
         PurchaseOrderService._calculate_total(db, po.id)
+        PurchaseOrderService._stage_event(db, po, "created")
         
         db.commit()
         db.refresh(po)
@@ -211,7 +214,7 @@ class PurchaseOrderService:
         po.approved_at = datetime.now(timezone.utc)
         
         # Audit log
-        AuditService.log_action(
+        AuditService.stage_action(
             db,
             tenant_id=tenant_id,
             user_id=user_id,
@@ -223,6 +226,7 @@ class PurchaseOrderService:
                 "approved_by": str(user_id)
             }
         )
+        PurchaseOrderService._stage_event(db, po, "approved")
         
         db.commit()
         db.refresh(po)
@@ -277,7 +281,8 @@ class PurchaseOrderService:
                         tenant_id=tenant_id,
                         performed_by=user_id,
                         reference_number=po.order_number,
-                        notes=f"Received from PO {po.order_number}"
+                        notes=f"Received from PO {po.order_number}",
+                        commit=False  # Committed together with the PO below
                     )
             
             if item.received_quantity < item.quantity:
@@ -291,7 +296,7 @@ class PurchaseOrderService:
             po.status = PurchaseOrderStatus.PARTIALLY_RECEIVED.value
         
         # Audit log
-        AuditService.log_action(
+        AuditService.stage_action(
             db,
             tenant_id=tenant_id,
             user_id=user_id,
@@ -303,12 +308,32 @@ class PurchaseOrderService:
                 "received_items": received_items
             }
         )
+        PurchaseOrderService._stage_event(db, po, "received")
         
         db.commit()
         db.refresh(po)
         
         return po
     
+    @staticmethod
+    def _stage_event(db: Session, po: PurchaseOrder, event_type: str) -> None:
+        """Stage a purchase order change event for the outbox."""
+        OutboxService.enqueue(
+            db,
+            tenant_id=po.tenant_id,
+            event_type=f"purchase_order.{event_type}",
+            aggregate_type="PurchaseOrder",
+            aggregate_id=po.id,
+            payload={
+                "id": str(po.id),
+                "order_number": po.order_number,
+                "supplier_id": str(po.supplier_id),
+                "status": po.status,
+                "total_amount": float(po.total_amount) if po.total_amount is not None else None,
+                "ai_recommendation_id": str(po.ai_recommendation_id) if po.ai_recommendation_id else None
+            }
+        )
+    
     @staticmethod
     def _calculate_total(db: Session, po_id: UUID):
         """Calculate and update purchase order total amount."""
@@ -372,6 +397,7 @@ class PurchaseOrderService:
         for key, value in po_data.items():
             if key in allowed_fields:
                 setattr(po, key, value)
+        PurchaseOrderService._stage_event(db, po, "updated")
         
         db.commit()
         db.refresh(po)
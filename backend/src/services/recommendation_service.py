@@ -4,7 +4,7 @@ Recommendation service for managing AI recommendations.
 from typing import List, Optional
 from uuid import UUID
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, desc
 
@@ -12,6 +12,7 @@ from src.models.ai_recommendation import AIRecommendation, RecommendationStatus
 from src.models.inventory import Inventory
 from src.models.forecast import Forecast
 from src.services.ai_service_client import ai_service_client
+from src.services.outbox_service import OutboxService
 
 
 class RecommendationService:
@@ -107,6 +108,8 @@ class RecommendationService:
         )
         
         db.add(recommendation)
+        db.flush()  # Get recommendation ID
+        RecommendationService._stage_event(db, recommendation, "created")
         db.commit()
         db.refresh(recommendation)
         
@@ -177,8 +180,28 @@ class RecommendationService:
         recommendation.status = status
         recommendation.actioned_at = datetime.now(timezone.utc)
         recommendation.actioned_by = user_id
+        RecommendationService._stage_event(db, recommendation, "status_changed")
         
         db.commit()
         db.refresh(recommendation)
         
         return recommendation
+    
+    @staticmethod
+    def _stage_event(db: Session, recommendation: AIRecommendation, event_type: str) -> None:
+        """Stage a recommendation change event for the outbox."""
+        OutboxService.enqueue(
+            db,
+            tenant_id=recommendation.tenant_id,
+            event_type=f"recommendation.{event_type}",
+            aggregate_type="AIRecommendation",
+            aggregate_id=recommendation.id,
+            payload={
+                "id": str(recommendation.id),
+                "recommendation_type": recommendation.recommendation_type,
+                "product_id": str(recommendation.product_id),
+                "warehouse_id": str(recommendation.warehouse_id),
+                "status": recommendation.status,
+                "urgency_score": float(recommendation.urgency_score) if recommendation.urgency_score is not None else None
+            }
+        )
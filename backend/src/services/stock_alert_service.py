@@ -0,0 +1,98 @@
+"""
+Low-stock threshold crossing events.
+
+Inventory changes that move a row across its minimum_stock threshold
+write a LowStockEvent to the outbox (event type 'inventory.<type>') in the
+same transaction, so consumers never hear about a crossing that was rolled
+back and WebSocket clients get it through the outbox dispatcher.
+"""
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from src.services.outbox_service import OutboxService
+
+
+LOW_STOCK_ENTERED = "low_stock_entered"
+LOW_STOCK_LEFT = "low_stock_left"
+
+
+def is_below_minimum(quantity: Decimal, minimum_stock: Optional[Decimal]) -> bool:
+    """Same rule as Inventory.is_low_stock."""
+    return minimum_stock is not None and quantity < minimum_stock
+
+
+@dataclass
+class LowStockEvent:
+    """An inventory row entered or left the low-stock set."""
+    type: str  # LOW_STOCK_ENTERED or LOW_STOCK_LEFT
+    tenant_id: UUID
+    inventory_id: UUID
+    product_id: UUID
+    warehouse_id: UUID
+    quantity: Decimal
+    minimum_stock: Optional[Decimal]
+    
+    def to_message(self) -> dict:
+        """JSON-serializable form for WebSocket clients."""
+        data = asdict(self)
+        for key in ('tenant_id', 'inventory_id', 'product_id', 'warehouse_id'):
+            data[key] = str(data[key])
+        data['quantity'] = float(self.quantity)
+        data['minimum_stock'] = float(self.minimum_stock) if self.minimum_stock is not None else None
+        return data
+
+
+class StockAlertService:
+    """Service for low-stock crossing events."""
+    
+    @staticmethod
+    def stage_crossing(
+        db: Session,
+        tenant_id: UUID,
+        inventory_id: UUID,
+        product_id: UUID,
+        warehouse_id: UUID,
+        was_below: bool,
+        quantity: Decimal,
+        minimum_stock: Optional[Decimal]
+    ) -> bool:
+        """
+        Enqueue an outbox event if an inventory row crossed its threshold.
+        
+        Args:
+            db: Database session
+            tenant_id: Tenant ID
+            inventory_id: Inventory row ID
+            product_id: Product ID
+            warehouse_id: Warehouse ID
+            was_below: Whether the row was below minimum before the change
+            quantity: Quantity after the change
+            minimum_stock: Minimum stock after the change
+        
+        Returns:
+            Whether the row is below minimum after the change
+        """
+        now_below = is_below_minimum(quantity, minimum_stock)
+        if now_below != was_below:
+            low_stock_event = LowStockEvent(
+                type=LOW_STOCK_ENTERED if now_below else LOW_STOCK_LEFT,
+                tenant_id=tenant_id,
+                inventory_id=inventory_id,
+                product_id=product_id,
+                warehouse_id=warehouse_id,
+                quantity=quantity,
+                minimum_stock=minimum_stock
+            )
+            OutboxService.enqueue(
+                db,
+                tenant_id=tenant_id,
+                event_type=f"inventory.{low_stock_event.type}",
+                aggregate_type="Inventory",
+                aggregate_id=inventory_id,
+                payload=low_stock_event.to_message()
+            )
+        return now_below
@@ -7,7 +7,6 @@ from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
 from src.models.warehouse import Warehouse
-from src.database.tenant_context import get_current_tenant_id
 
 
 class WarehouseService:
@@ -0,0 +1,152 @@
+"""
+Fan-out of outbox events to the WebSocket clients of every API worker.
+
+The outbox dispatcher that claims an event runs in one worker, but the
+tenant's clients may be connected to any worker. The WebSocket consumer
+publishes each event to the fan-out; every worker subscribes to it and
+relays the events to its own sockets.
+
+The default fan-out is in-process and only reaches the dispatching
+worker's clients, which is enough for a single worker. Set
+websocket_fanout_backend to 'redis' when running several workers: an event
+is then published once Redis accepted it, and every worker relays it from
+its Redis subscription.
+"""
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional
+
+from src.config.settings import settings
+
+
+# Called with each published event: {"tenant_id": ..., "message": ...}
+FanoutSubscriber = Callable[[Dict[str, Any]], None]
+
+# Seconds before a lost Redis subscription is retried
+RESUBSCRIBE_DELAY_SECONDS = 1.0
+
+
+class WebSocketFanout(ABC):
+    """Interface for WebSocket event fan-outs."""
+    
+    def __init__(self):
+        self._subscribers: List[FanoutSubscriber] = []
+    
+    def subscribe(self, subscriber: FanoutSubscriber) -> None:
+        """
+        Receive every published event in this worker.
+        
+        Subscribers must not block; they are called on the worker's event
+        loop or in the publishing thread.
+        """
+        if subscriber not in self._subscribers:
+            self._subscribers.append(subscriber)
+    
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber(event)
+            except Exception as e:
+                print(f"Error relaying WebSocket event: {e}")
+    
+    @abstractmethod
+    def publish(self, event: Dict[str, Any]) -> None:
+        """
+        Send an event to the subscribers of every worker.
+        
+        Called from the outbox dispatcher thread. Raises if the event could
+        not be handed off, which leaves the outbox event pending.
+        """
+    
+    @abstractmethod
+    async def start(self) -> None:
+        """Start receiving events published by other workers."""
+    
+    @abstractmethod
+    async def stop(self) -> None:
+        """Stop receiving events published by other workers."""
+
+
+class MemoryWebSocketFanout(WebSocketFanout):
+    """Fan-out within the current process."""
+    
+    def publish(self, event: Dict[str, Any]) -> None:
+        self._deliver(event)
+    
+    async def start(self) -> None:
+        pass  # Every event is published in this process
+    
+    async def stop(self) -> None:
+        pass
+
+
+class RedisWebSocketFanout(WebSocketFanout):
+    """Fan-out through a Redis pub/sub channel every worker subscribes to."""
+    
+    def __init__(self, url: str, channel: str = "websocket:outbox"):
+        """
+        Initialize the fan-out.
+        
+        Args:
+            url: Redis URL
+            channel: Pub/sub channel shared by the workers
+        """
+        import redis
+        
+        super().__init__()
+        self.url = url
+        self.channel = channel
+        self._publisher = redis.Redis.from_url(url)
+        self._task: Optional[asyncio.Task] = None
+    
+    def publish(self, event: Dict[str, Any]) -> None:
+        self._publisher.publish(self.channel, json.dumps(event, separators=(',', ':')))
+    
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+    
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    async def _run(self) -> None:
+        import redis.asyncio as redis
+        
+        client = redis.from_url(self.url)
+        try:
+            while True:
+                try:
+                    async with client.pubsub() as pubsub:
+                        await pubsub.subscribe(self.channel)
+                        async for item in pubsub.listen():
+                            if item["type"] == "message":
+                                self._deliver(json.loads(item["data"]))
+                except Exception as e:
+                    # Events published until the subscription is back miss this worker's clients
+                    print(f"Error receiving WebSocket events from Redis: {e}")
+                    await asyncio.sleep(RESUBSCRIBE_DELAY_SECONDS)
+        finally:
+            await client.close()
+
+
+def create_websocket_fanout() -> WebSocketFanout:
+    """Build the fan-out selected by settings.websocket_fanout_backend."""
+    if settings.websocket_fanout_backend == "redis":
+        return RedisWebSocketFanout(settings.redis_url)
+    if settings.websocket_fanout_backend == "memory":
+        return MemoryWebSocketFanout()
+    raise ValueError(
+        f"Unknown websocket_fanout_backend: {settings.websocket_fanout_backend}. Must be 'memory' or 'redis'"
+    )
+
+
+# Global fan-out instance
+websocket_fanout = create_websocket_fanout()
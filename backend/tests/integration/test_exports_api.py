@@ -0,0 +1,58 @@
+"""
+Integration tests for bulk export endpoints.
+"""
+import csv
+import io
+import json
+from decimal import Decimal
+from uuid import uuid4
+
+from src.services.inventory_service import InventoryService
+
+
+def test_export_movements_ndjson(client, db_session, tenant_id, auth_token, test_product, test_warehouse, test_inventory):
+    """Test GET /v1/exports/movements streams one JSON object per line."""
+    for quantity in (5, 7):
+        InventoryService.create_inbound_movement(
+            db=db_session,
+            product_id=test_product.id,
+            destination_warehouse_id=test_warehouse.id,
+            quantity=Decimal(quantity),
+            tenant_id=tenant_id,
+            performed_by=uuid4()
+        )
+    
+    response = client.get(
+        "/v1/exports/movements",
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["quantity"] for row in rows] == [5.0, 7.0]
+    assert rows[0]["product_id"] == str(test_product.id)
+
+
+def test_export_inventory_csv(client, auth_token, test_inventory):
+    """Test GET /v1/exports/inventory?format=csv returns a header row and data rows."""
+    response = client.get(
+        "/v1/exports/inventory?format=csv",
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    assert 'filename="inventory.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["id"] == str(test_inventory.id)
+    assert Decimal(rows[0]["quantity"]) == Decimal("100")
+
+
+def test_export_rejects_unknown_dataset_and_format(client, auth_token):
+    """Test export validation errors are reported before streaming starts."""
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    
+    assert client.get("/v1/exports/products", headers=headers).status_code == 400
+    assert client.get("/v1/exports/inventory?format=xml", headers=headers).status_code == 400
+    assert client.get("/v1/exports/inventory?since=2025-01-01T00:00:00", headers=headers).status_code == 400
@@ -0,0 +1,105 @@
+"""
+Integration tests for incremental forecast accuracy tracking.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from src.models.daily_movement_rollup import DailyMovementRollup
+from src.models.forecast import Forecast
+from src.services.forecast_accuracy_service import ForecastAccuracyService
+from src.services.forecast_path import pack
+
+
+def _forecast(db_session, tenant_id, inventory, forecast_date, predicted_demand, model_type="holt_winters", daily=True):
+    path = [predicted_demand / 7] * 7
+    forecast = Forecast(
+        tenant_id=tenant_id,
+        product_id=inventory.product_id,
+        warehouse_id=inventory.warehouse_id,
+        forecast_horizon_days=7,
+        forecast_date=forecast_date,
+        predicted_demand=predicted_demand,
+        model_version="1.0.0",
+        model_type=model_type,
+        daily_path=pack(path, path, path) if daily else None
+    )
+    db_session.add(forecast)
+    db_session.commit()
+    return forecast
+
+
+def _outbound(db_session, tenant_id, inventory, day, quantity, transfer_out=0):
+    db_session.add(DailyMovementRollup(
+        tenant_id=tenant_id,
+        product_id=inventory.product_id,
+        warehouse_id=inventory.warehouse_id,
+        day=day,
+        outbound_quantity=quantity,
+        transfer_out_quantity=transfer_out
+    ))
+    db_session.commit()
+
+
+def test_matured_forecasts_are_evaluated_once(db_session, tenant_id, test_inventory):
+    """Only forecasts whose window has passed are evaluated, and each only once."""
+    today = date.today()
+    matured = _forecast(db_session, tenant_id, test_inventory, today - timedelta(days=10), 90)
+    pending = _forecast(db_session, tenant_id, test_inventory, today - timedelta(days=3), 50)
+    _outbound(db_session, tenant_id, test_inventory, today - timedelta(days=9), 40)
+    _outbound(db_session, tenant_id, test_inventory, today - timedelta(days=4), 60)
+    _outbound(db_session, tenant_id, test_inventory, today - timedelta(days=10), 500)  # Before the window
+    
+    assert ForecastAccuracyService.evaluate(db_session, tenant_id, as_of=today) == 1
+    assert ForecastAccuracyService.evaluate(db_session, tenant_id, as_of=today) == 0
+    
+    db_session.refresh(matured)
+    db_session.refresh(pending)
+    assert matured.realized_demand == Decimal("100")
+    assert pending.realized_demand is None
+    
+    [accuracy] = ForecastAccuracyService.get_accuracy(db_session, tenant_id)
+    assert (accuracy.model_type, accuracy.forecasts_evaluated) == ("holt_winters", 1)
+    assert accuracy.wape == 0.1
+    assert accuracy.bias == -0.1
+    assert accuracy.within_tolerance_share == 1.0
+
+
+def test_summary_adds_up_runs(client, db_session, tenant_id, test_inventory, auth_token):
+    """Later runs add to the running sums, which the summary endpoint reports per model."""
+    today = date.today()
+    _forecast(db_session, tenant_id, test_inventory, today - timedelta(days=20), 100)
+    _outbound(db_session, tenant_id, test_inventory, today - timedelta(days=15), 100)
+    ForecastAccuracyService.evaluate(db_session, tenant_id, as_of=today - timedelta(days=10))
+    
+    _forecast(db_session, tenant_id, test_inventory, today - timedelta(days=9), 100)
+    _outbound(db_session, tenant_id, test_inventory, today - timedelta(days=5), 50)
+    ForecastAccuracyService.evaluate(db_session, tenant_id, as_of=today)
+    
+    response = client.get(
+        "/v1/forecast/accuracy/summary",
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    [summary] = response.json()
+    assert (summary["model_type"], summary["series"], summary["forecasts_evaluated"]) == ("holt_winters", 1, 2)
+    assert summary["wape"] == 50 / 150
+    assert summary["within_tolerance_share"] == 0.5
+
+
+def test_realized_demand_matches_forecast_input(db_session, tenant_id, test_inventory):
+    """Realized demand counts transfers out like the history forecasts are fitted to; stock-level forecasts are skipped."""
+    today = date.today()
+    forecast = _forecast(db_session, tenant_id, test_inventory, today - timedelta(days=10), 100)
+    legacy = _forecast(db_session, tenant_id, test_inventory, today - timedelta(days=11), 100, model_type="legacy", daily=False)
+    _outbound(db_session, tenant_id, test_inventory, today - timedelta(days=5), 60, transfer_out=40)
+    
+    assert ForecastAccuracyService.evaluate(db_session, tenant_id, as_of=today) == 1
+    assert ForecastAccuracyService.tenant_ids(db_session) == []
+    
+    db_session.refresh(forecast)
+    db_session.refresh(legacy)
+    assert forecast.realized_demand == Decimal("100")
+    assert legacy.realized_demand is None
+    [accuracy] = ForecastAccuracyService.get_accuracy(db_session, tenant_id)
+    assert (accuracy.model_type, accuracy.wape) == ("holt_winters", 0.0)
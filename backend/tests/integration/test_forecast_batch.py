@@ -0,0 +1,91 @@
+"""
+Integration tests for tenant-wide batch forecasting.
+"""
+import asyncio
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from src.models.forecast import Forecast
+from src.models.inventory import Inventory
+from src.models.product import Product
+from src.services.ai_service_client import ai_service_client
+from src.services.forecast_service import ForecastService
+from src.services.inventory_service import InventoryService
+
+
+@pytest.fixture
+def batch_requests(monkeypatch):
+    """Answer ai-service batch requests locally and record their sizes."""
+    sizes = []
+    
+    async def fake_batch(series_ids, start_date, quantities, forecast_horizon_days, model_type="exponential_smoothing"):
+        sizes.append(len(series_ids))
+        return {
+            "series_ids": series_ids,
+            "model_version": "1.0.0",
+            "confidence_level": 0.8,
+            "predicted_demand": [row[-1] for row in quantities],
+            "confidence_lower": [0.0] * len(series_ids),
+            "confidence_upper": [row[-1] * 2 for row in quantities],
+            "features": {"data_points": [len(row) for row in quantities]}
+        }
+    
+    monkeypatch.setattr(ai_service_client, "generate_forecast_batch", fake_batch)
+    return sizes
+
+
+def _add_products(db_session, tenant_id, warehouse, count):
+    """Products whose demand today is their index."""
+    for i in range(count):
+        product = Product(tenant_id=tenant_id, sku=f"BATCH-{i:03d}", name=f"Batch {i}", unit_of_measure="pieces")
+        db_session.add(product)
+        db_session.flush()
+        db_session.add(Inventory(tenant_id=tenant_id, product_id=product.id, warehouse_id=warehouse.id, quantity=Decimal(100)))
+        db_session.commit()
+        if i:
+            InventoryService.create_outbound_movement(db_session, product.id, warehouse.id, Decimal(i), tenant_id, uuid4())
+
+
+async def _run(**kwargs):
+    return [
+        (progress.processed, progress.forecasted, progress.failed)
+        async for progress in ForecastService.generate_forecasts_batch(**kwargs)
+    ]
+
+
+def test_batch_forecasts_whole_tenant_in_batches(db_session, tenant_id, test_warehouse, batch_requests):
+    """Series are sent in requests of batch_size and forecasts are upserted once per series and day."""
+    _add_products(db_session, tenant_id, test_warehouse, 7)
+    
+    updates = asyncio.run(_run(db=db_session, tenant_id=tenant_id, forecast_horizon_days=30, batch_size=3, concurrency=2))
+    
+    assert updates == [(6, 6, 0), (7, 7, 0)]
+    assert sorted(batch_requests) == [1, 3, 3]
+    forecasts = db_session.query(Forecast).filter(Forecast.tenant_id == tenant_id).all()
+    assert len(forecasts) == 7
+    assert sorted(float(f.predicted_demand) for f in forecasts) == [float(i) for i in range(7)]
+    assert forecasts[0].features_json == {"data_points": 90}
+    
+    asyncio.run(_run(db=db_session, tenant_id=tenant_id, forecast_horizon_days=30, batch_size=3, concurrency=2))
+    assert db_session.query(Forecast).filter(Forecast.tenant_id == tenant_id).count() == 7
+
+
+def test_failed_batch_only_fails_its_series(db_session, tenant_id, test_warehouse, batch_requests, monkeypatch):
+    """A failing ai-service request is reported and the other batches are still written."""
+    _add_products(db_session, tenant_id, test_warehouse, 4)
+    answer = ai_service_client.generate_forecast_batch
+    
+    async def fail_second(*args, **kwargs):
+        if len(batch_requests) == 1:
+            batch_requests.append(None)
+            raise RuntimeError("ai-service unavailable")
+        return await answer(*args, **kwargs)
+    
+    monkeypatch.setattr(ai_service_client, "generate_forecast_batch", fail_second)
+    
+    updates = asyncio.run(_run(db=db_session, tenant_id=tenant_id, forecast_horizon_days=7, batch_size=2, concurrency=1))
+    
+    assert updates == [(2, 2, 0), (4, 2, 2)]
+    assert db_session.query(Forecast).filter(Forecast.tenant_id == tenant_id).count() == 2
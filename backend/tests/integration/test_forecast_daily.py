@@ -0,0 +1,153 @@
+"""
+Integration tests for daily forecast paths.
+"""
+import asyncio
+from datetime import date, datetime, time, timedelta, timezone
+from uuid import uuid4
+
+import numpy as np
+
+from src.models.forecast import Forecast
+from src.models.inventory_movement import InventoryMovement
+from src.services.ai_service_client import ai_service_client
+from src.services.forecast_path import pack
+from src.services.forecast_service import ForecastService
+from src.services.inventory_service import InventoryService
+from src.services.movement_rollup_service import MovementRollupService
+
+
+def _forecast_with_path(db_session, tenant_id, inventory, forecast_date, days=30):
+    forecast = Forecast(
+        tenant_id=tenant_id,
+        product_id=inventory.product_id,
+        warehouse_id=inventory.warehouse_id,
+        forecast_horizon_days=days,
+        forecast_date=forecast_date,
+        predicted_demand=10 * days,
+        model_version="1.0.0",
+        model_type="exponential_smoothing",
+        daily_path=pack([10.0] * days, [5.0] * days, [20.0] * days)
+    )
+    db_session.add(forecast)
+    db_session.commit()
+    return forecast
+
+
+def test_daily_forecast_slice(client, db_session, tenant_id, test_inventory, auth_token):
+    """A date range returns only the days of the stored path it covers."""
+    today = date.today()
+    _forecast_with_path(db_session, tenant_id, test_inventory, today)
+    
+    response = client.get(
+        "/v1/forecast/daily",
+        params={
+            "product_id": str(test_inventory.product_id),
+            "warehouse_id": str(test_inventory.warehouse_id),
+            "start_date": str(today + timedelta(days=3)),
+            "end_date": str(today + timedelta(days=5))
+        },
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["forecast_date"] == str(today)
+    assert [day["date"] for day in data["days"]] == [str(today + timedelta(days=i)) for i in (3, 4, 5)]
+    assert data["days"][0] == {"date": str(today + timedelta(days=3)), "demand": 10.0, "lower": 5.0, "upper": 20.0}
+
+
+def test_stockout_estimate(client, db_session, tenant_id, test_inventory, auth_token):
+    """Available stock of 80 at 10 per day runs out on day 8, between the band's days 4 and 16."""
+    today = date.today()
+    test_inventory.reserved_quantity = 20
+    db_session.commit()
+    _forecast_with_path(db_session, tenant_id, test_inventory, today)
+    
+    response = client.get(
+        "/v1/forecast/stockout",
+        params={
+            "product_id": str(test_inventory.product_id),
+            "warehouse_id": str(test_inventory.warehouse_id)
+        },
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["on_hand"] == 80.0
+    assert data["expected_stockout_date"] == str(today + timedelta(days=8))
+    assert data["earliest_stockout_date"] == str(today + timedelta(days=4))
+    assert data["latest_stockout_date"] == str(today + timedelta(days=16))
+    assert data["forecast_end_date"] == str(today + timedelta(days=30))
+
+
+def test_stockout_estimate_from_expired_path_is_rejected(client, db_session, tenant_id, test_inventory, auth_token):
+    """A path that ended before tomorrow is reported as stale, not as no stock-out risk."""
+    _forecast_with_path(db_session, tenant_id, test_inventory, date.today() - timedelta(days=30), days=7)
+    
+    response = client.get(
+        "/v1/forecast/stockout",
+        params={
+            "product_id": str(test_inventory.product_id),
+            "warehouse_id": str(test_inventory.warehouse_id)
+        },
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 409
+    assert str(date.today() - timedelta(days=23)) in response.json()["detail"]
+
+
+def test_stockout_estimate_from_restocked_history(client, db_session, monkeypatch, tenant_id, test_inventory, auth_token):
+    """
+    Four weeks of 5 sold per day, restocked with 35 weekly, keep stock flat at
+    about 100; the forecast sees the 5 per day of demand, not the stock level,
+    so 100 on hand lasts 20 days rather than running out tomorrow.
+    """
+    today = date.today()
+    rows = []
+    for week in range(4):
+        rows.append({"movement_type": "inbound", "product_id": str(test_inventory.product_id),
+                     "destination_warehouse_id": str(test_inventory.warehouse_id), "quantity": 35})
+        rows.extend({"movement_type": "outbound", "product_id": str(test_inventory.product_id),
+                     "source_warehouse_id": str(test_inventory.warehouse_id), "quantity": 5} for _ in range(7))
+    results = InventoryService.create_movements_batch(db_session, rows, tenant_id, uuid4())
+    for i, result in enumerate(results):
+        day = today - timedelta(days=27 - (i // 8) * 7 - max(i % 8 - 1, 0))
+        db_session.query(InventoryMovement).filter(InventoryMovement.id == result["movement_id"]).update(
+            {"performed_at": datetime.combine(day, time.min, timezone.utc)}
+        )
+    db_session.commit()
+    MovementRollupService.rebuild(db_session, tenant_id)
+    
+    async def flat_forecast(product_id, warehouse_id, historical_data, forecast_horizon_days, model_type="auto"):
+        """Average of the last four weeks, held flat; enough to tell demand from stock levels."""
+        level = float(np.mean([point["quantity"] for point in historical_data[-28:]]))
+        path = [level] * forecast_horizon_days
+        return {
+            "predicted_demand": level * forecast_horizon_days,
+            "model_version": "1.0.0",
+            "daily_demand": path,
+            "daily_lower": path,
+            "daily_upper": path
+        }
+    
+    monkeypatch.setattr(ai_service_client, "generate_forecast", flat_forecast)
+    forecast = asyncio.run(ForecastService.generate_forecast(
+        db_session, test_inventory.product_id, test_inventory.warehouse_id, 30, tenant_id
+    ))
+    assert float(forecast.predicted_demand) == 150.0
+    
+    response = client.get(
+        "/v1/forecast/stockout",
+        params={
+            "product_id": str(test_inventory.product_id),
+            "warehouse_id": str(test_inventory.warehouse_id)
+        },
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["on_hand"] == 100.0
+    assert data["expected_stockout_date"] == str(today + timedelta(days=20))
@@ -0,0 +1,83 @@
+"""
+Integration tests for the incremental forecast scheduler.
+"""
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from src.models.forecast import Forecast
+from src.models.forecast_run import ForecastRun, ForecastRunStatus
+from src.services.ai_service_client import ai_service_client
+from src.services.forecast_scheduler import ForecastScheduler
+
+
+@pytest.fixture
+def forecasted_series(monkeypatch):
+    """Answer ai-service batch requests locally and record the series sent."""
+    sent = []
+    
+    async def fake_batch(series_ids, start_date, quantities, forecast_horizon_days, model_type="exponential_smoothing"):
+        sent.extend(series_ids)
+        return {
+            "series_ids": series_ids,
+            "model_version": "1.0.0",
+            "predicted_demand": [1.0] * len(series_ids)
+        }
+    
+    monkeypatch.setattr(ai_service_client, "generate_forecast_batch", fake_batch)
+    return sent
+
+
+def _forecast(db_session, tenant_id, inventory, generated_at):
+    db_session.add(Forecast(
+        tenant_id=tenant_id,
+        product_id=inventory.product_id,
+        warehouse_id=inventory.warehouse_id,
+        forecast_horizon_days=30,
+        forecast_date=generated_at.date(),
+        predicted_demand=1,
+        model_version="1.0.0",
+        generated_at=generated_at
+    ))
+    db_session.commit()
+
+
+def test_only_changed_or_stale_series_are_due(db_session, tenant_id, test_inventory):
+    """A fresh forecast with no later movement is skipped; a movement or age makes it due."""
+    key = (test_inventory.product_id, test_inventory.warehouse_id)
+    now = datetime.now(timezone.utc)
+    assert ForecastScheduler.due_series(db_session, tenant_id, 30) == [key]
+    
+    test_inventory.last_movement_at = now - timedelta(days=2)
+    db_session.commit()
+    _forecast(db_session, tenant_id, test_inventory, now - timedelta(days=1))
+    assert ForecastScheduler.due_series(db_session, tenant_id, 30) == []
+    
+    test_inventory.last_movement_at = now
+    db_session.commit()
+    assert ForecastScheduler.due_series(db_session, tenant_id, 30) == [key]
+    assert ForecastScheduler.due_series(db_session, tenant_id, 30, since=now - timedelta(days=2)) == []
+    
+    test_inventory.last_movement_at = now - timedelta(days=40)
+    db_session.query(Forecast).update({Forecast.generated_at: now - timedelta(days=31)})
+    db_session.commit()
+    assert ForecastScheduler.due_series(db_session, tenant_id, 30) == [key]
+
+
+def test_run_resumes_unfinished_run(db_session, tenant_id, test_inventory, forecasted_series):
+    """A run left 'running' is picked up again and completed."""
+    from tests.conftest import TestingSessionLocal
+    
+    crashed = ForecastScheduler.start_run(db_session, tenant_id, 30)
+    
+    runs = asyncio.run(ForecastScheduler.run(tenant_ids=[tenant_id], horizons=[30], session_factory=TestingSessionLocal))
+    
+    assert [run.id for run in runs] == [crashed.id]
+    assert runs[0].status == ForecastRunStatus.COMPLETED.value
+    assert (runs[0].series_total, runs[0].series_processed, runs[0].series_failed) == (1, 1, 0)
+    assert forecasted_series == [f"{test_inventory.product_id}:{test_inventory.warehouse_id}"]
+    
+    db_session.expire_all()
+    assert db_session.query(Forecast).filter(Forecast.forecast_date == date.today()).count() == 1
+    assert db_session.query(ForecastRun).count() == 1
@@ -0,0 +1,161 @@
+"""
+Integration tests for Idempotency-Key handling on write endpoints.
+"""
+import asyncio
+from decimal import Decimal
+from uuid import uuid4
+
+from src.models.inventory import Inventory
+from src.models.inventory_movement import InventoryMovement
+from src.models.purchase_order import PurchaseOrderStatus
+from src.config.settings import settings
+from src.services.idempotency_store import MemoryIdempotencyStore, StoredResponse, create_idempotency_store
+from src.services.purchase_order_service import PurchaseOrderService
+from src.services.supplier_service import SupplierService
+
+
+def _quantity(db_session, inventory_id):
+    db_session.expire_all()
+    return db_session.query(Inventory.quantity).filter(Inventory.id == inventory_id).scalar()
+
+
+def _post_movement(client, auth_token, test_product, test_warehouse, quantity, key=None):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    if key:
+        headers["Idempotency-Key"] = key
+    return client.post(
+        "/v1/inventory/movement",
+        json={
+            "movement_type": "outbound",
+            "product_id": str(test_product.id),
+            "source_warehouse_id": str(test_warehouse.id),
+            "quantity": quantity
+        },
+        headers=headers
+    )
+
+
+def test_retried_movement_is_applied_once(client, db_session, auth_token, test_product, test_warehouse, test_inventory):
+    """Test a retry with the same key replays the first response."""
+    first = _post_movement(client, auth_token, test_product, test_warehouse, 10, key="scan-1")
+    retry = _post_movement(client, auth_token, test_product, test_warehouse, 10, key="scan-1")
+    
+    assert first.status_code == 201
+    assert retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert _quantity(db_session, test_inventory.id) == Decimal("90")
+    assert db_session.query(InventoryMovement).filter(InventoryMovement.product_id == test_product.id).count() == 1
+
+
+def test_movements_without_key_or_with_new_key_are_applied(client, db_session, auth_token, test_product, test_warehouse, test_inventory):
+    """Test requests without a key, or with distinct keys, are independent."""
+    assert _post_movement(client, auth_token, test_product, test_warehouse, 10).status_code == 201
+    assert _post_movement(client, auth_token, test_product, test_warehouse, 10).status_code == 201
+    assert _post_movement(client, auth_token, test_product, test_warehouse, 10, key="scan-2").status_code == 201
+    assert _post_movement(client, auth_token, test_product, test_warehouse, 10, key="scan-3").status_code == 201
+    
+    assert _quantity(db_session, test_inventory.id) == Decimal("60")
+
+
+def test_key_reused_with_different_body_is_rejected(client, db_session, auth_token, test_product, test_warehouse, test_inventory):
+    """Test a key cannot be reused for a different request."""
+    assert _post_movement(client, auth_token, test_product, test_warehouse, 10, key="scan-4").status_code == 201
+    
+    response = _post_movement(client, auth_token, test_product, test_warehouse, 20, key="scan-4")
+    
+    assert response.status_code == 422
+    assert _quantity(db_session, test_inventory.id) == Decimal("90")
+
+
+def test_failed_request_can_be_retried(client, db_session, auth_token, test_product, test_warehouse, test_inventory):
+    """Test error responses are not stored, so the retry runs again."""
+    failed = _post_movement(client, auth_token, test_product, test_warehouse, 500, key="scan-5")
+    assert failed.status_code == 400
+    
+    assert _quantity(db_session, test_inventory.id) == Decimal("100")
+    
+    test_inventory.quantity = Decimal("600")
+    db_session.commit()
+    
+    retry = _post_movement(client, auth_token, test_product, test_warehouse, 500, key="scan-5")
+    assert retry.status_code == 201
+    assert _quantity(db_session, test_inventory.id) == Decimal("100")
+
+
+def test_retried_purchase_order_receive_is_applied_once(client, db_session, tenant_id, auth_token, test_product, test_warehouse, test_inventory):
+    """Test POST /v1/purchase-orders/{id}/receive honours Idempotency-Key."""
+    supplier = SupplierService.create(db_session, {"name": "Scanner Supplier"}, tenant_id)
+    po = PurchaseOrderService.create(
+        db_session,
+        supplier_id=supplier.id,
+        items=[{
+            "product_id": str(test_product.id),
+            "warehouse_id": str(test_warehouse.id),
+            "quantity": 20,
+            "unit_cost": 5
+        }],
+        tenant_id=tenant_id,
+        user_id=uuid4(),
+        order_number="PO-IDEMPOTENT-1"
+    )
+    po.status = PurchaseOrderStatus.SENT.value
+    db_session.commit()
+    
+    headers = {"Authorization": f"Bearer {auth_token}", "Idempotency-Key": "receive-1"}
+    body = {"received_items": {str(po.items[0].id): 20}}
+    first = client.post(f"/v1/purchase-orders/{po.id}/receive", json=body, headers=headers)
+    retry = client.post(f"/v1/purchase-orders/{po.id}/receive", json=body, headers=headers)
+    
+    assert first.status_code == 200
+    assert retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert _quantity(db_session, test_inventory.id) == Decimal("120")
+
+
+def test_memory_store_evicts_least_recently_used():
+    """Test the memory store stays within max_entries."""
+    store = MemoryIdempotencyStore(max_entries=2, ttl_seconds=60)
+    response = StoredResponse(fingerprint="f", status_code=201, headers=[], body="{}")
+    
+    async def scenario():
+        for key in ("a", "b"):
+            assert await store.reserve(key, "f") is None
+            await store.complete(key, response)
+        assert await store.reserve("a", "f") == response  # Touches 'a'
+        assert await store.reserve("c", "f") is None  # Evicts 'b'
+        return await store.reserve("b", "f")
+    
+    assert asyncio.run(scenario()) is None
+    assert store.stats() == {"entries": 2}
+
+
+def test_memory_store_reservation_expires_after_lease():
+    """Test a reservation frees its key after the in-flight lease, a stored response after the full TTL."""
+    store = MemoryIdempotencyStore(ttl_seconds=60, in_flight_ttl_seconds=0.05)
+    response = StoredResponse(fingerprint="f", status_code=201, headers=[], body="{}")
+    
+    async def scenario():
+        assert await store.reserve("crashed", "f") is None
+        assert await store.reserve("completed", "f") is None
+        await store.complete("completed", response)
+        assert await store.reserve("crashed", "f") is not None  # Still in flight
+        await asyncio.sleep(0.1)
+        return await store.reserve("crashed", "f"), await store.reserve("completed", "f")
+    
+    assert asyncio.run(scenario()) == (None, response)
+
+
+def test_memory_store_warns_with_several_workers(monkeypatch, caplog):
+    """Test the memory store logs a warning when several API workers run."""
+    monkeypatch.setattr(settings, "idempotency_backend", "memory")
+    monkeypatch.setattr(settings, "web_concurrency", 4)
+    
+    assert isinstance(create_idempotency_store(), MemoryIdempotencyStore)
+    assert "IDEMPOTENCY_BACKEND=redis" in caplog.text
+    
+    caplog.clear()
+    monkeypatch.setattr(settings, "web_concurrency", 1)
+    create_idempotency_store()
+    assert caplog.text == ""
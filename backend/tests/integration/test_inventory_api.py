@@ -184,3 +184,87 @@ def test_inventory_tenant_isolation(client, db_session, auth_token, test_product
     assert len(data) == 1
     assert data[0]["product_sku"] == "T2-SKU-001"
     assert data[0]["warehouse_name"] == "Tenant 2 Warehouse"
+
+
+def test_inventory_list_cursor_pagination(client, db_session, tenant_id, auth_token, test_warehouse):
+    """Test GET /v1/inventory pages through items with the X-Next-Cursor header."""
+    for i in range(3):
+        product = ProductService.create(
+            db_session,
+            {
+                "sku": f"PAGE-{i:03d}",
+                "name": f"Paged Product {i}",
+                "unit_of_measure": "pieces"
+            },
+            tenant_id
+        )
+        InventoryService.create_or_update(db_session, product.id, test_warehouse.id, 10.0, tenant_id)
+    
+    response = client.get(
+        "/v1/inventory?limit=2",
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    first_page = response.json()
+    assert [item["product_sku"] for item in first_page] == ["PAGE-000", "PAGE-001"]
+    cursor = response.headers["X-Next-Cursor"]
+    
+    response = client.get(
+        f"/v1/inventory?limit=2&cursor={cursor}",
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    assert [item["product_sku"] for item in response.json()] == ["PAGE-002"]
+    assert "X-Next-Cursor" not in response.headers
+    
+    response = client.get(
+        "/v1/inventory?cursor=not-a-cursor",
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 400
+
+
+def test_movement_history_time_range(client, db_session, tenant_id, auth_token, test_product, test_warehouse):
+    """Test GET /v1/inventory/movements bounds results with since/until, and by default to the last 90 days."""
+    from datetime import datetime, timedelta, timezone
+    from decimal import Decimal
+    from src.models.inventory_movement import InventoryMovement
+    
+    old = InventoryService.create_inbound_movement(
+        db_session, test_product.id, test_warehouse.id, Decimal("5"), tenant_id, uuid4(), reference_number="OLD"
+    )
+    InventoryService.create_inbound_movement(
+        db_session, test_product.id, test_warehouse.id, Decimal("3"), tenant_id, uuid4(), reference_number="NEW"
+    )
+    db_session.query(InventoryMovement).filter(InventoryMovement.id == old.id).update(
+        {"performed_at": datetime.now(timezone.utc) - timedelta(days=120)}
+    )
+    db_session.commit()
+    
+    since = (datetime.now(timezone.utc) - timedelta(days=90)).strftime("%Y-%m-%dT%H:%M:%S")
+    response = client.get(
+        f"/v1/inventory/movements?since={since}",
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    assert [movement["reference_number"] for movement in response.json()] == ["NEW"]
+    
+    response = client.get(
+        f"/v1/inventory/movements?until={since}",
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    assert [movement["reference_number"] for movement in response.json()] == ["OLD"]
+    
+    response = client.get(
+        "/v1/inventory/movements",
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    assert [movement["reference_number"] for movement in response.json()] == ["NEW"]  # Last 90 days by default
@@ -0,0 +1,121 @@
+"""
+Integration tests for point-in-time stock queries.
+"""
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from src.models.inventory_movement import InventoryMovement
+from src.models.inventory_snapshot import InventorySnapshot
+from src.services.inventory_service import InventoryService
+from src.services.inventory_snapshot_service import InventorySnapshotService
+
+
+def _backdate(db_session, movement, performed_at):
+    db_session.query(InventoryMovement).filter(InventoryMovement.id == movement.id).update(
+        {"performed_at": performed_at}
+    )
+    db_session.commit()
+
+
+def test_stock_as_of_replays_movements_after_snapshot(client, db_session, tenant_id, auth_token, test_product, test_warehouse):
+    """Stock as of a time is the nearest earlier snapshot plus the movements after it."""
+    user_id = uuid4()
+    now = datetime.now(timezone.utc)
+    
+    received = InventoryService.create_inbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("10"), tenant_id, user_id)
+    _backdate(db_session, received, now - timedelta(days=3))
+    
+    assert InventorySnapshotService.take_snapshot(db_session, tenant_id, snapshot_at=now - timedelta(days=2)) == 1
+    
+    shipped = InventoryService.create_outbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("4"), tenant_id, user_id)
+    _backdate(db_session, shipped, now - timedelta(days=1))
+    InventoryService.create_inbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("5"), tenant_id, user_id)
+    
+    # Before the oldest retained snapshot: rejected
+    with pytest.raises(ValueError):
+        InventorySnapshotService.get_stock_as_of(
+            db_session, tenant_id, test_product.id, test_warehouse.id, now - timedelta(days=2, hours=12)
+        )
+    
+    # After the snapshot: only the outbound movement is replayed
+    stock = InventorySnapshotService.get_stock_as_of(
+        db_session, tenant_id, test_product.id, test_warehouse.id, now - timedelta(hours=12)
+    )
+    assert stock["quantity"] == Decimal("6")
+    assert stock["snapshot_at"] is not None
+    assert stock["movements_replayed"] == 1
+    
+    response = client.get(
+        "/v1/inventory/as-of",
+        params={"warehouse_id": str(test_warehouse.id), "as_of": (now + timedelta(minutes=1)).isoformat()},
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["product_id"] == str(test_product.id)
+    assert data[0]["quantity"] == 11.0
+    assert data[0]["movements_replayed"] == 2
+    
+    response = client.get(
+        "/v1/inventory/as-of",
+        params={
+            "warehouse_id": str(test_warehouse.id),
+            "product_id": str(test_product.id),
+            "as_of": (now - timedelta(hours=12)).isoformat()
+        },
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    assert response.json()[0]["quantity"] == 6.0
+    
+    response = client.get(
+        "/v1/inventory/as-of",
+        params={"warehouse_id": str(test_warehouse.id), "as_of": (now - timedelta(days=2, hours=12)).isoformat()},
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 400
+
+
+def test_stock_as_of_without_snapshots_replays_whole_ledger(db_session, tenant_id, test_product, test_warehouse):
+    """Without any snapshot of the warehouse the whole ledger is replayed."""
+    user_id = uuid4()
+    now = datetime.now(timezone.utc)
+    received = InventoryService.create_inbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("10"), tenant_id, user_id)
+    _backdate(db_session, received, now - timedelta(days=3))
+    
+    stock = InventorySnapshotService.get_stock_as_of(db_session, tenant_id, test_product.id, test_warehouse.id, now - timedelta(days=2))
+    
+    assert stock["quantity"] == Decimal("10")
+    assert stock["snapshot_at"] is None
+    assert stock["movements_replayed"] == 1
+
+
+def test_snapshot_leaves_recent_movements_to_the_replay(db_session, tenant_id, test_product, test_warehouse):
+    """A movement performed shortly before a snapshot but committed after it is still counted once."""
+    user_id = uuid4()
+    now = datetime.now(timezone.utc)
+    received = InventoryService.create_inbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("10"), tenant_id, user_id)
+    _backdate(db_session, received, now - timedelta(days=1))
+    shipped = InventoryService.create_outbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("3"), tenant_id, user_id)
+    _backdate(db_session, shipped, now - timedelta(minutes=1))
+    
+    assert InventorySnapshotService.take_snapshot(db_session, tenant_id) == 1
+    snapshot = db_session.query(InventorySnapshot).filter(InventorySnapshot.tenant_id == tenant_id).one()
+    assert snapshot.quantity == Decimal("10")  # As of the commit lag before now, without the recent outbound
+    
+    # Recorded after the snapshot read the inventory, but performed (transaction start) before it
+    late = InventoryService.create_outbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("2"), tenant_id, user_id)
+    _backdate(db_session, late, now - timedelta(seconds=30))
+    
+    stock = InventorySnapshotService.get_stock_as_of(
+        db_session, tenant_id, test_product.id, test_warehouse.id, now + timedelta(minutes=1)
+    )
+    assert stock["quantity"] == Decimal("5")
+    assert stock["movements_replayed"] == 2
@@ -0,0 +1,169 @@
+"""
+Integration tests for the batch movement ingestion endpoint.
+"""
+from decimal import Decimal
+from uuid import uuid4
+
+from src.models.audit_log import AuditLog
+from src.models.inventory import Inventory
+from src.models.inventory_movement import InventoryMovement
+from src.services.inventory_service import InventoryService
+from src.services.warehouse_service import WarehouseService
+
+
+def test_movement_batch_applies_rows_in_order(client, db_session, tenant_id, auth_token, test_product, test_warehouse, test_inventory):
+    """Test POST /v1/inventory/movements:batch applies valid rows and reports each one."""
+    warehouse2 = WarehouseService.create(
+        db_session,
+        {
+            "name": "Batch Destination",
+            "is_active": True
+        },
+        tenant_id
+    )
+    
+    response = client.post(
+        "/v1/inventory/movements:batch",
+        json={
+            "movements": [
+                {
+                    "movement_type": "inbound",
+                    "product_id": str(test_product.id),
+                    "destination_warehouse_id": str(test_warehouse.id),
+                    "quantity": 20
+                },
+                {
+                    "movement_type": "transfer",
+                    "product_id": str(test_product.id),
+                    "source_warehouse_id": str(test_warehouse.id),
+                    "destination_warehouse_id": str(warehouse2.id),
+                    "quantity": 30
+                },
+                {
+                    "movement_type": "outbound",
+                    "product_id": str(test_product.id),
+                    "source_warehouse_id": str(test_warehouse.id),
+                    "quantity": 1000
+                }
+            ]
+        },
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["applied"] == 2
+    assert data["rejected"] == 1
+    assert [r["status"] for r in data["results"]] == ["applied", "applied", "rejected"]
+    assert data["results"][0]["quantity_before"] == 100.0
+    assert data["results"][0]["quantity_after"] == 120.0
+    assert "Insufficient stock" in data["results"][2]["error"]
+    
+    db_session.expire_all()
+    source = db_session.query(Inventory).filter(Inventory.id == test_inventory.id).one()
+    destination = db_session.query(Inventory).filter(Inventory.warehouse_id == warehouse2.id).one()
+    assert source.quantity == Decimal("90")
+    assert destination.quantity == Decimal("30")
+    assert db_session.query(InventoryMovement).count() == 2
+    assert db_session.query(AuditLog).count() == 2
+
+
+def test_movement_batch_atomic_rejects_everything(client, db_session, tenant_id, auth_token, test_product, test_warehouse, test_inventory):
+    """Test that an atomic batch is not applied when any row is rejected."""
+    response = client.post(
+        "/v1/inventory/movements:batch",
+        json={
+            "atomic": True,
+            "movements": [
+                {
+                    "movement_type": "outbound",
+                    "product_id": str(test_product.id),
+                    "source_warehouse_id": str(test_warehouse.id),
+                    "quantity": 10
+                },
+                {
+                    "movement_type": "outbound",
+                    "product_id": str(uuid4()),
+                    "source_warehouse_id": str(test_warehouse.id),
+                    "quantity": 10
+                }
+            ]
+        },
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["applied"] == 0
+    assert [r["status"] for r in data["results"]] == ["skipped", "rejected"]
+    
+    db_session.expire_all()
+    assert db_session.query(Inventory).filter(Inventory.id == test_inventory.id).one().quantity == Decimal("100")
+    assert db_session.query(InventoryMovement).count() == 0
+
+
+def test_movement_batch_destination_created_concurrently(client, db_session, monkeypatch, auth_token, test_product, test_warehouse, test_inventory):
+    """Test that a destination row created after the batch's first lock is updated, not re-inserted."""
+    lock = InventoryService._lock_batch_inventory
+    calls = []
+    
+    def lock_missing_first(db, tenant_id, stock, *criteria, **kwargs):
+        calls.append(criteria)
+        if len(calls) > 1:  # The first read runs before the concurrent insert
+            lock(db, tenant_id, stock, *criteria, **kwargs)
+    
+    monkeypatch.setattr(InventoryService, "_lock_batch_inventory", staticmethod(lock_missing_first))
+    response = client.post(
+        "/v1/inventory/movements:batch",
+        json={
+            "movements": [
+                {
+                    "movement_type": "inbound",
+                    "product_id": str(test_product.id),
+                    "destination_warehouse_id": str(test_warehouse.id),
+                    "quantity": 20
+                }
+            ]
+        },
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    result = response.json()["results"][0]
+    assert (result["status"], result["quantity_before"], result["quantity_after"]) == ("applied", 100.0, 120.0)
+    
+    db_session.expire_all()
+    assert db_session.query(Inventory).one().quantity == Decimal("120")
+
+
+def test_movement_batch_rejected_row_leaves_no_empty_inventory(client, db_session, auth_token, test_product, test_warehouse, test_inventory):
+    """Test that a destination row created for a rejected transfer is removed again."""
+    warehouse2 = WarehouseService.create(db_session, {"name": "Unused Destination", "is_active": True}, test_warehouse.tenant_id)
+    
+    response = client.post(
+        "/v1/inventory/movements:batch",
+        json={
+            "movements": [
+                {
+                    "movement_type": "transfer",
+                    "product_id": str(test_product.id),
+                    "source_warehouse_id": str(test_warehouse.id),
+                    "destination_warehouse_id": str(warehouse2.id),
+                    "quantity": 1000
+                },
+                {
+                    "movement_type": "inbound",
+                    "product_id": str(test_product.id),
+                    "destination_warehouse_id": str(test_warehouse.id),
+                    "quantity": 5
+                }
+            ]
+        },
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()["results"]] == ["rejected", "applied"]
+    
+    db_session.expire_all()
+    assert db_session.query(Inventory).filter(Inventory.warehouse_id == warehouse2.id).count() == 0
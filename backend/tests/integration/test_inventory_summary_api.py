@@ -0,0 +1,87 @@
+"""
+Integration tests for the per-warehouse inventory summary.
+"""
+from decimal import Decimal
+from uuid import uuid4
+
+from src.models.warehouse_inventory_summary import WarehouseInventorySummary
+from src.services.inventory_service import InventoryService
+from src.services.inventory_summary_service import InventorySummaryService
+from src.services.product_service import ProductService
+from src.services.warehouse_service import WarehouseService
+
+
+def _summaries(db_session, tenant_id):
+    db_session.expire_all()
+    return {
+        row.warehouse_id: (row.sku_count, row.total_units, row.low_stock_count)
+        for row in db_session.query(WarehouseInventorySummary).filter(
+            WarehouseInventorySummary.tenant_id == tenant_id
+        )
+    }
+
+
+def test_movements_keep_summary_in_step_with_inventory(db_session, tenant_id, test_product, test_warehouse, test_inventory):
+    """Summaries maintained by movements match a full rebuild from inventory."""
+    user_id = uuid4()
+    warehouse2 = WarehouseService.create(db_session, {"name": "Summary Destination", "is_active": True}, tenant_id)
+    product2 = ProductService.create(
+        db_session,
+        {"sku": "SUM-002", "name": "Summary Product", "unit_of_measure": "pieces"},
+        tenant_id
+    )
+    
+    # Test Warehouse: 100 -> 60 -> 40, dropping below minimum_stock (50) on the transfer
+    InventoryService.create_outbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("40"), tenant_id, user_id)
+    InventoryService.create_transfer_movement(db_session, test_product.id, test_warehouse.id, warehouse2.id, Decimal("20"), tenant_id, user_id)
+    InventoryService.create_inbound_movement(db_session, product2.id, warehouse2.id, Decimal("7"), tenant_id, user_id)
+    InventoryService.create_movements_batch(
+        db_session,
+        [
+            {"movement_type": "inbound", "product_id": str(product2.id), "destination_warehouse_id": str(test_warehouse.id), "quantity": 3},
+            {"movement_type": "outbound", "product_id": str(test_product.id), "source_warehouse_id": str(warehouse2.id), "quantity": 5},
+        ],
+        tenant_id,
+        user_id
+    )
+    InventoryService.create_or_update(db_session, product2.id, warehouse2.id, Decimal("1"), tenant_id, minimum_stock=Decimal("2"))
+    
+    maintained = _summaries(db_session, tenant_id)
+    assert maintained[test_warehouse.id] == (2, Decimal("43"), 1)
+    assert maintained[warehouse2.id] == (2, Decimal("16"), 1)
+    
+    InventorySummaryService.rebuild(db_session, tenant_id)
+    assert _summaries(db_session, tenant_id) == maintained
+
+
+def test_failed_movement_leaves_summary_untouched(db_session, tenant_id, test_product, test_warehouse, test_inventory):
+    """A rolled-back movement does not change the summary."""
+    InventoryService.create_inbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("1"), tenant_id, uuid4())
+    before = _summaries(db_session, tenant_id)
+    
+    InventoryService.create_outbound_movement(
+        db_session, test_product.id, test_warehouse.id, Decimal("5"), tenant_id, uuid4(), commit=False
+    )
+    db_session.rollback()
+    
+    assert _summaries(db_session, tenant_id) == before
+
+
+def test_warehouse_summary_api(client, db_session, tenant_id, auth_token, test_product, test_warehouse, test_inventory):
+    """Test GET /v1/inventory/summary returns one row per warehouse."""
+    WarehouseService.create(db_session, {"name": "Empty Warehouse", "is_active": True}, tenant_id)
+    InventoryService.create_outbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("60"), tenant_id, uuid4())
+    
+    response = client.get(
+        "/v1/inventory/summary",
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    data = {row["warehouse_name"]: row for row in response.json()}
+    assert data["Test Warehouse"]["sku_count"] == 1
+    assert data["Test Warehouse"]["total_units"] == 40.0
+    assert data["Test Warehouse"]["low_stock_count"] == 1
+    assert data["Test Warehouse"]["last_movement_at"] is not None
+    assert data["Empty Warehouse"]["sku_count"] == 0
+    assert data["Empty Warehouse"]["last_movement_at"] is None
@@ -0,0 +1,113 @@
+"""
+Integration tests for the maintained low-stock flag and crossing events.
+"""
+from decimal import Decimal
+from uuid import uuid4
+
+from src.models.inventory import Inventory
+from src.models.outbox_event import OutboxEvent
+from src.services.inventory_service import InventoryService
+from src.services.outbox_service import OutboxService
+
+
+def _crossings(db_session, tenant_id):
+    """Low-stock crossings written to the outbox, oldest first."""
+    db_session.expire_all()
+    return db_session.query(OutboxEvent).filter(
+        OutboxEvent.tenant_id == tenant_id,
+        OutboxEvent.event_type.in_(["inventory.low_stock_entered", "inventory.low_stock_left"])
+    ).order_by(OutboxEvent.created_at).all()
+
+
+def _flag(db_session, inventory_id):
+    db_session.expire_all()
+    return db_session.query(Inventory.below_minimum).filter(Inventory.id == inventory_id).scalar()
+
+
+def test_movements_flag_crossings_in_both_directions(db_session, tenant_id, test_product, test_warehouse, test_inventory):
+    """Crossing minimum_stock sets or clears the flag and writes one outbox event per crossing."""
+    user_id = uuid4()
+    
+    # 100 -> 60: still above minimum_stock (50), no event
+    InventoryService.create_outbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("40"), tenant_id, user_id)
+    assert _crossings(db_session, tenant_id) == []
+    assert _flag(db_session, test_inventory.id) is False
+    
+    # 60 -> 45: enters the low-stock set
+    InventoryService.create_outbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("15"), tenant_id, user_id)
+    crossings = _crossings(db_session, tenant_id)
+    assert [e.event_type for e in crossings] == ["inventory.low_stock_entered"]
+    assert crossings[0].aggregate_id == test_inventory.id
+    assert crossings[0].payload["quantity"] == 45.0
+    assert _flag(db_session, test_inventory.id) is True
+    
+    # 45 -> 55 through the batch path: leaves the low-stock set
+    InventoryService.create_movements_batch(
+        db_session,
+        [{"movement_type": "inbound", "product_id": str(test_product.id), "destination_warehouse_id": str(test_warehouse.id), "quantity": 10}],
+        tenant_id,
+        user_id
+    )
+    assert [e.event_type for e in _crossings(db_session, tenant_id)] == [
+        "inventory.low_stock_entered", "inventory.low_stock_left"
+    ]
+    assert _flag(db_session, test_inventory.id) is False
+    
+    low_stock = InventoryService.get_low_stock_items(db_session, tenant_id)
+    assert low_stock == []
+
+
+def test_rolled_back_crossing_is_not_published(db_session, tenant_id, test_product, test_warehouse, test_inventory):
+    """A rolled-back crossing leaves no event in the outbox."""
+    InventoryService.create_outbound_movement(
+        db_session, test_product.id, test_warehouse.id, Decimal("80"), tenant_id, uuid4(), commit=False
+    )
+    db_session.rollback()
+    
+    assert _crossings(db_session, tenant_id) == []
+    assert _flag(db_session, test_inventory.id) is False
+
+
+def test_low_stock_endpoint_uses_flag(client, db_session, tenant_id, auth_token, test_product, test_warehouse, test_inventory):
+    """Test GET /v1/inventory/low-stock returns rows flagged below minimum."""
+    InventoryService.create_or_update(
+        db_session, test_product.id, test_warehouse.id, Decimal("10"), tenant_id
+    )
+    
+    response = client.get(
+        "/v1/inventory/low-stock",
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data] == [str(test_inventory.id)]
+    assert data[0]["is_low_stock"] is True
+
+
+def test_low_stock_crossing_is_pushed_over_websocket(client, db_session, auth_token, test_product, test_warehouse, test_inventory):
+    """Test /ws/inventory clients receive low_stock_entered notifications from the outbox."""
+    with client.websocket_connect(f"/ws/inventory?token={auth_token}") as websocket:
+        assert websocket.receive_json()["type"] == "connected"
+        
+        response = client.post(
+            "/v1/inventory/movement",
+            json={
+                "movement_type": "outbound",
+                "product_id": str(test_product.id),
+                "source_warehouse_id": str(test_warehouse.id),
+                "quantity": 60
+            },
+            headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        assert response.status_code == 201
+        
+        # Low-stock entry, stock update and the movement itself
+        assert OutboxService.dispatch_batch(db_session) == 3
+        messages = [websocket.receive_json() for _ in range(3)]
+    
+    message = next(m for m in messages if m["type"] == "low_stock_entered")
+    assert message["data"]["inventory_id"] == str(test_inventory.id)
+    assert message["data"]["quantity"] == 40.0
+    assert {m["type"] for m in messages} == {"low_stock_entered", "inventory_update", "inventory.movement.created"}
+    assert len({m["event_id"] for m in messages}) == 3
@@ -0,0 +1,109 @@
+"""
+Integration tests for the daily movement rollup.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import numpy as np
+
+from src.models.daily_movement_rollup import DailyMovementRollup
+from src.services.forecast_service import ForecastService
+from src.services.inventory_service import InventoryService
+from src.services.movement_rollup_service import MovementRollupService
+from src.services.warehouse_service import WarehouseService
+
+
+def _rollups(db_session, tenant_id):
+    db_session.expire_all()
+    return {
+        (row.product_id, row.warehouse_id, row.day): (
+            row.inbound_quantity,
+            row.outbound_quantity,
+            row.transfer_in_quantity,
+            row.transfer_out_quantity,
+            row.movement_count
+        )
+        for row in db_session.query(DailyMovementRollup).filter(DailyMovementRollup.tenant_id == tenant_id)
+    }
+
+
+def test_movements_update_rollup_incrementally(db_session, tenant_id, test_product, test_warehouse, test_inventory):
+    """Rollups written with each movement match a rebuild from the ledger."""
+    user_id = uuid4()
+    warehouse2 = WarehouseService.create(db_session, {"name": "Rollup Destination", "is_active": True}, tenant_id)
+    
+    InventoryService.create_inbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("10"), tenant_id, user_id)
+    InventoryService.create_outbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("4"), tenant_id, user_id)
+    InventoryService.create_transfer_movement(db_session, test_product.id, test_warehouse.id, warehouse2.id, Decimal("6"), tenant_id, user_id)
+    InventoryService.create_movements_batch(
+        db_session,
+        [
+            {"movement_type": "outbound", "product_id": str(test_product.id), "source_warehouse_id": str(test_warehouse.id), "quantity": 2},
+            {"movement_type": "inbound", "product_id": str(test_product.id), "destination_warehouse_id": str(warehouse2.id), "quantity": 3},
+        ],
+        tenant_id,
+        user_id
+    )
+    
+    incremental = _rollups(db_session, tenant_id)
+    today = date.today()
+    source = next(value for (_, warehouse_id, _), value in incremental.items() if warehouse_id == test_warehouse.id)
+    destination = next(value for (_, warehouse_id, _), value in incremental.items() if warehouse_id == warehouse2.id)
+    assert len(incremental) == 2
+    assert source == (Decimal("10"), Decimal("6"), Decimal("0"), Decimal("6"), 4)
+    assert destination == (Decimal("3"), Decimal("0"), Decimal("6"), Decimal("0"), 2)
+    
+    assert MovementRollupService.rebuild(db_session, tenant_id) == 2
+    assert _rollups(db_session, tenant_id) == incremental
+    
+    rows = MovementRollupService.get_for_warehouse(db_session, tenant_id, test_warehouse.id, today - timedelta(days=1), today + timedelta(days=1))
+    assert [row.net_quantity for row in rows] == [Decimal("-2")]
+
+
+def test_rolled_back_movement_leaves_rollup_untouched(db_session, tenant_id, test_product, test_warehouse, test_inventory):
+    """Deltas staged in a rolled-back transaction are discarded."""
+    InventoryService.create_inbound_movement(
+        db_session, test_product.id, test_warehouse.id, Decimal("5"), tenant_id, uuid4(), commit=False
+    )
+    db_session.rollback()
+    db_session.commit()
+    
+    assert _rollups(db_session, tenant_id) == {}
+
+
+def test_historical_data_reads_rollup(db_session, tenant_id, test_product, test_warehouse, test_inventory):
+    """Forecast history has one point per day: the day's outbound and transfer-out demand."""
+    user_id = uuid4()
+    warehouse2 = WarehouseService.create(db_session, {"name": "History Destination", "is_active": True}, tenant_id)
+    InventoryService.create_inbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("10"), tenant_id, user_id)
+    InventoryService.create_outbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("4"), tenant_id, user_id)
+    InventoryService.create_transfer_movement(db_session, test_product.id, test_warehouse.id, warehouse2.id, Decimal("3"), tenant_id, user_id)
+    
+    history = ForecastService._get_historical_data(db_session, test_product.id, test_warehouse.id, tenant_id, days=30)
+    
+    assert history.quantities.shape == (1, 30)
+    points = {point["date"]: point["quantity"] for point in history.to_records()}
+    rollup_day = next(iter(_rollups(db_session, tenant_id)))[2]
+    assert points[rollup_day.isoformat()] == 7.0  # Inbound stock is not demand
+    assert points[(rollup_day - timedelta(days=5)).isoformat()] == 0.0
+
+
+def test_history_covers_many_series_in_one_matrix(db_session, tenant_id, test_product, test_warehouse, test_inventory):
+    """Every inventory row of the warehouse gets a dense row aligned to the same dates."""
+    user_id = uuid4()
+    warehouse2 = WarehouseService.create(db_session, {"name": "History Second", "is_active": True}, tenant_id)
+    InventoryService.create_outbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("7"), tenant_id, user_id)
+    InventoryService.create_inbound_movement(db_session, test_product.id, warehouse2.id, Decimal("3"), tenant_id, user_id)
+    
+    history = ForecastService.get_history(db_session, tenant_id, days=14)
+    
+    assert history.quantities.shape == (2, 14)
+    assert history.dates[-1] == np.datetime64(date.today(), 'D')
+    source = history.quantities[history.series.index((test_product.id, test_warehouse.id))]
+    destination = history.quantities[history.series.index((test_product.id, warehouse2.id))]
+    assert (source.max(), source.sum()) == (7.0, 7.0)
+    assert destination.sum() == 0.0
+    
+    only_second = ForecastService.get_history(db_session, tenant_id, warehouse_id=warehouse2.id, days=14)
+    assert only_second.series == [(test_product.id, warehouse2.id)]
@@ -0,0 +1,122 @@
+"""
+Integration tests for the transactional outbox.
+"""
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from src.api.websocket import relay_to_connections
+from src.models.outbox_event import OutboxEvent
+from src.services.inventory_service import InventoryService
+from src.services.outbox_service import OutboxService
+
+
+@pytest.fixture
+def delivered():
+    """Collect outbox messages delivered for the duration of a test."""
+    messages = []
+    OutboxService.register_consumer("test", messages.append)
+    yield messages
+    OutboxService.unregister_consumer("test")
+
+
+def _events(db_session, tenant_id):
+    db_session.expire_all()
+    return db_session.query(OutboxEvent).filter(OutboxEvent.tenant_id == tenant_id).order_by(OutboxEvent.created_at).all()
+
+
+def test_movement_writes_events_with_the_change(db_session, tenant_id, test_product, test_warehouse, test_inventory):
+    """A committed movement leaves stock update and movement events in the outbox."""
+    movement = InventoryService.create_inbound_movement(
+        db_session, test_product.id, test_warehouse.id, Decimal("10"), tenant_id, uuid4()
+    )
+    
+    events = _events(db_session, tenant_id)
+    assert sorted(e.event_type for e in events) == ["inventory.movement.created", "inventory.updated"]
+    assert all(e.published_at is None and e.attempts == 0 for e in events)
+    
+    updated = next(e for e in events if e.event_type == "inventory.updated")
+    assert updated.aggregate_id == test_inventory.id
+    assert updated.payload["quantity"] == 110.0
+    created = next(e for e in events if e.event_type == "inventory.movement.created")
+    assert created.aggregate_id == movement.id
+
+
+def test_rolled_back_change_writes_no_events(db_session, tenant_id, test_product, test_warehouse, test_inventory):
+    """Events staged in a rolled-back transaction are discarded."""
+    InventoryService.create_inbound_movement(
+        db_session, test_product.id, test_warehouse.id, Decimal("10"), tenant_id, uuid4(), commit=False
+    )
+    db_session.rollback()
+    db_session.commit()
+    
+    assert _events(db_session, tenant_id) == []
+
+
+def test_dispatch_publishes_pending_events(db_session, tenant_id, test_product, test_warehouse, test_inventory, delivered):
+    """Dispatched events reach consumers in order and are marked published."""
+    InventoryService.create_inbound_movement(db_session, test_product.id, test_warehouse.id, Decimal("10"), tenant_id, uuid4())
+    events = _events(db_session, tenant_id)
+    
+    assert OutboxService.dispatch_batch(db_session) == 2
+    assert [m.id for m in delivered] == [e.id for e in events]
+    assert all(e.published_at is not None for e in _events(db_session, tenant_id))
+    
+    # Nothing left to deliver
+    assert OutboxService.dispatch_batch(db_session) == 0
+    assert len(delivered) == 2
+
+
+def test_failed_delivery_is_retried(db_session, tenant_id, test_product, test_warehouse, test_inventory):
+    """An event a consumer rejects stays pending and counts the attempt."""
+    def reject(message):
+        raise RuntimeError("consumer unavailable")
+    
+    OutboxService.register_consumer("test", reject)
+    try:
+        InventoryService.create_or_update(db_session, test_product.id, test_warehouse.id, Decimal("80"), tenant_id)
+        assert OutboxService.dispatch_batch(db_session) == 0
+    finally:
+        OutboxService.unregister_consumer("test")
+    
+    [event] = _events(db_session, tenant_id)
+    assert event.published_at is None
+    assert event.attempts == 1
+    assert event.last_error == "consumer unavailable"
+    
+    lag = OutboxService.get_lag(db_session, tenant_id)
+    assert lag["pending"] == 1
+    assert lag["failed"] == 0
+    assert lag["lag_seconds"] >= 0
+    
+    assert OutboxService.dispatch_batch(db_session) == 1
+    assert OutboxService.get_lag(db_session, tenant_id)["pending"] == 0
+
+
+def test_outbox_lag_endpoint(client, db_session, tenant_id, auth_token, test_product, test_warehouse, test_inventory):
+    """Test GET /v1/outbox/lag reports pending events."""
+    InventoryService.create_or_update(db_session, test_product.id, test_warehouse.id, Decimal("80"), tenant_id)
+    
+    response = client.get("/v1/outbox/lag", headers={"Authorization": f"Bearer {auth_token}"})
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["pending"] == 1
+    assert data["failed"] == 0
+    assert data["oldest_pending_at"] is not None
+
+
+def test_fanned_out_event_reaches_local_sockets(client, tenant_id, auth_token):
+    """An event another worker published to the fan-out is relayed to this worker's sockets."""
+    with client.websocket_connect(f"/ws/inventory?token={auth_token}") as websocket:
+        assert websocket.receive_json()["type"] == "connected"
+        
+        relay_to_connections({
+            "tenant_id": str(tenant_id),
+            "message": {"type": "inventory_update", "event_id": "e1", "data": {"quantity": 5.0}, "timestamp": "t"}
+        })
+        message = websocket.receive_json()
+    
+    assert message["event_id"] == "e1"
+    assert message["data"] == {"quantity": 5.0}
@@ -0,0 +1,108 @@
+"""
+Commits-per-movement benchmark for deferred audit logging.
+
+Before deferred audit mode, every movement committed twice (once inside
+AuditService.log_action and once in the movement method) and receiving a
+purchase order with k lines committed 2k + 2 times.
+
+Run with: pytest tests/load/test_audit_commit_count.py -s
+"""
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import event
+
+from src.models.audit_log import AuditLog
+from src.models.inventory_movement import InventoryMovement
+from src.services.inventory_service import InventoryService
+
+
+MOVEMENT_COUNT = 50
+
+
+class CommitCounter:
+    """Counts commits issued on a session."""
+    
+    def __init__(self, session):
+        self.session = session
+        self.count = 0
+    
+    def _on_commit(self, session):
+        if not session.in_nested_transaction():  # Savepoint releases are not commits
+            self.count += 1
+    
+    def __enter__(self):
+        event.listen(self.session, "after_commit", self._on_commit)
+        return self
+    
+    def __exit__(self, *exc):
+        event.remove(self.session, "after_commit", self._on_commit)
+
+
+def test_single_commit_per_movement(db_session, tenant_id, test_product, test_warehouse, test_inventory):
+    """Each movement, including its audit entry, is written by exactly one commit."""
+    user_id = uuid4()
+    
+    with CommitCounter(db_session) as counter:
+        for _ in range(MOVEMENT_COUNT):
+            InventoryService.create_inbound_movement(
+                db=db_session,
+                product_id=test_product.id,
+                destination_warehouse_id=test_warehouse.id,
+                quantity=Decimal("2"),
+                tenant_id=tenant_id,
+                performed_by=user_id
+            )
+            InventoryService.create_outbound_movement(
+                db=db_session,
+                product_id=test_product.id,
+                source_warehouse_id=test_warehouse.id,
+                quantity=Decimal("1"),
+                tenant_id=tenant_id,
+                performed_by=user_id
+            )
+    
+    movements = 2 * MOVEMENT_COUNT
+    print(f"\n{movements} movements: {counter.count / movements:.2f} commits per movement (was 2.00)")
+    assert counter.count == movements
+    assert db_session.query(InventoryMovement).count() == movements
+    assert db_session.query(AuditLog).count() == movements
+
+
+def test_grouped_movements_share_one_commit(db_session, tenant_id, test_product, test_warehouse, test_inventory):
+    """Movements created with commit=False are written with the caller's commit."""
+    user_id = uuid4()
+    
+    with CommitCounter(db_session) as counter:
+        for _ in range(MOVEMENT_COUNT):
+            InventoryService.create_inbound_movement(
+                db=db_session,
+                product_id=test_product.id,
+                destination_warehouse_id=test_warehouse.id,
+                quantity=Decimal("1"),
+                tenant_id=tenant_id,
+                performed_by=user_id,
+                commit=False
+            )
+        db_session.commit()
+    
+    assert counter.count == 1
+    assert db_session.query(AuditLog).count() == MOVEMENT_COUNT
+
+
+def test_rollback_discards_staged_audit_entries(db_session, tenant_id, test_product, test_warehouse, test_inventory):
+    """A rolled-back movement leaves neither the movement nor its audit entry behind."""
+    InventoryService.create_inbound_movement(
+        db=db_session,
+        product_id=test_product.id,
+        destination_warehouse_id=test_warehouse.id,
+        quantity=Decimal("1"),
+        tenant_id=tenant_id,
+        performed_by=uuid4(),
+        commit=False
+    )
+    db_session.rollback()
+    db_session.commit()
+    
+    assert db_session.query(InventoryMovement).count() == 0
+    assert db_session.query(AuditLog).count() == 0
@@ -0,0 +1,73 @@
+"""
+Memory benchmark for streaming exports.
+
+Exports a small and a large movement history and compares peak Python
+memory while the whole stream is consumed. Peak memory should be bounded by
+the fetch size, not by the number of rows exported.
+
+Run with: pytest tests/load/test_export_memory.py -s
+"""
+import tracemalloc
+from uuid import uuid4
+
+from sqlalchemy import insert
+
+from src.models.inventory_movement import InventoryMovement
+from src.services.export_service import ExportService
+
+
+SMALL_EXPORT_ROWS = 10_000
+LARGE_EXPORT_ROWS = 100_000
+
+
+def _seed_movements(db_session, tenant_id, product_id, warehouse_id, count):
+    performed_by = uuid4()
+    for start in range(0, count, 10_000):
+        db_session.execute(insert(InventoryMovement), [
+            {
+                "id": uuid4(),
+                "tenant_id": tenant_id,
+                "movement_type": "inbound",
+                "product_id": product_id,
+                "destination_warehouse_id": warehouse_id,
+                "quantity": 1,
+                "quantity_before": n,
+                "quantity_after": n + 1,
+                "notes": "export benchmark",
+                "performed_by": performed_by
+            }
+            for n in range(start, min(start + 10_000, count))
+        ])
+    db_session.commit()
+
+
+def _export_peak(db_session, tenant_id, format):
+    """Consume a full export and return (bytes written, peak traced memory)."""
+    columns = ExportService.get_dataset("movements").columns
+    query = ExportService.build_query("movements", tenant_id)
+    chunks = ExportService.stream_rows(db_session, query)
+    body = ExportService.iter_csv(columns, chunks) if format == "csv" else ExportService.iter_ndjson(columns, chunks)
+    
+    tracemalloc.start()
+    try:
+        written = sum(len(chunk) for chunk in body)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return written, peak
+
+
+def test_export_memory_does_not_grow_with_row_count(db_session, test_product, test_warehouse):
+    """Exporting 10x more rows should not need meaningfully more memory."""
+    small_tenant, large_tenant = uuid4(), uuid4()
+    _seed_movements(db_session, small_tenant, test_product.id, test_warehouse.id, SMALL_EXPORT_ROWS)
+    _seed_movements(db_session, large_tenant, test_product.id, test_warehouse.id, LARGE_EXPORT_ROWS)
+    
+    for format in ("ndjson", "csv"):
+        small_bytes, small_peak = _export_peak(db_session, small_tenant, format)
+        large_bytes, large_peak = _export_peak(db_session, large_tenant, format)
+        
+        print(f"\n{format}: {SMALL_EXPORT_ROWS} rows {small_bytes / 1e6:.1f}MB out, peak {small_peak / 1e6:.2f}MB; "
+              f"{LARGE_EXPORT_ROWS} rows {large_bytes / 1e6:.1f}MB out, peak {large_peak / 1e6:.2f}MB")
+        assert large_bytes > 9 * small_bytes
+        assert large_peak < small_peak * 1.5
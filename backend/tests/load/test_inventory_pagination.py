@@ -0,0 +1,123 @@
+"""
+Page latency benchmark for GET /v1/inventory keyset pagination.
+
+Seeds a small and a large tenant and times the first page and a deep page
+for each. With keyset pagination, page latency should stay roughly flat as
+the tenant grows, while the old load-everything-then-slice path grows
+linearly.
+
+Run with: pytest tests/load/test_inventory_pagination.py -s
+"""
+import statistics
+import time
+from uuid import uuid4
+
+from sqlalchemy import insert
+
+from src.models.inventory import Inventory
+from src.models.product import Product
+from src.models.warehouse import Warehouse
+from src.services.inventory_service import InventoryService, encode_inventory_cursor
+
+
+WAREHOUSES = 4
+SMALL_TENANT_ROWS = 1_000
+LARGE_TENANT_ROWS = 40_000
+PAGE_SIZE = 100
+REPEATS = 5
+
+
+def _seed_tenant(db_session, rows):
+    """Bulk-insert a tenant with `rows` inventory rows spread over the warehouses."""
+    tenant_id = uuid4()
+    warehouses = [
+        {"id": uuid4(), "tenant_id": tenant_id, "name": f"Bench Warehouse {w}", "is_active": True}
+        for w in range(WAREHOUSES)
+    ]
+    products = [
+        {"id": uuid4(), "tenant_id": tenant_id, "sku": f"BENCH-{i:06d}", "name": f"Bench Product {i}", "unit_of_measure": "pieces"}
+        for i in range(rows // WAREHOUSES)
+    ]
+    inventory = [
+        {
+            "id": uuid4(),
+            "tenant_id": tenant_id,
+            "product_id": product["id"],
+            "warehouse_id": warehouse["id"],
+            "quantity": 50,
+            "reserved_quantity": 0,
+            "minimum_stock": 10,
+            "version": 0
+        }
+        for warehouse in warehouses
+        for product in products
+    ]
+    db_session.execute(insert(Warehouse), warehouses)
+    db_session.execute(insert(Product), products)
+    db_session.execute(insert(Inventory), inventory)
+    db_session.commit()
+    
+    # A cursor pointing half-way through the tenant
+    middle_warehouse = sorted(w["id"] for w in warehouses)[WAREHOUSES // 2]
+    middle_product = products[len(products) // 2]
+    middle_row = next(
+        row for row in inventory
+        if row["warehouse_id"] == middle_warehouse and row["product_id"] == middle_product["id"]
+    )
+    deep_cursor = encode_inventory_cursor(middle_warehouse, middle_product["sku"], middle_row["id"])
+    return tenant_id, deep_cursor
+
+
+def _median_ms(fn):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def test_walking_all_pages_returns_every_row_once(db_session):
+    """Following next_cursor visits every row exactly once, in (warehouse, sku, id) order."""
+    tenant_id, _ = _seed_tenant(db_session, SMALL_TENANT_ROWS)
+    
+    seen = []
+    cursor = None
+    while True:
+        items, cursor = InventoryService.get_inventory_page(db_session, tenant_id, limit=PAGE_SIZE, cursor=cursor)
+        seen.extend(items)
+        if cursor is None:
+            break
+    
+    assert len(seen) == SMALL_TENANT_ROWS
+    assert len({item["id"] for item in seen}) == SMALL_TENANT_ROWS
+    keys = [(item["warehouse_id"], item["product_sku"], item["id"]) for item in seen]
+    assert keys == sorted(keys)
+
+
+def test_page_latency_stays_flat_as_tenant_grows(db_session):
+    """First and deep page latency should not scale with tenant size."""
+    small_tenant, small_cursor = _seed_tenant(db_session, SMALL_TENANT_ROWS)
+    large_tenant, large_cursor = _seed_tenant(db_session, LARGE_TENANT_ROWS)
+    
+    def page(tenant_id, cursor=None):
+        return lambda: InventoryService.get_inventory_page(db_session, tenant_id, limit=PAGE_SIZE, cursor=cursor)
+    
+    def full_scan(tenant_id):
+        return lambda: InventoryService.get_inventory_with_details(db_session, tenant_id)[:PAGE_SIZE]
+    
+    small_first = _median_ms(page(small_tenant))
+    large_first = _median_ms(page(large_tenant))
+    small_deep = _median_ms(page(small_tenant, small_cursor))
+    large_deep = _median_ms(page(large_tenant, large_cursor))
+    small_scan = _median_ms(full_scan(small_tenant))
+    large_scan = _median_ms(full_scan(large_tenant))
+    
+    print(f"\n{'rows':>8} {'first page':>12} {'deep page':>12} {'full scan':>12}")
+    print(f"{SMALL_TENANT_ROWS:>8} {small_first:>10.2f}ms {small_deep:>10.2f}ms {small_scan:>10.2f}ms")
+    print(f"{LARGE_TENANT_ROWS:>8} {large_first:>10.2f}ms {large_deep:>10.2f}ms {large_scan:>10.2f}ms")
+    
+    # 40x more rows; keyset pages should stay within a small constant factor
+    assert large_first < small_first * 2
+    assert large_deep < small_deep * 2
+    assert large_deep < large_scan / 5
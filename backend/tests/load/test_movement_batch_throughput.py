@@ -0,0 +1,66 @@
+"""
+Throughput comparison between single-row and batch movement ingestion.
+
+Run with: pytest tests/load/test_movement_batch_throughput.py -s
+"""
+import time
+from decimal import Decimal
+from uuid import uuid4
+
+from src.models.product import Product
+from src.services.inventory_service import InventoryService
+
+
+MOVEMENT_COUNT = 500
+
+
+def _seed_products(db_session, tenant_id, count):
+    products = [
+        Product(tenant_id=tenant_id, sku=f"LOAD-{i:05d}", name=f"Load Product {i}", unit_of_measure="pieces")
+        for i in range(count)
+    ]
+    db_session.add_all(products)
+    db_session.commit()
+    return products
+
+
+def test_batch_ingestion_outperforms_single_row_path(db_session, tenant_id, test_warehouse):
+    """Batch ingestion of N inbound movements should beat N single-row calls."""
+    user_id = uuid4()
+    products = _seed_products(db_session, tenant_id, MOVEMENT_COUNT)
+    
+    start = time.perf_counter()
+    for product in products:
+        InventoryService.create_inbound_movement(
+            db=db_session,
+            product_id=product.id,
+            destination_warehouse_id=test_warehouse.id,
+            quantity=Decimal("5"),
+            tenant_id=tenant_id,
+            performed_by=user_id
+        )
+    single_elapsed = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    results = InventoryService.create_movements_batch(
+        db=db_session,
+        movements=[
+            {
+                "movement_type": "inbound",
+                "product_id": str(product.id),
+                "destination_warehouse_id": str(test_warehouse.id),
+                "quantity": 5
+            }
+            for product in products
+        ],
+        tenant_id=tenant_id,
+        performed_by=user_id
+    )
+    batch_elapsed = time.perf_counter() - start
+    
+    assert all(result["status"] == "applied" for result in results)
+    print(
+        f"\n{MOVEMENT_COUNT} movements: single-row {MOVEMENT_COUNT / single_elapsed:.0f}/s, "
+        f"batch {MOVEMENT_COUNT / batch_elapsed:.0f}/s ({single_elapsed / batch_elapsed:.1f}x)"
+    )
+    assert batch_elapsed < single_elapsed
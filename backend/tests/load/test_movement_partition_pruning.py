@@ -0,0 +1,138 @@
+"""
+Partition pruning benchmark for inventory_movements.
+
+Builds a plain and a monthly-partitioned copy of the movements table in a
+scratch schema, loads two years of movements into both, and compares the
+forecast-style "last 90 days for one product" query. The partitioned plan
+should touch only the 4 partitions overlapping the window.
+
+Needs PostgreSQL (the test suite itself runs on SQLite), so it is skipped
+unless BENCHMARK_DATABASE_URL points at a Postgres database.
+
+Run with: BENCHMARK_DATABASE_URL=postgresql://... pytest tests/load/test_movement_partition_pruning.py -s
+"""
+import os
+import re
+import statistics
+import time
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.database.partitions import add_months, ensure_partitions, month_start
+
+
+BENCHMARK_DATABASE_URL = os.environ.get("BENCHMARK_DATABASE_URL", "")
+SCHEMA = "partition_bench"
+MONTHS = 24
+ROWS = 2_000_000
+PRODUCTS = 500
+REPEATS = 5
+
+# Matches "Seq Scan on <partition>" and "Index Scan using ... on <partition>", not index names
+PARTITION_SCAN = re.compile(r" on (inventory_movements_p\d{6})\b")
+
+pytestmark = pytest.mark.skipif(
+    not BENCHMARK_DATABASE_URL.startswith("postgresql"),
+    reason="BENCHMARK_DATABASE_URL must point at a PostgreSQL database"
+)
+
+COLUMNS = """
+    id uuid NOT NULL,
+    tenant_id uuid NOT NULL,
+    product_id uuid NOT NULL,
+    movement_type varchar(20) NOT NULL,
+    quantity numeric(15, 3) NOT NULL,
+    performed_at timestamptz NOT NULL
+"""
+
+HISTORY_QUERY = """
+    SELECT * FROM {table}
+    WHERE tenant_id = :tenant_id AND product_id = :product_id
+      AND performed_at >= :since AND performed_at < :until
+    ORDER BY performed_at
+"""
+
+
+@pytest.fixture(scope="module")
+def bench_conn():
+    """Scratch schema with a plain and a partitioned movements table holding the same rows."""
+    engine = create_engine(BENCHMARK_DATABASE_URL)
+    first_month = add_months(month_start(date.today()), -MONTHS)
+    
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        conn.execute(text(f"SET search_path TO {SCHEMA}"))
+        
+        conn.execute(text(f"CREATE TABLE movements_plain ({COLUMNS}, PRIMARY KEY (id))"))
+        conn.execute(text(
+            f"CREATE TABLE inventory_movements ({COLUMNS}, PRIMARY KEY (id, performed_at)) "
+            f"PARTITION BY RANGE (performed_at)"
+        ))
+        ensure_partitions(conn, "inventory_movements", first_month, months_ahead=1)
+        
+        for table in ("movements_plain", "inventory_movements"):
+            conn.execute(text(
+                f"CREATE INDEX ON {table} (tenant_id, product_id, performed_at)"
+            ))
+        
+        tenant_id = uuid4()
+        conn.execute(
+            text(f"""
+                INSERT INTO movements_plain
+                SELECT gen_random_uuid(), :tenant_id,
+                       md5('product' || (n % {PRODUCTS}))::uuid,
+                       'outbound', 1 + n % 7,
+                       :start + (n::float / {ROWS}) * (now() - :start)
+                FROM generate_series(1, {ROWS}) AS n
+            """),
+            {"tenant_id": tenant_id, "start": datetime.combine(first_month, datetime.min.time(), timezone.utc)}
+        )
+        conn.execute(text("INSERT INTO inventory_movements SELECT * FROM movements_plain"))
+        conn.execute(text("ANALYZE movements_plain"))
+        conn.execute(text("ANALYZE inventory_movements"))
+        product_id = conn.execute(text("SELECT md5('product1')::uuid")).scalar()
+    
+    conn = engine.connect()
+    conn.execute(text(f"SET search_path TO {SCHEMA}"))
+    yield conn, {"tenant_id": tenant_id, "product_id": product_id}
+    conn.close()
+    
+    with engine.begin() as cleanup:
+        cleanup.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    engine.dispose()
+
+
+def _time_query(conn, table, params):
+    """Median latency in ms of the 90-day history query."""
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        conn.execute(text(HISTORY_QUERY.format(table=table)), params).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def test_90_day_history_scans_only_overlapping_partitions(bench_conn):
+    """The planner prunes every partition outside the query window."""
+    conn, ids = bench_conn
+    until = datetime.now(timezone.utc)
+    params = {**ids, "since": until - timedelta(days=90), "until": until}
+    
+    plan = conn.execute(
+        text("EXPLAIN (FORMAT TEXT) " + HISTORY_QUERY.format(table="inventory_movements")),
+        params
+    ).scalars().all()
+    scanned = {name for line in plan for name in PARTITION_SCAN.findall(line)}
+    
+    plain_ms = _time_query(conn, "movements_plain", params)
+    partitioned_ms = _time_query(conn, "inventory_movements", params)
+    
+    print(f"\nPartitions scanned: {len(scanned)} of {MONTHS + 2} ({', '.join(sorted(scanned))})")
+    print(f"90-day history: plain {plain_ms:.2f}ms, partitioned {partitioned_ms:.2f}ms")
+    
+    # 90 days overlaps at most 4 calendar months
+    assert 0 < len(scanned) <= 4
@@ -0,0 +1,157 @@
+"""
+Burst test: many movements arriving at once for a single SKU.
+
+Instead of failing with version conflicts, movements on the same SKU are
+queued and applied in arrival order while other SKUs proceed in parallel.
+
+Run with: pytest tests/load/test_movement_sequencer.py -s
+"""
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from src.services.movement_sequencer import MovementQueueFullError, MovementSequencer
+
+
+BURST_SIZE = 200
+
+
+def test_burst_on_one_sku_is_applied_in_arrival_order():
+    """Every movement in a burst is applied, one at a time, in arrival order."""
+    sequencer = MovementSequencer(max_queue_depth=BURST_SIZE)
+    key = (uuid4(), uuid4(), uuid4())
+    applied = []
+    tickets = []
+    in_flight = 0
+    max_in_flight = 0
+    
+    async def movement(n):
+        nonlocal in_flight, max_in_flight
+        async with sequencer.sequence([key]) as ticket:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0)  # Yield so a broken lock would interleave
+            applied.append(n)
+            tickets.append(ticket)
+            in_flight -= 1
+    
+    async def burst():
+        await asyncio.gather(*(movement(n) for n in range(BURST_SIZE)))
+    
+    asyncio.run(burst())
+    
+    delayed = sum(1 for t in tickets if t.delayed)
+    print(f"\n{BURST_SIZE} movements on one SKU: {delayed} delayed, "
+          f"max wait {max(t.wait_ms for t in tickets):.2f} ms")
+    assert applied == list(range(BURST_SIZE))
+    assert max_in_flight == 1
+    assert delayed == BURST_SIZE - 1
+    assert sequencer.stats()["active_skus"] == 0
+
+
+def test_different_skus_do_not_wait_on_each_other():
+    """Movements on distinct SKUs are not delayed by one another."""
+    sequencer = MovementSequencer()
+    tenant_id, product_id = uuid4(), uuid4()
+    
+    async def movement():
+        async with sequencer.sequence([(tenant_id, product_id, uuid4())]) as ticket:
+            await asyncio.sleep(0.01)
+            return ticket
+    
+    async def burst():
+        return await asyncio.gather(*(movement() for _ in range(50)))
+    
+    tickets = asyncio.run(burst())
+    
+    assert not any(t.delayed for t in tickets)
+
+
+def test_opposite_transfers_do_not_deadlock():
+    """Transfers A->B and B->A acquire their SKUs in the same order."""
+    sequencer = MovementSequencer()
+    tenant_id, product_id = uuid4(), uuid4()
+    a = (tenant_id, product_id, uuid4())
+    b = (tenant_id, product_id, uuid4())
+    
+    async def transfer(keys):
+        async with sequencer.sequence(keys):
+            await asyncio.sleep(0)
+    
+    async def burst():
+        await asyncio.wait_for(
+            asyncio.gather(*(transfer([a, b] if n % 2 else [b, a]) for n in range(100))),
+            timeout=5
+        )
+    
+    asyncio.run(burst())
+    assert sequencer.stats()["pending_movements"] == 0
+
+
+def test_full_queue_is_refused():
+    """Arrivals beyond max_queue_depth are refused instead of queued."""
+    sequencer = MovementSequencer(max_queue_depth=2)
+    key = (uuid4(), uuid4(), uuid4())
+    
+    async def scenario():
+        release = asyncio.Event()
+        
+        async def holder():
+            async with sequencer.sequence([key]):
+                await release.wait()
+        
+        tasks = [asyncio.create_task(holder()) for _ in range(2)]
+        await asyncio.sleep(0)
+        
+        with pytest.raises(MovementQueueFullError):
+            async with sequencer.sequence([key]):
+                pass
+        
+        release.set()
+        await asyncio.gather(*tasks)
+    
+    asyncio.run(scenario())
+    assert sequencer.stats()["active_skus"] == 0
+
+
+def _post_outbound(client, auth_token, test_product, test_warehouse, expected_version=None):
+    return client.post(
+        "/v1/inventory/movement",
+        json={
+            "movement_type": "outbound",
+            "product_id": str(test_product.id),
+            "source_warehouse_id": str(test_warehouse.id),
+            "quantity": 5,
+            "expected_version": expected_version
+        },
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+
+
+def test_movements_without_version_are_sequenced(client, auth_token, test_product, test_warehouse, test_inventory):
+    """POST /v1/inventory/movement applies movements without expected_version in arrival order."""
+    for _ in range(2):
+        response = _post_outbound(client, auth_token, test_product, test_warehouse)
+        
+        assert response.status_code == 201
+        data = response.json()
+        assert data["delayed"] is False
+        assert data["queue_wait_ms"] is not None
+    
+    assert data["quantity_before"] == 95.0
+    assert data["quantity_after"] == 90.0
+
+
+def test_stale_expected_version_is_rejected_in_sequence(client, auth_token, test_product, test_warehouse, test_inventory):
+    """A client-supplied expected_version is still checked when sequencing is on."""
+    version = test_inventory.version
+    first = _post_outbound(client, auth_token, test_product, test_warehouse, expected_version=version)
+    stale = _post_outbound(client, auth_token, test_product, test_warehouse, expected_version=version)
+    current = _post_outbound(client, auth_token, test_product, test_warehouse, expected_version=version + 1)
+    
+    assert first.status_code == 201
+    assert first.json()["queue_wait_ms"] is not None
+    assert stale.status_code == 409
+    assert current.status_code == 201
+    assert current.json()["quantity_after"] == 90.0
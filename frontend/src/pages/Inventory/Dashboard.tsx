@@ -1,9 +1,9 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { useInventory } from '../../hooks/useInventory';
 import { useWarehouses } from '../../hooks/useWarehouses';
 import { useAuth } from '../../contexts/AuthContext';
 import { WebSocketClient } from '../../services/websocket';
-import { Inventory } from '../../types/inventory';
+import { Inventory, InventoryStockUpdate, LowStockCrossing } from '../../types/inventory';
 import InventoryList from '../../components/inventory/InventoryList';
 import WarehouseFilter from '../../components/inventory/WarehouseFilter';
 import { useToast } from '../../components/common/Toast';
@@ -16,6 +16,8 @@ const Dashboard: React.FC = () => {
   const [lowStockOnly, setLowStockOnly] = useState(false);
   const [inventoryData, setInventoryData] = useState<Inventory[]>([]);
   const [wsClient, setWsClient] = useState<WebSocketClient | null>(null);
+  const inventoryRef = useRef<Inventory[]>([]);
+  inventoryRef.current = inventoryData;
   
   const { user } = useAuth();
   const { showToast } = useToast();
@@ -42,27 +44,26 @@ const Dashboard: React.FC = () => {
 
     const client = new WebSocketClient(API_BASE_URL, token);
     
-    client.on('inventory_update', (update: Inventory) => {
-      setInventoryData((prev) => {
-        const index = prev.findIndex((item) => item.id === update.id);
-        if (index >= 0) {
-          // Update existing item
-          const updated = [...prev];
-          updated[index] = update;
-          return updated;
-        } else {
-          // Add new item
-          return [...prev, update];
-        }
-      });
-      
-      // Show toast notification for low stock items
-      if (update.is_low_stock) {
-        showToast(
-          `Low stock alert: ${update.product_name} at ${update.warehouse_name}`,
-          'warning'
-        );
-      }
+    client.on('inventory_update', (update: InventoryStockUpdate) => {
+      // Rows not on screen yet show up on the next refetch
+      setInventoryData((prev) =>
+        prev.map((item) =>
+          item.id === update.id
+            ? { ...item, ...update, available_quantity: update.quantity - item.reserved_quantity }
+            : item
+        )
+      );
+    });
+
+    // Show toast notification when an item drops below minimum stock
+    client.on('low_stock_entered', (crossing: LowStockCrossing) => {
+      const item = inventoryRef.current.find((row) => row.id === crossing.inventory_id);
+      showToast(
+        item
+          ? `Low stock alert: ${item.product_name} at ${item.warehouse_name}`
+          : 'Low stock alert',
+        'warning'
+      );
     });
 
     client.connect().catch((error) => {
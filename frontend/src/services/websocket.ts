@@ -1,6 +1,6 @@
-import { InventoryUpdate } from '../types/inventory';
+import { InventoryUpdate, LowStockEvent } from '../types/inventory';
 
-export type WebSocketMessage = InventoryUpdate | { type: 'connected' | 'ping' | 'pong'; message?: string; timestamp?: number };
+export type WebSocketMessage = InventoryUpdate | LowStockEvent | { type: 'connected' | 'ping' | 'pong'; message?: string; timestamp?: number };
 
 export class WebSocketClient {
   private ws: WebSocket | null = null;
@@ -100,6 +100,11 @@ export class WebSocketClient {
       if (listeners) {
         listeners.forEach(callback => callback((message as InventoryUpdate).data));
       }
+    } else if (message.type === 'low_stock_entered' || message.type === 'low_stock_left') {
+      const listeners = this.listeners.get(message.type);
+      if (listeners) {
+        listeners.forEach(callback => callback((message as LowStockEvent).data));
+      }
     } else if (message.type === 'ping') {
       // Respond to ping
       this.send({ type: 'pong', timestamp: message.timestamp });
@@ -15,8 +15,31 @@ export interface Inventory {
   last_movement_at: string | null;
 }
 
+// Stock fields of an inventory row, as pushed after each change
+export type InventoryStockUpdate = Pick<
+  Inventory,
+  'id' | 'product_id' | 'warehouse_id' | 'quantity' | 'minimum_stock' | 'is_low_stock' | 'last_movement_at'
+>;
+
 export interface InventoryUpdate {
   type: 'inventory_update';
-  data: Inventory;
-  timestamp: number;
+  event_id: string;
+  data: InventoryStockUpdate;
+  timestamp: string;
+}
+
+export interface LowStockCrossing {
+  tenant_id: string;
+  inventory_id: string;
+  product_id: string;
+  warehouse_id: string;
+  quantity: number;
+  minimum_stock: number | null;
+}
+
+export interface LowStockEvent {
+  type: 'low_stock_entered' | 'low_stock_left';
+  event_id: string;
+  data: LowStockCrossing;
+  timestamp: string;
 }